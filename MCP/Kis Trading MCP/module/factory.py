@@ -4,3 +4,4 @@ CONTEXT_ENVIRONMENT = "context_environment"
 CONTEXT_STARTED_AT = "context_started_at"
 CONTEXT_ENDED_AT = "context_ended_at"
 CONTEXT_ELAPSED_SECONDS = "context_elapsed_seconds"
+CONTEXT_CACHE_STATUS = "context_cache_status"
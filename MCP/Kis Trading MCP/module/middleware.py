@@ -5,6 +5,7 @@ import time
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 
 import module.factory as factory
+from module.plugin.response_cache import ResponseCache, call_info
 
 # 기본 미들웨어
 class EnvironmentMiddleware(Middleware):
@@ -28,6 +29,10 @@ class EnvironmentMiddleware(Middleware):
         # context setup
         ctx.set_state(factory.CONTEXT_ENVIRONMENT, self.environment)
 
+        # 응답 캐시 처리 결과 (hit/miss/coalesced/bypass) 수집
+        info = {}
+        token = call_info.set(info)
+
         try:
             result = await call_next(context)
             return result
@@ -42,5 +47,10 @@ class EnvironmentMiddleware(Middleware):
             elapsed_sec = time.perf_counter() - t0
             ctx.set_state(factory.CONTEXT_ELAPSED_SECONDS, round(elapsed_sec, 2))
 
+            # cache hit/miss metrics
+            call_info.reset(token)
+            ctx.set_state(factory.CONTEXT_CACHE_STATUS, info.get("cache"))
+            ResponseCache().record_call(getattr(context.message, "name", "unknown"), info.get("cache"), elapsed_sec)
+
 
 
@@ -1,4 +1,9 @@
 from .kis import setup_kis_config
 from .environment import setup_environment, EnvironmentConfig
 from .master_file import MasterFileManager
-from .database import DatabaseEngine, Database
\ No newline at end of file
+from .database import DatabaseEngine, Database
+from .api_runtime import ApiCodeCache, ApiRuntime
+from .api_worker import ApiWorkerPool
+from .stock_resolver import StockResolver
+from .config_registry import ConfigRegistry
+from .response_cache import ResponseCache
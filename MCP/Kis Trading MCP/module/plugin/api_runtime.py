@@ -0,0 +1,361 @@
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from module.decorator import singleton
+
+# GitHub 트리 URL (https://github.com/{owner}/{repo}/tree/{ref}/{path})
+GITHUB_TREE_PATTERN = re.compile(r"https://github\.com/([^/]+)/([^/]+)/tree/([^/]+)/(.+)")
+# 예제 코드의 trenv 사용 패턴 (param_name=xxx.my_attr)
+TRENV_PARAM_PATTERN = re.compile(r"(\w+)=\w*\.(my_\w+)")
+
+# 계좌 관련 파라미터는 LLM 값을 무시하고 kis_auth 설정값 사용
+ACCOUNT_PARAMS = {
+    "cano": "my_acct",  # 종합계좌번호
+    "acnt_prdt_cd": "my_prod",  # 계좌상품코드
+    "my_htsid": "my_htsid",  # HTS ID
+    "user_id": "my_htsid",  # domestic_stock에서 발견된 변형
+}
+
+
+class ApiCodeCache:
+    """API 예제 코드 로컬 캐시
+
+    GitHub 에서 받은 kis_auth.py 와 API 파일을 ref(브랜치/태그) 별 디렉토리에 저장하고, 이후에는 로컬 파일을 사용한다.
+    KIS_API_CODE_DIR 에 open-trading-api 체크아웃 경로를 지정하면 다운로드 없이 해당 경로의 파일을 사용한다.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, source_dir: Optional[str] = None):
+        self.base_dir = base_dir or os.getenv("KIS_API_CODE_CACHE", "./tmp/api_code")
+        self.source_dir = source_dir or os.getenv("KIS_API_CODE_DIR") or None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse_github_url(github_url: str) -> Tuple[str, str, str]:
+        """GitHub 트리 URL → (owner/repo, ref, 경로)"""
+        match = GITHUB_TREE_PATTERN.match(github_url.rstrip("/"))
+        if not match:
+            raise ValueError(f"지원하지 않는 GitHub URL: {github_url}")
+        owner, repo, ref, path = match.groups()
+        return f"{owner}/{repo}", ref, path
+
+    def _manifest_path(self, ref: str) -> str:
+        return os.path.join(self.base_dir, ref, "manifest.json")
+
+    def _read_manifest(self, ref: str) -> Dict[str, Any]:
+        try:
+            with open(self._manifest_path(ref), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self, ref: str, manifest: Dict[str, Any]):
+        path = self._manifest_path(ref)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def get_file(self, repo: str, ref: str, rel_path: str) -> str:
+        """캐시된 파일 경로 반환 (없으면 다운로드)"""
+        if self.source_dir:
+            local_path = os.path.join(self.source_dir, rel_path)
+            if os.path.isfile(local_path):
+                return local_path
+
+        local_path = os.path.join(self.base_dir, ref, rel_path)
+        if os.path.isfile(local_path):
+            return local_path
+
+        with self._lock:
+            if os.path.isfile(local_path):
+                return local_path
+
+            url = f"https://raw.githubusercontent.com/{repo}/{ref}/{rel_path}"
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(f"{local_path}.tmp", "w", encoding="utf-8") as f:
+                f.write(response.text)
+            os.replace(f"{local_path}.tmp", local_path)
+
+            manifest = self._read_manifest(ref)
+            manifest[rel_path] = {
+                "url": url,
+                "sha256": hashlib.sha256(response.content).hexdigest(),
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._write_manifest(ref, manifest)
+            logging.info(f"📥 API 코드 캐시 저장: {rel_path} ({ref})")
+            return local_path
+
+    def get_api_file(self, github_url: str, api_type: str) -> Tuple[str, str]:
+        """API 파일 경로와 ref 반환"""
+        repo, ref, path = self.parse_github_url(github_url)
+        return self.get_file(repo, ref, f"{path}/{api_type}.py"), ref
+
+    def get_kis_auth(self, github_url: str) -> str:
+        """API 파일과 같은 ref 의 examples_llm/kis_auth.py 경로 반환"""
+        repo, ref, _ = self.parse_github_url(github_url)
+        return self.get_file(repo, ref, "examples_llm/kis_auth.py")
+
+    def invalidate(self, ref: Optional[str] = None):
+        """캐시 삭제 (ref 미지정시 전체), 이미 import 된 모듈은 서버 재시작 후 반영"""
+        target = os.path.join(self.base_dir, ref) if ref else self.base_dir
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def to_structured(result: Any) -> Any:
+    """API 함수 반환값을 JSON 직렬화 가능한 값으로 변환"""
+    if isinstance(result, tuple):
+        return {f"output{i + 1}": to_structured(item) for i, item in enumerate(result)}
+    if hasattr(result, "to_json"):
+        # DataFrame: numpy 타입 변환을 pandas 에 맡김
+        return json.loads(result.to_json(orient="records", force_ascii=False)) if not result.empty else []
+    if result is None or isinstance(result, (dict, list, str, int, float, bool)):
+        return result
+    return str(result)
+
+
+class _ThreadStdout:
+    """sys.stdout 대체 객체, capture() 중인 스레드의 print 출력만 해당 버퍼로 보내고 나머지는 원래 stdout 으로 보냄
+
+    redirect_stdout 은 프로세스 전체의 sys.stdout 을 바꾸므로 여러 스레드에서 동시에 API 를 호출할 때 사용할 수 없다.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self, buffer: io.StringIO):
+        previous = getattr(self._local, "buffer", None)
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = previous
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+_stdout_lock = threading.Lock()
+
+
+def _thread_stdout() -> _ThreadStdout:
+    """sys.stdout 을 _ThreadStdout 으로 한번만 교체"""
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadStdout):
+            sys.stdout = _ThreadStdout(sys.stdout)
+        return sys.stdout
+
+
+@singleton
+class ApiRuntime:
+    """API 함수를 서버 프로세스 안에서 직접 호출
+
+    kis_auth 는 실전/모의 환경별로 따로 import 하여(kis_auth_prod / kis_auth_vps) 환경마다 인증 상태(토큰, 헤더)를
+    각자의 모듈 전역에 보관하고, API 모듈도 환경별로 import 하여 해당 환경의 kis_auth 를 사용하게 한다.
+    호출마다 kis_auth 전역을 바꾸지 않으므로 lock 은 모듈 로드와 인증에만 사용하고, API 호출(HTTP) 은 동시에 실행된다.
+    API 함수의 print 출력은 MCP stdio 와 섞이지 않도록 호출한 스레드별 버퍼로 받는다.
+    """
+
+    def __init__(self):
+        self.code_cache = ApiCodeCache()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._auth_modules: Dict[str, Any] = {}
+        self._modules: Dict[str, Any] = {}
+        self._sessions: Dict[str, float] = {}
+        self._stats = {"calls": 0, "errors": 0, "module_loads": 0, "auth": 0, "total_time": 0.0, "active": 0}
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self._stats[name] += delta
+
+    # ========== 모듈 로드 ==========
+    def _load_kis_auth(self, github_url: str, svr: str):
+        """svr 전용 kis_auth 모듈 (lock 안에서 호출)"""
+        ka = self._auth_modules.get(svr)
+        if ka is not None:
+            return ka
+        kis_auth_path = self.code_cache.get_kis_auth(github_url)
+        kis_auth_dir = os.path.dirname(os.path.abspath(kis_auth_path))
+        if kis_auth_dir not in sys.path:
+            sys.path.insert(0, kis_auth_dir)
+        spec = importlib.util.spec_from_file_location(f"kis_auth_{svr}", kis_auth_path)
+        ka = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(ka)
+        # 실전/모의 토큰이 같은 파일을 덮어쓰지 않도록 모의는 별도 파일 사용
+        if svr != "prod":
+            ka.token_tmp = f"{ka.token_tmp}_{svr}"
+        self._auth_modules[svr] = ka
+        return ka
+
+    def _load_module(self, github_url: str, api_type: str, svr: str):
+        """svr 의 kis_auth 를 사용하는 API 모듈 (lock 안에서 호출)"""
+        key = f"{svr}:{github_url}/{api_type}"
+        module = self._modules.get(key)
+        if module is not None:
+            return module
+
+        ka = self._load_kis_auth(github_url, svr)
+        api_path, ref = self.code_cache.get_api_file(github_url, api_type)
+        _, _, path = ApiCodeCache.parse_github_url(github_url)
+        module_name = "kis_api_" + re.sub(r"\W", "_", f"{svr}_{ref}_{path}_{api_type}")
+        spec = importlib.util.spec_from_file_location(module_name, api_path)
+        module = importlib.util.module_from_spec(spec)
+
+        # API 파일의 import kis_auth 가 svr 전용 모듈을 받도록 하고, sys.path.extend 가 서버 경로를 바꾸지 않도록 복원
+        saved_path = list(sys.path)
+        saved_kis_auth = sys.modules.get("kis_auth")
+        sys.modules["kis_auth"] = ka
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path[:] = saved_path
+            if saved_kis_auth is None:
+                sys.modules.pop("kis_auth", None)
+            else:
+                sys.modules["kis_auth"] = saved_kis_auth
+
+        with open(api_path, "r", encoding="utf-8") as f:
+            module.__kis_source__ = f.read()
+        self._modules[key] = module
+        self._count(module_loads=1)
+        return module
+
+    @staticmethod
+    def _find_function(module, api_type: str):
+        func = getattr(module, api_type, None)
+        if callable(func):
+            return func
+        # 파일명과 함수명이 다르면 첫번째 함수 사용
+        match = re.search(r"def\s+(\w+)\s*\(", module.__kis_source__)
+        if not match:
+            raise Exception("코드에서 함수를 찾을 수 없습니다.")
+        return getattr(module, match.group(1))
+
+    # ========== 인증 ==========
+    def _activate(self, github_url: str, svr: str):
+        """svr(prod/vps) kis_auth 인증 (lock 안에서 호출), 최초 1회 또는 12시간 경과시에만 토큰 확인"""
+        ka = self._load_kis_auth(github_url, svr)
+        authed_at = self._sessions.get(svr)
+        if authed_at is not None and time.time() - authed_at < 12 * 3600:
+            return ka
+        ka.auth(svr)
+        self._sessions[svr] = time.time()
+        self._count(auth=1)
+        return ka
+
+    def _prepare(self, github_url: str, api_type: str, svr: str):
+        # 모듈 로드와 인증만 lock 으로 보호
+        with self._lock:
+            ka = self._activate(github_url, svr)
+            module = self._load_module(github_url, api_type, svr)
+        return ka, module
+
+    # ========== 파라미터 ==========
+    @staticmethod
+    def _resolve_params(ka, func, source: str, params: Dict[str, Any], tool_name: str) -> Dict[str, Any]:
+        """함수 시그니처 기준 파라미터 보정 (계좌정보 강제 설정, max_depth 기본값, 거래소구분 추론)"""
+        signature = inspect.signature(func).parameters
+        # 서버에서 추가한 내부 파라미터(_로 시작)는 전달하지 않음
+        adjusted = {k: v for k, v in params.items() if not k.startswith("_")}
+
+        if "max_depth" in signature:
+            adjusted.setdefault("max_depth", 1)
+        else:
+            adjusted.pop("max_depth", None)
+
+        trenv_params = dict(ACCOUNT_PARAMS)
+        for param_name, trenv_attr in TRENV_PARAM_PATTERN.findall(source):
+            trenv_params[param_name] = trenv_attr
+            trenv_params[param_name.upper()] = trenv_attr
+
+        trenv = ka._TRENV
+        for param_name, trenv_attr in trenv_params.items():
+            if param_name in signature:
+                if param_name in adjusted:
+                    logging.info(f"[보안강제] {func.__name__} 함수의 {param_name} → {trenv_attr} (LLM값 무시)")
+                adjusted[param_name] = getattr(trenv, trenv_attr)
+
+        if "excg_id_dvsn_cd" in signature and "excg_id_dvsn_cd" not in adjusted and tool_name.startswith("domestic"):
+            adjusted["excg_id_dvsn_cd"] = "KRX"
+
+        return adjusted
+
+    # ========== 실행 ==========
+    def call(self, tool_name: str, api_type: str, params: Dict[str, Any], github_url: str) -> Dict[str, Any]:
+        """API 함수 호출, {"success", "data" | "error", "log"} 반환 (여러 스레드에서 동시에 호출 가능)"""
+        start_time = time.time()
+        svr = "vps" if params.get("env_dv", "real") == "demo" else "prod"
+        log = io.StringIO()
+        self._count(calls=1, active=1)
+        try:
+            with _thread_stdout().capture(log):
+                ka, module = self._prepare(github_url, api_type, svr)
+                func = self._find_function(module, api_type)
+                kwargs = self._resolve_params(ka, func, module.__kis_source__, params, tool_name)
+                try:
+                    result = func(**kwargs)
+                except TypeError as e:
+                    hint = "find_stock_code로 종목을 검색하세요." if "stock_name" in params \
+                        else "find_api_detail로 API 상세 정보를 확인하세요"
+                    self._count(errors=1)
+                    return {"success": False, "error": f"TypeError: {str(e)}\n💡 해결방법: {hint}", "log": log.getvalue()}
+            data = to_structured(result)
+        except Exception as e:
+            self._count(errors=1)
+            return {"success": False, "error": f"실행 중 오류: {str(e)}", "log": log.getvalue()}
+        finally:
+            self._count(total_time=time.time() - start_time, active=-1)
+
+        return {"success": True, "data": data, "log": log.getvalue()}
+
+    def warm(self, github_url: str, env_dv: str = "real") -> Dict[str, Any]:
+        """kis_auth import 및 인증을 미리 수행 (워커 시작시 사용)"""
+        try:
+            with _thread_stdout().capture(io.StringIO()):
+                with self._lock:
+                    self._activate(github_url, "vps" if env_dv == "demo" else "prod")
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        return {"success": True}
+
+    async def execute(self, tool_name: str, api_type: str, params: Dict[str, Any], github_url: str) -> Dict[str, Any]:
+        """call() 을 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.call, tool_name, api_type, params, github_url)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["loaded_modules"] = len(self._modules)
+        stats["avg_time"] = round(stats["total_time"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from module.decorator import singleton
+
+# 워커 프로세스 실행 파일 (이 파일을 스크립트로 실행)
+WORKER_SCRIPT = os.path.abspath(__file__)
+# 환경별 워커에 동시에 보내는 요청 수 (워커의 API 실행 스레드 수)
+WORKER_CONCURRENCY = int(os.getenv("KIS_WORKER_CONCURRENCY", "4"))
+
+
+class _Worker:
+    """상주 워커 프로세스 1개 (stdin/stdout 으로 JSON 한 줄씩 요청/응답, 응답은 요청 id 로 구분하므로 여러 요청을 동시에 처리)"""
+
+    def __init__(self, env: str, python: str):
+        self.env = env
+        self.python = python
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.calls = 0
+        self.rss_mb = 0.0
+        self.started_at = None
+        self.retiring = False  # 교체 대상, 처리 중인 요청이 끝나면 종료
+        self._seq = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    @property
+    def inflight(self) -> int:
+        return len(self._pending)
+
+    async def start(self, github_url: str, timeout: float):
+        # 서버 경로를 PYTHONPATH 로 전달하여 워커에서도 module 패키지 사용
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+        self.proc = await asyncio.create_subprocess_exec(
+            self.python, "-u", WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            cwd=os.getcwd(),
+            env=env,
+            limit=64 * 1024 * 1024,
+        )
+        self.started_at = time.time()
+        self._reader = asyncio.create_task(self._read_responses())
+        # kis_auth/pandas import 및 인증을 미리 수행
+        resp = await self.request({"op": "warm", "github_url": github_url, "env_dv": self.env}, timeout)
+        if not resp.get("success"):
+            await self.stop()
+            raise RuntimeError(f"워커 초기화 실패: {resp.get('error')}")
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self.proc.stdout.readline()
+                if not line:
+                    break
+                resp = json.loads(line)
+                self.rss_mb = resp.pop("rss_mb", self.rss_mb)
+                # 시간 초과 후 늦게 도착한 이전 응답은 무시
+                future = self._pending.pop(resp.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(resp)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("워커 프로세스 종료"))
+            self._pending.clear()
+
+    async def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if self._reader is None or self._reader.done():
+            raise ConnectionError("워커 프로세스 종료")
+        self._seq += 1
+        seq = self._seq
+        future = asyncio.get_running_loop().create_future()
+        self._pending[seq] = future
+        try:
+            self.proc.stdin.write((json.dumps(dict(payload, id=seq), ensure_ascii=False) + "\n").encode("utf-8"))
+            await self.proc.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(seq, None)
+
+    async def stop(self):
+        if self.proc is None:
+            return
+        if self.proc.returncode is None:
+            self.proc.kill()
+        try:
+            await self.proc.wait()
+        except ProcessLookupError:
+            pass
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self.proc = None
+
+
+@singleton
+class ApiWorkerPool:
+    """실전/모의 환경별 상주 워커 프로세스로 API 실행
+
+    워커는 kis_auth, pandas import 와 인증을 시작할 때 한번만 수행하고, 이후 요청은 파이프로 받아 ApiRuntime 으로 실행한다.
+    환경별로 최대 concurrency 개 요청을 워커에 동시에 보내고, 워커는 요청마다 스레드에서 실행한다.
+    요청별 시간 초과, max_calls 회 실행, 메모리(RSS) 가 max_rss_mb 초과시 새 워커로 교체하며,
+    이전 워커는 처리 중인 요청이 끝나면 종료한다. 환경별 대기 요청 수(queue depth) 와 처리 시간은 get_stats() 로 확인한다.
+    """
+
+    def __init__(self):
+        self.python = os.getenv("KIS_WORKER_PYTHON") or os.path.join(os.getcwd(), ".venv", "bin", "python")
+        if not os.path.isfile(self.python):
+            self.python = sys.executable
+        self.timeout = float(os.getenv("KIS_WORKER_TIMEOUT", "15"))
+        self.start_timeout = float(os.getenv("KIS_WORKER_START_TIMEOUT", "60"))
+        self.max_calls = int(os.getenv("KIS_WORKER_MAX_CALLS", "500"))
+        self.max_rss_mb = float(os.getenv("KIS_WORKER_MAX_RSS_MB", "512"))
+        self.concurrency = max(1, WORKER_CONCURRENCY)
+        self._workers: Dict[str, Optional[_Worker]] = {"real": None, "demo": None}
+        self._start_locks: Dict[str, asyncio.Lock] = {"real": asyncio.Lock(), "demo": asyncio.Lock()}
+        self._slots: Dict[str, asyncio.Semaphore] = {env: asyncio.Semaphore(self.concurrency) for env in self._workers}
+        self._metrics = {env: self._new_metrics() for env in self._workers}
+
+    @staticmethod
+    def _new_metrics() -> Dict[str, Any]:
+        return {
+            "waiting": 0, "calls": 0, "errors": 0, "timeouts": 0, "starts": 0, "recycles": 0,
+            "latency": deque(maxlen=500), "queue_wait": deque(maxlen=500),
+        }
+
+    async def _ensure_worker(self, env: str, github_url: str) -> _Worker:
+        async with self._start_locks[env]:
+            worker = self._workers[env]
+            if worker is not None and worker.alive:
+                return worker
+            worker = _Worker(env, self.python)
+            await worker.start(github_url, self.start_timeout)
+            self._workers[env] = worker
+            self._metrics[env]["starts"] += 1
+            logging.info(f"🔥 API 워커 시작 ({env}, pid={worker.proc.pid})")
+            return worker
+
+    async def _retire(self, env: str, worker: Optional[_Worker], reason: str):
+        """워커를 교체 대상으로 표시, 처리 중인 요청이 없으면 바로 종료"""
+        if worker is None:
+            return
+        if self._workers[env] is worker:
+            self._workers[env] = None
+            self._metrics[env]["recycles"] += 1
+            logging.info(f"♻️ API 워커 교체 ({env}, {reason}, calls={worker.calls}, rss={worker.rss_mb:.0f}MB)")
+        worker.retiring = True
+        if worker.inflight == 0:
+            await worker.stop()
+
+    async def execute(self, tool_name: str, api_type: str, params: Dict[str, Any], github_url: str,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """API 실행, {"success", "data" | "error"} 반환"""
+        env = "demo" if params.get("env_dv", "real") == "demo" else "real"
+        timeout = timeout or self.timeout
+        metrics = self._metrics[env]
+
+        queued_at = time.perf_counter()
+        metrics["waiting"] += 1
+        async with self._slots[env]:
+            metrics["waiting"] -= 1
+            metrics["queue_wait"].append(time.perf_counter() - queued_at)
+            metrics["calls"] += 1
+            started = time.perf_counter()
+            worker = None
+            try:
+                worker = await self._ensure_worker(env, github_url)
+                resp = await worker.request({
+                    "op": "call", "tool_name": tool_name, "api_type": api_type,
+                    "params": params, "github_url": github_url,
+                }, timeout)
+                worker.calls += 1
+            except asyncio.TimeoutError:
+                metrics["timeouts"] += 1
+                await self._retire(env, worker, "timeout")
+                return {"success": False, "error": f"실행 시간 초과 ({timeout}초)"}
+            except Exception as e:
+                metrics["errors"] += 1
+                await self._retire(env, worker, "error")
+                return {"success": False, "error": f"워커 실행 중 오류: {str(e)}"}
+            finally:
+                metrics["latency"].append(time.perf_counter() - started)
+
+            if not resp.get("success"):
+                metrics["errors"] += 1
+            if worker.retiring:
+                await self._retire(env, worker, "retired")
+            elif worker.calls >= self.max_calls:
+                await self._retire(env, worker, "max_calls")
+            elif worker.rss_mb > self.max_rss_mb:
+                await self._retire(env, worker, "memory")
+            return resp
+
+    @staticmethod
+    def _percentile(values, q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """환경별 대기 요청 수, 처리/대기 시간(초, 최근 500건), 호출/오류/시간초과 수, 워커 상태"""
+        stats = {}
+        for env, m in self._metrics.items():
+            worker = self._workers[env]
+            stats[env] = {
+                "queue_depth": m["waiting"],
+                "calls": m["calls"],
+                "errors": m["errors"],
+                "timeouts": m["timeouts"],
+                "starts": m["starts"],
+                "recycles": m["recycles"],
+                "latency_avg": round(sum(m["latency"]) / len(m["latency"]), 4) if m["latency"] else 0.0,
+                "latency_p50": self._percentile(m["latency"], 0.5),
+                "latency_p95": self._percentile(m["latency"], 0.95),
+                "queue_wait_p95": self._percentile(m["queue_wait"], 0.95),
+                "worker": {
+                    "pid": worker.proc.pid,
+                    "calls": worker.calls,
+                    "inflight": worker.inflight,
+                    "rss_mb": round(worker.rss_mb, 1),
+                    "uptime": round(time.time() - worker.started_at, 1),
+                } if worker is not None and worker.alive else None,
+            }
+        return stats
+
+    async def close(self):
+        for env, worker in list(self._workers.items()):
+            self._workers[env] = None
+            if worker is not None:
+                await worker.stop()
+
+
+def _rss_mb() -> float:
+    """현재 메모리 사용량(RSS, MB), 확인할 수 없으면 0 (메모리 기준 교체 안 함)
+
+    resource.ru_maxrss 는 최대 사용량이라 한번 한도를 넘으면 매 호출마다 교체되므로 사용하지 않는다.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        # Linux: /proc/self/statm 의 두번째 값이 현재 RSS (페이지 수)
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+def worker_main():
+    """워커 프로세스 진입점, stdin 의 요청을 스레드에서 ApiRuntime 으로 실행하고 끝난 순서대로 stdout 으로 응답"""
+    # 응답 전용 stdout 을 분리하고, 이후 print 출력은 stderr 로 보냄
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    import pandas  # noqa: F401
+    from module.plugin.api_runtime import ApiRuntime
+    runtime = ApiRuntime()
+    out_lock = threading.Lock()
+
+    def handle(req: Dict[str, Any]):
+        try:
+            if req["op"] == "warm":
+                resp = runtime.warm(req["github_url"], req["env_dv"])
+            else:
+                resp = runtime.call(req["tool_name"], req["api_type"], req["params"], req["github_url"])
+        except Exception as e:
+            resp = {"success": False, "error": str(e)}
+        resp["id"] = req.get("id")
+        resp["rss_mb"] = _rss_mb()
+        line = json.dumps(resp, ensure_ascii=False, default=str) + "\n"
+        with out_lock:
+            out.write(line)
+
+    with ThreadPoolExecutor(max_workers=max(1, WORKER_CONCURRENCY)) as executor:
+        for line in sys.stdin:
+            executor.submit(handle, json.loads(line))
+
+
+if __name__ == "__main__":
+    worker_main()
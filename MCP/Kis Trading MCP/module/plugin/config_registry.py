@@ -0,0 +1,339 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from module.decorator import singleton
+
+# 검색어 분리 (공백, _, -, /, 괄호 등)
+_TOKEN_SPLIT = re.compile(r"[\s_\-/\[\]()·,]+")
+
+
+class _ToolConfig:
+    """툴 설정 1개와 미리 계산한 설명/API 상세/검색 인덱스"""
+
+    def __init__(self, tool_name: str, path: str, config: Dict[str, Any], stamp):
+        self.tool_name = tool_name
+        self.path = path
+        self.config = config
+        self.stamp = stamp
+        self.description = build_description(tool_name, config)
+        self.api_details = {api_type: build_api_detail(tool_name, api_type, info)
+                            for api_type, info in config["apis"].items()}
+        self.available_apis = list(config["apis"].keys())
+        # api_type 별 검색 대상 문자열 (소문자)
+        self.search_text = {
+            api_type: " ".join([
+                api_type, info.get("name", ""), info.get("category", ""),
+                info.get("method", ""), info.get("api_path", ""),
+            ]).lower()
+            for api_type, info in config["apis"].items()
+        }
+
+
+def build_description(tool_name: str, config: Dict[str, Any]) -> str:
+    """툴 설정(configs/{tool}.json) 으로 도구 설명 생성"""
+    tool_info = config.get("tool_info")
+    apis = config.get("apis", {})
+
+    if not tool_info:
+        return f"{tool_name} 도구의 tool_info가 없습니다."
+
+    # description 문자열 구성
+    lines = [tool_info.get("introduce", "")]
+
+    # introduce_append가 있으면 추가
+    introduce_append = tool_info.get("introduce_append", "").strip()
+    if introduce_append:
+        lines.append(introduce_append)
+
+    lines.append("")  # 빈 줄
+    lines.append("[지원 기능]")
+
+    # API 목록 추가
+    for api_type, api_info in apis.items():
+        lines.append(f"- {api_info['name']} (api_type: \"{api_type}\")")
+
+    lines.append("")  # 빈 줄
+
+    # 개선된 구조 적용
+    lines.append("📋 사용 방법:")
+    lines.append("1. find_api_detail로 API 상세 정보를 확인하세요")
+    lines.append("2. api_type을 선택하고 params에 필요한 파라미터를 입력하세요")
+    lines.append("3. 종목명으로 검색할 경우: stock_name='종목명' 파라미터를 사용하세요")
+    lines.append("4. 모의투자 시에는 env_dv='demo'를 추가하세요")
+    lines.append("")
+    lines.append("🔧 특별한 api_type 및 예시:")
+    lines.append(f"- find_stock_code (종목번호 검색) : {tool_name}({{ \"api_type\": \"find_stock_code\", \"params\": {{ \"stock_name\": \"삼성전자\" }} }})")
+    lines.append(f"- find_api_detail (API 정보 조회) : {tool_name}({{ \"api_type\": \"find_api_detail\", \"params\": {{ \"api_type\": \"inquire_price\" }} }})")
+    lines.append(f"- find_api_detail (API 검색) : {tool_name}({{ \"api_type\": \"find_api_detail\", \"params\": {{ \"query\": \"현재가\" }} }})")
+    lines.append(f"- batch (여러 API 한번에 실행) : {tool_name}({{ \"api_type\": \"batch\", \"params\": {{ \"items\": [{{ \"api_type\": \"inquire_price\", \"params\": {{ \"stock_name\": \"삼성전자\" }} }}] }} }})")
+    lines.append(f"- executor_stats (API 실행 통계) : {tool_name}({{ \"api_type\": \"executor_stats\", \"params\": {{}} }})")
+    lines.append("")
+    lines.append("🔍 종목명 사용: stock_name=\"삼성전자\" → 자동으로 종목번호 변환하여 실행")
+    lines.append(f"{tool_name}({{ \"api_type\": \"inquire_price\", \"params\": {{ \"stock_name\": \"삼성전자\" }} }})")
+    lines.append("")
+    lines.append("💡 주요 파라미터:")
+    if tool_name.startswith('domestic'):
+        lines.append("- 시장코드(fid_cond_mrkt_div_code)='J'(KRX)/'NX'(넥스트레이드)/'UN'(통합)")
+    lines.append("- 매매구분(ord_dv)='buy'(매수)/'sell'(매도)")
+    lines.append("- 실전모의구분(env_dv)='real'(실전)/'demo'(모의)")
+    lines.append("")
+    lines.append("⚠️ 중요: API 호출 시 필수 주의사항")
+    lines.append("**API 실행 전 반드시 API 상세 문서의 파라미터를 확인하세요. Request Query Params와 Request Body 입력 시 추측이나 과거 실행 값 사용 금지, 확인된 API 상세 문서의 값을 사용하세요.**")
+    lines.append("**파라미터 description에 '공란'이 있는 경우 기본적으로 빈값으로 처리하되, 아닌 경우에는 값을 넣어도 됩니다.**")
+    lines.append("**🎯 모의투자 관련: 사용자가 '모의', '모의투자', '데모', '테스트' 등의 용어를 언급하거나 모의투자 관련 요청을 할 경우, 반드시 env_dv 파라미터를 'demo'로 설정하여 API를 호출해야 합니다. env_dv 파라미터가 있는 모든 API에서 모의투자 시에는 env_dv='demo', 실전투자 시에는 env_dv='real'을 사용합니다. 기본값은 'real'이므로 모의투자 요청 시 반드시 env_dv='demo'를 명시적으로 설정해주세요.**")
+    lines.append("")
+    lines.append("🔒 자동 처리되는 파라미터 (제공하지 마세요):")
+    lines.append("• cano (계좌번호), acnt_prdt_cd (계좌상품코드), my_htsid (HTS ID) - 시스템 자동 설정")
+    if tool_name.startswith('domestic'):
+        lines.append("• excg_id_dvsn_cd (거래소구분) - 국내 API는 자동으로 KRX 설정")
+    lines.append("")
+
+    # 예시 호출 추가
+    examples = tool_info.get("examples", [])
+    if examples:
+        lines.append("💻 예시 호출:")
+        for example in examples:
+            params_str = json.dumps(example.get('params', {}), ensure_ascii=False)
+            lines.append(
+                f"{tool_name}({{ \"api_type\": \"{example['api_type']}\",\"params\": {params_str} }})")
+
+    return "\n".join(lines)
+
+
+def build_api_detail(tool_name: str, api_type: str, api_info: Dict[str, Any]) -> Dict[str, Any]:
+    """find_api_detail 응답용 API 상세 정보 (파라미터 스키마 정리)"""
+    param_details = {}
+    for param_name, param_info in api_info.get("params", {}).items():
+        param_details[param_name] = {
+            "name": param_info.get("name", param_name),
+            "type": param_info.get("type", "str"),
+            "required": param_info.get("required", False),
+            "default_value": param_info.get("default_value"),
+            "description": param_info.get("description", "")
+        }
+
+    return {
+        "tool_name": tool_name,
+        "api_type": api_type,
+        "name": api_info.get("name", ""),
+        "category_detail": api_info.get("category", ""),
+        "method": api_info.get("method", ""),
+        "api_path": api_info.get("api_path", ""),
+        "github_url": api_info.get("github_url", ""),
+        "params": param_details
+    }
+
+
+def validate_config(tool_name: str, config: Any) -> Dict[str, Any]:
+    """설정 구조 검증, 형식이 잘못된 API 는 제외하고 경고 로그 출력
+
+    Raises:
+        ValueError: 최상위 구조(apis)가 잘못된 경우
+    """
+    if not isinstance(config, dict) or not isinstance(config.get("apis", {}), dict):
+        raise ValueError(f"{tool_name} 설정 형식 오류: 'apis' 객체가 필요합니다.")
+    if config.get("tool_info") is not None and not isinstance(config["tool_info"], dict):
+        raise ValueError(f"{tool_name} 설정 형식 오류: 'tool_info'는 객체여야 합니다.")
+
+    apis = {}
+    for api_type, info in config.get("apis", {}).items():
+        problems = []
+        if not isinstance(info, dict):
+            problems.append("객체가 아님")
+        else:
+            for key in ("name", "github_url"):
+                if not isinstance(info.get(key), str) or not info.get(key):
+                    problems.append(f"'{key}' 없음")
+            if not isinstance(info.get("params", {}), dict):
+                problems.append("'params'가 객체가 아님")
+            elif any(not isinstance(p, dict) for p in info.get("params", {}).values()):
+                problems.append("'params' 항목이 객체가 아님")
+        if problems:
+            logging.warning(f"⚠️ {tool_name}.{api_type} 설정 제외: {', '.join(problems)}")
+            continue
+        apis[api_type] = info
+
+    return dict(config, apis=apis)
+
+
+@singleton
+class ConfigRegistry:
+    """configs/{tool}.json 을 한번만 읽어 툴 설명, API 상세 정보, 검색 인덱스를 미리 만들어 두는 레지스트리
+
+    요청 처리 중에는 파일을 읽거나 JSON 을 파싱하지 않는다.
+    watch() 를 호출하면 백그라운드 스레드가 파일 변경(mtime/size) 을 확인하여 다시 읽고, on_reload 로 등록한 콜백을 호출한다.
+    watch(loop=...) 로 이벤트 루프를 지정하면 콜백은 감시 스레드가 아닌 해당 루프에서 실행된다 (MCP 도구 재등록 등).
+    변경된 파일이 잘못된 경우 이전 설정을 유지한다.
+    """
+
+    def __init__(self):
+        self.config_dir = os.getenv("KIS_CONFIG_DIR", "./configs")
+        self.reload_interval = float(os.getenv("KIS_CONFIG_RELOAD_INTERVAL", "2"))
+        self._tools: Dict[str, _ToolConfig] = {}
+        self._callbacks: List[Callable[[str], None]] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def path(self, tool_name: str) -> str:
+        return os.path.join(self.config_dir, f"{tool_name}.json")
+
+    @staticmethod
+    def _stamp(path: str):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self, tool_name: str) -> _ToolConfig:
+        path = self.path(tool_name)
+        stamp = self._stamp(path)
+        if stamp is None:
+            config = {"apis": {}}
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        return _ToolConfig(tool_name, path, validate_config(tool_name, config), stamp)
+
+    def get(self, tool_name: str) -> _ToolConfig:
+        """툴 설정 (최초 1회 로드)"""
+        entry = self._tools.get(tool_name)
+        if entry is None:
+            with self._lock:
+                entry = self._tools.get(tool_name)
+                if entry is None:
+                    entry = self._load(tool_name)
+                    self._tools[tool_name] = entry
+                    logging.info(f"📚 {tool_name} 설정 로드 완료 (API {len(entry.available_apis)}개)")
+        return entry
+
+    def preload(self, tool_names: Optional[List[str]] = None):
+        """툴 설정 일괄 로드 (생략시 configs 폴더의 모든 json)"""
+        if tool_names is None:
+            tool_names = sorted(f[:-5] for f in os.listdir(self.config_dir) if f.endswith(".json"))
+        for tool_name in tool_names:
+            try:
+                self.get(tool_name)
+            except Exception as e:
+                logging.error(f"❌ {tool_name} 설정 로드 실패: {e}")
+
+    # ========== 조회 ==========
+
+    def config(self, tool_name: str) -> Dict[str, Any]:
+        return self.get(tool_name).config
+
+    def description(self, tool_name: str) -> str:
+        return self.get(tool_name).description
+
+    def api_detail(self, tool_name: str, api_type: str) -> Optional[Dict[str, Any]]:
+        """API 상세 정보 사본, 없으면 None"""
+        detail = self.get(tool_name).api_details.get(api_type)
+        return copy.deepcopy(detail) if detail is not None else None
+
+    def available_apis(self, tool_name: str) -> List[str]:
+        return list(self.get(tool_name).available_apis)
+
+    def search_apis(self, tool_name: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """api_type/API명/카테고리/경로로 API 검색 (검색어 전체 일치 우선, 이후 단어 일치 수 순)"""
+        entry = self.get(tool_name)
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+        terms = [t for t in _TOKEN_SPLIT.split(query) if t]
+
+        scored = []
+        for api_type, text in entry.search_text.items():
+            info = entry.config["apis"][api_type]
+            score = 0
+            if api_type.lower() == query:
+                score += 100
+            if query in api_type.lower():
+                score += 10
+            if query in info.get("name", "").lower():
+                score += 10
+            score += sum(2 if t in api_type.lower() else 1 for t in terms if t in text)
+            if score:
+                scored.append((score, api_type))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [{
+            "api_type": api_type,
+            "name": entry.config["apis"][api_type].get("name", ""),
+            "category": entry.config["apis"][api_type].get("category", ""),
+            "score": score,
+        } for score, api_type in scored[:limit]]
+
+    # ========== 변경 감지 ==========
+
+    def on_reload(self, callback: Callable[[str], None]):
+        """설정이 다시 로드되면 callback(tool_name) 호출"""
+        self._callbacks.append(callback)
+
+    def check_updates(self) -> List[str]:
+        """변경된 설정 파일을 다시 읽고 다시 읽은 툴 이름 목록 반환"""
+        reloaded = []
+        for tool_name, entry in list(self._tools.items()):
+            if self._stamp(entry.path) == entry.stamp:
+                continue
+            try:
+                new_entry = self._load(tool_name)
+            except Exception as e:
+                logging.error(f"❌ {tool_name} 설정 다시 읽기 실패, 이전 설정 유지: {e}")
+                # 같은 파일로 반복 실패하지 않도록 현재 stamp 기록
+                entry.stamp = self._stamp(entry.path)
+                continue
+            with self._lock:
+                self._tools[tool_name] = new_entry
+            reloaded.append(tool_name)
+            logging.info(f"🔄 {tool_name} 설정 다시 로드 (API {len(new_entry.available_apis)}개)")
+            self._notify(tool_name)
+        return reloaded
+
+    def _notify(self, tool_name: str):
+        loop = self._loop
+        for callback in list(self._callbacks):
+            if loop is None:
+                self._invoke(callback, tool_name)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._invoke, callback, tool_name)
+            except RuntimeError:
+                # 이벤트 루프 종료 후에는 콜백을 실행하지 않음
+                logging.warning(f"⚠️ {tool_name} 설정 변경 처리 생략: 이벤트 루프가 종료되었습니다.")
+
+    @staticmethod
+    def _invoke(callback: Callable[[str], None], tool_name: str):
+        try:
+            callback(tool_name)
+        except Exception as e:
+            logging.error(f"❌ {tool_name} 설정 변경 처리 실패: {e}")
+
+    def watch(self, interval: Optional[float] = None, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """백그라운드 스레드에서 interval 초마다 설정 파일 변경 확인 (0 이하면 사용 안 함)
+
+        loop 지정시 on_reload 콜백은 loop.call_soon_threadsafe 로 해당 이벤트 루프에서 실행
+        """
+        if loop is not None:
+            self._loop = loop
+        interval = self.reload_interval if interval is None else interval
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.check_updates()
+
+        self._watcher = threading.Thread(target=run, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
@@ -1,5 +1,5 @@
 from typing import Any, Dict, List, Optional, Type, Union
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -8,6 +8,11 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# 마스터 종목명/코드 부분일치 검색용 FTS5 가상 테이블
+SEARCH_TABLE = "master_search"
+# 검색어가 짧아 일치 종목이 많을 때 정렬 대상으로 읽는 최대 행 수 (완전일치는 항상 포함)
+SEARCH_SCAN_LIMIT = 500
+
 
 class DatabaseEngine:
     """1 SQLite 파일 : 1 엔진을 관리하는 클래스"""
@@ -37,6 +42,7 @@ class DatabaseEngine:
                 pool_pre_ping=True,  # 연결 상태 확인
                 connect_args={"check_same_thread": False}  # SQLite 멀티스레드 지원
             )
+            event.listen(self.engine, "connect", self._set_sqlite_pragma)
             
             # 세션 팩토리 생성
             self.SessionLocal = sessionmaker(
@@ -47,6 +53,7 @@ class DatabaseEngine:
             
             # 테이블 생성
             self._create_tables()
+            self.search_enabled = self._create_search_table()
             
             logger.info(f"Database engine initialized: {self.db_path}")
             
@@ -64,6 +71,30 @@ class DatabaseEngine:
             logger.error(f"Failed to create tables for {self.db_path}: {e}")
             raise
     
+    @staticmethod
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        """WAL 모드 사용 (마스터 갱신 중에도 조회가 막히지 않도록)"""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+        finally:
+            cursor.close()
+    
+    def _create_search_table(self) -> bool:
+        """종목 검색용 FTS5(trigram) 테이블 생성, SQLite 3.34 미만 등으로 실패하면 LIKE 검색 사용"""
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                    "USING fts5(name, code, ex, tool_name UNINDEXED, tokenize='trigram')"
+                ))
+            return True
+        except SQLAlchemyError as e:
+            logger.warning(f"FTS5 trigram search unavailable for {self.db_path}, fallback to LIKE: {e}")
+            return False
+    
     def get_session(self) -> Session:
         """새로운 데이터베이스 세션 반환"""
         if not self.SessionLocal:
@@ -206,6 +237,29 @@ class DatabaseEngine:
         finally:
             session.close()
     
+    def list_columns(self, model_class: Type, columns: List[str]) -> List[tuple]:
+        """
+        지정 컬럼만 튜플로 전체 조회 (ORM 객체 생성 없이 한 번의 쿼리)
+        
+        Args:
+            model_class: 조회할 모델 클래스
+            columns: 조회할 컬럼명 리스트
+            
+        Returns:
+            컬럼 순서대로의 튜플 리스트
+        """
+        session = self.get_session()
+        try:
+            results = session.query(*[getattr(model_class, c) for c in columns]).all()
+            logger.info(f"Listed {len(results)} rows ({', '.join(columns)}): {model_class.__name__}")
+            return [tuple(row) for row in results]
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to list columns: {e}")
+            raise
+        finally:
+            session.close()
+    
     def get(self, model_class: Type, filters: Dict[str, Any]) -> Optional[Any]:
         """
         조건에 맞는 첫 번째 레코드 조회
@@ -330,6 +384,185 @@ class DatabaseEngine:
         finally:
             session.close()
     
+    def apply_master_diff(self, model_class: Type, records_by_ex: Dict[str, List[tuple]]) -> Dict[str, int]:
+        """
+        마스터 데이터를 기존 테이블과 비교하여 추가/수정/삭제분만 반영 (한 트랜잭션)
+        
+        거래소 코드(ex) 별로 교체하며, records_by_ex 에 없는 거래소의 데이터는 그대로 둔다.
+        커밋 전까지 다른 연결에서는 기존 데이터가 그대로 조회된다 (WAL).
+        
+        Args:
+            model_class: 마스터 데이터 모델 클래스
+            records_by_ex: {거래소 코드: [(종목명, 종목코드), ...]}
+            
+        Returns:
+            {"inserted", "updated", "deleted", "unchanged"} 레코드 수
+        """
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        session = self.get_session()
+        try:
+            inserts, updates, deletes = [], [], []
+            for ex, records in records_by_ex.items():
+                # 종목코드별 기존 (id, 종목명) 목록
+                current: Dict[str, List[tuple]] = {}
+                for record_id, name, code in session.query(model_class.id, model_class.name, model_class.code).filter(model_class.ex == ex):
+                    current.setdefault(code, []).append((record_id, name))
+                
+                incoming: Dict[str, List[str]] = {}
+                for name, code in records:
+                    incoming.setdefault(str(code), []).append(str(name))
+                
+                for code, names in incoming.items():
+                    rows = current.pop(code, [])
+                    # 종목명이 같은 행은 유지, 남은 행은 종목명 수정, 그래도 남으면 추가/삭제
+                    leftover_rows = []
+                    for record_id, name in rows:
+                        if name in names:
+                            names.remove(name)
+                            stats["unchanged"] += 1
+                        else:
+                            leftover_rows.append(record_id)
+                    for record_id, name in zip(leftover_rows, names):
+                        updates.append({"id": record_id, "name": name})
+                    inserts.extend({"name": name, "code": code, "ex": ex} for name in names[len(leftover_rows):])
+                    deletes.extend(leftover_rows[len(names):])
+                deletes.extend(record_id for rows in current.values() for record_id, _ in rows)
+            
+            batch_size = 1000
+            for i in range(0, len(deletes), batch_size):
+                session.query(model_class).filter(model_class.id.in_(deletes[i:i + batch_size])).delete(synchronize_session=False)
+            if updates:
+                session.bulk_update_mappings(model_class, updates)
+            if inserts:
+                session.bulk_insert_mappings(model_class, inserts)
+            session.commit()
+            
+            stats.update(inserted=len(inserts), updated=len(updates), deleted=len(deletes))
+            logger.info(f"Master diff applied to {model_class.__name__}: {stats}")
+            return stats
+            
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Failed to apply master diff for {model_class.__name__}: {e}")
+            raise
+        finally:
+            session.close()
+    
+    def rebuild_search_index(self, tool_name: str, model_classes: List[Type]) -> int:
+        """
+        툴의 검색 인덱스(FTS5)를 마스터 테이블 내용으로 다시 생성
+        
+        삭제와 재삽입을 한 트랜잭션으로 처리하므로 재생성 중에도 검색은 이전 인덱스를 그대로 사용한다.
+        
+        Args:
+            tool_name: 툴명
+            model_classes: 툴의 마스터 모델 클래스 리스트
+            
+        Returns:
+            인덱싱된 레코드 수
+        """
+        if not self.search_enabled:
+            return 0
+        try:
+            total = 0
+            with self.engine.begin() as conn:
+                conn.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE tool_name = :tool"), {"tool": tool_name})
+                for model_class in model_classes:
+                    ex = "ex" if hasattr(model_class, "ex") else "NULL"
+                    result = conn.execute(text(
+                        f"INSERT INTO {SEARCH_TABLE} (name, code, ex, tool_name) "
+                        f"SELECT name, code, {ex}, :tool FROM {model_class.__tablename__}"
+                    ), {"tool": tool_name})
+                    total += result.rowcount
+            logger.info(f"Search index rebuilt: {tool_name} ({total} records)")
+            return total
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to rebuild search index for {tool_name}: {e}")
+            raise
+    
+    def ensure_search_index(self, tool_name: str, model_classes: List[Type]) -> int:
+        """마스터 데이터는 있는데 검색 인덱스가 비어 있으면 생성 (기존 DB 파일 최초 실행시)"""
+        if not self.search_enabled:
+            return 0
+        with self.engine.connect() as conn:
+            indexed = conn.execute(
+                text(f"SELECT count(*) FROM {SEARCH_TABLE} WHERE tool_name = :tool"), {"tool": tool_name}
+            ).scalar()
+        if indexed or not any(self.count(model_class) for model_class in model_classes):
+            return indexed
+        return self.rebuild_search_index(tool_name, model_classes)
+    
+    def search_master(self, tool_name: str, query: str, model_classes: List[Type], limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        종목명/종목코드 부분일치 검색 (코드 일치 > 이름 일치 > 앞글자 일치 > 중간 일치, 같은 단계는 짧은 이름 우선)
+        
+        Args:
+            tool_name: 툴명
+            query: 검색어
+            model_classes: 툴의 마스터 모델 클래스 리스트 (FTS5 를 사용할 수 없을 때 LIKE 검색 대상)
+            limit: 최대 결과 수
+            
+        Returns:
+            [{code, name, ex, match_type}] 리스트
+        """
+        query = query.strip()
+        if not query:
+            return []
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = {"q": query, "prefix": f"{escaped}%", "contains": f"%{escaped}%", "tool": tool_name, "scan": SEARCH_SCAN_LIMIT}
+        rank = (
+            "CASE WHEN code = :q THEN 0 WHEN name = :q THEN 1 "
+            "WHEN name LIKE :prefix ESCAPE '\\' OR code LIKE :prefix ESCAPE '\\' THEN 2 ELSE 3 END"
+        )
+        params["upper"] = query + "\uffff"
+
+        def base(model_class, where: str, tier: str = rank) -> str:
+            ex = "ex" if hasattr(model_class, "ex") else "NULL AS ex"
+            return (f"SELECT * FROM (SELECT name, code, {ex}, {tier} AS tier FROM {model_class.__tablename__} "
+                    f"WHERE {where} ORDER BY tier, length(name), name LIMIT :scan)")
+
+        # 코드/이름 완전일치와 앞글자 일치는 항상 마스터 테이블의 name/code B-tree 인덱스로 조회 (FTS 결과 수와 관계없이 포함)
+        sources = [base(m, "code = :q OR name = :q") for m in model_classes]
+        sources += [base(m, "(name >= :q AND name < :upper) OR (code > :q AND code < :upper)") for m in model_classes]
+        if self.search_enabled and len(query) >= 3:
+            # trigram 토크나이저는 3글자 이상일 때 MATCH 로 인덱스 사용, 단계/bm25 순으로 정렬한 후 scan 건만 사용
+            params["match"] = '{name code ex}: "' + query.replace('"', '""') + '"'
+            sources.append(
+                f"SELECT name, code, ex, tier FROM (SELECT name, code, ex, {rank} AS tier FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :match AND tool_name = :tool "
+                f"ORDER BY tier, bm25({SEARCH_TABLE}), length(name) LIMIT :scan)"
+            )
+            rows = self._search_rows(sources, params, tool_name)
+        else:
+            # 1~2 글자 검색어(또는 FTS5 미지원)는 앞글자 일치가 부족하면 중간 일치를 전체 조회로 보충
+            rows = self._search_rows(sources, params, tool_name)
+            if len(rows) < limit:
+                sources = [base(m, "name LIKE :contains ESCAPE '\\'", "3") for m in model_classes]
+                rows = self._search_rows(sources, params, tool_name, rows)
+
+        match_types = ["code_exact", "name_exact", "name_prefix", "name_contains"]
+        return [
+            {"code": code, "name": name, "ex": ex, "match_type": match_types[tier]}
+            for name, code, ex, tier in rows[:limit]
+        ]
+    
+    def _search_rows(self, sources: List[str], params: Dict[str, Any], tool_name: str,
+                     rows: Optional[List[tuple]] = None) -> List[tuple]:
+        # 단계 순으로 정렬 후 같은 종목은 가장 높은 단계만 유지
+        rows = list(rows or [])
+        seen = {row[:2] for row in rows}
+        sql = f"SELECT * FROM ({' UNION ALL '.join(sources)}) ORDER BY tier, length(name), name"
+        try:
+            with self.engine.connect() as conn:
+                for row in conn.execute(text(sql), params):
+                    if (row[0], row[1]) not in seen:
+                        seen.add((row[0], row[1]))
+                        rows.append(tuple(row))
+            return rows
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to search master for {tool_name}: {e}")
+            raise
+    
     def update_master_timestamp(self, tool_name: str, record_count: int = None) -> bool:
         """
         마스터파일 업데이트 시간 기록
@@ -1,13 +1,52 @@
+import asyncio
+import hashlib
+import io
+import json
 import logging
+import multiprocessing
 import os
 import shutil
 import requests
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from module.plugin.database import Database
+from module.plugin.master_parser import (
+    COMMODITY_FUTURE_FIELDS, DOMESTIC_STOCK_HEAD, KONEX_TAIL, KOSDAQ_TAIL, KOSPI_TAIL, MasterLayout, parse_fixed_width,
+)
+from module.plugin.stock_resolver import StockResolver
 from typing import Dict
 import pandas as pd
 
+# 마스터파일 가공용 프로세스 풀 (최초 사용시 생성)
+_parse_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        workers = int(os.getenv("KIS_MASTER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        # 서버 프로세스의 스레드/이벤트 루프를 복제하지 않도록 spawn 사용
+        _parse_executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _parse_executor
+
+
+class _ParseContext:
+    """프로세스 풀에서 가공 함수에 넘기는 ctx, 로그 메시지를 모아 서버 프로세스에서 다시 출력"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def info(self, message: str):
+        self.messages.append(("info", message))
+
+    async def warning(self, message: str):
+        self.messages.append(("warning", message))
+
+    async def error(self, message: str):
+        self.messages.append(("error", message))
+
+
 class MasterFileManager:
     """도구별 마스터파일 관리 클래스 (1:N 매핑 지원)"""
 
@@ -242,9 +281,13 @@ class MasterFileManager:
         }
     }
 
+    # 마스터파일 동시 다운로드 수
+    DOWNLOAD_CONCURRENCY = 4
+
     def __init__(self, tool_name: str):
         self.tool_name = tool_name
         self.master_dir = f"./configs/master/{tool_name}"
+        self.download_meta_path = os.path.join(self.master_dir, "download_meta.json")
         self.error_log_path = os.path.join(os.getcwd(), "configs", "master", "error.log")
 
         # 툴별 필요한 마스터파일 목록 가져오기
@@ -321,7 +364,12 @@ class MasterFileManager:
     # ==============================================
     
     async def ensure_master_file_updated(self, ctx, force_update: bool = False):
-        """툴에 필요한 모든 마스터파일 체크 및 업데이트"""
+        """툴에 필요한 모든 마스터파일 체크 및 업데이트
+
+        1. 마스터파일을 동시에 조건부 다운로드 (ETag/Last-Modified, 내용 해시가 같으면 변경 없음)
+        2. 바뀐 마스터파일만 프로세스 풀에서 가공
+        3. 기존 테이블과 비교한 추가/수정/삭제분만 한 트랜잭션으로 반영 (갱신 중에도 빈 테이블이 조회되지 않음)
+        """
         try:
             # 마스터파일이 필요 없는 툴인 경우 스킵
             if not self.required_masters:
@@ -335,20 +383,49 @@ class MasterFileManager:
                     await ctx.info(f"{self.tool_name} 툴의 마스터파일들이 최신 상태입니다.")
                     return
 
-            # 2. 카테고리 레벨에서 테이블 전체 삭제 (한 번만)
-            await self.__clear_category_tables(ctx)
-
-            # 2-1. 해당 폴더의 CSV 파일들 삭제
-            await self.__clear_category_csv_files(ctx)
-
-            # 3. 각 마스터파일별로 업데이트 (삭제 없이 추가만)
-            total_record_count = 0
-            for master_name in self.required_masters:
-                record_count = await self.__ensure_single_master_updated(ctx, master_name, force_update)
-                total_record_count += record_count
+            model_class = self.__get_model_class(self.required_masters[0])
+            if not model_class:
+                raise Exception(f"{self.tool_name}에 대한 모델 클래스를 찾을 수 없습니다.")
+
+            # 2. 마스터파일별 다운로드/가공을 동시에 진행
+            download_meta = self.__load_download_meta()
+            semaphore = asyncio.Semaphore(self.DOWNLOAD_CONCURRENCY)
+            results = await asyncio.gather(
+                *[self.__refresh_single_master(ctx, master_name, download_meta, force_update, semaphore)
+                  for master_name in self.required_masters],
+                return_exceptions=True
+            )
+
+            changed: Dict[str, List[tuple]] = {}
+            changed_meta: Dict[str, Dict] = {}
+            failed = []
+            for master_name, result in zip(self.required_masters, results):
+                if isinstance(result, BaseException):
+                    failed.append(master_name)
+                    self._log("error", master_name, "refresh", str(result))
+                    await ctx.error(f"{master_name} 마스터파일 업데이트 실패: {str(result)}")
+                elif result is not None:
+                    records, meta = result
+                    changed[self.MASTER_FILE_PROCESS[master_name]["ex_value"]] = records
+                    changed_meta[master_name] = meta
+
+            # 3. 변경분 반영 (실패한 마스터파일의 기존 데이터는 유지)
+            if changed:
+                stats = await asyncio.to_thread(self.db_engine.apply_master_diff, model_class, changed)
+                download_meta.update(changed_meta)
+                self.__save_download_meta(download_meta)
+                await asyncio.to_thread(
+                    self.db_engine.rebuild_search_index, self.tool_name, self.get_master_models_for_tool(self.tool_name)
+                )
+                StockResolver().invalidate(self.tool_name)
+                await ctx.info(
+                    f"{self.tool_name} 마스터 변경분 반영: 추가 {stats['inserted']}, 수정 {stats['updated']}, "
+                    f"삭제 {stats['deleted']}, 유지 {stats['unchanged']}"
+                )
 
-            # 4. 모든 마스터파일 처리 완료 후 툴 전체 업데이트 시간 기록
-            if total_record_count > 0:
+            # 4. 모든 마스터파일 확인 후 툴 전체 업데이트 시간 기록 (실패가 있으면 다음 호출시 다시 시도)
+            if not failed:
+                total_record_count = self.db_engine.count(model_class)
                 self.db_engine.update_master_timestamp(self.tool_name, total_record_count)
                 await ctx.info(f"{self.tool_name} 툴의 모든 마스터파일 업데이트 완료 (총 {total_record_count}개 레코드)")
 
@@ -358,6 +435,130 @@ class MasterFileManager:
             await ctx.error(f"마스터파일 체크 실패: {str(e)}")
             raise
 
+    async def __refresh_single_master(self, ctx, master_name: str, download_meta: Dict, force_update: bool,
+                                      semaphore: asyncio.Semaphore):
+        """단일 마스터파일 다운로드 및 가공, 변경이 없으면 None, 있으면 ([(종목명, 종목코드)], 다운로드 정보) 반환"""
+        master_config = self.MASTER_FILE_PROCESS.get(master_name)
+        if not master_config:
+            raise Exception(f"{master_name}에 대한 마스터파일 설정이 없습니다.")
+
+        # 테이블에 해당 마스터 데이터가 없으면 조건부 요청 없이 다시 받음
+        previous = download_meta.get(master_name, {})
+        model_class = self.__get_model_class(master_name)
+        if force_update or not self.db_engine.count(model_class, {"ex": master_config["ex_value"]}):
+            previous = {}
+
+        temp_file = os.path.join(self.master_dir, f"{master_name}.tmp")
+        async with semaphore:
+            meta = await asyncio.to_thread(self.__download_master, master_config["file"], temp_file, previous)
+        if meta is None:
+            await ctx.info(f"{master_name} 마스터파일 변경 없음")
+            return None
+
+        await ctx.info(f"{master_name} 마스터파일 가공 중...")
+        loop = asyncio.get_running_loop()
+        records, messages = await loop.run_in_executor(
+            _get_parse_executor(), self._parse_master_file, self.tool_name, master_name, temp_file
+        )
+        for level, message in messages:
+            await getattr(ctx, level)(message)
+        if not records:
+            raise Exception(f"{master_name} 마스터파일 가공 결과가 없습니다.")
+        return records, meta
+
+    @classmethod
+    def _parse_master_file(cls, tool_name: str, master_name: str, raw_file: str):
+        """프로세스 풀에서 실행: 마스터파일 가공, CSV 저장, 모델용 데이터 변환
+
+        Returns:
+            ([(종목명, 종목코드)], [(로그 레벨, 메시지)])
+        """
+        # DB 연결 없이 가공 메서드만 사용
+        manager = cls.__new__(cls)
+        manager.tool_name = tool_name
+        manager.master_dir = os.path.dirname(raw_file)
+        manager.error_logger = logging.getLogger(f"master_file_error_{tool_name}")
+        ctx = _ParseContext()
+
+        async def run():
+            process_func = getattr(manager, cls.MASTER_FILE_PROCESS[master_name]["process"])
+            df = await process_func(raw_file, ctx)
+            await manager.__save_csv_file(df, master_name, ctx)
+            return manager.__convert_to_model_data(df, master_name)
+
+        model_data = asyncio.run(run())
+        return [(data["name"], data["code"]) for data in model_data], ctx.messages
+
+    def __download_master(self, url: str, file_path: str, previous: Dict):
+        """조건부 다운로드 (ZIP 파일 지원), 변경이 없으면 None, 있으면 새 다운로드 정보 반환"""
+        try:
+            import zipfile
+            import ssl
+
+            # SSL 컨텍스트 설정 (한국투자증권 서버용)
+            ssl._create_default_https_context = ssl._create_unverified_context
+
+            headers = {}
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+            response = requests.get(url, headers=headers, timeout=60)  # 대용량 파일을 위해 타임아웃 증가
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+
+            # 서버가 조건부 요청을 지원하지 않아도 내용이 같으면 변경 없음
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if previous.get("sha256") == content_hash:
+                return None
+
+            # ZIP 파일인지 확인
+            if url.endswith('.zip'):
+                # ZIP 파일 압축 해제 (마스터파일별 디렉토리에 풀어서 동시 다운로드시 파일명 충돌 방지)
+                extract_dir = file_path + '.d'
+                shutil.rmtree(extract_dir, ignore_errors=True)
+                with zipfile.ZipFile(io.BytesIO(response.content), 'r') as zip_ref:
+                    zip_ref.extractall(extract_dir)
+                    extracted_files = zip_ref.namelist()
+                if not extracted_files:
+                    raise Exception("ZIP 파일이 비어 있습니다.")
+
+                # .mst 파일 찾아서 원본 파일명으로 이동
+                mst_file = next((f for f in extracted_files if f.endswith('.mst')), extracted_files[0])
+                shutil.move(os.path.join(extract_dir, mst_file), file_path)
+                shutil.rmtree(extract_dir, ignore_errors=True)
+            else:
+                # 일반 파일로 저장
+                with open(file_path, 'wb') as f:
+                    f.write(response.content)
+
+            return {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": content_hash,
+                "downloaded_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        except Exception as e:
+            # 오류 로그 기록
+            self._log("error", os.path.basename(file_path), "download", str(e))
+            raise Exception(f"다운로드 실패: {str(e)}")
+
+    def __load_download_meta(self) -> Dict:
+        """마스터파일별 마지막 다운로드 정보 (ETag, Last-Modified, 내용 해시)"""
+        try:
+            with open(self.download_meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __save_download_meta(self, meta: Dict):
+        tmp_path = self.download_meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.download_meta_path)
+
     def is_master_file_available(self) -> bool:
         """마스터파일들이 사용 가능한지 확인"""
         try:
@@ -384,94 +585,6 @@ class MasterFileManager:
     #     """마스터파일 경로 반환"""
     #     return os.path.join(self.master_dir, f"{master_name}.tmp")
 
-    async def __ensure_single_master_updated(self, ctx, master_name: str, force_update: bool = False) -> int:
-        """단일 마스터파일 체크 및 업데이트"""
-        # 마스터파일 다운로드 및 DB 저장
-        await ctx.info(f"{master_name} 마스터파일 업데이트 중...")
-
-        try:
-            # 1. URL 확인
-            master_config = self.MASTER_FILE_PROCESS.get(master_name)
-            if not master_config:
-                raise Exception(f"{master_name}에 대한 마스터파일 설정이 없습니다.")
-            
-            master_url = master_config["file"]
-
-            # 2. 임시 파일로 다운로드
-            temp_file = os.path.join(self.master_dir, f"{master_name}.tmp")
-            await ctx.info(f"마스터파일 다운로드 중: {master_name}")
-
-            success = await self.__download_file(master_url, temp_file)
-            if not success:
-                raise Exception(f"{master_name} 마스터파일 다운로드 실패")
-
-            # 3. 파일 가공 (마스터파일별 특화 로직) - DataFrame 반환
-            import pandas as pd
-
-            # MASTER_FILE_PROCESS에서 처리 함수명 가져오기
-            process_func_name = master_config.get("process")
-            if process_func_name:
-                try:
-                    # 처리 함수 가져오기
-                    process_func = getattr(self, process_func_name)
-                    # 가공 함수에서 DataFrame 반환받기
-                    df = await process_func(temp_file, ctx)
-                except Exception as e:
-                    # 오류 로그 기록
-                    self._log("error", master_name, "process", str(e))
-                    await ctx.error(f"마스터파일 가공 실패: {master_name}, 오류: {str(e)}")
-                    # 빈 DataFrame 반환
-                    df = pd.DataFrame()
-            else:
-                # 기본 처리 - 빈 DataFrame 반환
-                await ctx.warning(f"지원하지 않는 마스터파일: {master_name}")
-                df = pd.DataFrame()
-
-            # 4. CSV 파일 저장
-            await ctx.info(f"CSV 파일 저장 중: {master_name} ({len(df)}개 레코드)")
-            csv_saved = await self.__save_csv_file(df, master_name, ctx)
-
-            # 5. 모델에 저장
-            await ctx.info(f"모델에 저장 중: {master_name} ({len(df)}개 레코드)")
-
-            # 5-1. 모델용 데이터 변환
-            model_data = self.__convert_to_model_data(df, master_name)
-
-            # 5-2. 모델에 저장
-            try:
-                model_class = self.__get_model_class(master_name)
-                if not model_class:
-                    raise Exception(f"{master_name}에 대한 모델 클래스를 찾을 수 없습니다.")
-                
-                # bulk_replace_master_data 사용 (카테고리 레벨에서 이미 삭제되었으므로 INSERT만)
-                record_count = self.db_engine.bulk_replace_master_data(
-                    model_class=model_class,
-                    data_list=model_data,
-                    master_name=master_name
-                )
-            except Exception as e:
-                # 에러 로깅 시스템에 기록
-                self._log("error", master_name, "bulk_replace_master_data", str(e))
-                raise
-
-            await ctx.info(f"데이터베이스 저장 완료: {master_name} ({record_count}개 레코드)")
-
-            # 6. 임시 파일 정리 (보존)
-            # if os.path.exists(temp_file):
-            #     os.remove(temp_file)
-
-            await ctx.info(f"{master_name} 마스터파일 업데이트 완료")
-            return record_count
-
-        except Exception as e:
-            # 오류 로그 기록
-            self._log("error", master_name, "download_and_save", str(e))
-            # 임시 파일 정리 (보존)
-            # temp_file = os.path.join(self.master_dir, f"{master_name}.tmp")
-            # if os.path.exists(temp_file):
-            #     os.remove(temp_file)
-            raise
-
     def __should_update_from_db(self, last_update: datetime) -> bool:
         """DB 기반 업데이트 필요 여부 확인"""
         try:
@@ -479,94 +592,6 @@ class MasterFileManager:
         except (ValueError, AttributeError):
             return True  # 날짜 파싱 실패 시 업데이트
 
-    async def __clear_category_tables(self, ctx):
-        """카테고리 레벨에서 해당 툴의 모든 테이블 데이터 삭제"""
-        try:
-            # 툴별 모델 클래스들 가져오기
-            master_models = self.get_master_models_for_tool(self.tool_name)
-            
-            if not master_models:
-                await ctx.info(f"{self.tool_name} 툴에 해당하는 모델이 없습니다.")
-                return
-            
-            # 각 모델의 테이블 데이터 삭제
-            for model_class in master_models:
-                try:
-                    # 기존 데이터 개수 확인
-                    before_count = self.db_engine.count(model_class)
-                    
-                    # 테이블 전체 삭제
-                    session = self.db_engine.get_session()
-                    try:
-                        deleted_count = session.query(model_class).delete()
-                        session.commit()
-                        await ctx.info(f"{model_class.__name__} 테이블 데이터 삭제 완료: {deleted_count}개 레코드")
-                    finally:
-                        session.close()
-                        
-                except Exception as e:
-                    self._log("error", model_class.__name__, "clear_table", str(e))
-                    await ctx.error(f"{model_class.__name__} 테이블 삭제 실패: {str(e)}")
-                    raise
-                    
-        except Exception as e:
-            self._log("error", "all_models", "clear_category_tables", str(e))
-            await ctx.error(f"카테고리 테이블 삭제 실패: {str(e)}")
-            raise
-
-    async def __clear_category_csv_files(self, ctx):
-        """카테고리 레벨에서 해당 툴의 모든 CSV 파일 및 임시 파일 삭제"""
-        try:
-            import glob
-            
-            # 해당 툴의 마스터 디렉토리 경로
-            master_dir = self.master_dir
-            
-            if not os.path.exists(master_dir):
-                await ctx.info(f"마스터 디렉토리가 존재하지 않습니다: {master_dir}")
-                return
-            
-            # CSV 파일 패턴으로 검색
-            csv_pattern = os.path.join(master_dir, "*.csv")
-            csv_files = glob.glob(csv_pattern)
-            
-            # 임시 파일 패턴으로 검색 (.tmp, .tmp.zip 등)
-            tmp_patterns = [
-                os.path.join(master_dir, "*.tmp"),
-                os.path.join(master_dir, "*.tmp.*"),
-                os.path.join(master_dir, "*_part*.tmp"),
-                os.path.join(master_dir, "*_part*.tmp.*")
-            ]
-            
-            tmp_files = []
-            for pattern in tmp_patterns:
-                tmp_files.extend(glob.glob(pattern))
-            
-            all_files = csv_files + tmp_files
-            
-            if not all_files:
-                await ctx.info(f"삭제할 파일이 없습니다: {master_dir}")
-                return
-            
-            # 파일들 삭제
-            deleted_count = 0
-            for file_path in all_files:
-                try:
-                    os.remove(file_path)
-                    deleted_count += 1
-                    file_type = "CSV" if file_path.endswith('.csv') else "TMP"
-                    await ctx.info(f"{file_type} 파일 삭제: {os.path.basename(file_path)}")
-                except Exception as e:
-                    self._log("error", os.path.basename(file_path), "delete_file", str(e))
-                    await ctx.warning(f"파일 삭제 실패: {os.path.basename(file_path)} - {str(e)}")
-            
-            await ctx.info(f"파일 삭제 완료: {deleted_count}개 파일 (CSV + TMP)")
-                    
-        except Exception as e:
-            self._log("error", "all_files", "clear_category_csv_files", str(e))
-            await ctx.error(f"카테고리 파일 삭제 실패: {str(e)}")
-            raise
-
     def __get_model_class(self, master_name: str):
         """마스터파일명에 해당하는 모델 클래스 반환 - TOOL_MASTER_MAPPING 활용"""
         # TOOL_MASTER_MAPPING을 역방향으로 검색하여 마스터파일이 속한 툴 찾기
@@ -581,54 +606,6 @@ class MasterFileManager:
         # 마스터파일이 TOOL_MASTER_MAPPING에 없는 경우 None 반환
         return None
 
-    async def __download_file(self, url: str, file_path: str) -> bool:
-        """파일 다운로드 (ZIP 파일 지원)"""
-        try:
-            import zipfile
-            import ssl
-
-            # SSL 컨텍스트 설정 (한국투자증권 서버용)
-            ssl._create_default_https_context = ssl._create_unverified_context
-
-            response = requests.get(url, timeout=60)  # 대용량 파일을 위해 타임아웃 증가
-            response.raise_for_status()
-
-            # ZIP 파일인지 확인
-            if url.endswith('.zip'):
-                # ZIP 파일로 저장
-                zip_file_path = file_path + '.zip'
-                with open(zip_file_path, 'wb') as f:
-                    f.write(response.content)
-
-                # ZIP 파일 압축 해제
-                with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                    zip_ref.extractall(os.path.dirname(file_path))
-
-                # 압축 해제된 파일명 찾기
-                extracted_files = zip_ref.namelist()
-                if extracted_files:
-                    # .mst 파일 찾기
-                    mst_file = next((f for f in extracted_files if f.endswith('.mst')), extracted_files[0])
-                    extracted_path = os.path.join(os.path.dirname(file_path), mst_file)
-
-                    # 원본 파일명으로 이동
-                    if extracted_path != file_path:
-                        shutil.move(extracted_path, file_path)
-
-                # ZIP 파일 삭제
-                os.remove(zip_file_path)
-            else:
-                # 일반 파일로 저장
-                with open(file_path, 'wb') as f:
-                    f.write(response.content)
-
-            return True
-        except Exception as e:
-            # 오류 로그 기록
-            master_file = os.path.basename(file_path)
-            self._log("error", master_file, "download", str(e))
-            return False
-
     def __get_master_update_status(self, master_name: str = None):
         """마스터파일 업데이트 상태 조회"""
         if master_name:
@@ -736,30 +713,22 @@ class MasterFileManager:
             code_key = master_config.get("code_key", "code")
             ex_value = master_config.get("ex_value", "")
             
-            for _, row in df.iterrows():
-                # 지정된 키로 종목명과 종목코드 추출
-                name = None
-                code = None
-                
-                # 종목명 추출 (띄어쓰기 제거)
-                if name_key in row and pd.notna(row[name_key]) and str(row[name_key]).strip():
-                    name_str = str(row[name_key]).strip()
-                    if name_str not in ['nan', 'NaN', 'None', 'null', '']:
-                        name = name_str.replace(" ", "")
-                
-                # 종목코드 추출
-                if code_key in row and pd.notna(row[code_key]) and str(row[code_key]).strip():
-                    code_str = str(row[code_key]).strip()
-                    if code_str not in ['nan', 'NaN', 'None', 'null', '']:
-                        code = code_str
-                
-                # 유효한 데이터만 추가
-                if name and code:
-                    model_data.append({
-                        'name': name,
-                        'code': code,
-                        'ex': ex_value
-                    })
+            if name_key not in df.columns or code_key not in df.columns:
+                return model_data
+
+            # 종목명은 띄어쓰기 제거, 종목코드는 앞뒤 공백 제거
+            invalid = ['nan', 'NaN', 'None', 'null', '']
+            names = df[name_key].astype(str).str.strip()
+            codes = df[code_key].astype(str).str.strip()
+            valid = df[name_key].notna() & df[code_key].notna() & ~names.isin(invalid) & ~codes.isin(invalid)
+            names = names[valid].str.replace(" ", "", regex=False)
+
+            # 유효한 데이터만 추가
+            model_data = [
+                {'name': name, 'code': code, 'ex': ex_value}
+                for name, code in zip(names.tolist(), codes[valid].tolist())
+                if name
+            ]
             
             return model_data
             
@@ -797,53 +766,16 @@ class MasterFileManager:
     # ========== 마스터파일별 특화 가공 메서드들 ==========
 
     async def __process_domestic_stock(self, raw_file: str, ctx) -> pd.DataFrame:
-        """국내주식 마스터파일 가공 (원본 코드와 동일)"""
+        """국내주식 마스터파일 가공 (종목마스터정보 레이아웃)"""
         await ctx.info("국내주식 마스터파일 가공 중...")
 
         try:
-            import pandas as pd
-            import os
-
-            # 파일 읽기 (공통 로직)
-            file_content = await self._read_file_with_encoding(raw_file, ctx)
-
-            # 원본 코드와 정확히 동일한 파싱
-            tmp_fil1 = raw_file.replace('.tmp', '_part1.tmp')
-            tmp_fil2 = raw_file.replace('.tmp', '_part2.tmp')
-            wf1 = open(tmp_fil1, mode="w")
-            wf2 = open(tmp_fil2, mode="w")
-
-            # 파일 내용을 라인별로 처리
-            for row in file_content.splitlines():
-                rf1 = row[0:len(row) - 222]
-                rf1_1 = rf1[0:9].rstrip()
-                rf1_2 = rf1[9:21].rstrip()
-                rf1_3 = rf1[21:].strip()
-                wf1.write(rf1_1 + ',' + rf1_2 + ',' + rf1_3 + '\n')
-                rf2 = row[-222:]
-                wf2.write(rf2)
-
-            wf1.close()
-            wf2.close()
+            with open(raw_file, "rb") as f:
+                data = f.read()
 
+            # 단축코드/표준코드/한글종목명(가변) + 고정폭 kosdaq 필드
+            layout = MasterLayout.from_widths(head=DOMESTIC_STOCK_HEAD, tail=KOSDAQ_TAIL)
             part1_columns = ['short_code', 'standard_code', 'korean_name']
-            df1 = self._read_csv_with_encoding(tmp_fil1, header=None, names=part1_columns, dtype=str)
-
-            field_specs = [2, 1,
-                           4, 4, 4, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 9,
-                           5, 5, 1, 1, 1,
-                           2, 1, 1, 1, 2,
-                           2, 2, 3, 1, 3,
-                           12, 12, 8, 15, 21,
-                           2, 7, 1, 1, 1,
-                           1, 9, 9, 9, 5,
-                           9, 8, 9, 3, 1,
-                           1, 1
-                           ]
 
             part2_columns = ['security_group_code', 'market_cap_scale_code',
                              'industry_large_code', 'industry_medium_code', 'industry_small_code', 'venture_company_yn',
@@ -861,19 +793,7 @@ class MasterFileManager:
                              'base_year_month', 'prev_day_market_cap_billion', 'group_company_code', 'company_credit_limit_exceed_yn', 'collateral_loan_yn', 'securities_lending_yn'
                              ]
 
-            df2 = self._read_fwf_with_encoding(tmp_fil2, widths=field_specs, names=part2_columns)
-
-            df = pd.merge(df1, df2, how='outer', left_index=True, right_index=True)
-            
-            # 공통 DataFrame 처리
-            df = df.astype(str)
-            df = df.replace(['nan', 'NaN', 'None', 'null'], '')
-
-            # clean temporary file and dataframe
-            del (df1)
-            del (df2)
-            os.remove(tmp_fil1)
-            os.remove(tmp_fil2)
+            df = parse_fixed_width(data, layout, columns=part1_columns + part2_columns)
 
             await ctx.info(f"국내주식 마스터파일 가공 완료: {len(df)}개 종목")
             return df
@@ -884,53 +804,16 @@ class MasterFileManager:
             return pd.DataFrame()
 
     async def __process_domestic_stock_kospi(self, raw_file: str, ctx) -> pd.DataFrame:
-        """국내주식 마스터파일 가공 (원본 코드와 동일)"""
+        """국내주식 마스터파일 가공 (종목마스터정보 레이아웃)"""
         await ctx.info("국내주식 마스터파일 가공 중...")
 
         try:
-            import pandas as pd
-            import os
-
-            # 파일 읽기 (공통 로직)
-            file_content = await self._read_file_with_encoding(raw_file, ctx)
-
-            # 원본 코드와 정확히 동일한 파싱
-            tmp_fil1 = raw_file.replace('.tmp', '_part1.tmp')
-            tmp_fil2 = raw_file.replace('.tmp', '_part2.tmp')
-            wf1 = open(tmp_fil1, mode="w")
-            wf2 = open(tmp_fil2, mode="w")
-
-            # 파일 내용을 라인별로 처리
-            for row in file_content.splitlines():
-                rf1 = row[0:len(row) - 228]
-                rf1_1 = rf1[0:9].rstrip()
-                rf1_2 = rf1[9:21].rstrip()
-                rf1_3 = rf1[21:].strip()
-                wf1.write(rf1_1 + ',' + rf1_2 + ',' + rf1_3 + '\n')
-                rf2 = row[-228:]
-                wf2.write(rf2)
-
-            wf1.close()
-            wf2.close()
+            with open(raw_file, "rb") as f:
+                data = f.read()
 
+            # 단축코드/표준코드/한글종목명(가변) + 고정폭 kospi 필드
+            layout = MasterLayout.from_widths(head=DOMESTIC_STOCK_HEAD, tail=KOSPI_TAIL)
             part1_columns = ['short_code', 'standard_code', 'korean_name']
-            df1 = self._read_csv_with_encoding(tmp_fil1, header=None, names=part1_columns, dtype=str)
-
-            field_specs = [2, 1, 4, 4, 4,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 1, 1, 1, 1,
-                           1, 9, 5, 5, 1,
-                           1, 1, 2, 1, 1,
-                           1, 2, 2, 2, 3,
-                           1, 3, 12, 12, 8,
-                           15, 21, 2, 7, 1,
-                           1, 1, 1, 1, 9,
-                           9, 9, 5, 9, 8,
-                           9, 3, 1, 1, 1
-                           ]
 
             part2_columns = ['group_code', 'market_cap_scale', 'industry_large', 'industry_medium', 'industry_small',
                              'manufacturing', 'low_liquidity', 'governance_index_stock', 'kospi200_sector_industry', 'kospi100',
@@ -948,19 +831,7 @@ class MasterFileManager:
                              'market_cap', 'group_company_code', 'company_credit_limit_exceed', 'collateral_loan_available', 'securities_lending_available'
                              ]
 
-            df2 = self._read_fwf_with_encoding(tmp_fil2, widths=field_specs, names=part2_columns)
-
-            df = pd.merge(df1, df2, how='outer', left_index=True, right_index=True)
-            
-            # 공통 DataFrame 처리
-            df = df.astype(str)
-            df = df.replace(['nan', 'NaN', 'None', 'null'], '')
-
-            # clean temporary file and dataframe
-            del (df1)
-            del (df2)
-            os.remove(tmp_fil1)
-            os.remove(tmp_fil2)
+            df = parse_fixed_width(data, layout, columns=part1_columns + part2_columns)
 
             await ctx.info(f"국내주식 마스터파일 가공 완료: {len(df)}개 종목")
             return df
@@ -971,75 +842,14 @@ class MasterFileManager:
             return pd.DataFrame()
 
     async def __process_domestic_stock_konex(self, raw_file: str, ctx) -> pd.DataFrame:
-        """국내주식 마스터파일 가공 (원본 코드와 동일)"""
+        """국내주식 마스터파일 가공 (종목마스터정보 레이아웃)"""
         await ctx.info("국내주식 마스터파일 가공 중...")
 
         try:
-            import pandas as pd
-
-            # 원본 코드와 정확히 동일한 파싱
-            await ctx.info("복잡한 고정폭 텍스트 파일 파싱 중...")
-            
-            # 파일 읽기 (공통 로직)
-            file_content = await self._read_file_with_encoding(raw_file, ctx)
-            lines = file_content.splitlines()
-
-            data = []
-            for row in lines:
-                row = row.strip()
-                mksc_shrn_iscd = row[0:9].strip()
-                stnd_iscd = row[9:21].strip()
-                scrt_grp_cls_code = row[-184:-182].strip()
-                stck_sdpr = row[-182:-173].strip()
-                frml_mrkt_deal_qty_unit = row[-173:-168].strip()
-                ovtm_mrkt_deal_qty_unit = row[-168:-163].strip()
-                trht_yn = row[-163:-162].strip()
-                sltr_yn = row[-162:-161].strip()
-                mang_issu_yn = row[-161:-160].strip()
-                mrkt_alrm_cls_code = row[-160:-158].strip()
-                mrkt_alrm_risk_adnt_yn = row[-158:-157].strip()
-                insn_pbnt_yn = row[-157:-156].strip()
-                byps_lstn_yn = row[-156:-155].strip()
-                flng_cls_code = row[-155:-153].strip()
-                fcam_mod_cls_code = row[-153:-151].strip()
-                icic_cls_code = row[-151:-149].strip()
-                marg_rate = row[-149:-146].strip()
-                crdt_able = row[-146:-145].strip()
-                crdt_days = row[-145:-142].strip()
-                prdy_vol = row[-142:-130].strip()
-                stck_fcam = row[-130:-118].strip()
-                stck_lstn_date = row[-118:-110].strip()
-                lstn_stcn = row[-110:-95].strip()
-                cpfn = row[-95:-74].strip()
-                stac_month = row[-74:-72].strip()
-                po_prc = row[-72:-65].strip()
-                prst_cls_code = row[-65:-64].strip()
-                ssts_hot_yn = row[-64:-63].strip()
-                stange_runup_yn = row[-63:-62].strip()
-                krx300_issu_yn = row[-62:-61].strip()
-                sale_account = row[-61:-52].strip()
-                bsop_prfi = row[-52:-43].strip()
-                op_prfi = row[-43:-34].strip()
-                thtr_ntin = row[-34:-29].strip()
-                roe = row[-29:-20].strip()
-                base_date = row[-20:-12].strip()
-                prdy_avls_scal = row[-12:-3].strip()
-                co_crdt_limt_over_yn = row[-3:-2].strip()
-                secu_lend_able_yn = row[-2:-1].strip()
-                stln_able_yn = row[-1:].strip()
-                hts_kor_isnm = row[21:-184].strip()
-
-                data.append([mksc_shrn_iscd, stnd_iscd, hts_kor_isnm, scrt_grp_cls_code,
-                             stck_sdpr, frml_mrkt_deal_qty_unit, ovtm_mrkt_deal_qty_unit,
-                             trht_yn, sltr_yn, mang_issu_yn, mrkt_alrm_cls_code,
-                             mrkt_alrm_risk_adnt_yn, insn_pbnt_yn, byps_lstn_yn,
-                             flng_cls_code, fcam_mod_cls_code, icic_cls_code, marg_rate,
-                             crdt_able, crdt_days, prdy_vol, stck_fcam, stck_lstn_date,
-                             lstn_stcn, cpfn, stac_month, po_prc, prst_cls_code, ssts_hot_yn,
-                             stange_runup_yn, krx300_issu_yn, sale_account, bsop_prfi,
-                             op_prfi, thtr_ntin, roe, base_date, prdy_avls_scal,
-                             co_crdt_limt_over_yn, secu_lend_able_yn, stln_able_yn])
+            with open(raw_file, "rb") as f:
+                data = f.read()
 
+            layout = MasterLayout.from_widths(head=DOMESTIC_STOCK_HEAD, tail=KONEX_TAIL)
             columns = ['short_code', 'standard_code', 'stock_name', 'security_group_code', 'stock_base_price',
                        'regular_market_unit', 'after_hours_market_unit', 'trading_halt_yn',
                        'liquidation_yn', 'management_stock_yn', 'market_warning_code', 'market_warning_risk_yn',
@@ -1049,9 +859,8 @@ class MasterFileManager:
                        'preferred_stock_code', 'short_sale_overheat_yn', 'unusual_rise_yn', 'krx300_stock_yn',
                        'sales', 'operating_profit', 'ordinary_profit', 'net_income', 'roe', 'base_year_month', 'prev_day_market_cap_billion',
                        'company_credit_limit_exceed_yn', 'collateral_loan_yn', 'securities_lending_yn']
-            
-            # 공통 DataFrame 처리
-            df = self._create_dataframe(data, columns)
+
+            df = parse_fixed_width(data, layout, columns=columns)
 
             await ctx.info(f"국내주식 마스터파일 가공 완료: {len(df)}개 종목")
             return df
@@ -1232,8 +1041,7 @@ class MasterFileManager:
 
             # 원본 코드와 정확히 동일한 파싱
             columns = ['product_type', 'short_code', 'standard_code', 'korean_name', 'strike_price', 'underlying_short_code', 'underlying_name']
-            df = pd.DataFrame(columns=columns)
-            ridx = 1
+            rows = []
 
             # 파일 읽기 (공통 로직)
             file_content = await self._read_file_with_encoding(raw_file, ctx)
@@ -1247,8 +1055,9 @@ class MasterFileManager:
                 e = row[63:72].strip()
                 f = row[72:81].strip()
                 g = row[81:].strip()
-                df.loc[ridx] = [a, b, c, d, e, f, g]
-                ridx += 1
+                rows.append([a, b, c, d, e, f, g])
+
+            df = pd.DataFrame(rows, columns=columns)
 
             # DataFrame 직접 반환 (CSV 저장 제거됨)
 
@@ -1261,68 +1070,17 @@ class MasterFileManager:
             return pd.DataFrame()
 
     async def __process_domestic_commodity_future(self, raw_file: str, ctx) -> pd.DataFrame:
-        """국내상품선물 마스터파일 가공 (원본 코드와 동일)"""
+        """국내상품선물 마스터파일 가공 (종목마스터정보(상품선물옵션) 레이아웃)"""
         await ctx.info("국내상품선물 마스터파일 가공 중...")
 
         try:
-            import pandas as pd
-            import os
-
-            # 원본 코드와 정확히 동일한 파싱
-            # df1 : '상품구분','상품종류','단축코드','표준코드','한글종목명'
-            tmp_fil1 = raw_file.replace('.tmp', '_part1.tmp')
-            tmp_fil2 = raw_file.replace('.tmp', '_part2.tmp')
-            wf1 = open(tmp_fil1, mode="w")
-            wf2 = open(tmp_fil2, mode="w")
-
-            # 파일 읽기 (공통 로직)
-            file_content = await self._read_file_with_encoding(raw_file, ctx)
-            
-            # 파일 내용을 라인별로 처리
-            for row in file_content.splitlines():
-                rf1 = row[0:55]
-                rf1_1 = rf1[0:1]
-                rf1_2 = rf1[1:2]
-                rf1_3 = rf1[2:11].strip()
-                rf1_4 = rf1[11:23].strip()
-                rf1_5 = rf1[23:55].strip()
-                wf1.write(rf1_1 + ',' + rf1_2 + ',' + rf1_3 + ',' + rf1_4 + ',' + rf1_5 + '\n')
-                rf2 = row[55:].lstrip()
-                wf2.write(rf2)
+            with open(raw_file, "rb") as f:
+                data = f.read()
 
-            wf1.close()
-            wf2.close()
-
-            part1_columns = ['product_division', 'product_type', 'short_code', 'standard_code', 'korean_name']
-            df1 = self._read_csv_with_encoding(tmp_fil1, header=None, names=part1_columns)
-
-            # df2 : '월물구분코드','기초자산 단축코드','기초자산 명'
-            tmp_fil3 = raw_file.replace('.tmp', '_part3.tmp')
-            wf3 = open(tmp_fil3, mode="w")
-
-            # tmp_fil2 읽기 (공통 함수 사용)
-            tmp_fil2_content = await self._read_file_with_encoding(tmp_fil2, ctx)
-            for row in tmp_fil2_content.splitlines():
-                rf2 = row[:]
-                rf2_1 = rf2[8:9]
-                rf2_2 = rf2[9:12]
-                rf2_3 = rf2[12:].strip()
-                wf3.write(rf2_1 + ',' + rf2_2 + ',' + rf2_3 + '\n')
-
-            wf3.close()
-
-            part2_columns = ['maturity_division_code', 'underlying_short_code', 'underlying_name']
-            df2 = self._read_csv_with_encoding(tmp_fil3, header=None, names=part2_columns)
-
-            # DF : df1 + df2
-            df = pd.concat([df1, df2], axis=1)
-
-            # 임시 파일들 정리
-            for tmp_file in [tmp_fil1, tmp_fil2, tmp_fil3]:
-                if os.path.exists(tmp_file):
-                    os.unlink(tmp_file)
-
-            # DataFrame 직접 반환 (CSV 저장 제거됨)
+            layout = MasterLayout.from_widths(head=COMMODITY_FUTURE_FIELDS, variable=False)
+            columns = ['product_division', 'product_type', 'short_code', 'standard_code', 'korean_name',
+                       'atm_division', 'strike_price', 'maturity_division_code', 'underlying_short_code', 'underlying_name']
+            df = parse_fixed_width(data, layout, columns=columns)
 
             await ctx.info(f"국내상품선물 마스터파일 가공 완료: {len(df)}개 종목")
             return df
@@ -1422,8 +1180,7 @@ class MasterFileManager:
                        'filler', 'korean_name', 'exchange_code', 'item_code', 'item_type', 'output_decimal', 'calculation_decimal',
                        'tick_size', 'tick_value', 'contract_size', 'price_display_base', 'conversion_multiplier', 'most_active_month_yn',
                        'nearest_month_yn', 'spread_yn', 'spread_leg1_yn', 'sub_exchange_code']
-            df = pd.DataFrame(columns=columns)
-            ridx = 1
+            rows = []
 
             # 파일 읽기 (공통 로직)
             file_content = await self._read_file_with_encoding(raw_file, ctx)
@@ -1452,8 +1209,9 @@ class MasterFileManager:
                 t = row[-4:-3].rstrip()  # 스프레드기준종목 LEG1 여부 Y/N
                 u = row[-3:].rstrip()  # 서브 거래소 코드
 
-                df.loc[ridx] = [a, b, c, d, e, f, g, h, i, j, k, l, m, n, o, p, q, r, s, t, u]
-                ridx += 1
+                rows.append([a, b, c, d, e, f, g, h, i, j, k, l, m, n, o, p, q, r, s, t, u])
+
+            df = pd.DataFrame(rows, columns=columns)
 
             # DataFrame 직접 반환 (CSV 저장 제거됨)
 
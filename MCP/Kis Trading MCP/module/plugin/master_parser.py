@@ -0,0 +1,204 @@
+"""종목마스터 고정폭 파일(*.mst) 파서
+
+stocks_info/kis_master_parser.py 도 이 파일의 파서를 그대로 불러 쓰며, 레이아웃은 stocks_info 의 *.h 정의를 필드 폭 목록으로 옮겨 내장한다.
+파일 전체를 cp949 바이트 그대로 메모리에서 잘라 DataFrame 으로 변환하며 임시 파일을 만들지 않는다.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# 종목마스터정보(*.h) 필드 폭 (단축코드 9, 표준코드 12, 한글종목명 가변, 이후 고정폭)
+DOMESTIC_STOCK_HEAD = (9, 12)
+KOSPI_TAIL = (
+    2, 1, 4, 4, 4, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 9, 5, 5, 1, 1, 1, 2, 1, 1, 1, 2, 2, 2, 3, 1, 3, 12, 12, 8, 15, 21, 2, 7, 1, 1, 1, 1, 1, 9,
+    9, 9, 5, 9, 8, 9, 3, 1, 1, 1,
+)  # 227B
+KOSDAQ_TAIL = (
+    2, 1, 4, 4, 4, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 9, 5, 5, 1,
+    1, 1, 2, 1, 1, 1, 2, 2, 2, 3, 1, 3, 12, 12, 8, 15, 21, 2, 7, 1, 1, 1, 1, 9, 9, 9, 5, 9, 8, 9,
+    3, 1, 1, 1,
+)  # 221B
+KONEX_TAIL = (
+    2, 9, 5, 5, 1, 1, 1, 2, 1, 1, 1, 2, 2, 2, 3, 1, 3, 12, 12, 8, 15, 21, 2, 7, 1, 1, 1, 1, 9, 9,
+    9, 5, 9, 8, 9, 1, 1, 1,
+)  # 184B
+# 종목마스터정보(상품선물옵션).h, 종목명을 포함한 전체가 고정폭 (116B)
+COMMODITY_FUTURE_FIELDS = (1, 1, 9, 12, 40, 1, 8, 1, 3, 40)
+
+
+class Field(NamedTuple):
+    name: str
+    width: Optional[int]  # None: 가변 길이 (앞/뒤 고정 필드를 제외한 나머지)
+    label: str = ""
+
+
+class MasterLayout:
+    """한 줄의 필드 배치
+
+    가변 길이 필드는 최대 1개이며, 그 앞의 필드는 줄 앞에서부터, 뒤의 필드는 줄 끝에서부터 바이트 단위로 자른다.
+    """
+
+    def __init__(self, fields: Sequence[Field]):
+        self.fields = list(fields)
+        variable = [i for i, f in enumerate(self.fields) if f.width is None]
+        if len(variable) > 1:
+            raise ValueError(f"가변 길이 필드는 1개만 가능합니다: {[self.fields[i].name for i in variable]}")
+        split = variable[0] if variable else len(self.fields)
+        self.head = self.fields[:split]
+        self.variable = self.fields[split] if variable else None
+        self.tail = self.fields[split + 1:]
+        self.head_width = sum(f.width for f in self.head)
+        self.tail_width = sum(f.width for f in self.tail)
+
+    @classmethod
+    def from_widths(cls, head: Sequence[int], tail: Sequence[int] = (), variable: bool = True) -> "MasterLayout":
+        """필드 폭 목록으로 생성 (컬럼명은 parse_fixed_width 의 columns 로 지정)"""
+        fields = [Field(f"f{i}", w) for i, w in enumerate(head)]
+        if variable:
+            fields.append(Field(f"f{len(fields)}", None))
+        fields += [Field(f"f{len(fields) + i}", w) for i, w in enumerate(tail)]
+        return cls(fields)
+
+    @property
+    def names(self) -> List[str]:
+        return [f.name for f in self.fields]
+
+    def __repr__(self):
+        return f"MasterLayout(head={self.head_width}B, variable={self.variable is not None}, tail={self.tail_width}B, fields={len(self.fields)})"
+
+
+def _block(parts: List[bytes], width: int) -> np.ndarray:
+    # 같은 폭으로 맞춘 바이트열을 (행, 바이트) 배열로 변환
+    return np.frombuffer(b"".join(parts), dtype=np.uint8).reshape(len(parts), width)
+
+
+def _fixed_block(data: bytes, width: int) -> Optional[np.ndarray]:
+    # 모든 줄 길이가 같으면 줄바꿈만 건너뛰는 뷰로 처리 (줄 단위 복사 없음)
+    for eol in (b"\r\n", b"\n"):
+        stride = width + len(eol)
+        if data and len(data) % stride == 0 and data[width:width + len(eol)] == eol:
+            block = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+            if (block[:, width:] == np.frombuffer(eol, dtype=np.uint8)).all():
+                return block[:, :width]
+    return None
+
+
+# 숫자형 필드로 볼 수 있는 바이트 (숫자, 공백, 부호, 소수점)
+_NUMERIC_BYTES = np.zeros(256, dtype=bool)
+_NUMERIC_BYTES[np.frombuffer(b"0123456789 +-.", dtype=np.uint8)] = True
+_strip = getattr(np, "strings", np.char).strip
+
+
+# float64 로 정확히 표현되는 정수 자릿수 (2^53 미만)
+_FLOAT_EXACT_WIDTH = 15
+
+
+def _to_int(values: np.ndarray) -> np.ndarray:
+    # 숫자 문자열을 float64 를 거치지 않고 정수로 변환, int64 범위를 넘으면 Python int 의 object 배열
+    try:
+        return values.astype(np.int64)
+    except OverflowError:
+        return np.array([int(v) for v in values.tolist()], dtype=object)
+
+
+def _to_number(raw: np.ndarray) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    values = _strip(raw)
+    empty = values == b""
+    if (np.char.find(values, b".") >= 0).any():
+        # 소수점이 있으면 실수형
+        return np.where(empty, b"nan", values).astype(np.float64)
+    if not empty.any():
+        return _to_int(values)
+    if raw.dtype.itemsize <= _FLOAT_EXACT_WIDTH:
+        # 빈 값이 있는 정수 필드는 float64 (NaN), 필드 폭이 좁아 정밀도 손실 없음
+        return np.where(empty, b"nan", values).astype(np.float64)
+    # 넓은 정수 필드의 빈 값은 nullable Int64 (범위를 넘으면 object) 로 유지
+    numbers = _to_int(values[~empty])
+    if numbers.dtype == object:
+        result = np.full(len(values), None, dtype=object)
+        result[~empty] = numbers
+        return result
+    result = pd.array(np.zeros(len(values), dtype=np.int64), dtype="Int64")
+    result[~empty] = numbers
+    result[empty] = pd.NA
+    return result
+
+
+def _column(block: np.ndarray, start: int, width: int, encoding: str, numeric: Optional[bool]) -> np.ndarray:
+    # numeric: True 숫자 변환, None 숫자로만 이루어진 경우 변환, False 문자열
+    cells = block[:, start:start + width]
+    raw = np.ascontiguousarray(cells).view(f"S{width}").ravel()
+    if numeric is not False and len(raw) and _NUMERIC_BYTES[cells].all() and ((cells >= 0x30) & (cells <= 0x39)).any():
+        try:
+            return _to_number(raw)
+        except ValueError:
+            if numeric:
+                raise
+    elif numeric:
+        return pd.to_numeric(pd.Series(_strip(raw.astype(f"U{width}")), dtype=object).replace("", np.nan), errors="coerce").to_numpy()
+    if not (cells >= 0x80).any():
+        # 영문/숫자만 있는 필드는 바이트 그대로 유니코드 배열로 변환
+        return _strip(raw.astype(f"U{width}"))
+    # 한글이 포함된 필드는 컬럼 전체를 한번에 decode
+    values = b"\x00".join(raw.tolist()).decode(encoding, "replace").split("\x00")
+    return np.array([v.strip() for v in values], dtype=object)
+
+
+def parse_fixed_width(data: bytes, layout: MasterLayout, columns: Optional[Sequence[str]] = None,
+                      numeric: Union[Iterable[str], bool] = (), text: Iterable[str] = (),
+                      encoding: str = "cp949") -> pd.DataFrame:
+    """고정폭 마스터 데이터(bytes) 를 DataFrame 으로 변환
+
+    Args:
+        data: 마스터파일 전체 바이트 (cp949)
+        layout: 필드 배치
+        columns: 컬럼명 (layout 필드 순서, 생략시 layout 필드명)
+        numeric: 숫자형으로 변환할 컬럼명, True 이면 고정폭 필드 중 모든 값이 숫자인 컬럼을 변환
+        text: numeric=True 여도 문자열로 유지할 컬럼명 (단축코드 등 앞자리 0 유지)
+        encoding: 문자 인코딩
+
+    Returns:
+        문자열 컬럼은 앞뒤 공백 제거, 숫자형 컬럼은 int64/float64 (빈 값은 NaN)
+        폭 16자리 이상의 정수 컬럼은 빈 값이 있으면 Int64, int64 범위를 넘으면 Python int 의 object
+    """
+    columns = list(columns) if columns is not None else layout.names
+    if len(columns) != len(layout.fields):
+        raise ValueError(f"컬럼 수({len(columns)})가 레이아웃 필드 수({len(layout.fields)})와 다릅니다.")
+    numeric_columns = set() if numeric is True else set(numeric or ())
+    text_columns = set(text)
+
+    def kind(column: str) -> Optional[bool]:
+        if column in text_columns:
+            return False
+        return None if numeric is True else (True if column in numeric_columns else False)
+
+    head_w, tail_w = layout.head_width, layout.tail_width
+    head = None if layout.variable is not None else _fixed_block(data, head_w)
+    lines = None
+    if head is None:
+        lines = [line for line in data.splitlines() if line.strip()]
+        head = _block([line[:head_w].ljust(head_w) for line in lines], head_w)
+
+    result: Dict[str, np.ndarray] = {}
+    pos = 0
+    for field, column in zip(layout.head, columns):
+        result[column] = _column(head, pos, field.width, encoding, kind(column))
+        pos += field.width
+
+    if layout.variable is not None:
+        # 가변 길이 필드(종목명 등)는 전체를 한번에 decode 후 줄 단위로 분리
+        middle = b"\n".join(line[head_w:len(line) - tail_w] for line in lines)
+        values = middle.decode(encoding, "replace").split("\n") if lines else []
+        result[columns[len(layout.head)]] = np.array([v.strip() for v in values], dtype=object)
+
+    if layout.tail:
+        tail = _block([line[-tail_w:].rjust(tail_w) for line in lines], tail_w)
+        pos = 0
+        for field, column in zip(layout.tail, columns[len(columns) - len(layout.tail):]):
+            result[column] = _column(tail, pos, field.width, encoding, kind(column))
+            pos += field.width
+
+    return pd.DataFrame(result, columns=columns)
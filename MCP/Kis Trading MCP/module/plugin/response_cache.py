@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from module.decorator import singleton
+
+# 캐시 정책
+POLICY_QUOTE = "quote"          # 시세 (짧은 TTL)
+POLICY_REFERENCE = "reference"  # 종목/상품 기본정보 (긴 TTL)
+POLICY_ACCOUNT = "account"      # 잔고/체결/주문가능 조회 (짧은 TTL, 주문 후 무효화)
+POLICY_ORDER = "order"          # 주문/정정/취소 (캐시, 요청 병합 모두 사용 안 함)
+POLICY_NONE = "none"            # 인증 등 캐시 제외
+
+DEFAULT_TTL = {
+    POLICY_QUOTE: 2.0,
+    POLICY_REFERENCE: 600.0,
+    POLICY_ACCOUNT: 2.0,
+    POLICY_ORDER: 0.0,
+    POLICY_NONE: 0.0,
+}
+
+# 호출 결과 상태 (미들웨어 집계용)
+STATUS_HIT = "hit"
+STATUS_MISS = "miss"
+STATUS_COALESCED = "coalesced"
+STATUS_BYPASS = "bypass"
+
+_ORDER_API_TYPE = re.compile(r"(^|_)(order|buy|sell)($|_)")
+_QUERY_WORDS = ("조회", "내역", "가능", "현황")
+_REFERENCE_WORDS = ("기본조회", "기본정보", "발행정보")
+
+# 현재 MCP 호출의 캐시 처리 결과 (EnvironmentMiddleware 가 호출마다 새 dict 로 설정)
+call_info: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("kis_call_info", default=None)
+
+
+def classify_api(tool_name: str, api_type: str, api_info: Dict[str, Any]) -> str:
+    """API 설정(api_path, category, name) 으로 캐시 정책 결정"""
+    if tool_name == "auth":
+        return POLICY_NONE
+    name = api_info.get("name", "")
+    path = api_info.get("api_path", "")
+    category = api_info.get("category", "")
+
+    is_query = any(word in name for word in _QUERY_WORDS)
+    if not is_query and (_ORDER_API_TYPE.search(api_type) or "주문" in name):
+        return POLICY_ORDER
+    if "/trading/" in path:
+        return POLICY_ACCOUNT
+    if api_type.startswith("search_") or "종목정보" in category or any(word in name for word in _REFERENCE_WORDS):
+        return POLICY_REFERENCE
+    if "/quotations/" in path or "/ranking/" in path:
+        return POLICY_QUOTE
+    # 분류되지 않은 API 는 캐시하지 않음
+    return POLICY_NONE
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """캐시 키용 파라미터 문자열 (내부 키(_*) 와 None 제외, 문자열 공백 제거, 키 정렬)"""
+    normalized = {}
+    for key, value in params.items():
+        if key.startswith("_") or value is None:
+            continue
+        normalized[key] = value.strip() if isinstance(value, str) else value
+    normalized.setdefault("env_dv", "real")
+    return json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+
+
+@singleton
+class ResponseCache:
+    """MCP 툴 API 응답 캐시와 동일 요청 병합
+
+    키는 (툴, api_type, env_dv, 정규화한 파라미터) 이고 정책(시세/기본정보/계좌) 별 TTL 동안 성공 응답을 재사용한다.
+    같은 키의 요청이 실행 중이면 새로 호출하지 않고 결과를 함께 받는다. 주문 API 는 캐시와 병합 모두 사용하지 않으며,
+    주문이 성공하면 같은 툴/환경의 계좌 조회 캐시를 비운다.
+    """
+
+    def __init__(self):
+        self.ttl = {policy: float(os.getenv(f"KIS_CACHE_TTL_{policy.upper()}", str(default)))
+                    for policy, default in DEFAULT_TTL.items()}
+        self.max_entries = int(os.getenv("KIS_CACHE_MAX_ENTRIES", "2000"))
+        # key -> (만료 시각, 정책, 응답)
+        self._entries: "OrderedDict[Tuple, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._metrics = {policy: self._new_metrics() for policy in DEFAULT_TTL}
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _new_metrics() -> Dict[str, int]:
+        return {STATUS_HIT: 0, STATUS_MISS: 0, STATUS_COALESCED: 0, STATUS_BYPASS: 0, "stored": 0, "evicted": 0}
+
+    @staticmethod
+    def make_key(tool_name: str, api_type: str, params: Dict[str, Any]) -> Tuple:
+        return tool_name, api_type, params.get("env_dv") or "real", normalize_params(params)
+
+    async def get_or_fetch(self, tool_name: str, api_type: str, params: Dict[str, Any], policy: str,
+                           fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], str]:
+        """(응답, 처리 상태) 반환, 상태는 hit/miss/coalesced/bypass"""
+        metrics = self._metrics[policy]
+        key = self.make_key(tool_name, api_type, params)
+        ttl = self.ttl[policy]
+
+        if policy == POLICY_ORDER or ttl <= 0:
+            metrics[STATUS_BYPASS] += 1
+            result = await fetch()
+            if policy == POLICY_ORDER and isinstance(result, dict) and result.get("success"):
+                self.invalidate(tool_name, policy=POLICY_ACCOUNT, env_dv=key[2])
+            return result, STATUS_BYPASS
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, _, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                metrics[STATUS_HIT] += 1
+                return self._copy(result, now, expires_at, ttl), STATUS_HIT
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics[STATUS_COALESCED] += 1
+            return dict(await asyncio.shield(inflight)), STATUS_COALESCED
+
+        metrics[STATUS_MISS] += 1
+        # 조회는 별도 task 로 실행하여 처음 요청한 쪽이 취소되어도(연결 종료, 시간 초과) 함께 기다리는 요청과 캐시에 결과 전달
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done, ttl, policy))
+        return await asyncio.shield(task), STATUS_MISS
+
+    def _finish(self, key: Tuple, task: asyncio.Future, ttl: float, policy: str):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리는 요청이 없어도 예외를 회수하여 경고 방지
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if isinstance(result, dict) and result.get("success"):
+            self._store(key, result, ttl, policy)
+
+    def _store(self, key: Tuple, result: Dict[str, Any], ttl: float, policy: str):
+        self._entries[key] = (time.monotonic() + ttl, policy, result)
+        self._entries.move_to_end(key)
+        self._metrics[policy]["stored"] += 1
+        # 최대 개수 초과시 가장 오래 사용하지 않은 항목부터 제거
+        while len(self._entries) > self.max_entries:
+            _, (_, old_policy, _) = self._entries.popitem(last=False)
+            self._metrics[old_policy]["evicted"] += 1
+
+    @staticmethod
+    def _copy(result: Dict[str, Any], now: float, expires_at: float, ttl: float) -> Dict[str, Any]:
+        # 캐시 원본은 그대로 두고 캐시 정보만 추가한 사본 반환
+        copied = dict(result)
+        copied["cache"] = {"hit": True, "age": round(ttl - (expires_at - now), 3)}
+        return copied
+
+    def invalidate(self, tool_name: Optional[str] = None, policy: Optional[str] = None, env_dv: Optional[str] = None):
+        """조건(툴, 정책, 환경)에 맞는 캐시 삭제"""
+        for key, (_, entry_policy, _) in list(self._entries.items()):
+            if tool_name is not None and key[0] != tool_name:
+                continue
+            if env_dv is not None and key[2] != env_dv:
+                continue
+            if policy is not None and entry_policy != policy:
+                continue
+            self._entries.pop(key, None)
+
+    def record_call(self, tool_name: str, status: Optional[str], elapsed: float):
+        """EnvironmentMiddleware 에서 툴 호출마다 처리 상태와 소요 시간 기록"""
+        stats = self._calls.setdefault(tool_name, {"calls": 0, "elapsed": 0.0, **{s: 0 for s in (
+            STATUS_HIT, STATUS_MISS, STATUS_COALESCED, STATUS_BYPASS)}})
+        stats["calls"] += 1
+        stats["elapsed"] += elapsed
+        if status in stats:
+            stats[status] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """정책별 hit/miss/병합/우회 수, TTL, 현재 캐시 크기, 툴별 호출 통계"""
+        policies = {}
+        for policy, m in self._metrics.items():
+            lookups = m[STATUS_HIT] + m[STATUS_MISS] + m[STATUS_COALESCED]
+            policies[policy] = {
+                **m,
+                "ttl": self.ttl[policy],
+                "hit_ratio": round((m[STATUS_HIT] + m[STATUS_COALESCED]) / lookups, 4) if lookups else 0.0,
+            }
+        tools = {
+            tool: {**{k: v for k, v in s.items() if k != "elapsed"},
+                   "elapsed_avg": round(s["elapsed"] / s["calls"], 4) if s["calls"] else 0.0}
+            for tool, s in self._calls.items()
+        }
+        return {"entries": len(self._entries), "inflight": len(self._inflight), "policies": policies, "tools": tools}
@@ -0,0 +1,337 @@
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+from module.decorator import singleton
+
+# 한글 음절 분해 (초성 19, 중성 21, 종성 28)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+# 매칭 단계별 기본 점수 (같은 단계에서는 검색어와 길이가 가까운 종목 우선)
+MATCH_SCORES = {
+    "code_exact": 1.0,
+    "name_exact": 0.95,
+    "name_prefix": 0.9,
+    "name_contains": 0.8,
+    "chosung": 0.7,
+    "fuzzy": 0.6,
+}
+
+
+def normalize(text: str) -> str:
+    """공백 제거 및 영문 대문자 변환"""
+    return "".join(str(text).split()).upper()
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모로 분해 (ex. 삼성 → ㅅㅏㅁㅅㅓㅇ), 한글 외 문자는 그대로 유지"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSUNG[offset // 588])
+            out.append(JUNGSUNG[(offset % 588) // 28])
+            if offset % 28:
+                out.append(JONGSUNG[offset % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def to_chosung(text: str) -> str:
+    """초성 문자열 (ex. 삼성전자 → ㅅㅅㅈㅈ), 한글 외 문자는 그대로 유지"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        out.append(CHOSUNG[(code - HANGUL_BASE) // 588] if HANGUL_BASE <= code <= HANGUL_LAST else ch)
+    return "".join(out)
+
+
+def _is_chosung_query(text: str) -> bool:
+    return bool(text) and all(ch in CHOSUNG for ch in text)
+
+
+def _ngrams(text: str, n: int = 2) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class StockIndex:
+    """툴 1개의 종목 검색 인덱스
+
+    - 종목코드/종목명 완전일치: dict
+    - 종목명 앞글자 일치: 정렬된 종목명 배열 + 이진 탐색 (prefix trie 대신 메모리를 적게 쓰는 정렬 배열 사용)
+    - 종목명 중간 일치: 2-gram 역색인 후보를 실제 문자열로 확인
+    - 초성 검색(ㅅㅅㅈㅈ): 초성 문자열 2-gram 역색인
+    - 오타 허용 검색: 다른 단계에서 찾지 못한 경우에만, 자모 3-gram 역색인 후보를 자모 문자열 유사도로 정렬
+    """
+
+    def __init__(self, rows: List[tuple]):
+        # rows: (name, code, ex)
+        self.names: List[str] = []
+        self.codes: List[str] = []
+        self.exs: List[Optional[str]] = []
+        self.norms: List[str] = []
+        self.jamos: List[str] = []
+        self.chosungs: List[str] = []
+
+        self.by_code: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.grams: Dict[str, List[int]] = {}
+        self.cho_grams: Dict[str, List[int]] = {}
+        self.jamo_grams: Dict[str, List[int]] = {}
+
+        for name, code, ex in rows:
+            if not name and not code:
+                continue
+            idx = len(self.names)
+            norm = normalize(name or "")
+            jamo = to_jamo(norm)
+            self.names.append(name or "")
+            self.codes.append(str(code or ""))
+            self.exs.append(ex)
+            self.norms.append(norm)
+            self.jamos.append(jamo)
+            chosung = to_chosung(norm)
+            self.chosungs.append(chosung)
+
+            self.by_code.setdefault(normalize(code or ""), []).append(idx)
+            self.by_name.setdefault(norm, []).append(idx)
+            for gram in _ngrams(norm):
+                self.grams.setdefault(gram, []).append(idx)
+            for gram in _ngrams(chosung):
+                self.cho_grams.setdefault(gram, []).append(idx)
+            for gram in _ngrams(jamo, 3):
+                self.jamo_grams.setdefault(gram, []).append(idx)
+
+        self.sorted_names = sorted((norm, idx) for idx, norm in enumerate(self.norms))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix(self, q: str) -> List[int]:
+        result = []
+        pos = bisect_left(self.sorted_names, (q, -1))
+        while pos < len(self.sorted_names) and self.sorted_names[pos][0].startswith(q):
+            result.append(self.sorted_names[pos][1])
+            pos += 1
+        return result
+
+    @staticmethod
+    def _contains(q: str, grams: Dict[str, List[int]], texts: List[str]) -> List[int]:
+        postings = [grams.get(g) for g in _ngrams(q)]
+        if not postings or any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates.intersection_update(p)
+            if not candidates:
+                return []
+        return [idx for idx in candidates if q in texts[idx]]
+
+    def _fuzzy(self, q: str, limit: int, min_ratio: float = 0.6) -> List[tuple]:
+        jamo = to_jamo(q)
+        # 너무 흔한 자모 3-gram 은 후보 선별에 도움이 되지 않으므로 제외
+        max_posting = max(100, len(self.names) // 20)
+        counts = Counter()
+        for gram in _ngrams(jamo, 3):
+            posting = self.jamo_grams.get(gram, ())
+            if len(posting) <= max_posting:
+                counts.update(posting)
+        scored = []
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(jamo)
+        for idx, _ in counts.most_common(limit * 4):
+            matcher.set_seq1(self.jamos[idx])
+            if matcher.quick_ratio() < min_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= min_ratio:
+                scored.append((ratio, idx))
+        scored.sort(key=lambda x: -x[0])
+        return scored[:limit]
+
+    def search(self, query: str, limit: int = 5, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """점수 순 후보 목록 [{code, name, ex, match_type, score}]"""
+        q = normalize(query)
+        if not q:
+            return []
+
+        found: Dict[int, tuple] = {}
+
+        def add(indices, match_type):
+            base = MATCH_SCORES[match_type]
+            for idx in indices:
+                if idx not in found:
+                    # 같은 단계에서는 이름 길이가 검색어와 가까울수록 높은 점수
+                    closeness = len(q) / max(len(self.norms[idx]), len(q))
+                    found[idx] = (round(base - 0.05 * (1 - closeness), 4), match_type)
+
+        add(self.by_code.get(q, ()), "code_exact")
+        add(self.by_name.get(q, ()), "name_exact")
+        if len(found) < limit:
+            add(self._prefix(q), "name_prefix")
+        if len(found) < limit:
+            add(self._contains(q, self.grams, self.norms), "name_contains")
+        if len(found) < limit and _is_chosung_query(q):
+            add(self._contains(q, self.cho_grams, self.chosungs), "chosung")
+        if fuzzy and not found:
+            for ratio, idx in self._fuzzy(q, limit):
+                found.setdefault(idx, (round(MATCH_SCORES["fuzzy"] * ratio, 4), "fuzzy"))
+
+        ranked = sorted(found.items(), key=lambda item: (-item[1][0], len(self.norms[item[0]]), self.norms[item[0]]))
+        return [
+            {
+                "code": self.codes[idx],
+                "name": self.names[idx],
+                "ex": self.exs[idx],
+                "match_type": match_type,
+                "score": score,
+            }
+            for idx, (score, match_type) in ranked[:limit]
+        ]
+
+
+@singleton
+class StockResolver:
+    """툴별 마스터 테이블 전체를 메모리 인덱스로 보관하는 종목 검색기
+
+    인덱스는 툴별로 처음 검색할 때(또는 warm 호출시) 만들고, Updated.updated_at 이 바뀌면 다시 만든다.
+    updated_at 확인은 check_interval 초에 한 번만 하므로 검색은 DB 조회 없이 메모리에서 처리한다.
+    인덱스를 만드는 동안의 검색은 기다리지 않고 마스터 DB 의 FTS5 검색(DatabaseEngine.search_master) 으로 처리하고,
+    다시 만드는 동안에는 이전 인덱스로 처리한다. 인덱스 확인/생성은 툴별 lock 으로 보호하므로 다른 툴의 검색은 막지 않으며,
+    async 코드에서는 DB 확인이나 인덱스 생성이 이벤트 루프를 막지 않도록 search_async() 를 사용한다.
+    """
+
+    def __init__(self, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._indexes: Dict[str, StockIndex] = {}
+        self._versions: Dict[str, Any] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()  # _tool_locks, _building 보호
+        self._tool_locks: Dict[str, threading.Lock] = {}
+        self._building: set = set()
+
+    def _tool_lock(self, tool_name: str) -> threading.Lock:
+        with self._lock:
+            lock = self._tool_locks.get(tool_name)
+            if lock is None:
+                lock = self._tool_locks[tool_name] = threading.Lock()
+            return lock
+
+    def _is_fresh(self, tool_name: str) -> bool:
+        return tool_name in self._indexes and \
+            time.monotonic() - self._checked_at.get(tool_name, 0) < self.check_interval
+
+    @staticmethod
+    def _db_engine():
+        from module.plugin.database import Database
+        db = Database()
+        if not db.ensure_initialized():
+            raise RuntimeError("데이터베이스 초기화 실패")
+        return db.get_by_name("master")
+
+    def _build(self, tool_name: str, db_engine) -> StockIndex:
+        from module.plugin.master_file import MasterFileManager
+        rows = []
+        for model_class in MasterFileManager.get_master_models_for_tool(tool_name):
+            columns = ["name", "code", "ex"] if hasattr(model_class, "ex") else ["name", "code"]
+            rows.extend(
+                tuple(row) + (None,) * (3 - len(row))
+                for row in db_engine.list_columns(model_class, columns)
+            )
+        started = time.perf_counter()
+        index = StockIndex(rows)
+        logging.info(f"🔎 {tool_name} 종목 인덱스 생성: {len(index)}건 ({time.perf_counter() - started:.2f}s)")
+        return index
+
+    def get_index(self, tool_name: str) -> StockIndex:
+        """툴 인덱스 반환, 마스터 업데이트 시간이 바뀌었으면 다시 생성 (DB 조회가 있으므로 이벤트 루프에서 직접 호출하지 않음)"""
+        index = self._indexes.get(tool_name)
+        if index is not None and self._is_fresh(tool_name):
+            return index
+
+        lock = self._tool_lock(tool_name)
+        # 같은 툴의 인덱스를 다른 스레드가 확인/생성 중이면 기다리지 않고 이전 인덱스 사용
+        if not lock.acquire(blocking=index is None):
+            return index
+        try:
+            index = self._indexes.get(tool_name)
+            if index is not None and self._is_fresh(tool_name):
+                return index
+            db_engine = self._db_engine()
+            version = db_engine.get_master_update_time(tool_name)
+            if index is None or version != self._versions.get(tool_name):
+                index = self._build(tool_name, db_engine)
+                # 새 인덱스를 다 만든 후 참조만 교체
+                self._indexes[tool_name] = index
+                self._versions[tool_name] = version
+            self._checked_at[tool_name] = time.monotonic()
+            return index
+        finally:
+            lock.release()
+
+    def _build_background(self, tool_name: str):
+        with self._lock:
+            if tool_name in self._building:
+                return
+            self._building.add(tool_name)
+
+        def run():
+            try:
+                self.get_index(tool_name)
+            except Exception as e:
+                logging.warning(f"{tool_name} 종목 인덱스 생성 실패: {e}")
+            finally:
+                self._building.discard(tool_name)
+
+        threading.Thread(target=run, name=f"stock_index_{tool_name}", daemon=True).start()
+
+    def invalidate(self, tool_name: Optional[str] = None):
+        """다음 검색시 인덱스 재생성 (마스터파일 업데이트 직후 호출)"""
+        for name in [tool_name] if tool_name else list(self._indexes):
+            with self._tool_lock(name):
+                self._indexes.pop(name, None)
+                self._versions.pop(name, None)
+                self._checked_at.pop(name, None)
+
+    def warm(self, tool_names: List[str]):
+        """서버 시작시 마스터 데이터가 있는 툴의 인덱스를 미리 생성"""
+        from module.plugin.master_file import MasterFileManager
+        for tool_name in tool_names:
+            try:
+                self._db_engine().ensure_search_index(tool_name, MasterFileManager.get_master_models_for_tool(tool_name))
+                self.get_index(tool_name)
+            except Exception as e:
+                logging.warning(f"{tool_name} 종목 인덱스 생성 실패: {e}")
+
+    def search(self, tool_name: str, query: str, limit: int = 5, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        if tool_name in self._indexes:
+            return self.get_index(tool_name).search(query, limit=limit, fuzzy=fuzzy)
+
+        # 인덱스가 아직 없으면 백그라운드에서 만들고, 그 동안은 DB 검색 결과 반환
+        from module.plugin.master_file import MasterFileManager
+        self._build_background(tool_name)
+        candidates = self._db_engine().search_master(
+            tool_name, query, MasterFileManager.get_master_models_for_tool(tool_name), limit=limit
+        )
+        for candidate in candidates:
+            candidate["score"] = MATCH_SCORES[candidate["match_type"]]
+        return candidates
+
+    async def search_async(self, tool_name: str, query: str, limit: int = 5, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """search() 의 async 버전, 인덱스 확인/생성이나 DB 검색이 필요하면 스레드에서 실행"""
+        if self._is_fresh(tool_name):
+            return self.search(tool_name, query, limit=limit, fuzzy=fuzzy)
+        return await asyncio.to_thread(self.search, tool_name, query, limit, fuzzy)
@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import os
 import platform
 import sys
+from contextlib import asynccontextmanager
 
 from fastmcp import FastMCP
 
 from module import setup_environment, EnvironmentMiddleware, EnvironmentConfig, setup_kis_config
-from module.plugin import Database
+from module.plugin import Database, MasterFileManager, StockResolver, ConfigRegistry
 from tools import *
 
 logging.basicConfig(
@@ -16,6 +18,13 @@ logging.basicConfig(
 )
 
 
+@asynccontextmanager
+async def config_watch_lifespan(server: FastMCP):
+    """서버 이벤트 루프에서 설정 파일 변경 감시 시작 (도구 재등록은 서버 루프에서 실행)"""
+    ConfigRegistry().watch(loop=asyncio.get_running_loop())
+    yield {}
+
+
 def main():
     env = os.getenv("ENV", None)
 
@@ -38,6 +47,9 @@ def main():
         db_exists = os.path.exists(os.path.join("configs/master", "master.db"))
         db.new(db_dir="configs/master")
         logging.info(f"📁 Available databases: {db.get_available_databases()}")
+
+        # 종목 검색 인덱스 미리 생성 (마스터 데이터가 있는 툴만)
+        StockResolver().warm(list(MasterFileManager.TOOL_MASTER_MAPPING))
     except Exception as e:
         logging.error(f"❌ Database initialization failed: {e}")
         sys.exit(1)
@@ -48,11 +60,17 @@ def main():
         instructions="This is a server for a specific project.",
         version="1.0.0",
         stateless_http=False,
+        lifespan=config_watch_lifespan,
     )
 
     # middleware
     mcp_server.add_middleware(EnvironmentMiddleware(environment=env_config))
 
+    # 툴 설정 일괄 로드 (설명/API 상세/검색 인덱스 미리 생성), 설정 파일 변경 감지는 서버 시작시 (config_watch_lifespan)
+    logging.info("setup tool configs ...")
+    config_registry = ConfigRegistry()
+    config_registry.preload()
+
     # tools 등록
     DomesticStockTool().register(mcp_server=mcp_server)
     DomesticFutureOptionTool().register(mcp_server=mcp_server)
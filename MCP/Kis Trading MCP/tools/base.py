@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import os
 import time
 import shutil
@@ -8,17 +8,51 @@ import subprocess
 import requests
 from fastmcp import FastMCP, Context
 
-from module.plugin import MasterFileManager
+from module.plugin import MasterFileManager, ApiRuntime, ApiWorkerPool, StockResolver, ConfigRegistry, ResponseCache
+from module.plugin.response_cache import call_info, classify_api
 from module.plugin.database import Database
 import module.factory as factory
 
+# 종목명으로 찾을 수 있는 파라미터들
+STOCK_NAME_PARAMS = ("stock_name", "stock_name_kr", "korean_name", "company_name")
+
+# batch 실행 설정
+BATCH_MAX_ITEMS = int(os.getenv("KIS_BATCH_MAX_ITEMS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("KIS_BATCH_CONCURRENCY", "4"))
+MULTPRICE_API_TYPE = "intstock_multprice"
+MULTPRICE_MAX_CODES = 30  # 관심종목(멀티종목) 시세조회 1회 최대 종목 수
+QUOTE_API_TYPE = "inquire_price"
+QUOTE_MERGE_PARAMS = {"env_dv", "fid_cond_mrkt_div_code", "fid_input_iscd", "pdno", *STOCK_NAME_PARAMS}
+# 관심종목(멀티종목) 시세조회 응답 필드 -> 현재가 조회(inquire_price) 응답 필드
+MULTPRICE_QUOTE_FIELDS = {
+    "inter_shrn_iscd": "stck_shrn_iscd",
+    "inter2_prpr": "stck_prpr",
+    "inter2_prdy_vrss": "prdy_vrss",
+    "prdy_vrss_sign": "prdy_vrss_sign",
+    "prdy_ctrt": "prdy_ctrt",
+    "acml_vol": "acml_vol",
+    "acml_tr_pbmn": "acml_tr_pbmn",
+    "inter2_oprc": "stck_oprc",
+    "inter2_hgpr": "stck_hgpr",
+    "inter2_lwpr": "stck_lwpr",
+    "inter2_mxpr": "stck_mxpr",
+    "inter2_llam": "stck_llam",
+    "inter2_sdpr": "stck_sdpr",
+}
+
 
 class ApiExecutor:
-    """API 실행 클래스 - GitHub에서 코드를 다운로드하고 실행"""
+    """API 실행 클래스
+
+    - inprocess (기본값): 코드 캐시의 API 모듈을 서버 프로세스에서 직접 호출 (ApiRuntime)
+    - pool: 실전/모의 환경별 상주 워커 프로세스에서 실행 (ApiWorkerPool), 서버 프로세스와 격리 필요시 사용
+    - subprocess: 호출마다 GitHub에서 코드를 다운로드하여 별도 프로세스로 실행
+    """
 
     def __init__(self, tool_name: str):
         """초기화"""
         self.tool_name = tool_name
+        self.mode = os.getenv("KIS_API_EXECUTOR", "inprocess")
         self.temp_base_dir = "./tmp"
         # 절대 경로로 venv python 설정
         self.venv_python = os.path.join(os.getcwd(), ".venv", "bin", "python")
@@ -291,8 +325,41 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"임시 디렉토리 정리 실패: {temp_dir}, 오류: {str(e)}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """실행 방식별 통계 (pool: 환경별 대기 요청 수, 처리 시간)"""
+        if self.mode == "pool":
+            return {"executor": "pool", **ApiWorkerPool().get_stats()}
+        if self.mode == "inprocess":
+            return {"executor": "inprocess", **ApiRuntime().get_stats()}
+        return {"executor": self.mode}
+
+    async def _execute_inprocess(self, ctx: Context, api_type: str, params: Dict[str, Any], github_url: str) -> Dict[str, Any]:
+        """캐시된 API 모듈을 서버 프로세스 또는 상주 워커에서 직접 호출"""
+        start_time = time.time()
+        await ctx.info(f"API 실행 시작: {api_type}")
+
+        runner = ApiWorkerPool() if self.mode == "pool" else ApiRuntime()
+        execution_result = await runner.execute(self.tool_name, api_type, params, github_url)
+        result = {
+            "success": execution_result["success"],
+            "api_type": api_type,
+            "params": params,
+            "message": f"{self.tool_name} API 호출 완료",
+            "execution_time": f"{time.time() - start_time:.2f}s",
+            "executor": self.mode,
+        }
+        if execution_result["success"]:
+            result["data"] = execution_result["data"]
+        else:
+            result["error"] = execution_result["error"]
+            await ctx.error(f"API 실행 중 오류: {execution_result['error']}")
+        return result
+
     async def execute_api(self, ctx: Context, api_type: str, params: Dict[str, Any], github_url: str) -> Dict[str, Any]:
         """API 실행 메인 함수"""
+        if self.mode in ("inprocess", "pool"):
+            return await self._execute_inprocess(ctx, api_type, params, github_url)
+
         temp_dir = None
         start_time = time.time()
 
@@ -365,7 +432,9 @@ class BaseTool(ABC):
 
     def __init__(self):
         """도구 초기화"""
-        self._load_config()
+        self.config_registry = ConfigRegistry()
+        self.config_registry.get(self.tool_name)
+        self.mcp_server = None
         self.api_executor = ApiExecutor(self.tool_name)
         self.master_file_manager = MasterFileManager(self.tool_name)
         self.db = Database()
@@ -380,17 +449,25 @@ class BaseTool(ABC):
     # ========== Public Properties ==========
     @property
     def description(self) -> str:
-        """도구 설명 (분류.json에서 동적 생성)"""
-        return self._generate_description()
+        """도구 설명 (설정 로드시 미리 생성)"""
+        return self.config_registry.description(self.tool_name)
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """JSON 설정 (ConfigRegistry 에서 조회, 파일 변경시 다시 로드된 설정)"""
+        return self.config_registry.config(self.tool_name)
 
     @property
     def config_file(self) -> str:
         """JSON 설정 파일 경로 (tool_name 기반 자동 생성)"""
-        return f"./configs/{self.tool_name}.json"
+        return self.config_registry.path(self.tool_name)
 
     # ========== Public Methods ==========
     def register(self, mcp_server: FastMCP) -> None:
         """MCP 서버에 도구 등록"""
+        if self.mcp_server is None:
+            self.config_registry.on_reload(self._on_config_reload)
+        self.mcp_server = mcp_server
         mcp_server.tool(
             self._run,
             name=self.tool_name,
@@ -398,89 +475,13 @@ class BaseTool(ABC):
         )
 
     # ========== Protected Methods ==========
-    def _load_config(self) -> None:
-        """JSON 설정 파일 로드"""
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            # 임시로 빈 설정으로 초기화
-            self.config = {"apis": {}}
-
-    def _generate_description(self) -> str:
-        """분류.json에서 도구 설명 동적 생성"""
-        try:
-            config_json_path = f"./configs/{self.tool_name}.json"
-            with open(config_json_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-
-            tool_info = config_data.get("tool_info")
-            apis = config_data.get("apis", {})
-
-            if not tool_info:
-                return f"{self.tool_name} 도구의 tool_info가 없습니다."
-
-            # description 문자열 구성
-            lines = [tool_info.get("introduce", "")]
-
-            # introduce_append가 있으면 추가
-            introduce_append = tool_info.get("introduce_append", "").strip()
-            if introduce_append:
-                lines.append(introduce_append)
-
-            lines.append("")  # 빈 줄
-            lines.append("[지원 기능]")
-
-            # API 목록 추가
-            for api_type, api_info in apis.items():
-                lines.append(f"- {api_info['name']} (api_type: \"{api_type}\")")
-
-            lines.append("")  # 빈 줄
-
-            # 개선된 구조 적용
-            lines.append("📋 사용 방법:")
-            lines.append("1. find_api_detail로 API 상세 정보를 확인하세요")
-            lines.append("2. api_type을 선택하고 params에 필요한 파라미터를 입력하세요")
-            lines.append("3. 종목명으로 검색할 경우: stock_name='종목명' 파라미터를 사용하세요")
-            lines.append("4. 모의투자 시에는 env_dv='demo'를 추가하세요")
-            lines.append("")
-            lines.append("🔧 특별한 api_type 및 예시:")
-            lines.append(f"- find_stock_code (종목번호 검색) : {self.tool_name}({{ \"api_type\": \"find_stock_code\", \"params\": {{ \"stock_name\": \"삼성전자\" }} }})")
-            lines.append(f"- find_api_detail (API 정보 조회) : {self.tool_name}({{ \"api_type\": \"find_api_detail\", \"params\": {{ \"api_type\": \"inquire_price\" }} }})")
-            lines.append("")
-            lines.append("🔍 종목명 사용: stock_name=\"삼성전자\" → 자동으로 종목번호 변환하여 실행")
-            lines.append(f"{self.tool_name}({{ \"api_type\": \"inquire_price\", \"params\": {{ \"stock_name\": \"삼성전자\" }} }})")
-            lines.append("")
-            lines.append("💡 주요 파라미터:")
-            if self.tool_name.startswith('domestic'):
-                lines.append("- 시장코드(fid_cond_mrkt_div_code)='J'(KRX)/'NX'(넥스트레이드)/'UN'(통합)")
-            lines.append("- 매매구분(ord_dv)='buy'(매수)/'sell'(매도)")
-            lines.append("- 실전모의구분(env_dv)='real'(실전)/'demo'(모의)")
-            lines.append("")
-            lines.append("⚠️ 중요: API 호출 시 필수 주의사항")
-            lines.append("**API 실행 전 반드시 API 상세 문서의 파라미터를 확인하세요. Request Query Params와 Request Body 입력 시 추측이나 과거 실행 값 사용 금지, 확인된 API 상세 문서의 값을 사용하세요.**")
-            lines.append("**파라미터 description에 '공란'이 있는 경우 기본적으로 빈값으로 처리하되, 아닌 경우에는 값을 넣어도 됩니다.**")
-            lines.append("**🎯 모의투자 관련: 사용자가 '모의', '모의투자', '데모', '테스트' 등의 용어를 언급하거나 모의투자 관련 요청을 할 경우, 반드시 env_dv 파라미터를 'demo'로 설정하여 API를 호출해야 합니다. env_dv 파라미터가 있는 모든 API에서 모의투자 시에는 env_dv='demo', 실전투자 시에는 env_dv='real'을 사용합니다. 기본값은 'real'이므로 모의투자 요청 시 반드시 env_dv='demo'를 명시적으로 설정해주세요.**")
-            lines.append("")
-            lines.append("🔒 자동 처리되는 파라미터 (제공하지 마세요):")
-            lines.append("• cano (계좌번호), acnt_prdt_cd (계좌상품코드), my_htsid (HTS ID) - 시스템 자동 설정")
-            if self.tool_name.startswith('domestic'):
-                lines.append("• excg_id_dvsn_cd (거래소구분) - 국내 API는 자동으로 KRX 설정")
-            lines.append("")
-
-            # 예시 호출 추가
-            examples = tool_info.get("examples", [])
-            if examples:
-                lines.append("💻 예시 호출:")
-                for example in examples:
-                    params_str = json.dumps(example.get('params', {}), ensure_ascii=False)
-                    lines.append(
-                        f"{self.tool_name}({{ \"api_type\": \"{example['api_type']}\",\"params\": {params_str} }})")
-
-            return "\n".join(lines)
+    def _on_config_reload(self, tool_name: str) -> None:
+        """설정 파일 변경시 도구 설명 갱신 (같은 이름으로 다시 등록)
 
-        except Exception as e:
-            return f"{self.tool_name} 도구 설명 생성 중 오류: {str(e)}"
+        ConfigRegistry.watch(loop=...) 로 서버 이벤트 루프에서 호출되므로 요청 처리와 동시에 도구 목록을 바꾸지 않는다.
+        """
+        if tool_name == self.tool_name and self.mcp_server is not None:
+            self.register(self.mcp_server)
 
     async def _run(self, ctx: Context, api_type: str, params: dict) -> Dict[str, Any]:
         """공통 실행 로직"""
@@ -502,6 +503,10 @@ class BaseTool(ABC):
                 return await self._handle_find_stock_code(ctx, params)
             elif api_type == "find_api_detail":
                 return await self._handle_find_api_detail(ctx, params)
+            elif api_type == "batch":
+                return await self._handle_batch(ctx, params)
+            elif api_type == "executor_stats":
+                return {"ok": True, "data": {**self.api_executor.get_stats(), "cache": ResponseCache().get_stats()}}
             
             # 3. API 설정 조회
             if api_type not in self.config['apis']:
@@ -529,13 +534,20 @@ class BaseTool(ABC):
             if not github_url:
                 return {"error": f"GitHub URL이 없습니다: {api_type}"}
 
-            # ApiExecutor를 사용하여 API 실행
-            result = await self.api_executor.execute_api(
-                ctx=ctx,
-                api_type=api_type,
-                params=params,
-                github_url=github_url
+            # ApiExecutor를 사용하여 API 실행 (정책별 TTL 캐시, 동일 요청 병합, 주문은 항상 실행)
+            result, status = await ResponseCache().get_or_fetch(
+                self.tool_name, api_type, params,
+                policy=classify_api(self.tool_name, api_type, api_info),
+                fetch=lambda: self.api_executor.execute_api(
+                    ctx=ctx,
+                    api_type=api_type,
+                    params=params,
+                    github_url=github_url
+                ),
             )
+            info = call_info.get()
+            if info is not None:
+                info["cache"] = status
 
             return result
 
@@ -545,15 +557,8 @@ class BaseTool(ABC):
     async def _process_stock_name(self, ctx: Context, params: Dict[str, Any]) -> Dict[str, Any]:
         """종목명/종목코드 자동 처리 (stock_name이 있으면 자동으로 pdno 변환)"""
         try:
-            # 종목명으로 찾을 수 있는 파라미터들
-            stock_name_params = ["stock_name", "stock_name_kr", "korean_name", "company_name"]
-            
             # 파라미터에서 종목명/종목코드 찾기
-            search_value = None
-            for param_name in stock_name_params:
-                if param_name in params and params[param_name]:
-                    search_value = params[param_name]
-                    break
+            search_value = self._stock_search_value(params)
             
             # 검색할 값이 없으면 그대로 반환
             if not search_value:
@@ -565,11 +570,8 @@ class BaseTool(ABC):
             result = await self._find_stock_by_name_or_code(ctx, search_value)
             
             if result["found"]:
-                params["pdno"] = result["code"]
+                self._apply_stock_code(params, search_value, result["code"])
                 await ctx.info(f"종목번호 자동 찾기 성공: {search_value} → {result['code']}")
-                # 원본 검색값 보존
-                params["_original_search_value"] = search_value
-                params["_resolved_stock_code"] = result["code"]
             else:
                 await ctx.warning(f"종목을 찾을 수 없음: {search_value}")
                 # 종목을 찾지 못해도 원본 파라미터 유지
@@ -580,106 +582,59 @@ class BaseTool(ABC):
             await ctx.error(f"종목명 자동 처리 실패: {str(e)}")
             return params
     
-    async def _find_stock_by_name_or_code(self, ctx: Context, search_value: str) -> Dict[str, Any]:
-        """종목명 또는 종목코드로 종목번호 찾기"""
+    @staticmethod
+    def _stock_search_value(params: Dict[str, Any]) -> Optional[str]:
+        """파라미터의 종목명/종목코드 검색값"""
+        for param_name in STOCK_NAME_PARAMS:
+            if params.get(param_name):
+                return params[param_name]
+        return None
+
+    @staticmethod
+    def _apply_stock_code(params: Dict[str, Any], search_value: str, code: str) -> None:
+        """찾은 종목번호를 pdno 로 설정 (원본 검색값 보존)"""
+        params["pdno"] = code
+        params["_original_search_value"] = search_value
+        params["_resolved_stock_code"] = code
+
+    async def _prepare_stock_index(self, ctx: Context) -> Optional[str]:
+        """종목 검색 전 DB/마스터 파일 확인, 검색할 수 없으면 사유 반환"""
+        # 데이터베이스 연결 확인
+        if not self.db.ensure_initialized():
+            return "데이터베이스 초기화 실패"
+
+        # 마스터 파일 업데이트 확인 (force_update=False로 필요시에만 업데이트)
         try:
-            # 검색어에서 띄어쓰기 제거
-            search_term = search_value.replace(" ", "")
-            
-            # 데이터베이스 연결 확인
-            if not self.db.ensure_initialized():
-                return {"found": False, "message": "데이터베이스 초기화 실패"}
+            await self.master_file_manager.ensure_master_file_updated(ctx, force_update=False)
+        except Exception as e:
+            await ctx.warning(f"마스터 파일 업데이트 확인 중 오류: {str(e)}")
 
-            # 마스터 파일 업데이트 확인 (force_update=False로 필요시에만 업데이트)
-            try:
-                from module.plugin import MasterFileManager
-                master_file_manager = MasterFileManager(self.tool_name)
-                await master_file_manager.ensure_master_file_updated(ctx, force_update=False)
-            except Exception as e:
-                await ctx.warning(f"마스터 파일 업데이트 확인 중 오류: {str(e)}")
-            
-            # DB 엔진
-            db_engine = self.db.get_by_name("master")
-            master_models = MasterFileManager.get_master_models_for_tool(self.tool_name)
-            
-            if not master_models:
-                return {"found": False, "message": f"지원하지 않는 툴: {self.tool_name}"}
-            
-            # 각 모델에서 우선순위별 검색
-            for model_class in master_models:
-                try:
-                    # 1순위: 종목코드로 완전 매칭
-                    code_results = db_engine.list(
-                        model_class, 
-                        filters={"code": search_term}, 
-                        limit=1
-                    )
-                    
-                    if code_results:
-                        result = code_results[0]
-                        return {
-                            "found": True,
-                            "code": result.code,
-                            "name": result.name,
-                            "ex": result.ex if hasattr(result, 'ex') else None,
-                            "match_type": "code_exact"
-                        }
-                    
-                    # 2순위: 종목명으로 완전 매칭
-                    name_results = db_engine.list(
-                        model_class, 
-                        filters={"name": search_term}, 
-                        limit=1
-                    )
-                    
-                    if name_results:
-                        result = name_results[0]
-                        return {
-                            "found": True,
-                            "code": result.code,
-                            "name": result.name,
-                            "ex": result.ex if hasattr(result, 'ex') else None,
-                            "match_type": "name_exact"
-                        }
-                    
-                    # 3순위: 종목명으로 앞글자 매칭
-                    prefix_results = db_engine.list(
-                        model_class, 
-                        filters={"name": f"{search_term}%"}, 
-                        limit=1
-                    )
-                    
-                    if prefix_results:
-                        result = prefix_results[0]
-                        return {
-                            "found": True,
-                            "code": result.code,
-                            "name": result.name,
-                            "ex": result.ex if hasattr(result, 'ex') else None,
-                            "match_type": "name_prefix"
-                        }
-                    
-                    # 4순위: 종목명으로 중간 매칭
-                    contains_results = db_engine.list(
-                        model_class, 
-                        filters={"name": f"%{search_term}%"}, 
-                        limit=1
-                    )
-                    
-                    if contains_results:
-                        result = contains_results[0]
-                        return {
-                            "found": True,
-                            "code": result.code,
-                            "name": result.name,
-                            "ex": result.ex if hasattr(result, 'ex') else None,
-                            "match_type": "name_contains"
-                        }
-                        
-                except Exception as e:
-                    continue
-            
-            return {"found": False, "message": f"종목을 찾을 수 없음: {search_value}"}
+        if not MasterFileManager.get_master_models_for_tool(self.tool_name):
+            return f"지원하지 않는 툴: {self.tool_name}"
+        return None
+
+    async def _find_stock_by_name_or_code(self, ctx: Context, search_value: str, fuzzy: bool = False) -> Dict[str, Any]:
+        """종목명 또는 종목코드로 종목번호 찾기 (fuzzy=True 이면 초성/오타 허용 검색 포함)"""
+        try:
+            message = await self._prepare_stock_index(ctx)
+            if message:
+                return {"found": False, "message": message}
+
+            # 메모리 인덱스 검색 (종목코드/종목명 완전일치 → 앞글자 → 중간 → 초성 → 오타 허용 순, 검색어 공백 무시)
+            candidates = await StockResolver().search_async(self.tool_name, search_value, limit=5, fuzzy=fuzzy)
+            if not candidates:
+                return {"found": False, "message": f"종목을 찾을 수 없음: {search_value}"}
+
+            best = candidates[0]
+            return {
+                "found": True,
+                "code": best["code"],
+                "name": best["name"],
+                "ex": best["ex"],
+                "match_type": best["match_type"],
+                "score": best["score"],
+                "candidates": candidates,
+            }
             
         except Exception as e:
             return {"found": False, "message": f"종목 검색 오류: {str(e)}"}
@@ -687,42 +642,17 @@ class BaseTool(ABC):
     def get_api_info(self, api_type: str) -> Dict[str, Any]:
         """API 정보 조회 (리소스 기능 통합)"""
         try:
-            # API 설정 조회
-            if api_type not in self.config['apis']:
+            # 미리 생성한 API 상세 정보 조회
+            api_info = self.config_registry.api_detail(self.tool_name, api_type)
+            if api_info is None:
                 return {
                     "error": f"지원하지 않는 API 타입: {api_type}",
-                    "available_apis": list(self.config['apis'].keys()),
+                    "available_apis": self.config_registry.available_apis(self.tool_name),
+                    "similar_apis": self.config_registry.search_apis(self.tool_name, api_type, limit=5),
                     "api_type": api_type
                 }
             
-            # API 정보 반환
-            api_info = self.config['apis'][api_type]
-            
-            # 파라미터 정보 정리
-            params = api_info.get("params", {})
-            param_details = {}
-            
-            for param_name, param_info in params.items():
-                param_details[param_name] = {
-                    "name": param_info.get("name", param_name),
-                    "type": param_info.get("type", "str"),
-                    "required": param_info.get("required", False),
-                    "default_value": param_info.get("default_value"),
-                    "description": param_info.get("description", "")
-                }
-            
-            result = {
-                "tool_name": self.tool_name,
-                "api_type": api_type,
-                "name": api_info.get("name", ""),
-                "category_detail": api_info.get("category", ""),
-                "method": api_info.get("method", ""),
-                "api_path": api_info.get("api_path", ""),
-                "github_url": api_info.get("github_url", ""),
-                "params": param_details
-            }
-            
-            return result
+            return api_info
             
         except Exception as e:
             return {
@@ -746,8 +676,8 @@ class BaseTool(ABC):
                     "message": "stock_name 파라미터가 필요합니다. (종목명 또는 종목코드 입력 가능)"
                 }
             
-            # 종목 검색 실행 (종목명 또는 종목코드)
-            result = await self._find_stock_by_name_or_code(ctx, search_value)
+            # 종목 검색 실행 (종목명 또는 종목코드, 초성/오타 허용)
+            result = await self._find_stock_by_name_or_code(ctx, search_value, fuzzy=True)
             
             if result["found"]:
                 return {
@@ -760,6 +690,7 @@ class BaseTool(ABC):
                         "stock_name_found": result["name"],
                         "ex": result.get("ex"),
                         "match_type": result.get("match_type"),
+                        "candidates": result.get("candidates", []),
                         "message": f"'{search_value}' 종목을 찾았습니다. 종목번호: {result['code']}",
                         "usage_guide": f"find_api_detail로 API상세정보를 확인하고 종목코드 '{result['code']}'를 해당 API의 종목코드 필드에 입력하여 실행하세요.",
                         "next_step": f"{self.tool_name} 툴에서 find_api_detail로 확인한 종목코드 필드에 '{result['code']}'를 입력하세요."
@@ -789,13 +720,25 @@ class BaseTool(ABC):
             
             # api_type 파라미터 확인
             target_api_type = params.get("api_type")
+            query = params.get("query") or params.get("keyword")
+            if not target_api_type and query:
+                # API명/카테고리/경로 검색
+                return {
+                    "ok": True,
+                    "data": {
+                        "tool_name": self.tool_name,
+                        "query": query,
+                        "matches": self.config_registry.search_apis(self.tool_name, query),
+                        "next_step": "api_type을 선택하여 find_api_detail을 다시 호출하면 파라미터 상세 정보를 확인할 수 있습니다."
+                    }
+                }
             if not target_api_type:
                 return {
                     "ok": False,
                     "error": "MISSING_OR_INVALID_ARGS",
                     "missing": ["api_type"],
-                    "message": "api_type 파라미터가 필요합니다.",
-                    "available_apis": list(self.config['apis'].keys())
+                    "message": "api_type 파라미터가 필요합니다. (API 검색은 query 파라미터 사용)",
+                    "available_apis": self.config_registry.available_apis(self.tool_name)
                 }
             
             # API 정보 조회
@@ -805,7 +748,8 @@ class BaseTool(ABC):
                 return {
                     "ok": False,
                     "error": api_info["error"],
-                    "available_apis": api_info.get("available_apis", [])
+                    "available_apis": api_info.get("available_apis", []),
+                    "similar_apis": api_info.get("similar_apis", [])
                 }
             
             return {
@@ -816,3 +760,225 @@ class BaseTool(ABC):
         except Exception as e:
             await ctx.error(f"API 상세 정보 조회 처리 중 오류: {str(e)}")
             return {"ok": False, "error": str(e)}
+
+    async def _handle_batch(self, ctx: Context, params: Dict[str, Any]) -> Dict[str, Any]:
+        """여러 API 호출을 한번에 처리
+
+        1) 모든 항목의 종목명을 한번에 종목번호로 변환 (같은 종목명은 1회만 검색)
+        2) 실전 환경의 현재가 조회(inquire_price) 여러 건은 관심종목(멀티종목) 시세조회로 최대 30종목씩 병합
+        3) 나머지 항목은 KIS_BATCH_CONCURRENCY 개씩 동시 실행 (호출 속도는 kis_auth 속도 제한을 따르고,
+           pool 실행 방식은 KIS_WORKER_CONCURRENCY 를 넘는 요청이 워커 앞에서 대기)
+        """
+        try:
+            items = params.get("items")
+            if not isinstance(items, list) or not items:
+                return {
+                    "ok": False,
+                    "error": "MISSING_OR_INVALID_ARGS",
+                    "missing": ["items"],
+                    "message": "items 파라미터에 [{\"api_type\": ..., \"params\": {...}}] 목록을 입력하세요."
+                }
+            if len(items) > BATCH_MAX_ITEMS:
+                return {"ok": False, "error": f"batch 항목은 최대 {BATCH_MAX_ITEMS}개까지 가능합니다. (요청: {len(items)}개)"}
+
+            start_time = time.time()
+            await ctx.info(f"batch 실행 시작: {self.tool_name} {len(items)}건")
+
+            # 1. 항목 검증
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+            valid: List[Tuple[int, str, Dict[str, Any]]] = []
+            for index, item in enumerate(items):
+                api_type = item.get("api_type") if isinstance(item, dict) else None
+                item_params = item.get("params", {}) if isinstance(item, dict) else None
+                if not api_type or not isinstance(item_params, dict):
+                    results[index] = self._batch_result(index, api_type, error="MISSING_OR_INVALID_ARGS")
+                elif api_type in ("batch", "executor_stats"):
+                    results[index] = self._batch_result(index, api_type, error=f"batch 에서 사용할 수 없는 api_type: {api_type}")
+                elif api_type not in ("find_stock_code", "find_api_detail") and api_type not in self.config['apis']:
+                    results[index] = self._batch_result(index, api_type, error=f"지원하지 않는 API 타입: {api_type}")
+                else:
+                    valid.append((index, api_type, dict(item_params)))
+
+            # 2. 종목명 일괄 변환
+            unresolved = await self._resolve_stock_names(
+                ctx, [item_params for _, api_type, item_params in valid if api_type != "find_stock_code"])
+
+            # 3. 현재가 조회 병합
+            groups, singles = self._group_quotes(valid) if params.get("merge_quotes", True) else ([], valid)
+
+            # 4. 동시 실행
+            semaphore = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+            async def run_single(index: int, api_type: str, item_params: Dict[str, Any]):
+                async with semaphore:
+                    results[index] = await self._run_batch_item(ctx, index, api_type, item_params)
+
+            async def run_group(group: List[Tuple[str, str, List[int]]]):
+                async with semaphore:
+                    for index, result in await self._run_multprice(ctx, group, items):
+                        results[index] = result
+
+            await asyncio.gather(*[run_single(*entry) for entry in singles], *[run_group(group) for group in groups])
+
+            # 하나의 툴 호출에 여러 API 가 실행되므로 캐시 처리 결과는 항목별 결과로만 전달
+            info = call_info.get()
+            if info is not None:
+                info.pop("cache", None)
+
+            succeeded = sum(1 for result in results if result["ok"])
+            return {
+                "ok": True,
+                "data": {
+                    "tool_name": self.tool_name,
+                    "count": len(items),
+                    "succeeded": succeeded,
+                    "failed": len(items) - succeeded,
+                    "api_calls": len(singles) + len(groups),
+                    "merged_quotes": sum(len(indices) for group in groups for _, _, indices in group),
+                    "unresolved": unresolved,
+                    "execution_time": f"{time.time() - start_time:.2f}s",
+                    "results": results,
+                }
+            }
+
+        except Exception as e:
+            await ctx.error(f"batch 처리 중 오류: {str(e)}")
+            return {"ok": False, "error": str(e)}
+
+    @staticmethod
+    def _batch_result(index: int, api_type: Optional[str], data: Any = None, error: Any = None, **extra) -> Dict[str, Any]:
+        """batch 항목별 결과"""
+        result = {"index": index, "api_type": api_type, "ok": error is None}
+        if error is None:
+            result["data"] = data
+        else:
+            result["error"] = error
+        result.update(extra)
+        return result
+
+    async def _resolve_stock_names(self, ctx: Context, params_list: List[Dict[str, Any]]) -> List[str]:
+        """여러 항목의 종목명을 한번에 종목번호로 변환, 찾지 못한 검색값 목록 반환"""
+        targets: Dict[str, List[Dict[str, Any]]] = {}
+        for item_params in params_list:
+            search_value = self._stock_search_value(item_params)
+            if search_value:
+                targets.setdefault(search_value, []).append(item_params)
+        if not targets:
+            return []
+
+        message = await self._prepare_stock_index(ctx)
+        if message:
+            await ctx.warning(f"종목명 일괄 변환 불가: {message}")
+            return list(targets)
+
+        resolver = StockResolver()
+        unresolved = []
+        for search_value, params_group in targets.items():
+            candidates = await resolver.search_async(self.tool_name, search_value, limit=1, fuzzy=False)
+            if not candidates:
+                unresolved.append(search_value)
+                continue
+            for item_params in params_group:
+                self._apply_stock_code(item_params, search_value, candidates[0]["code"])
+        await ctx.info(f"종목명 일괄 변환: {len(targets) - len(unresolved)}/{len(targets)}건")
+        return unresolved
+
+    def _group_quotes(self, entries: List[Tuple[int, str, Dict[str, Any]]]):
+        """현재가 조회 항목을 관심종목(멀티종목) 시세조회 단위(최대 30종목)로 묶기
+
+        Returns:
+            (groups, singles) - groups 는 [(시장구분, 종목코드, [항목 index...]), ...] 목록
+        """
+        apis = self.config['apis']
+        if MULTPRICE_API_TYPE not in apis or QUOTE_API_TYPE not in apis:
+            return [], entries
+
+        mergeable: Dict[Tuple[str, str], List[int]] = {}
+        singles = []
+        for index, api_type, item_params in entries:
+            code = item_params.get("fid_input_iscd") or item_params.get("_resolved_stock_code")
+            keys = {k for k, v in item_params.items() if not k.startswith("_") and v not in (None, "")}
+            # 실전 환경의 종목코드만 지정한 현재가 조회만 병합 (모의투자는 멀티종목 시세조회 미지원)
+            if (api_type != QUOTE_API_TYPE or not code or item_params.get("env_dv", "real") != "real"
+                    or not keys <= QUOTE_MERGE_PARAMS):
+                singles.append((index, api_type, item_params))
+                continue
+            market = item_params.get("fid_cond_mrkt_div_code") or "J"
+            mergeable.setdefault((market, str(code)), []).append(index)
+
+        if len(mergeable) < 2:
+            # 종목이 1개면 병합하지 않고 원래 API 로 조회
+            return [], entries
+
+        members = [(market, code, indices) for (market, code), indices in mergeable.items()]
+        groups = [members[i:i + MULTPRICE_MAX_CODES] for i in range(0, len(members), MULTPRICE_MAX_CODES)]
+        return groups, singles
+
+    async def _run_batch_item(self, ctx: Context, index: int, api_type: str, item_params: Dict[str, Any]) -> Dict[str, Any]:
+        """batch 항목 1건 실행"""
+        try:
+            if api_type == "find_stock_code":
+                result = await self._handle_find_stock_code(ctx, item_params)
+            elif api_type == "find_api_detail":
+                result = await self._handle_find_api_detail(ctx, item_params)
+            else:
+                data = await self._run_api(ctx, api_type, item_params)
+                if isinstance(data, dict) and data.get("success"):
+                    return self._batch_result(index, api_type, data=data)
+                return self._batch_result(index, api_type, error=data.get("error") if isinstance(data, dict) else data)
+            if result.get("ok"):
+                return self._batch_result(index, api_type, data=result.get("data"))
+            return self._batch_result(index, api_type, error=result.get("error"),
+                                      **{k: v for k, v in result.items() if k not in ("ok", "error")})
+        except Exception as e:
+            return self._batch_result(index, api_type, error=str(e))
+
+    async def _run_multprice(self, ctx: Context, group: List[Tuple[str, str, List[int]]],
+                             items: List[Any]) -> List[Tuple[int, Dict[str, Any]]]:
+        """병합한 현재가 조회를 관심종목(멀티종목) 시세조회 1회로 실행하여 항목별 결과로 분리"""
+        multi_params = {}
+        for n, (market, code, _) in enumerate(group, start=1):
+            multi_params[f"fid_cond_mrkt_div_code_{n}"] = market
+            multi_params[f"fid_input_iscd_{n}"] = code
+
+        data = await self._run_api(ctx, MULTPRICE_API_TYPE, multi_params)
+        ok = isinstance(data, dict) and data.get("success")
+        rows = data.get("data") if ok else None
+        if isinstance(rows, dict):
+            rows = next((v for v in rows.values() if isinstance(v, list)), [])
+        # 응답 행에는 시장구분이 없으므로 같은 종목코드의 행은 요청 순서대로 (시장구분, 종목코드) 에 대응
+        by_code: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows or []:
+            if isinstance(row, dict):
+                by_code.setdefault(str(row.get("inter_shrn_iscd", "")).strip(), []).append(row)
+
+        results = []
+        for market, code, indices in group:
+            pending = by_code.get(code)
+            row = pending.pop(0) if pending else None
+            for index in indices:
+                if not ok:
+                    result = self._batch_result(index, QUOTE_API_TYPE, error=data.get("error") if isinstance(data, dict) else data,
+                                                merged_into=MULTPRICE_API_TYPE)
+                elif row is None:
+                    result = self._batch_result(index, QUOTE_API_TYPE, error=f"멀티종목 시세조회 응답에 종목이 없습니다: {code}",
+                                                merged_into=MULTPRICE_API_TYPE)
+                else:
+                    result = self._batch_result(index, QUOTE_API_TYPE, data={
+                        "success": True,
+                        "api_type": QUOTE_API_TYPE,
+                        "params": items[index].get("params", {}),
+                        "stock_code": code,
+                        "data": [self._multprice_to_quote(row)],
+                    }, merged_into=MULTPRICE_API_TYPE)
+                results.append((index, result))
+        return results
+
+    @staticmethod
+    def _multprice_to_quote(row: Dict[str, Any]) -> Dict[str, Any]:
+        """관심종목(멀티종목) 시세조회 1종목 결과를 현재가 조회(inquire_price) 필드명으로 변환
+
+        현재가 조회에만 있는 필드(PER, 외국인 보유 수량 등)는 포함되지 않으며,
+        대응하는 필드가 없는 멀티종목 시세조회 필드(종목명, 호가, 잔량 등)는 원래 이름으로 유지
+        """
+        return {MULTPRICE_QUOTE_FIELDS.get(field, field): value for field, value in row.items()}
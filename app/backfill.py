@@ -0,0 +1,370 @@
+"""차트 봉 데이터 증분 수집 (backfill)
+
+종목/봉 주기별로 이미 수집한 일자 구간을 SQLite 원장(ledger) 에 기록하고, 요청 구간 중 빠진 구간만 조회하여
+TickStore 에 저장한다. 종목별 조회는 스레드로 동시에 진행하며 호출 간격은 kis_auth 의 호출 속도 제한기가 조절한다.
+
+- 일/주/월/년봉: 국내주식기간별시세 (inquire_daily_itemchartprice), 1회 100건, 조회 종료일을 앞으로 옮기며 연속조회
+- 분봉: 주식일별분봉조회 (inquire_time_dailychartprice), 1회 120건, 마지막 봉의 일자/시각 1분 전으로 연속조회
+- 해외 분봉: 해외주식분봉조회 (inquire_time_itemchartprice), 1회 120건, NEXT=1 과 KEYB(마지막 봉 1분 전) 로 연속조회
+
+페이지를 저장할 때마다 완료된 일자 구간을 원장에 기록하므로 중단 후 다시 실행하면 남은 구간부터 이어서 조회한다.
+장이 끝나지 않은 일자는 원장에 기록하지 않고, 다음 실행시 저장된 마지막 봉(미완성일 수 있음)부터 다시 조회한다.
+
+Example:
+    >>> manager = BackfillManager(ka)
+    >>> report = manager.run(["005930", "000660"], timeframe="1d", start="20240101")
+    >>> report = manager.run(["005930"], timeframe="1m", start="20250801")
+    >>> report = manager.run(["NAS.TSLA"], timeframe="1m", start="20250801")    # 해외: 거래소코드.종목코드
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from tick_store import TickStore, normalize_interval
+
+
+class Endpoint(NamedTuple):
+    name: str
+    api_url: str
+    tr_id: str
+    page_rows: int  # 1회 호출 최대 건수
+    date_column: str
+    time_column: Optional[str]
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    "daily": Endpoint("inquire_daily_itemchartprice", "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+                      "FHKST03010100", 100, "stck_bsop_date", None),
+    "minute": Endpoint("inquire_time_dailychartprice", "/uapi/domestic-stock/v1/quotations/inquire-time-dailychartprice",
+                       "FHKST03010230", 120, "stck_bsop_date", "stck_cntg_hour"),
+    "overseas_minute": Endpoint("inquire_time_itemchartprice", "/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice",
+                                "HHDFS76950200", 120, "xymd", "xhms"),
+}
+
+# 일봉 이상 기간분류코드
+PERIOD_CODES = {"1d": "D", "1w": "W", "1mo": "M", "1y": "Y"}
+
+# 시장별 당일 데이터를 완료로 볼 시각(HHMM) 과 지난 일자 분봉 조회 시작 시각 (KRX 15:30, NXT/통합 20:00 장 종료)
+SESSION_CLOSE = {"J": ("1600", "153000"), "NX": ("2030", "200000"), "UN": ("2030", "200000")}
+
+# start 생략시 조회 시작일 (종료일 기준 일수)
+DEFAULT_DAYS = {"1m": 30, "1d": 365, "1w": 365 * 3, "1mo": 365 * 10, "1y": 365 * 30}
+
+
+def _yyyymmdd(value: Any) -> str:
+    return pd.Timestamp(value).strftime("%Y%m%d")
+
+
+def _shift(day: str, days: int) -> str:
+    return (datetime.strptime(day, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
+
+
+class CoverageLedger:
+    """종목/봉 주기별 수집 완료 일자 구간 (SQLite), 겹치거나 이어지는 구간은 하나로 합쳐서 보관"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage (symbol TEXT, timeframe TEXT, start TEXT, end TEXT, updated_at TEXT)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_coverage ON coverage (symbol, timeframe, start)")
+        self._conn.commit()
+
+    def ranges(self, symbol: str, timeframe: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? AND timeframe = ? ORDER BY start",
+                (symbol, timeframe)).fetchall()
+        return [tuple(row) for row in rows]
+
+    def add(self, symbol: str, timeframe: str, start: str, end: str):
+        """수집 완료 구간 [start, end] 추가"""
+        if start > end:
+            return
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT rowid, start, end FROM coverage WHERE symbol = ? AND timeframe = ? AND start <= ? AND end >= ?",
+                (symbol, timeframe, _shift(end, 1), _shift(start, -1))).fetchall()
+            if rows:
+                start = min([start] + [row[1] for row in rows])
+                end = max([end] + [row[2] for row in rows])
+                self._conn.executemany("DELETE FROM coverage WHERE rowid = ?", [(row[0],) for row in rows])
+            self._conn.execute("INSERT INTO coverage VALUES (?, ?, ?, ?, ?)",
+                               (symbol, timeframe, start, end, datetime.now().strftime("%Y%m%d%H%M%S")))
+
+    def gaps(self, symbol: str, timeframe: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """[start, end] 중 수집하지 않은 일자 구간"""
+        gaps = []
+        cursor = start
+        for lo, hi in self.ranges(symbol, timeframe):
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, _shift(lo, -1)))
+            cursor = _shift(hi, 1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM coverage WHERE (? IS NULL OR symbol = ?) AND (? IS NULL OR timeframe = ?)",
+                               (symbol, symbol, timeframe, timeframe))
+
+    def close(self):
+        self._conn.close()
+
+
+class BackfillManager:
+    """빠진 구간만 조회하는 차트 봉 수집기
+
+    Args:
+        ka_module: 인증된 kis_auth 모듈
+        store: 저장소 (생략시 TickStore())
+        ledger_path: 원장 파일 (생략시 {store.root}/backfill.db)
+        market: 국내 조건 시장 분류 코드 (J:KRX, NX:NXT, UN:통합)
+        adjusted: 일봉 이상 수정주가 여부
+        max_workers: 동시에 조회할 종목 수
+        close_hour: 이 시각(HHMM) 이후에는 당일 국내 데이터를 완료로 기록 (생략시 시장별 SESSION_CLOSE)
+        minute_start_hour: 지난 일자 분봉 조회 시작 시각 (생략시 시장별 SESSION_CLOSE)
+    """
+
+    def __init__(self, ka_module, store: Optional[TickStore] = None, ledger_path: Optional[str] = None,
+                 market: str = "J", adjusted: bool = True, max_workers: int = 4, close_hour: Optional[str] = None,
+                 minute_start_hour: Optional[str] = None):
+        if market not in SESSION_CLOSE and (close_hour is None or minute_start_hour is None):
+            raise ValueError(f"시장 {market} 은 close_hour, minute_start_hour 를 지정해야 합니다.")
+        self.ka = ka_module
+        self.store = store or TickStore()
+        self.ledger = CoverageLedger(ledger_path or os.path.join(self.store.root, "backfill.db"))
+        self.market = market
+        self.adjusted = adjusted
+        self.max_workers = max(1, max_workers)
+        default_close, default_start = SESSION_CLOSE.get(market, (None, None))
+        self.close_hour = close_hour or default_close
+        self.minute_start_hour = minute_start_hour or default_start
+        self._stats_lock = threading.Lock()
+        self._stats = {"symbols": 0, "requests": 0, "rows": 0, "errors": 0}
+
+    # ========== 계획 ==========
+
+    @staticmethod
+    def endpoint_of(symbol: str, timeframe: str) -> Endpoint:
+        overseas = "." in symbol
+        if timeframe == "1m":
+            return ENDPOINTS["overseas_minute" if overseas else "minute"]
+        if timeframe in PERIOD_CODES and not overseas:
+            return ENDPOINTS["daily"]
+        raise ValueError(f"지원하지 않는 봉 주기입니다: {symbol} {timeframe}")
+
+    def closed_through(self, symbol: str) -> str:
+        """장이 끝나 더 이상 바뀌지 않는 마지막 일자"""
+        now = datetime.now()
+        today = now.strftime("%Y%m%d")
+        if "." in symbol:
+            # 해외는 현지 일자 기준, 한국 시간 오전 8시 이후 전일 장 종료
+            return _shift(today, -1 if now.strftime("%H%M") >= "0800" else -2)
+        return today if now.strftime("%H%M") >= self.close_hour else _shift(today, -1)
+
+    def plan(self, symbol: str, timeframe: str, start: str, end: str) -> List[Tuple[str, str, bool]]:
+        """조회할 구간 목록 [(시작일, 종료일, 완료 구간 여부)], 장이 끝나지 않은 구간은 마지막에 1개"""
+        closed = self.closed_through(symbol)
+        ranges = [(a, b, True) for a, b in self.ledger.gaps(symbol, timeframe, start, min(end, closed))] \
+            if start <= min(end, closed) else []
+        if end > closed:
+            ranges.append((max(start, _shift(closed, 1)), end, False))
+        return ranges
+
+    # ========== 조회 ==========
+
+    def _fetch(self, endpoint: Endpoint, params: Dict[str, str]) -> pd.DataFrame:
+        res = self.ka._url_fetch(endpoint.api_url, endpoint.tr_id, "", params)
+        with self._stats_lock:
+            self._stats["requests"] += 1
+        if not res.isOK():
+            raise RuntimeError(f"{endpoint.name} {res.getErrorCode()} {res.getErrorMessage()}")
+        output = getattr(res.getBody(), "output2", None) or []
+        if isinstance(output, dict):
+            output = [output]
+        df = pd.DataFrame.from_records([row for row in output if row])
+        if df.empty or endpoint.date_column not in df.columns:
+            return pd.DataFrame()
+        # 데이터가 없을 때 빈 값 1건이 오는 경우 제외
+        return df[df[endpoint.date_column].astype(str).str.strip() != ""].reset_index(drop=True)
+
+    @staticmethod
+    def _keys(df: pd.DataFrame, endpoint: Endpoint) -> pd.Series:
+        keys = df[endpoint.date_column].astype(str).str.strip()
+        if endpoint.time_column:
+            keys = keys + df[endpoint.time_column].astype(str).str.strip().str.zfill(6)
+        return keys
+
+    def _walk_daily(self, symbol: str, timeframe: str, start: str, end: str) -> Iterator[Tuple[pd.DataFrame, str]]:
+        # 조회 종료일을 가장 오래된 봉의 전일로 옮기며 조회, (페이지, 완료된 첫 일자) 반환
+        endpoint = ENDPOINTS["daily"]
+        cursor = end
+        while cursor >= start:
+            df = self._fetch(endpoint, {
+                "FID_COND_MRKT_DIV_CODE": self.market,
+                "FID_INPUT_ISCD": symbol,
+                "FID_INPUT_DATE_1": start,
+                "FID_INPUT_DATE_2": cursor,
+                "FID_PERIOD_DIV_CODE": PERIOD_CODES[timeframe],
+                "FID_ORG_ADJ_PRC": "0" if self.adjusted else "1",
+            })
+            if df.empty:
+                yield df, start
+                return
+            oldest = self._keys(df, endpoint).min()
+            if len(df) < endpoint.page_rows or oldest <= start:
+                yield df, start
+                return
+            yield df, oldest
+            cursor = _shift(oldest, -1)
+
+    def _walk_minute(self, symbol: str, start: str, end: str, stop: Optional[str]) -> Iterator[Tuple[pd.DataFrame, str]]:
+        # 가장 오래된 봉 1분 전의 일자/시각으로 연속조회 (과거 데이터 포함), stop 이전 봉에 닿으면 종료
+        endpoint = ENDPOINTS["minute"]
+        now = datetime.now()
+        hour = now.strftime("%H%M%S") if end >= now.strftime("%Y%m%d") else self.minute_start_hour
+        cursor = (end, hour)
+        while True:
+            df = self._fetch(endpoint, {
+                "FID_COND_MRKT_DIV_CODE": self.market,
+                "FID_INPUT_ISCD": symbol,
+                "FID_INPUT_HOUR_1": cursor[1],
+                "FID_INPUT_DATE_1": cursor[0],
+                "FID_PW_DATA_INCU_YN": "Y",
+                "FID_FAKE_TICK_INCU_YN": "",
+            })
+            df, oldest, done = self._clip(df, endpoint, start, end, stop)
+            if done:
+                yield df, start
+                return
+            yield df, _shift(oldest[:8], 1)
+            previous = datetime.strptime(oldest, "%Y%m%d%H%M%S") - timedelta(minutes=1)
+            next_cursor = (previous.strftime("%Y%m%d"), previous.strftime("%H%M%S"))
+            if next_cursor >= cursor:
+                return
+            cursor = next_cursor
+
+    def _walk_overseas_minute(self, symbol: str, start: str, end: str, stop: Optional[str]) -> Iterator[Tuple[pd.DataFrame, str]]:
+        # 최근 봉부터 NEXT=1, KEYB=가장 오래된 봉 1분 전 으로 연속조회
+        endpoint = ENDPOINTS["overseas_minute"]
+        excd, symb = symbol.split(".", 1)
+        next_flag, keyb = "", ""
+        while True:
+            df = self._fetch(endpoint, {
+                "AUTH": "", "EXCD": excd, "SYMB": symb, "NMIN": "1", "PINC": "1",
+                "NEXT": next_flag, "NREC": str(endpoint.page_rows), "FILL": "", "KEYB": keyb,
+            })
+            df, oldest, done = self._clip(df, endpoint, start, end, stop)
+            if done:
+                yield df, start
+                return
+            yield df, _shift(oldest[:8], 1)
+            previous = (datetime.strptime(oldest, "%Y%m%d%H%M%S") - timedelta(minutes=1)).strftime("%Y%m%d%H%M%S")
+            if keyb and previous >= keyb:
+                return
+            next_flag, keyb = "1", previous
+
+    def _clip(self, df: pd.DataFrame, endpoint: Endpoint, start: str, end: str,
+              stop: Optional[str]) -> Tuple[pd.DataFrame, str, bool]:
+        # 조회 구간 안의 봉(stop 지정시 stop 시각 포함 이후)만 남김, (페이지, 가장 오래된 봉, 조회 종료 여부) 반환
+        # 저장된 마지막 봉은 장중 미완성 봉일 수 있으므로 다시 받아 덮어씀 (같은 시각은 마지막 저장값 사용)
+        if df.empty:
+            return df, start, True
+        keys = self._keys(df, endpoint)
+        oldest = keys.min()
+        lower = start + "000000"
+        mask = (keys >= lower) & (keys <= end + "235959")
+        if stop:
+            mask &= keys >= stop
+        done = oldest < lower or (stop is not None and oldest <= stop)
+        return df[mask].reset_index(drop=True), oldest, done
+
+    def _stop_key(self, store_symbol: str, timeframe: str) -> Optional[str]:
+        last = self.store.last_ts(TickStore.bar_dataset(timeframe), store_symbol)
+        return last.strftime("%Y%m%d%H%M%S") if last is not None else None
+
+    # ========== 실행 ==========
+
+    def backfill_symbol(self, symbol: str, timeframe: str, start: Any, end: Any = None) -> Dict[str, Any]:
+        """종목 1개의 빠진 구간 조회 및 저장"""
+        start, end = _yyyymmdd(start), _yyyymmdd(end or datetime.now())
+        timeframe = normalize_interval(timeframe)
+        report = {"symbol": symbol, "timeframe": timeframe, "ranges": 0, "pages": 0, "rows": 0, "error": None}
+        dataset = TickStore.bar_dataset(timeframe)
+        try:
+            endpoint = self.endpoint_of(symbol, timeframe)
+            ranges = self.plan(symbol, timeframe, start, end)
+            report["ranges"] = len(ranges)
+            for lo, hi, closed in ranges:
+                stop = None if closed else self._stop_key(symbol, timeframe)
+                if endpoint is ENDPOINTS["daily"]:
+                    pages = self._walk_daily(symbol, timeframe, lo, hi)
+                elif endpoint is ENDPOINTS["minute"]:
+                    pages = self._walk_minute(symbol, lo, hi, stop)
+                else:
+                    pages = self._walk_overseas_minute(symbol, lo, hi, stop)
+
+                for df, complete_from in pages:
+                    report["pages"] += 1
+                    if not df.empty:
+                        report["rows"] += self.store.append_bars(symbol, df, interval=timeframe)
+                    if closed:
+                        # 저장한 데이터를 파일로 기록한 후 완료 구간 기록 (중단 후 재실행시 이어서 조회)
+                        self.store.flush(dataset, symbol)
+                        self.ledger.add(symbol, timeframe, complete_from, hi)
+        except Exception as e:
+            report["error"] = str(e)
+            logging.warning(f"backfill failed {symbol} {timeframe}: {e}")
+        finally:
+            self.store.flush(dataset, symbol)
+
+        with self._stats_lock:
+            self._stats["symbols"] += 1
+            self._stats["rows"] += report["rows"]
+            self._stats["errors"] += report["error"] is not None
+        return report
+
+    def run(self, symbols: Iterable[str], timeframe: str = "1d", start: Any = None, end: Any = None) -> pd.DataFrame:
+        """여러 종목의 빠진 구간을 동시에 조회, 종목별 결과(구간/페이지/건수/오류) DataFrame 반환"""
+        symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+        timeframe = normalize_interval(timeframe)
+        end = _yyyymmdd(end or datetime.now())
+        start = _yyyymmdd(start) if start is not None else _shift(end, -DEFAULT_DAYS.get(timeframe, 365))
+
+        if len(symbols) <= 1 or self.max_workers <= 1:
+            reports = [self.backfill_symbol(s, timeframe, start, end) for s in symbols]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="backfill") as executor:
+                reports = list(executor.map(lambda s: self.backfill_symbol(s, timeframe, start, end), symbols))
+        return pd.DataFrame(reports, columns=["symbol", "timeframe", "ranges", "pages", "rows", "error"])
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        self.store.flush()
+        self.ledger.close()
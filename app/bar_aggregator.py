@@ -0,0 +1,497 @@
+"""실시간 체결 데이터로 OHLCV 봉 생성
+
+웹소켓 on_result 로 받은 H0STCNT0(KRX 체결) / H0NXCNT0(NXT 체결) / H0UNCNT0(통합 체결) / H0IFCNT0(지수선물 체결) 데이터를
+종목별 1초/1분/5분 등 시간 봉과 N틱 봉으로 합친다. 봉마다 VWAP 과 매수/매도 체결량(순매수 체결량)을 함께 계산한다.
+
+- 종목/주기별로 고정 크기 링 버퍼(numpy)를 미리 할당하고, 만들고 있는 봉은 리스트 1개로 갱신하므로 체결 1건 처리 비용은 일정
+- 봉이 완성되면 add_listener() 로 등록한 콜백 호출 (다음 주기의 첫 체결 수신시, 또는 flush_due() 호출시)
+- 이미 완성한 주기의 체결이 늦게 도착하면 만들고 있는 봉에 합치거나(만들고 있는 봉이 있을 때) 버리고 late 로 집계하며,
+  같은 시각의 봉을 다시 만들지 않음
+- 체결 구분 코드(1:매수, 5:매도)가 없거나 장전 체결이면 직전 체결가와 비교하여 매수/매도 판단 (tick rule)
+- 시작시 seed() / seed_from_store() 로 REST 분봉을 채워 두면 이후 체결은 마지막 봉부터 이어서 합침
+
+종목당 메모리는 대략 (주기 수) x capacity x 88 byte 이다. (기본 4개 주기, 390개 봉: 약 137KB)
+
+Example:
+    >>> agg = BarAggregator(intervals=("1s", "1m", "5m", "100t"))
+    >>> agg.add_listener(lambda symbol, interval, bar: print(symbol, interval, bar["close"]))
+    >>> agg.seed_from_backfill(BackfillManager(ka), ["005930", "000660"])     # 당일 분봉으로 시작
+    >>> kws.start(on_result=agg.on_ws_result)
+    >>> agg.bars("005930", "1m").tail()
+"""
+
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from tick_store import BAR_DATE_COLUMNS, BAR_TIME_COLUMNS, TS_COLUMN
+
+# 실시간 체결 tr_id 별 컬럼: (종목코드, 영업일자, 체결시각, 체결가, 체결량, 체결구분), 영업일자가 없으면 수신일 사용
+TRADE_SOURCES: Dict[str, Tuple[str, Optional[str], str, str, str, Optional[str]]] = {
+    "H0STCNT0": ("mksc_shrn_iscd", "bsop_date", "stck_cntg_hour", "stck_prpr", "cntg_vol", "ccld_dvsn"),
+    "H0NXCNT0": ("mksc_shrn_iscd", "bsop_date", "stck_cntg_hour", "stck_prpr", "cntg_vol", "cntg_cls_code"),
+    "H0UNCNT0": ("mksc_shrn_iscd", "bsop_date", "stck_cntg_hour", "stck_prpr", "cntg_vol", "cntg_cls_code"),
+    "H0IFCNT0": ("futs_shrn_iscd", None, "bsop_hour", "futs_prpr", "last_cnqn", None),
+}
+
+# 체결구분 코드 -> 방향 (1:매수, -1:매도), 그 외(3:장전 등)는 tick rule
+SIDE_CODES = {"1": 1, "5": -1}
+
+# REST 봉 컬럼 후보 (국내 분봉/일봉, 해외 분봉)
+SEED_COLUMNS = {
+    "open": ("stck_oprc", "open"),
+    "high": ("stck_hgpr", "high"),
+    "low": ("stck_lwpr", "low"),
+    "close": ("stck_prpr", "stck_clpr", "last", "close"),
+    "volume": ("cntg_vol", "acml_vol", "evol", "volume"),
+}
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "turnover", "buy_volume", "sell_volume", "ticks")
+_O, _H, _L, _C, _V, _TV, _BV, _SV, _N = range(len(BAR_COLUMNS))
+
+INTERVAL_UNITS = {"s": 1_000_000_000, "m": 60_000_000_000, "h": 3_600_000_000_000}
+TICK_UNIT = "t"
+DAY_NS = 86_400_000_000_000
+
+Listener = Callable[[str, str, Dict[str, Any]], None]
+
+
+def parse_interval(interval: str) -> Tuple[int, int]:
+    """봉 주기 문자열을 (시간 폭 ns, 틱 수) 로 변환 ("1s", "1m", "5m", "1h" -> 시간 봉, "100t" -> 100틱 봉)"""
+    unit, count = interval[-1:], interval[:-1]
+    if not count.isdigit() or int(count) <= 0 or (unit not in INTERVAL_UNITS and unit != TICK_UNIT):
+        raise ValueError(f"지원하지 않는 봉 주기입니다: {interval}")
+    if unit == TICK_UNIT:
+        return 0, int(count)
+    return int(count) * INTERVAL_UNITS[unit], 0
+
+
+def _column(result: Any, name: str) -> Optional[list]:
+    # KISWebSocket mode 별 on_result 데이터 (DataFrame / 컬럼 dict / namedtuple 목록) 에서 컬럼 1개를 대소문자 구분 없이 추출
+    if isinstance(result, pd.DataFrame):
+        for column in (name, name.upper()):
+            if column in result.columns:
+                return result[column].tolist()
+        return None
+    if isinstance(result, dict):
+        for column in (name, name.upper()):
+            if column in result:
+                values = result[column]
+                return list(values) if isinstance(values, (list, tuple, pd.Series, np.ndarray)) else [values]
+        return None
+    rows = list(result)
+    if not rows:
+        return []
+    first = rows[0]._asdict() if hasattr(rows[0], "_asdict") else rows[0]
+    column = name if name in first else name.upper() if name.upper() in first else None
+    if column is None:
+        return None
+    return [getattr(row, column) if hasattr(row, "_asdict") else row[column] for row in rows]
+
+
+class _Series:
+    """종목 1개, 주기 1개의 완성 봉 링 버퍼와 만들고 있는 봉"""
+
+    __slots__ = ("interval", "width", "ticks", "capacity", "ts", "values", "head", "count", "key", "closed_key",
+                 "bar_ts", "bar")
+
+    def __init__(self, interval: str, capacity: int):
+        self.interval = interval
+        self.width, self.ticks = parse_interval(interval)
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self.head = 0  # 다음 봉을 기록할 위치
+        self.count = 0
+        self.key = -1  # 시간 봉: 만들고 있는 봉의 시각 // width
+        self.closed_key = -1  # 시간 봉: 마지막으로 완성한 봉의 key
+        self.bar_ts = 0  # 만들고 있는 봉의 시작 시각 (틱 봉: 첫 체결 시각)
+        self.bar: Optional[List[float]] = None
+
+    def push(self, ts: int, bar: List[float]):
+        i = self.head
+        self.ts[i] = ts
+        self.values[i] = bar
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def order(self, count: Optional[int] = None) -> np.ndarray:
+        # 오래된 봉부터의 링 버퍼 위치
+        n = self.count if count is None else min(count, self.count)
+        return (self.head - n + np.arange(n)) % self.capacity
+
+
+class _Symbol:
+    __slots__ = ("series", "last_price", "last_side", "day", "session_pv", "session_volume", "trades")
+
+    def __init__(self, series: List[_Series]):
+        self.series = series
+        self.last_price = 0.0
+        self.last_side = 0
+        self.day = -1
+        self.session_pv = 0.0
+        self.session_volume = 0.0
+        self.trades = 0
+
+
+class BarAggregator:
+    """종목별 시간 봉 / 틱 봉 실시간 생성기
+
+    Args:
+        intervals: 생성할 봉 주기 ("1s", "1m", "5m", "1h" 등 시간 봉, "100t" 등 틱 봉)
+        capacity: 주기별로 보관할 완성 봉 개수 (int 또는 {주기: 개수}), 넘으면 오래된 봉부터 덮어씀
+        max_symbols: 최대 종목 수, 넘는 종목의 체결은 버림
+        grace: flush_due() 가 주기 종료 후 이 시간(초)이 더 지난 봉만 완성 처리 (체결 시각은 거래소 기준, flush_due 는
+            로컬 시계 기준이므로 시계 차이와 전송 지연만큼 여유를 둠)
+    """
+
+    def __init__(self, intervals: Iterable[str] = ("1s", "1m", "5m", "100t"),
+                 capacity: Union[int, Dict[str, int]] = 390, max_symbols: int = 1000, grace: float = 2.0):
+        self.intervals = list(dict.fromkeys(intervals))
+        for interval in self.intervals:
+            parse_interval(interval)
+        self.capacity = {interval: max(1, capacity.get(interval, 390) if isinstance(capacity, dict) else capacity)
+                         for interval in self.intervals}
+        self.max_symbols = max_symbols
+        self.grace_ns = int(grace * 1_000_000_000)
+        self._symbols: Dict[str, _Symbol] = {}
+        self._listeners: List[Listener] = []
+        self._lock = threading.RLock()
+        self._day_base: Dict[str, int] = {}
+        self._stats = {"trades": 0, "bars": 0, "late": 0, "dropped": 0, "listener_errors": 0}
+
+    # ========== 이벤트 ==========
+
+    def add_listener(self, callback: Listener):
+        """봉 완성시 callback(종목코드, 주기, 봉 dict) 호출"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Listener):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, symbol: str, series: _Series, ts: int, bar: List[float]):
+        self._stats["bars"] += 1
+        if not self._listeners:
+            return
+        event = self._bar_dict(ts, bar)
+        for callback in self._listeners:
+            try:
+                callback(symbol, series.interval, event)
+            except Exception as e:
+                self._stats["listener_errors"] += 1
+                logging.error(f"bar aggregator listener error {symbol} {series.interval}: {e}")
+
+    @staticmethod
+    def _bar_dict(ts: int, bar: List[float]) -> Dict[str, Any]:
+        event = dict(zip(BAR_COLUMNS, bar))
+        event["ts"] = pd.Timestamp(ts)
+        event["vwap"] = bar[_TV] / bar[_V] if bar[_V] else bar[_C]
+        event["signed_volume"] = bar[_BV] - bar[_SV]
+        return event
+
+    # ========== 입력 ==========
+
+    def on_ws_result(self, ws, tr_id: str, result: Any, data_map: dict):
+        """KISWebSocket.start(on_result=...) 에 그대로 사용할 수 있는 콜백"""
+        self.append_frame(tr_id, result)
+
+    def append_frame(self, tr_id: str, result: Any) -> int:
+        """실시간 체결 데이터 반영 (TRADE_SOURCES 에 없는 tr_id 는 무시), 반영 건수 반환"""
+        source = TRADE_SOURCES.get(tr_id)
+        if source is None or result is None or len(result) == 0:
+            return 0
+        symbol_column, date_column, time_column, price_column, volume_column, side_column = source
+        symbols = _column(result, symbol_column)
+        hours = _column(result, time_column)
+        prices = _column(result, price_column)
+        volumes = _column(result, volume_column)
+        if symbols is None or hours is None or prices is None or volumes is None:
+            logging.warning(f"bar aggregator: {tr_id} 데이터에 체결 컬럼이 없습니다.")
+            self._stats["dropped"] += len(result)
+            return 0
+        dates = _column(result, date_column) if date_column else None
+        sides = _column(result, side_column) if side_column else None
+        today = datetime.now().strftime("%Y%m%d")
+
+        added = 0
+        with self._lock:
+            for i in range(len(symbols)):
+                try:
+                    hour = str(hours[i]).strip().zfill(6)
+                    day = str(dates[i]).strip() if dates is not None else ""
+                    ts = self._day_ns(day if len(day) == 8 else today) \
+                        + (int(hour[:2]) * 3600 + int(hour[2:4]) * 60 + int(hour[4:6])) * 1_000_000_000
+                    price = float(prices[i])
+                    volume = float(volumes[i])
+                except (TypeError, ValueError):
+                    self._stats["dropped"] += 1
+                    continue
+                side = SIDE_CODES.get(str(sides[i]).strip(), 0) if sides is not None else 0
+                added += self.on_trade(str(symbols[i]).strip(), ts, price, volume, side)
+        return added
+
+    def _day_ns(self, day: str) -> int:
+        base = self._day_base.get(day)
+        if base is None:
+            base = self._day_base[day] = pd.Timestamp(day).value
+        return base
+
+    def _state(self, symbol: str) -> Optional[_Symbol]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            if len(self._symbols) >= self.max_symbols:
+                return None
+            state = self._symbols[symbol] = _Symbol(
+                [_Series(interval, self.capacity[interval]) for interval in self.intervals])
+        return state
+
+    def on_trade(self, symbol: str, ts: Any, price: float, volume: float, side: int = 0) -> int:
+        """체결 1건 반영 (ts: epoch ns 또는 시각, side: 1 매수 / -1 매도 / 0 tick rule), 반영 건수(0/1) 반환"""
+        if not isinstance(ts, (int, np.integer)):
+            ts = pd.Timestamp(ts).value
+        if price <= 0 or volume < 0:
+            self._stats["dropped"] += 1
+            return 0
+        with self._lock:
+            state = self._state(symbol)
+            if state is None:
+                self._stats["dropped"] += 1
+                return 0
+
+            if side == 0:
+                side = 1 if price > state.last_price else -1 if price < state.last_price else state.last_side
+            state.last_price = price
+            state.last_side = side
+            state.trades += 1
+            day = ts // DAY_NS
+            if day != state.day:
+                state.day, state.session_pv, state.session_volume = day, 0.0, 0.0
+            state.session_pv += price * volume
+            state.session_volume += volume
+            buy = volume if side > 0 else 0.0
+            sell = volume if side < 0 else 0.0
+
+            for series in state.series:
+                bar = series.bar
+                if series.ticks:
+                    if bar is None:
+                        series.bar_ts = ts
+                else:
+                    key = ts // series.width
+                    if bar is not None and key != series.key:
+                        if key < series.key:
+                            # 이전 주기의 늦게 도착한 체결은 만들고 있는 봉에 합침
+                            self._stats["late"] += 1
+                        else:
+                            self._close(symbol, series)
+                            bar = None
+                    if bar is None and key <= series.closed_key:
+                        # 이미 완성한 주기의 체결은 같은 시각의 봉을 다시 만들지 않고 버림
+                        self._stats["late"] += 1
+                        continue
+                    if bar is None:
+                        series.key = key
+                        series.bar_ts = key * series.width
+                if bar is None:
+                    series.bar = bar = [price, price, price, price, volume, price * volume, buy, sell, 1.0]
+                else:
+                    if price > bar[_H]:
+                        bar[_H] = price
+                    elif price < bar[_L]:
+                        bar[_L] = price
+                    bar[_C] = price
+                    bar[_V] += volume
+                    bar[_TV] += price * volume
+                    bar[_BV] += buy
+                    bar[_SV] += sell
+                    bar[_N] += 1.0
+                if series.ticks and bar[_N] >= series.ticks:
+                    self._close(symbol, series)
+            self._stats["trades"] += 1
+        return 1
+
+    def _close(self, symbol: str, series: _Series):
+        # 만들고 있는 봉을 링 버퍼에 기록하고 콜백 호출
+        bar, series.bar = series.bar, None
+        series.push(series.bar_ts, bar)
+        if not series.ticks:
+            series.closed_key = series.key
+        self._emit(symbol, series, series.bar_ts, bar)
+
+    def flush_due(self, now: Any = None) -> int:
+        """주기가 끝나고 grace 초가 지났는데 다음 체결이 없어 열려 있는 시간 봉을 완성 처리 (타이머에서 1초 간격 호출),
+        완성한 봉 개수 반환"""
+        now_ns = pd.Timestamp(now).value if now is not None else pd.Timestamp(datetime.now()).value
+        closed = 0
+        with self._lock:
+            for symbol, state in self._symbols.items():
+                for series in state.series:
+                    if series.ticks or series.bar is None or (series.key + 1) * series.width + self.grace_ns > now_ns:
+                        continue
+                    self._close(symbol, series)
+                    closed += 1
+        return closed
+
+    # ========== 초기 데이터 ==========
+
+    def seed(self, symbol: str, bars: pd.DataFrame, interval: str = "1m") -> int:
+        """REST 차트 조회 결과(또는 TickStore.read_bars 결과) 로 시간 봉 채우기, 채운 봉 개수 반환
+
+        interval 과 같거나 배수인 시간 봉 주기를 합쳐서 채우고, 가장 최근 봉은 만들고 있는 봉으로 두어 이후 체결을 이어서 합친다.
+        이미 데이터가 있는 주기는 건너뛴다. REST 봉에는 봉별 거래대금과 매수/매도 구분이 없어 VWAP 은 종가 x 거래량으로 근사한다.
+        """
+        width, ticks = parse_interval(interval)
+        if ticks:
+            raise ValueError("틱 봉은 REST 데이터로 채울 수 없습니다.")
+        if bars is None or bars.empty:
+            return 0
+        df = bars.rename(columns=lambda c: str(c).lower())
+        if TS_COLUMN in df.columns:
+            ts = pd.to_datetime(df[TS_COLUMN], errors="coerce")
+        else:
+            date_column = next((c for c in BAR_DATE_COLUMNS if c in df.columns), None)
+            if date_column is None:
+                raise KeyError(f"차트 데이터에 일자 컬럼이 없습니다: {BAR_DATE_COLUMNS}")
+            time_column = next((c for c in BAR_TIME_COLUMNS if c in df.columns), None)
+            text = df[date_column].astype(str).str.strip().str[:8]
+            if time_column is not None:
+                text = text + df[time_column].astype(str).str.strip().str.zfill(6).str[:6]
+            ts = pd.to_datetime(text, format="%Y%m%d%H%M%S" if time_column else "%Y%m%d", errors="coerce")
+
+        values = {}
+        for name, candidates in SEED_COLUMNS.items():
+            column = next((c for c in candidates if c in df.columns), None)
+            if column is None:
+                raise KeyError(f"차트 데이터에 {name} 컬럼이 없습니다: {candidates}")
+            values[name] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+        frame = pd.DataFrame(values)
+        frame[TS_COLUMN] = ts.astype("datetime64[ns]").to_numpy().astype(np.int64)
+        frame = frame[ts.notna().to_numpy() & (frame["close"] > 0).to_numpy()]
+        if frame.empty:
+            return 0
+        # 같은 시각의 봉은 마지막 값 사용
+        frame = frame.sort_values(TS_COLUMN, kind="stable").drop_duplicates(TS_COLUMN, keep="last")
+        frame["turnover"] = frame["close"] * frame["volume"]
+
+        seeded = 0
+        with self._lock:
+            state = self._state(symbol)
+            if state is None:
+                return 0
+            for series in state.series:
+                if series.ticks or series.width < width or series.width % width or series.count or series.bar is not None:
+                    continue
+                grouped = frame.groupby(frame[TS_COLUMN] // series.width, sort=True).agg(
+                    open=("open", "first"), high=("high", "max"), low=("low", "min"), close=("close", "last"),
+                    volume=("volume", "sum"), turnover=("turnover", "sum"), ticks=("close", "size"))
+                rows = grouped.tail(series.capacity + 1)
+                for key, row in zip(rows.index, rows.itertuples(index=False)):
+                    bar = [row.open, row.high, row.low, row.close, row.volume, row.turnover, 0.0, 0.0, float(row.ticks)]
+                    if series.bar is not None:
+                        series.push(series.bar_ts, series.bar)
+                        series.closed_key = series.key
+                    series.key, series.bar_ts, series.bar = int(key), int(key) * series.width, bar
+                seeded += len(rows)
+
+            last = frame.iloc[-1]
+            state.last_price = float(last["close"])
+            day = int(last[TS_COLUMN]) // DAY_NS
+            session = frame[frame[TS_COLUMN] // DAY_NS == day]
+            if day != state.day:
+                state.day = day
+                state.session_pv = float(session["turnover"].sum())
+                state.session_volume = float(session["volume"].sum())
+        return seeded
+
+    def seed_from_store(self, store, symbols: Iterable[str], interval: str = "1m", start: Any = None) -> Dict[str, int]:
+        """TickStore 에 저장된 REST 봉으로 채우기 (start 생략시 당일), 종목별 채운 봉 개수 반환"""
+        start = start if start is not None else pd.Timestamp(datetime.now().date())
+        return {symbol: self.seed(symbol, store.read_bars(symbol, interval, start=start), interval) for symbol in symbols}
+
+    def seed_from_backfill(self, manager, symbols: Iterable[str], start: Any = None) -> Dict[str, int]:
+        """BackfillManager 로 당일(또는 start 이후) 분봉을 받아 저장한 후 채우기"""
+        symbols = list(symbols)
+        start = pd.Timestamp(start if start is not None else datetime.now().date())
+        manager.run(symbols, timeframe="1m", start=start.strftime("%Y%m%d"))
+        return self.seed_from_store(manager.store, symbols, "1m", start)
+
+    # ========== 조회 ==========
+
+    def _series(self, symbol: str, interval: str) -> Optional[_Series]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            return None
+        if interval not in self.capacity:
+            raise KeyError(f"생성하지 않는 봉 주기입니다: {interval}")
+        return state.series[self.intervals.index(interval)]
+
+    def bars(self, symbol: str, interval: str = "1m", count: Optional[int] = None,
+             include_open: bool = False) -> pd.DataFrame:
+        """완성 봉 (include_open=True 면 만들고 있는 봉 포함) 을 시각 순서의 DataFrame 으로 반환"""
+        columns = [TS_COLUMN, *BAR_COLUMNS, "vwap", "signed_volume"]
+        with self._lock:
+            series = self._series(symbol, interval)
+            if series is None:
+                return pd.DataFrame(columns=columns)
+            order = series.order(count)
+            ts = series.ts[order]
+            values = series.values[order]
+            if include_open and series.bar is not None:
+                ts = np.append(ts, series.bar_ts)
+                values = np.vstack([values, series.bar])
+                if count is not None and len(ts) > count:
+                    ts, values = ts[-count:], values[-count:]
+        df = pd.DataFrame(values, columns=BAR_COLUMNS)
+        df.insert(0, TS_COLUMN, pd.to_datetime(ts).astype("datetime64[ns]"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["vwap"] = np.where(df["volume"] > 0, df["turnover"] / df["volume"], df["close"])
+        df["signed_volume"] = df["buy_volume"] - df["sell_volume"]
+        return df
+
+    def last_bar(self, symbol: str, interval: str = "1m") -> Optional[Dict[str, Any]]:
+        """만들고 있는 봉 (없으면 None)"""
+        with self._lock:
+            series = self._series(symbol, interval)
+            if series is None or series.bar is None:
+                return None
+            return self._bar_dict(series.bar_ts, list(series.bar))
+
+    def session_vwap(self, symbol: str) -> Optional[float]:
+        """당일 누적 VWAP"""
+        state = self._symbols.get(symbol)
+        if state is None or not state.session_volume:
+            return None
+        return state.session_pv / state.session_volume
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        state = self._symbols.get(symbol)
+        return state.last_price if state is not None and state.last_price else None
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def reset(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._symbols.clear()
+            else:
+                self._symbols.pop(symbol, None)
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["symbols"] = len(self._symbols)
+        stats["memory_bytes"] = sum(series.ts.nbytes + series.values.nbytes
+                                    for state in self._symbols.values() for series in state.series)
+        return stats
@@ -0,0 +1,167 @@
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import pandas as pd
+
+# [국내주식] 시세분석 > 관심종목(멀티종목) 시세조회 [국내주식-205], 1회 호출에 최대 30종목
+API_MULTI_PRICE = "/uapi/domestic-stock/v1/quotations/intstock-multprice"
+TR_MULTI_PRICE = "FHKST11300006"
+MAX_SHARD_SIZE = 30
+
+# 문자열로 유지할 컬럼, 나머지 응답 컬럼은 숫자형으로 변환
+STR_COLUMNS = {
+    "kospi_kosdaq_cls_name",
+    "mrkt_trtm_cls_name",
+    "hour_cls_code",
+    "inter_shrn_iscd",
+    "inter_kor_isnm",
+    "prdy_vrss_sign",
+    "intr_antc_cntg_vrss_sign",
+}
+
+Symbol = Union[str, Tuple[str, str]]
+
+
+class BatchQuoteEngine:
+    """관심종목(멀티종목) 시세조회로 여러 종목의 현재가를 한번에 조회
+
+    관심종목 목록을 30종목 단위로 나누어 동시에 요청하고, 한 시점의 결과를 종목코드 index 의 DataFrame 하나로 반환한다.
+    같은 종목을 여러 시장(J/NX/UN)으로 요청하면 시장별로 한 행씩 반환되며 mrkt 컬럼으로 구분한다.
+    호출 간격은 kis_auth 의 호출 속도 제한기가 조절하므로 여러 묶음을 동시에 보내도 초당 호출 건수를 넘지 않는다.
+
+    Example:
+        >>> engine = BatchQuoteEngine(ka)
+        >>> snap = engine.snapshot(["005930", "000660", ("NX", "035420")])
+        >>> snap.loc["005930", "inter2_prpr"]
+    """
+
+    def __init__(self, ka_module, market: str = "J", shard_size: int = MAX_SHARD_SIZE, max_workers: int = 4):
+        if not 1 <= shard_size <= MAX_SHARD_SIZE:
+            raise ValueError(f"shard_size must be between 1 and {MAX_SHARD_SIZE}")
+        self.ka = ka_module
+        self.market = market
+        self.shard_size = shard_size
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"snapshots": 0, "requests": 0, "failed_requests": 0, "symbols": 0, "missing_symbols": 0}
+
+    def _normalize(self, symbols: Iterable[Symbol]) -> List[Tuple[str, str]]:
+        # (시장구분, 종목코드) 로 변환, 같은 시장의 중복 종목은 처음 위치만 유지 (시장이 다르면 별도 종목)
+        seen = set()
+        items: List[Tuple[str, str]] = []
+        for s in symbols:
+            mrkt, code = (self.market, s) if isinstance(s, str) else s
+            code = code.strip()
+            if code and (mrkt, code) not in seen:
+                seen.add((mrkt, code))
+                items.append((mrkt, code))
+        return items
+
+    def shards(self, symbols: Iterable[Symbol]) -> List[List[Tuple[str, str]]]:
+        items = self._normalize(symbols)
+        return [items[i:i + self.shard_size] for i in range(0, len(items), self.shard_size)]
+
+    @staticmethod
+    def _params(shard: List[Tuple[str, str]]) -> Dict[str, str]:
+        params: Dict[str, str] = {}
+        for i, (mrkt, code) in enumerate(shard, start=1):
+            params[f"FID_COND_MRKT_DIV_CODE_{i}"] = mrkt
+            params[f"FID_INPUT_ISCD_{i}"] = code
+        return params
+
+    # 실패한 묶음은 None 반환
+    def _rows(self, res, shard: List[Tuple[str, str]]) -> Optional[List[dict]]:
+        if not res.isOK():
+            logging.warning(f"multi price failed for {len(shard)} symbols: {res.getErrorCode()} {res.getErrorMessage()}")
+            return None
+        output = res.getBody().output
+        if isinstance(output, dict):
+            output = [output]
+        return self._tag(list(output or []), shard)
+
+    @staticmethod
+    def _tag(rows: List[dict], shard: List[Tuple[str, str]]) -> List[dict]:
+        # 응답 행에는 시장구분이 없으므로 요청 순서대로 같은 종목코드의 시장구분을 붙인다
+        markets: Dict[str, List[str]] = {}
+        for mrkt, code in shard:
+            markets.setdefault(code, []).append(mrkt)
+        tagged = []
+        for row in rows:
+            pending = markets.get(row.get("inter_shrn_iscd", ""))
+            if pending:
+                tagged.append({**row, "mrkt": pending.pop(0)})
+        return tagged
+
+    def _fetch_shard(self, shard: List[Tuple[str, str]]) -> Optional[List[dict]]:
+        try:
+            res = self.ka._url_fetch(API_MULTI_PRICE, TR_MULTI_PRICE, "", self._params(shard))
+        except Exception as e:
+            logging.error(f"multi price error for {len(shard)} symbols: {e}")
+            return None
+        return self._rows(res, shard)
+
+    async def _fetch_shard_async(self, shard: List[Tuple[str, str]]) -> Optional[List[dict]]:
+        try:
+            res = await self.ka.async_url_fetch(API_MULTI_PRICE, TR_MULTI_PRICE, "", self._params(shard))
+        except Exception as e:
+            logging.error(f"multi price error for {len(shard)} symbols: {e}")
+            return None
+        return self._rows(res, shard)
+
+    def _to_frame(self, results: List[Optional[List[dict]]], items: List[Tuple[str, str]], ts: float) -> pd.DataFrame:
+        # 응답은 모두 문자열이므로 컬럼 단위로 한번에 숫자형 변환, 조회되지 않은 종목은 NaN 행으로 유지
+        rows = [row for rows in results if rows for row in rows]
+        df = pd.DataFrame.from_records(rows)
+        if df.empty:
+            df = pd.DataFrame(columns=["mrkt", "inter_shrn_iscd", "inter2_prpr"])
+        df = df.drop_duplicates(subset=["mrkt", "inter_shrn_iscd"], keep="last").set_index(["mrkt", "inter_shrn_iscd"])
+        for col in df.columns:
+            if col not in STR_COLUMNS:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        # (시장구분, 종목코드) 로 요청 순서에 맞춘 뒤 종목코드 index + mrkt 컬럼으로 반환
+        df = df.reindex(pd.MultiIndex.from_tuples(items, names=["mrkt", "code"]) if items else
+                        pd.MultiIndex.from_arrays([[], []], names=["mrkt", "code"]))
+        df = df.reset_index(level="mrkt")
+        df.insert(0, "ts", pd.Timestamp(ts, unit="s"))
+
+        self._stats["snapshots"] += 1
+        self._stats["requests"] += len(results)
+        self._stats["failed_requests"] += sum(1 for rows in results if rows is None)
+        self._stats["symbols"] += len(items)
+        self._stats["missing_symbols"] += int(df["inter2_prpr"].isna().sum())
+        return df
+
+    def snapshot(self, symbols: Iterable[Symbol]) -> pd.DataFrame:
+        """관심종목 전체의 현재가 조회, 종목코드 index 의 DataFrame 반환 (요청 순서 유지)"""
+        shards = self.shards(symbols)
+        items = [item for shard in shards for item in shard]
+        ts = time.time()
+        if not shards:
+            return self._to_frame([], items, ts)
+
+        if len(shards) == 1 or self.max_workers <= 1:
+            results = [self._fetch_shard(shard) for shard in shards]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch_quote")
+            results = list(self._executor.map(self._fetch_shard, shards))
+
+        return self._to_frame(results, items, ts)
+
+    async def snapshot_async(self, symbols: Iterable[Symbol]) -> pd.DataFrame:
+        """snapshot() 의 asyncio 버전, kis_auth.async_url_fetch 사용"""
+        shards = self.shards(symbols)
+        items = [item for shard in shards for item in shard]
+        ts = time.time()
+        results = await asyncio.gather(*[self._fetch_shard_async(shard) for shard in shards])
+        return self._to_frame(results, items, ts)
+
+    def get_stats(self) -> dict:
+        return dict(self._stats)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,601 @@
+"""차트 봉 데이터 기술적 지표 (numpy 벡터 연산)
+
+inquire_daily_itemchartprice / inquire_time_itemchartprice (국내주식), inquire_daily_fuopchartprice (선물옵션),
+해외주식 분봉/기간별 조회 결과와 TickStore.read_bars() / BarAggregator.bars() 결과를 공통 OHLCV 로 맞춘 후
+여러 종목을 (종목 x 시간) 2차원 배열(panel) 로 한번에 계산한다.
+
+- 지표: 이동평균(sma), 지수이동평균(ema), RSI, MACD, 볼린저밴드, ATR, OBV, 이격도, VWAP
+- 1차원(종목 1개) 입력은 1차원으로 반환
+- 값이 없는 봉(NaN, 거래정지/체결 없는 분 등)은 건너뛰고 직전 유효 봉들로 계산하며 해당 위치 결과는 NaN
+- EMA 계열은 첫 값에서 시작하여 기간 수만큼 쌓인 후부터 값 반환 (pandas ewm(adjust=False, min_periods=n) 과 같음),
+  RSI/ATR 은 Wilder 평활 (alpha = 1/n), 볼린저밴드 표준편차는 모표준편차
+- 실시간 봉은 *State 클래스의 update() 로 봉 1개씩 O(1) 갱신 (일괄 계산과 같은 값)
+
+Example:
+    >>> panel = build_panel({"005930": daily_005930, "000660": daily_000660})   # 기간별시세 output2
+    >>> values = compute_panel(panel)
+    >>> values["rsi"][panel.symbols.index("005930"), -1]
+    >>> df = add_indicators(daily_005930)                                        # 종목 1개 DataFrame 에 지표 컬럼 추가
+    >>> stream = IndicatorStream()
+    >>> aggregator.add_listener(stream.on_bar)                                   # BarAggregator 봉 완성시 갱신
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from tick_store import BAR_DATE_COLUMNS, BAR_TIME_COLUMNS, TS_COLUMN
+
+# 조회 결과별 OHLCV 컬럼 후보 (국내주식 일/분봉, 선물옵션, 해외주식 일/분봉, 해외지수, 저장소/실시간 봉)
+OHLCV_COLUMNS = {
+    "open": ("stck_oprc", "futs_oprc", "ovrs_nmix_oprc", "open"),
+    "high": ("stck_hgpr", "futs_hgpr", "ovrs_nmix_hgpr", "high"),
+    "low": ("stck_lwpr", "futs_lwpr", "ovrs_nmix_lwpr", "low"),
+    "close": ("stck_clpr", "stck_prpr", "futs_prpr", "ovrs_nmix_prpr", "clos", "last", "close"),
+    "volume": ("cntg_vol", "evol", "acml_vol", "tvol", "volume"),
+}
+
+Array = Union[np.ndarray, pd.Series, pd.DataFrame, List[float]]
+
+
+# ========== 데이터 준비 ==========
+
+def to_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """조회 결과를 시각 오름차순 OHLCV DataFrame (index: 시각) 으로 변환, 같은 시각은 마지막 값 사용"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=list(OHLCV_COLUMNS), index=pd.DatetimeIndex([], name=TS_COLUMN), dtype=np.float64)
+    df = df.rename(columns=lambda c: str(c).lower())
+    if TS_COLUMN in df.columns:
+        ts = pd.to_datetime(df[TS_COLUMN], errors="coerce")
+    else:
+        date_column = next((c for c in BAR_DATE_COLUMNS if c in df.columns), None)
+        if date_column is None:
+            raise KeyError(f"차트 데이터에 일자 컬럼이 없습니다: {BAR_DATE_COLUMNS}")
+        time_column = next((c for c in BAR_TIME_COLUMNS if c in df.columns), None)
+        text = df[date_column].astype(str).str.strip().str[:8]
+        if time_column is not None:
+            text = text + df[time_column].astype(str).str.strip().str.zfill(6).str[:6]
+        ts = pd.to_datetime(text, format="%Y%m%d%H%M%S" if time_column else "%Y%m%d", errors="coerce")
+
+    out = {}
+    for name, candidates in OHLCV_COLUMNS.items():
+        column = next((c for c in candidates if c in df.columns), None)
+        if column is None and name != "close":
+            out[name] = np.full(len(df), np.nan)
+            continue
+        if column is None:
+            raise KeyError(f"차트 데이터에 종가 컬럼이 없습니다: {candidates}")
+        out[name] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    bars = pd.DataFrame(out, index=pd.DatetimeIndex(ts.astype("datetime64[ns]"), name=TS_COLUMN))
+    bars = bars[bars.index.notna()]
+    bars = bars[~bars.index.duplicated(keep="last")]
+    return bars.sort_index(kind="stable")
+
+
+class Panel(NamedTuple):
+    """여러 종목 봉을 시각 합집합으로 맞춘 (종목 x 시간) 배열, 봉이 없는 위치는 NaN"""
+    symbols: List[str]
+    index: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def build_panel(frames: Dict[str, pd.DataFrame]) -> Panel:
+    """{종목코드: 조회 결과} 를 Panel 로 변환"""
+    bars = {symbol: to_bars(df) for symbol, df in frames.items()}
+    index = pd.DatetimeIndex([], name=TS_COLUMN)
+    for df in bars.values():
+        index = index.union(df.index)
+    arrays = {name: np.full((len(bars), len(index)), np.nan) for name in OHLCV_COLUMNS}
+    for row, df in enumerate(bars.values()):
+        positions = index.get_indexer(df.index)
+        for name in OHLCV_COLUMNS:
+            arrays[name][row, positions] = df[name].to_numpy()
+    return Panel(list(bars), index, **arrays)
+
+
+def session_starts(index: pd.DatetimeIndex) -> np.ndarray:
+    """일자가 바뀌는 위치 (분봉 VWAP 초기화용)"""
+    days = index.normalize().asi8 if len(index) else np.array([], dtype=np.int64)
+    starts = np.ones(len(days), dtype=bool)
+    starts[1:] = days[1:] != days[:-1]
+    return starts
+
+
+# ========== 내부 ==========
+
+def _panel(x: Array) -> Tuple[np.ndarray, bool]:
+    values = np.asarray(x, dtype=np.float64)
+    if values.ndim > 2:
+        raise ValueError("지표 입력은 1차원(시간) 또는 2차원(종목 x 시간) 배열이어야 합니다.")
+    return np.atleast_2d(values), values.ndim == 1
+
+
+def _restore(values: np.ndarray, flat: bool) -> np.ndarray:
+    return values[0] if flat else values
+
+
+def _compact(valid: np.ndarray) -> Optional[np.ndarray]:
+    # 유효 값을 행마다 앞으로 모으는 순서 (빈 곳이 없으면 None)
+    if valid.all():
+        return None
+    return np.argsort(~valid, axis=1, kind="stable")
+
+
+def _on_valid(fn, *arrays: np.ndarray) -> Tuple[np.ndarray, ...]:
+    # 유효 봉만 앞으로 모아서 계산한 후 원래 위치로 되돌림 (NaN 위치 결과는 NaN)
+    valid = np.logical_and.reduce([~np.isnan(a) for a in arrays])
+    order = _compact(valid)
+    if order is None:
+        results = fn(*arrays)
+        return results if isinstance(results, tuple) else (results,)
+    packed = [np.where(valid, a, np.nan) for a in arrays]
+    packed = [np.take_along_axis(a, order, axis=1) for a in packed]
+    results = fn(*packed)
+    results = results if isinstance(results, tuple) else (results,)
+    restored = []
+    for result in results:
+        out = np.empty_like(result)
+        np.put_along_axis(out, order, result, axis=1)
+        out[~valid] = np.nan
+        restored.append(out)
+    return tuple(restored)
+
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    # 앞으로 모은 배열 (뒤쪽만 NaN) 의 지수평활, 첫 값에서 시작
+    out = np.full_like(x, np.nan)
+    if x.shape[1] == 0:
+        return out
+    state = x[:, 0].copy()
+    out[:, 0] = state
+    for t in range(1, x.shape[1]):
+        state += alpha * (x[:, t] - state)
+        out[:, t] = state
+    out[:, :max(0, min_periods - 1)] = np.nan
+    return out
+
+
+def _rolling(x: np.ndarray, n: int):
+    # (종목, 시간-n+1, n) 창, 시간이 n 보다 짧으면 None
+    if x.shape[1] < n:
+        return None
+    return np.lib.stride_tricks.sliding_window_view(x, n, axis=1)
+
+
+def _rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    windows = _rolling(x, n)
+    if windows is not None:
+        out[:, n - 1:] = windows.mean(axis=2)
+    return out
+
+
+def _rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    windows = _rolling(x, n)
+    if windows is not None:
+        out[:, n - 1:] = windows.std(axis=2)
+    return out
+
+
+def _diff(x: np.ndarray) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    out[:, 1:] = x[:, 1:] - x[:, :-1]
+    return out
+
+
+def _rsi_core(close: np.ndarray, n: int) -> np.ndarray:
+    change = _diff(close)[:, 1:]
+    gain = _ewm(np.clip(change, 0, None), 1.0 / n, n)
+    loss = _ewm(np.clip(-change, 0, None), 1.0 / n, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), 100.0 - 100.0 / (1.0 + gain / loss))
+    rsi[np.isnan(gain) | np.isnan(loss)] = np.nan
+    out = np.full_like(close, np.nan)
+    out[:, 1:] = rsi
+    return out
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    previous = np.full_like(close, np.nan)
+    previous[:, 1:] = close[:, :-1]
+    tr = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+    tr[:, 0] = (high - low)[:, 0]
+    return tr
+
+
+# ========== 일괄 계산 ==========
+
+def sma(close: Array, n: int = 20) -> np.ndarray:
+    """단순이동평균"""
+    x, flat = _panel(close)
+    return _restore(_on_valid(lambda v: _rolling_mean(v, n), x)[0], flat)
+
+
+def ema(close: Array, n: int = 20) -> np.ndarray:
+    """지수이동평균 (alpha = 2 / (n + 1))"""
+    x, flat = _panel(close)
+    return _restore(_on_valid(lambda v: _ewm(v, 2.0 / (n + 1), n), x)[0], flat)
+
+
+def rsi(close: Array, n: int = 14) -> np.ndarray:
+    """RSI (Wilder)"""
+    x, flat = _panel(close)
+    return _restore(_on_valid(lambda v: _rsi_core(v, n), x)[0], flat)
+
+
+def macd(close: Array, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD, 시그널, 히스토그램"""
+    x, flat = _panel(close)
+
+    def core(v):
+        line = _ewm(v, 2.0 / (fast + 1), fast) - _ewm(v, 2.0 / (slow + 1), slow)
+        # 시그널은 MACD 값이 나온 봉부터 계산
+        sig = np.full_like(line, np.nan)
+        start = max(fast, slow) - 1
+        if v.shape[1] > start:
+            sig[:, start:] = _ewm(line[:, start:], 2.0 / (signal + 1), signal)
+        return line, sig, line - sig
+
+    return tuple(_restore(r, flat) for r in _on_valid(core, x))
+
+
+def bollinger(close: Array, n: int = 20, k: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """볼린저밴드 (중심선, 상단, 하단)"""
+    x, flat = _panel(close)
+
+    def core(v):
+        mid, std = _rolling_mean(v, n), _rolling_std(v, n)
+        return mid, mid + k * std, mid - k * std
+
+    return tuple(_restore(r, flat) for r in _on_valid(core, x))
+
+
+def atr(high: Array, low: Array, close: Array, n: int = 14) -> np.ndarray:
+    """ATR (Wilder)"""
+    (h, flat), (l, _), (c, _) = _panel(high), _panel(low), _panel(close)
+    return _restore(_on_valid(lambda hh, ll, cc: _ewm(_true_range(hh, ll, cc), 1.0 / n, n), h, l, c)[0], flat)
+
+
+def obv(close: Array, volume: Array) -> np.ndarray:
+    """OBV (첫 봉 0 부터 누적)"""
+    (c, flat), (v, _) = _panel(close), _panel(volume)
+
+    def core(cc, vv):
+        signed = np.sign(np.nan_to_num(_diff(cc))) * vv
+        signed[:, 0] = 0.0
+        return np.cumsum(np.nan_to_num(signed), axis=1)
+
+    return _restore(_on_valid(core, c, v)[0], flat)
+
+
+def disparity(close: Array, n: int = 20) -> np.ndarray:
+    """이격도 (종가 / n 이동평균 x 100)"""
+    x, flat = _panel(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _restore(x / np.atleast_2d(sma(x, n)) * 100.0, flat)
+
+
+def vwap(close: Array, volume: Array, high: Optional[Array] = None, low: Optional[Array] = None,
+         reset: Optional[np.ndarray] = None) -> np.ndarray:
+    """누적 VWAP (high/low 지정시 (고가+저가+종가)/3 기준), reset 위치(True)에서 누적 초기화 (session_starts() 사용)"""
+    (c, flat), (v, _) = _panel(close), _panel(volume)
+    price = c
+    if high is not None and low is not None:
+        typical = (_panel(high)[0] + _panel(low)[0] + c) / 3.0
+        price = np.where(np.isnan(typical), c, typical)
+    valid = ~np.isnan(price) & ~np.isnan(v)
+    pv = np.cumsum(np.where(valid, price * v, 0.0), axis=1)
+    vol = np.cumsum(np.where(valid, v, 0.0), axis=1)
+    if reset is not None and len(reset):
+        # 구간 시작 직전까지의 누적값을 빼서 구간별 누적으로 변환
+        starts = np.maximum.accumulate(np.where(np.asarray(reset, dtype=bool), np.arange(len(reset)), 0))
+        before = starts - 1
+        pv = pv - np.where(before >= 0, pv[:, np.maximum(before, 0)], 0.0)
+        vol = vol - np.where(before >= 0, vol[:, np.maximum(before, 0)], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(vol > 0, pv / vol, np.nan)
+    out[~valid] = np.nan
+    return _restore(out, flat)
+
+
+def compute_panel(panel: Panel, ma: Iterable[int] = (5, 20, 60), rsi_n: int = 14, atr_n: int = 14,
+                  bollinger_n: int = 20, disparity_n: int = 20, intraday: Optional[bool] = None) -> Dict[str, np.ndarray]:
+    """Panel 전체 지표를 한번에 계산, {지표명: (종목 x 시간) 배열} 반환
+
+    intraday 생략시 시각에 시분초가 있으면 분봉으로 보고 VWAP 을 일자별로 초기화한다.
+    """
+    out: Dict[str, np.ndarray] = {}
+    for n in ma:
+        out[f"sma_{n}"] = sma(panel.close, n)
+        out[f"ema_{n}"] = ema(panel.close, n)
+    out["rsi"] = rsi(panel.close, rsi_n)
+    out["macd"], out["macd_signal"], out["macd_hist"] = macd(panel.close)
+    out["bb_mid"], out["bb_upper"], out["bb_lower"] = bollinger(panel.close, bollinger_n)
+    out["atr"] = atr(panel.high, panel.low, panel.close, atr_n)
+    out["obv"] = obv(panel.close, panel.volume)
+    out["disparity"] = disparity(panel.close, disparity_n)
+    if intraday is None:
+        intraday = bool(len(panel.index)) and bool((panel.index != panel.index.normalize()).any())
+    out["vwap"] = vwap(panel.close, panel.volume, panel.high, panel.low,
+                       reset=session_starts(panel.index) if intraday else None)
+    return out
+
+
+def add_indicators(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """종목 1개 조회 결과를 OHLCV 로 변환하고 compute_panel() 지표 컬럼 추가"""
+    bars = to_bars(df)
+    panel = build_panel({"": bars.reset_index()})
+    for name, values in compute_panel(panel, **kwargs).items():
+        bars[name] = values[0]
+    return bars
+
+
+# ========== 실시간 갱신 (봉 1개씩 O(1)) ==========
+
+def _state_input(x: Any, width: int) -> np.ndarray:
+    values = np.asarray(x, dtype=np.float64)
+    return np.broadcast_to(values, (width,)) if values.ndim == 0 else values
+
+
+def _state_output(values: np.ndarray, scalar: bool) -> Union[float, np.ndarray]:
+    return float(values[0]) if scalar else values
+
+
+class EMAState:
+    """지수이동평균 (alpha 생략시 2/(n+1)), width 는 동시에 갱신할 종목 수"""
+
+    def __init__(self, n: int = 20, alpha: Optional[float] = None, width: int = 1):
+        self.n = n
+        self.alpha = alpha if alpha is not None else 2.0 / (n + 1)
+        self.width = width
+        self.value = np.full(width, np.nan)
+        self.count = np.zeros(width, dtype=np.int64)
+
+    def update(self, x: Any) -> Union[float, np.ndarray]:
+        values = _state_input(x, self.width)
+        ok = ~np.isnan(values)
+        self.value = np.where(ok, np.where(self.count == 0, values, self.value + self.alpha * (values - self.value)),
+                              self.value)
+        self.count += ok
+        return _state_output(self.current(ok), np.ndim(x) == 0)
+
+    def current(self, ok: Optional[np.ndarray] = None) -> np.ndarray:
+        ready = self.count >= self.n
+        return np.where(ready if ok is None else ready & ok, self.value, np.nan)
+
+
+class RollingState:
+    """최근 n개 값의 평균과 모표준편차 (링 버퍼, n개마다 합계를 다시 계산하여 오차 누적 방지)"""
+
+    def __init__(self, n: int = 20, width: int = 1):
+        self.n = n
+        self.width = width
+        self.buffer = np.zeros((n, width))
+        self.pos = np.zeros(width, dtype=np.int64)
+        self.count = np.zeros(width, dtype=np.int64)
+        self.total = np.zeros(width)
+        self.squares = np.zeros(width)
+        self._columns = np.arange(width)
+
+    def update(self, x: Any) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+        values = _state_input(x, self.width)
+        ok = ~np.isnan(values)
+        rows, columns = self.pos[ok], self._columns[ok]
+        old = np.where(self.count[ok] >= self.n, self.buffer[rows, columns], 0.0)
+        new = values[ok]
+        self.buffer[rows, columns] = new
+        self.total[ok] += new - old
+        self.squares[ok] += new * new - old * old
+        self.count[ok] += 1
+        self.pos[ok] = (rows + 1) % self.n
+        wrapped = ok & (self.pos == 0)
+        if wrapped.any():
+            self.total[wrapped] = self.buffer[:, wrapped].sum(axis=0)
+            self.squares[wrapped] = (self.buffer[:, wrapped] ** 2).sum(axis=0)
+
+        ready = ok & (self.count >= self.n)
+        mean = np.where(ready, self.total / self.n, np.nan)
+        std = np.where(ready, np.sqrt(np.maximum(self.squares / self.n - mean * mean, 0.0)), np.nan)
+        scalar = np.ndim(x) == 0
+        return _state_output(mean, scalar), _state_output(std, scalar)
+
+
+class RSIState:
+    def __init__(self, n: int = 14, width: int = 1):
+        self.width = width
+        self.gain = EMAState(n, alpha=1.0 / n, width=width)
+        self.loss = EMAState(n, alpha=1.0 / n, width=width)
+        self.previous = np.full(width, np.nan)
+
+    def update(self, close: Any) -> Union[float, np.ndarray]:
+        values = _state_input(close, self.width)
+        change = values - self.previous
+        has_change = ~np.isnan(change)
+        gain = self.gain.update(np.where(has_change, np.clip(change, 0, None), np.nan))
+        loss = self.loss.update(np.where(has_change, np.clip(-change, 0, None), np.nan))
+        gain, loss = np.atleast_1d(gain), np.atleast_1d(loss)
+        self.previous = np.where(np.isnan(values), self.previous, values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), 100.0 - 100.0 / (1.0 + gain / loss))
+        out[np.isnan(gain) | np.isnan(loss)] = np.nan
+        return _state_output(out, np.ndim(close) == 0)
+
+
+class MACDState:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, width: int = 1):
+        self.width = width
+        self.fast = EMAState(fast, width=width)
+        self.slow = EMAState(slow, width=width)
+        self.signal = EMAState(signal, width=width)
+
+    def update(self, close: Any) -> Tuple[Any, Any, Any]:
+        values = _state_input(close, self.width)
+        line = np.atleast_1d(self.fast.update(values)) - np.atleast_1d(self.slow.update(values))
+        sig = np.atleast_1d(self.signal.update(line))
+        scalar = np.ndim(close) == 0
+        return _state_output(line, scalar), _state_output(sig, scalar), _state_output(line - sig, scalar)
+
+
+class BollingerState:
+    def __init__(self, n: int = 20, k: float = 2.0, width: int = 1):
+        self.k = k
+        self.rolling = RollingState(n, width)
+
+    def update(self, close: Any) -> Tuple[Any, Any, Any]:
+        mean, std = self.rolling.update(close)
+        return mean, mean + self.k * std, mean - self.k * std
+
+
+class ATRState:
+    def __init__(self, n: int = 14, width: int = 1):
+        self.width = width
+        self.average = EMAState(n, alpha=1.0 / n, width=width)
+        self.previous = np.full(width, np.nan)
+
+    def update(self, high: Any, low: Any, close: Any) -> Union[float, np.ndarray]:
+        h, l, c = (_state_input(v, self.width) for v in (high, low, close))
+        ok = ~(np.isnan(h) | np.isnan(l) | np.isnan(c))
+        tr = np.fmax(h - l, np.fmax(np.abs(h - self.previous), np.abs(l - self.previous)))
+        out = np.atleast_1d(self.average.update(np.where(ok, tr, np.nan)))
+        self.previous = np.where(ok, c, self.previous)
+        return _state_output(out, np.ndim(close) == 0)
+
+
+class OBVState:
+    def __init__(self, width: int = 1):
+        self.width = width
+        self.value = np.zeros(width)
+        self.previous = np.full(width, np.nan)
+
+    def update(self, close: Any, volume: Any) -> Union[float, np.ndarray]:
+        c, v = _state_input(close, self.width), _state_input(volume, self.width)
+        ok = ~(np.isnan(c) | np.isnan(v))
+        self.value = self.value + np.where(ok, np.sign(np.nan_to_num(c - self.previous)) * np.nan_to_num(v), 0.0)
+        self.previous = np.where(ok, c, self.previous)
+        return _state_output(np.where(ok, self.value, np.nan), np.ndim(close) == 0)
+
+
+class DisparityState:
+    def __init__(self, n: int = 20, width: int = 1):
+        self.rolling = RollingState(n, width)
+
+    def update(self, close: Any) -> Union[float, np.ndarray]:
+        mean, _ = self.rolling.update(close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(close, dtype=np.float64) / mean * 100.0 if np.ndim(close) else float(close) / mean * 100.0
+
+
+class VWAPState:
+    """누적 VWAP, reset() 으로 초기화 (new_session=True 로 update 해도 초기화)"""
+
+    def __init__(self, width: int = 1):
+        self.width = width
+        self.pv = np.zeros(width)
+        self.volume = np.zeros(width)
+
+    def reset(self):
+        self.pv[:] = 0.0
+        self.volume[:] = 0.0
+
+    def update(self, close: Any, volume: Any, high: Any = None, low: Any = None,
+               new_session: bool = False) -> Union[float, np.ndarray]:
+        if new_session:
+            self.reset()
+        c, v = _state_input(close, self.width), _state_input(volume, self.width)
+        price = c
+        if high is not None and low is not None:
+            typical = (_state_input(high, self.width) + _state_input(low, self.width) + c) / 3.0
+            price = np.where(np.isnan(typical), c, typical)
+        ok = ~(np.isnan(price) | np.isnan(v))
+        self.pv = self.pv + np.where(ok, price * v, 0.0)
+        self.volume = self.volume + np.where(ok, v, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(ok & (self.volume > 0), self.pv / self.volume, np.nan)
+        return _state_output(out, np.ndim(close) == 0)
+
+
+class IndicatorStream:
+    """종목별 compute_panel() 기본 지표를 봉 1개씩 갱신
+
+    BarAggregator.add_listener(stream.on_bar) 로 연결하면 interval 봉이 완성될 때마다 갱신한다.
+    시작시 seed() 로 REST 봉을 먼저 넣어 두면 지표가 바로 계산된다.
+    intraday 생략시 compute_panel() 과 같이 시각에 시분초가 있는 봉만 일자가 바뀔 때 VWAP 을 초기화한다.
+    """
+
+    def __init__(self, interval: str = "1m", ma: Iterable[int] = (5, 20, 60), rsi_n: int = 14, atr_n: int = 14,
+                 bollinger_n: int = 20, disparity_n: int = 20, intraday: Optional[bool] = None):
+        self.interval = interval
+        self.ma = tuple(ma)
+        self.rsi_n, self.atr_n, self.bollinger_n, self.disparity_n = rsi_n, atr_n, bollinger_n, disparity_n
+        self.intraday = intraday
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._latest: Dict[str, Dict[str, float]] = {}
+        self._day: Dict[str, Any] = {}
+
+    def _new_states(self) -> Dict[str, Any]:
+        states: Dict[str, Any] = {}
+        for n in self.ma:
+            states[f"sma_{n}"] = RollingState(n)
+            states[f"ema_{n}"] = EMAState(n)
+        states.update(rsi=RSIState(self.rsi_n), macd=MACDState(), bb=BollingerState(self.bollinger_n),
+                      atr=ATRState(self.atr_n), obv=OBVState(), disparity=DisparityState(self.disparity_n),
+                      vwap=VWAPState())
+        return states
+
+    def update(self, symbol: str, bar: Dict[str, Any]) -> Dict[str, float]:
+        """봉 1개 (open/high/low/close/volume, ts) 반영 후 지표값 반환"""
+        states = self._states.get(symbol)
+        if states is None:
+            states = self._states[symbol] = self._new_states()
+        close, volume = float(bar["close"]), float(bar.get("volume", 0.0))
+        high, low = float(bar.get("high", close)), float(bar.get("low", close))
+        ts = pd.Timestamp(bar[TS_COLUMN]) if bar.get(TS_COLUMN) is not None else None
+        new_session = False
+        if ts is not None and (self.intraday if self.intraday is not None else ts != ts.normalize()):
+            new_session = self._day.get(symbol) not in (None, ts.date())
+            self._day[symbol] = ts.date()
+
+        out: Dict[str, float] = {}
+        for n in self.ma:
+            out[f"sma_{n}"] = states[f"sma_{n}"].update(close)[0]
+            out[f"ema_{n}"] = states[f"ema_{n}"].update(close)
+        out["rsi"] = states["rsi"].update(close)
+        out["macd"], out["macd_signal"], out["macd_hist"] = states["macd"].update(close)
+        out["bb_mid"], out["bb_upper"], out["bb_lower"] = states["bb"].update(close)
+        out["atr"] = states["atr"].update(high, low, close)
+        out["obv"] = states["obv"].update(close, volume)
+        out["disparity"] = states["disparity"].update(close)
+        out["vwap"] = states["vwap"].update(close, volume, high, low, new_session=new_session)
+        self._latest[symbol] = out
+        return out
+
+    def on_bar(self, symbol: str, interval: str, bar: Dict[str, Any]):
+        """BarAggregator 리스너"""
+        if interval == self.interval:
+            self.update(symbol, bar)
+
+    def seed(self, symbol: str, bars: pd.DataFrame) -> Dict[str, float]:
+        """조회 결과 봉을 시각 순서로 반영"""
+        frame = to_bars(bars)
+        for ts, row in zip(frame.index, frame.itertuples(index=False)):
+            self.update(symbol, {TS_COLUMN: ts, "open": row.open, "high": row.high, "low": row.low,
+                                 "close": row.close, "volume": row.volume})
+        return self.latest(symbol)
+
+    def latest(self, symbol: str) -> Dict[str, float]:
+        return dict(self._latest.get(symbol, {}))
+
+    def symbols(self) -> List[str]:
+        return list(self._states)
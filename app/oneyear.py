@@ -6,6 +6,8 @@ import pandas as pd
 
 sys.path.extend(["..", "..\\examples_llm", "."])
 
+from batch_quote import BatchQuoteEngine
+
 GROUP_NAME = "Aggressive_Growth_2027"
 STOCKS: Dict[str, str] = {
     "칩스앤미디어": "094360",
@@ -72,8 +74,8 @@ def format_price(name: str, code: str, df: pd.DataFrame) -> str:
     if df.empty:
         return f"{name}({code}) price: N/A"
     r = df.iloc[0]
-    p = r.get("stck_prpr", None)
-    c = r.get("prdy_vrss", None)
+    p = r.get("stck_prpr", r.get("inter2_prpr", None))
+    c = r.get("prdy_vrss", r.get("inter2_prdy_vrss", None))
     rt = r.get("prdy_ctrt", None)
     if p is not None and rt is not None:
         return f"{name}({code}) price={p} change={c} rate={rt}%"
@@ -98,11 +100,22 @@ def main():
         logging.warning(f"auth failed: {e}")
     logging.info(f"group: {GROUP_NAME}")
     logging.info(f"watchlist: {', '.join(STOCKS.keys())}")
+    engine = BatchQuoteEngine(ka) if ka is not None else None
     try:
         while True:
+            # 현재가는 관심종목(멀티종목) 시세조회로 한번에 조회, 투자자 동향은 종목별 조회
+            snap = pd.DataFrame()
+            if engine is not None:
+                try:
+                    snap = engine.snapshot(list(STOCKS.values()))
+                except Exception as e:
+                    logging.error(f"batch quote error: {e}")
             for n, c in STOCKS.items():
                 try:
-                    p = fetch_price(ka, c)
+                    if c in snap.index and pd.notna(snap.at[c, "inter2_prpr"]):
+                        p = snap.loc[[c]]
+                    else:
+                        p = fetch_price(ka, c)
                     logging.info(format_price(n, c, p))
                     inv = fetch_investor(ka, c)
                     for line in format_investor(n, c, inv):
@@ -0,0 +1,339 @@
+"""실시간 호가 데이터로 종목별 호가창(L2) 상태 유지
+
+웹소켓 on_result 로 받은 국내주식(H0STASP0/H0NXASP0/H0UNASP0), 국내 선물옵션(H0IFASP0/H0IOASP0/H0ZFASP0/H0ZOASP0/
+H0CFASP0/H0MFASP0/H0EUASP0), 해외주식(HDFSASP0/HDFSASP1) 호가를 전 종목 공용 numpy 배열에 그대로 덮어쓰고,
+갱신할 때마다 스프레드/중간가/microprice/잔량 불균형/총잔량 변화량을 함께 계산한다.
+
+- 호가창: [종목, (매도호가, 매도잔량, 매수호가, 매수잔량), 호가 단계] float64 배열 1개를 미리 할당하여 제자리 갱신
+- snapshot() / feature_matrix() 는 복사하지 않은 읽기 전용 view 를 반환 (다음 갱신시 값이 바뀌므로 보관하려면 copy())
+- REST 호가 조회 결과(국내 inquire_asking_price_exp_ccn output1, 해외 inquire_asking_price output2) 는 update_from_rest() 로 반영
+- 호가가 없는 단계는 0, 매수/매도 최우선 호가 중 하나가 없으면 스프레드 등은 NaN
+
+Example:
+    >>> book = OrderBook()
+    >>> kws.start(on_result=book.on_ws_result)
+    >>> snap = book.snapshot("005930")
+    >>> snap.ask_price[0], snap.bid_price[0], book.feature("005930", "microprice")
+    >>> matrix, symbols = book.feature_matrix()                 # 전 종목 특성값 (종목 x FEATURES)
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class BookSpec(NamedTuple):
+    """호가 데이터 컬럼 구성 (호가/잔량 컬럼명은 {} 자리에 단계 번호)"""
+    symbol: str
+    date: Optional[str]  # 일자 컬럼이 없으면 수신일 사용
+    time: str
+    levels: int
+    ask_price: str
+    bid_price: str
+    ask_qty: str
+    bid_qty: str
+
+    def columns(self) -> List[str]:
+        return [pattern.format(level) for pattern in (self.ask_price, self.ask_qty, self.bid_price, self.bid_qty)
+                for level in range(1, self.levels + 1)]
+
+
+_DOMESTIC_STOCK = BookSpec("mksc_shrn_iscd", None, "bsop_hour", 10, "askp{}", "bidp{}", "askp_rsqn{}", "bidp_rsqn{}")
+_FUTURES = BookSpec("futs_shrn_iscd", None, "bsop_hour", 5, "futs_askp{}", "futs_bidp{}", "askp_rsqn{}", "bidp_rsqn{}")
+_OPTIONS = BookSpec("optn_shrn_iscd", None, "bsop_hour", 5, "optn_askp{}", "optn_bidp{}", "askp_rsqn{}", "bidp_rsqn{}")
+_OVERSEAS = BookSpec("symb", "kymd", "khms", 1, "pask{}", "pbid{}", "vask{}", "vbid{}")
+
+# 실시간 호가 tr_id 별 컬럼 구성
+BOOK_SOURCES: Dict[str, BookSpec] = {
+    "H0STASP0": _DOMESTIC_STOCK,    # 국내주식 실시간호가 (KRX)
+    "H0NXASP0": _DOMESTIC_STOCK,    # 국내주식 실시간호가 (NXT)
+    "H0UNASP0": _DOMESTIC_STOCK,    # 국내주식 실시간호가 (통합)
+    "H0IFASP0": _FUTURES,           # 지수선물 실시간호가
+    "H0CFASP0": _FUTURES,           # 상품선물 실시간호가
+    "H0MFASP0": _FUTURES,           # KRX야간선물 실시간호가
+    "H0IOASP0": _OPTIONS,           # 지수옵션 실시간호가
+    "H0EUASP0": _OPTIONS,           # KRX야간옵션 실시간호가
+    "H0ZFASP0": BookSpec("futs_shrn_iscd", None, "bsop_hour", 10, "askp{}", "bidp{}", "askp_rsqn{}", "bidp_rsqn{}"),
+    "H0ZOASP0": _OPTIONS._replace(levels=10),
+    "HDFSASP0": _OVERSEAS,          # 해외주식 실시간호가 (미국: 1호가)
+    "HDFSASP1": _OVERSEAS,          # 해외주식 지연호가 (아시아)
+}
+
+# REST 호가 조회 결과 컬럼 구성 (종목코드는 인자로 지정)
+REST_SOURCES: Dict[str, BookSpec] = {
+    "domestic": _DOMESTIC_STOCK,
+    "overseas": _OVERSEAS._replace(levels=10),
+}
+
+MAX_LEVELS = 10
+ASK_PRICE, ASK_QTY, BID_PRICE, BID_QTY = range(4)
+
+FEATURES = ("best_bid", "best_ask", "spread", "mid", "microprice", "imbalance_1", "imbalance",
+            "total_bid", "total_ask", "total_bid_delta", "total_ask_delta", "updates")
+_F = {name: i for i, name in enumerate(FEATURES)}
+
+Listener = Callable[[str, "BookSnapshot"], None]
+
+
+class BookSnapshot(NamedTuple):
+    """종목 1개의 호가창 읽기 전용 view (복사본 아님)"""
+    symbol: str
+    ts: pd.Timestamp
+    levels: int
+    ask_price: np.ndarray
+    ask_qty: np.ndarray
+    bid_price: np.ndarray
+    bid_qty: np.ndarray
+    features: np.ndarray  # FEATURES 순서
+
+    def feature(self, name: str) -> float:
+        return float(self.features[_F[name]])
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _column_positions(names: List[Any], columns: List[str]) -> Optional[np.ndarray]:
+    lookup = {str(c).lower(): i for i, c in enumerate(names)}
+    if any(c not in lookup for c in columns):
+        return None
+    return np.array([lookup[c] for c in columns], dtype=np.intp)
+
+
+def _numbers(block: np.ndarray) -> np.ndarray:
+    try:
+        return block.astype(np.float64)
+    except (TypeError, ValueError):
+        # 빈 문자열 등 변환할 수 없는 값은 0 (호가 없음)
+        return pd.DataFrame(block).apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+
+class OrderBook:
+    """종목별 호가창 상태와 호가 특성값을 제자리 갱신하는 엔진
+
+    Args:
+        max_symbols: 미리 할당할 종목 수, 넘는 종목의 호가는 버림
+        depth: imbalance 계산에 사용할 호가 단계 수 (imbalance_1 은 최우선 호가만)
+    """
+
+    def __init__(self, max_symbols: int = 1000, depth: int = 5):
+        self.max_symbols = max_symbols
+        self.depth = max(1, min(depth, MAX_LEVELS))
+        self._book = np.zeros((max_symbols, 4, MAX_LEVELS), dtype=np.float64)
+        self._features = np.full((max_symbols, len(FEATURES)), np.nan, dtype=np.float64)
+        self._ts = np.zeros(max_symbols, dtype=np.int64)
+        self._levels = np.zeros(max_symbols, dtype=np.int8)
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._listeners: List[Listener] = []
+        self._day_base: Dict[str, int] = {}
+        # (수신 컬럼명, 필요한 컬럼명) -> 컬럼 위치
+        self._positions: Dict[Tuple[tuple, tuple], Optional[np.ndarray]] = {}
+        self._columns: Dict[str, List[str]] = {}
+        self._stats = {"frames": 0, "updates": 0, "dropped": 0, "listener_errors": 0}
+
+    # ========== 이벤트 ==========
+
+    def add_listener(self, callback: Listener):
+        """호가 갱신시 callback(종목코드, BookSnapshot) 호출"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Listener):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ========== 입력 ==========
+
+    def on_ws_result(self, ws, tr_id: str, result: Any, data_map: dict):
+        """KISWebSocket.start(on_result=...) 에 그대로 사용할 수 있는 콜백"""
+        self.append_frame(tr_id, result)
+
+    def append_frame(self, tr_id: str, result: Any) -> int:
+        """실시간 호가 반영 (BOOK_SOURCES 에 없는 tr_id 는 무시), 반영 건수 반환"""
+        spec = BOOK_SOURCES.get(tr_id)
+        if spec is None or result is None or len(result) == 0:
+            return 0
+        head = 3 if spec.date else 2
+        columns = self._columns.get(tr_id)
+        if columns is None:
+            columns = self._columns[tr_id] = [spec.symbol, spec.time] + ([spec.date] if spec.date else []) + spec.columns()
+        block = self._to_block(result, columns)
+        if block is None:
+            logging.warning(f"order book: {tr_id} 데이터에 호가 컬럼이 없습니다.")
+            self._stats["dropped"] += len(result)
+            return 0
+        today = datetime.now().strftime("%Y%m%d")
+        symbols = [str(s).strip() for s in block[:, 0]]
+        dates = [str(d).strip() for d in block[:, 2]] if spec.date else [today] * len(symbols)
+        ts = [self._ts_of(day if len(day) == 8 else today, str(hour)) for day, hour in zip(dates, block[:, 1])]
+        self._stats["frames"] += 1
+        return self._apply(symbols, ts, _numbers(block[:, head:]), spec.levels)
+
+    def update_from_rest(self, symbol: str, output: Any, market: str = "domestic") -> int:
+        """REST 호가 조회 결과 반영 (domestic: inquire_asking_price_exp_ccn output1, overseas: inquire_asking_price output2)"""
+        spec = REST_SOURCES[market]
+        frame = output if isinstance(output, pd.DataFrame) else pd.DataFrame(output if isinstance(output, list) else [output])
+        block = self._to_block(frame.head(1), spec.columns())
+        if block is None:
+            raise KeyError(f"호가 조회 결과에 {market} 호가 컬럼이 없습니다.")
+        return self._apply([symbol], [pd.Timestamp(datetime.now()).value], _numbers(block), spec.levels)
+
+    def update(self, symbol: str, ask_price: Iterable[float], ask_qty: Iterable[float], bid_price: Iterable[float],
+               bid_qty: Iterable[float], ts: Any = None) -> int:
+        """호가 단계별 값으로 직접 갱신 (1호가부터)"""
+        rows = [np.asarray(list(values), dtype=np.float64) for values in (ask_price, ask_qty, bid_price, bid_qty)]
+        levels = min(MAX_LEVELS, min(len(row) for row in rows))
+        block = np.concatenate([row[:levels] for row in rows]).reshape(1, -1)
+        return self._apply([symbol], [pd.Timestamp(ts if ts is not None else datetime.now()).value], block, levels)
+
+    def _to_block(self, result: Any, columns: List[str]) -> Optional[np.ndarray]:
+        # KISWebSocket mode 별 on_result 데이터 (DataFrame / 컬럼 dict / namedtuple 목록) 에서 필요한 컬럼만 (행 x 컬럼) 으로 추출
+        if isinstance(result, pd.DataFrame):
+            names, values = tuple(result.columns.tolist()), result.to_numpy(dtype=object)
+        elif isinstance(result, dict):
+            names = tuple(result)
+            values = [result[c] for c in names]
+            values = np.array([list(v) if isinstance(v, (list, tuple, pd.Series, np.ndarray)) else [v] for v in values],
+                              dtype=object).T
+        else:
+            rows = [row._asdict() if hasattr(row, "_asdict") else row for row in result]
+            if not rows:
+                return None
+            names = tuple(rows[0])
+            values = np.array([list(row.values()) for row in rows], dtype=object)
+        key = (names, tuple(columns))
+        if key not in self._positions:
+            self._positions[key] = _column_positions(list(names), columns)
+        positions = self._positions[key]
+        return values[:, positions] if positions is not None else None
+
+    def _ts_of(self, day: str, hour: str) -> int:
+        base = self._day_base.get(day)
+        if base is None:
+            base = self._day_base[day] = pd.Timestamp(day).value
+        hour = hour.strip().zfill(6)
+        try:
+            return base + (int(hour[:2]) * 3600 + int(hour[2:4]) * 60 + int(hour[4:6])) * 1_000_000_000
+        except ValueError:
+            return pd.Timestamp(datetime.now()).value
+
+    def _slot(self, symbol: str) -> Optional[int]:
+        i = self._index.get(symbol)
+        if i is None:
+            if len(self._symbols) >= self.max_symbols:
+                return None
+            i = self._index[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return i
+
+    def _apply(self, symbols: List[str], ts: List[int], values: np.ndarray, levels: int) -> int:
+        # values: (행, 4 x levels) = 매도호가, 매도잔량, 매수호가, 매수잔량 순서, 실시간 호가는 대부분 1행이므로 행 단위 스칼라 계산
+        depth = min(self.depth, levels)
+        nan = float("nan")
+        applied = 0
+        for row, symbol in enumerate(symbols):
+            i = self._slot(symbol)
+            if i is None:
+                self._stats["dropped"] += 1
+                continue
+            line = values[row].tolist()
+            ask, ask_qty = line[0], line[levels]
+            bid, bid_qty = line[2 * levels], line[3 * levels]
+            ask_depth = sum(line[levels:levels + depth])
+            bid_depth = sum(line[3 * levels:3 * levels + depth])
+            total_ask = sum(line[levels:2 * levels])
+            total_bid = sum(line[3 * levels:])
+            top = bid_qty + ask_qty
+            if ask > 0 and bid > 0:
+                spread, mid = ask - bid, (ask + bid) / 2
+                microprice = (ask * bid_qty + bid * ask_qty) / top if top > 0 else mid
+            else:
+                spread = mid = microprice = nan
+            imbalance_1 = (bid_qty - ask_qty) / top if top > 0 else nan
+            imbalance = (bid_depth - ask_depth) / (bid_depth + ask_depth) if bid_depth + ask_depth > 0 else nan
+
+            features = self._features[i]
+            updates = features[_F["updates"]]
+            if updates > 0:
+                bid_delta, ask_delta = total_bid - features[_F["total_bid"]], total_ask - features[_F["total_ask"]]
+            else:
+                updates, bid_delta, ask_delta = 0.0, 0.0, 0.0
+
+            self._book[i, :, :levels] = values[row].reshape(4, levels)
+            if self._levels[i] > levels:
+                self._book[i, :, levels:] = 0.0
+            self._levels[i] = levels
+            self._ts[i] = ts[row]
+            features[:] = (bid, ask, spread, mid, microprice, imbalance_1, imbalance,
+                           total_bid, total_ask, bid_delta, ask_delta, updates + 1)
+            applied += 1
+            if self._listeners:
+                snapshot = self._snapshot(symbol, i)
+                for callback in self._listeners:
+                    try:
+                        callback(symbol, snapshot)
+                    except Exception as e:
+                        self._stats["listener_errors"] += 1
+                        logging.error(f"order book listener error {symbol}: {e}")
+        self._stats["updates"] += applied
+        return applied
+
+    # ========== 조회 ==========
+
+    def _snapshot(self, symbol: str, i: int) -> BookSnapshot:
+        levels = int(self._levels[i])
+        book = self._book[i]
+        return BookSnapshot(symbol, pd.Timestamp(int(self._ts[i])), levels,
+                            _readonly(book[ASK_PRICE, :levels]), _readonly(book[ASK_QTY, :levels]),
+                            _readonly(book[BID_PRICE, :levels]), _readonly(book[BID_QTY, :levels]),
+                            _readonly(self._features[i]))
+
+    def snapshot(self, symbol: str) -> Optional[BookSnapshot]:
+        """종목 호가창 view (수신한 적 없는 종목은 None)"""
+        i = self._index.get(symbol)
+        return self._snapshot(symbol, i) if i is not None else None
+
+    def feature(self, symbol: str, name: str) -> Optional[float]:
+        i = self._index.get(symbol)
+        return float(self._features[i, _F[name]]) if i is not None else None
+
+    def feature_matrix(self) -> Tuple[np.ndarray, List[str]]:
+        """전 종목 특성값 view (종목 x FEATURES) 와 행 순서의 종목코드 목록"""
+        n = len(self._symbols)
+        return _readonly(self._features[:n]), list(self._symbols)
+
+    def book_array(self) -> Tuple[np.ndarray, List[str]]:
+        """전 종목 호가창 view (종목 x (매도호가, 매도잔량, 매수호가, 매수잔량) x 호가 단계) 와 종목코드 목록"""
+        n = len(self._symbols)
+        return _readonly(self._book[:n]), list(self._symbols)
+
+    def to_frame(self, symbol: str) -> pd.DataFrame:
+        """호가 단계별 DataFrame (복사본)"""
+        snap = self.snapshot(symbol)
+        if snap is None:
+            return pd.DataFrame(columns=["level", "ask_price", "ask_qty", "bid_price", "bid_qty"])
+        return pd.DataFrame({"level": np.arange(1, snap.levels + 1), "ask_price": snap.ask_price.copy(),
+                             "ask_qty": snap.ask_qty.copy(), "bid_price": snap.bid_price.copy(),
+                             "bid_qty": snap.bid_qty.copy()})
+
+    def features(self, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """종목별 특성값 DataFrame (복사본, 종목코드 index)"""
+        matrix, names = self.feature_matrix()
+        df = pd.DataFrame(matrix.copy(), index=pd.Index(names, name="symbol"), columns=FEATURES)
+        df.insert(0, "ts", pd.to_datetime(self._ts[:len(names)]).astype("datetime64[ns]"))
+        return df.loc[[s for s in symbols if s in self._index]] if symbols is not None else df
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["symbols"] = len(self._symbols)
+        stats["memory_bytes"] = self._book.nbytes + self._features.nbytes + self._ts.nbytes
+        return stats
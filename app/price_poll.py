@@ -10,6 +10,8 @@ sys.path.extend([
     "."
 ])
 
+from batch_quote import BatchQuoteEngine
+
 API_URL = "/uapi/domestic-stock/v1/quotations/inquire-price"
 TR_ID = "FHKST01010100"
 
@@ -45,8 +47,8 @@ def format_row(df: pd.DataFrame, name: str, code: str) -> str:
     if df.empty:
         return f"{name}({code}) price: N/A"
     row = df.iloc[0]
-    price = row.get("stck_prpr", None)
-    chg = row.get("prdy_vrss", None)
+    price = row.get("stck_prpr", row.get("inter2_prpr", None))
+    chg = row.get("prdy_vrss", row.get("inter2_prdy_vrss", None))
     rate = row.get("prdy_ctrt", None)
     if price is not None and rate is not None:
         return f"{name}({code}) price={price} change={chg} rate={rate}%"
@@ -67,14 +69,27 @@ def main():
         logging.warning(f"auth failed: {e}")
     symbols: List[str] = list(STOCKS.keys())
     logging.info(f"polling: {', '.join(symbols)} every {INTERVAL_SEC}s")
+    # 관심종목(멀티종목) 시세조회로 30종목씩 한번에 조회, 실패시 종목별 현재가 조회
+    engine = BatchQuoteEngine(ka) if ka is not None else None
     try:
         while True:
+            snap = pd.DataFrame()
+            if engine is not None:
+                try:
+                    snap = engine.snapshot(list(STOCKS.values()))
+                except Exception as e:
+                    logging.error(f"batch quote error: {e}")
             for name, code in STOCKS.items():
                 try:
-                    df = fetch_price(code, ka)
+                    if code in snap.index and pd.notna(snap.at[code, "inter2_prpr"]):
+                        df = snap.loc[[code]]
+                    else:
+                        df = fetch_price(code, ka)
                     logging.info(format_row(df, name, code))
                 except Exception as e:
                     logging.error(f"{name}({code}) error: {e}")
+            if ka is not None and hasattr(ka, "get_transport_stats"):
+                logging.info(f"transport: {ka.get_transport_stats()}")
             time.sleep(INTERVAL_SEC)
     except KeyboardInterrupt:
         logging.info("stopped")
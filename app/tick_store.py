@@ -0,0 +1,471 @@
+"""실시간 체결/호가와 차트 봉 데이터 로컬 저장소 (Arrow IPC 세그먼트, pyarrow 필요)
+
+웹소켓 on_result 로 받은 H0STCNT0(주식 체결) / H0STASP0(주식 호가) / H0IFCNT0(지수선물 체결) 데이터와
+REST 차트 조회(분봉/일봉) 결과를 데이터셋/종목/일자별 폴더에 추가 전용(append-only) 파일로 저장한다.
+
+    {root}/{데이터셋}/{종목코드}/{일자}/part-000000.arrow, part-000001.arrow, ..., index.json
+
+- 실시간 데이터는 수신한 그대로 모았다가 한번에 변환하고, flush_rows 건 또는 flush_interval 초마다 새 파트 파일 1개로 기록
+  (기존 파일은 수정하지 않음), 변환과 기록은 기록 스레드에서 처리하여 웹소켓 수신 콜백을 막지 않음
+- index.json 에 파트별 건수와 최소/최대 시각을 기록하여 조회 구간과 겹치는 파트만 메모리 매핑으로 읽음
+- 일봉 이상(1d, 1w, 1mo, 1y) 데이터는 일자 대신 연도 폴더로 나눔
+  (월봉은 대소문자를 구분하지 않는 파일 시스템에서 분봉(1m) 폴더와 겹치지 않도록 1M 대신 1mo 사용)
+- 같은 세그먼트에 동시에 쓰는 프로세스는 1개로 가정
+
+Example:
+    >>> store = TickStore()
+    >>> kws.start(on_result=store.on_ws_result)                         # 웹소켓 수신 데이터 그대로 저장
+    >>> store.append_bars("005930", output2, interval="1m")              # inquire_time_itemchartprice 결과
+    >>> df = store.read("stock_tick", "005930", "2025-08-01 09:00", "2025-08-01 09:30")
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 실시간 tr_id 별 저장 설정: (데이터셋명, 종목코드 컬럼, 일자 컬럼, 시각 컬럼), 일자 컬럼이 없으면 수신일 사용
+WS_DATASETS: Dict[str, Tuple[str, str, Optional[str], str]] = {
+    "H0STCNT0": ("stock_tick", "mksc_shrn_iscd", "bsop_date", "stck_cntg_hour"),
+    "H0STASP0": ("stock_quote", "mksc_shrn_iscd", None, "bsop_hour"),
+    "H0IFCNT0": ("future_tick", "futs_shrn_iscd", None, "bsop_hour"),
+}
+
+# REST 차트 조회 결과의 일자/시각 컬럼 후보 (국내: stck_bsop_date/stck_cntg_hour, 해외: xymd/xhms)
+BAR_DATE_COLUMNS = ("stck_bsop_date", "xymd", "bsop_date")
+BAR_TIME_COLUMNS = ("stck_cntg_hour", "xhms")
+BAR_PREFIX = "bar_"
+DAILY_INTERVALS = ("1d", "1w", "1mo", "1y")
+# 다른 이름으로 받는 봉 주기 (월봉 1M 은 Windows/macOS 에서 bar_1m 과 같은 폴더가 되므로 1mo 로 저장)
+INTERVAL_ALIASES = {"1M": "1mo"}
+
+# 문자열로 유지할 컬럼 (종목코드, 일자/시각, 부호, 구분코드 등), 나머지는 float64 로 저장하여 파트간 스키마 유지
+_TEXT_SUFFIXES = ("_iscd", "_hour", "_date", "_sign", "_code", "_yn", "_isnm", "_name", "_nm", "xymd", "xhms")
+
+TS_COLUMN = "ts"
+INDEX_FILE = "index.json"
+
+Frame = Union[pd.DataFrame, Dict[str, Any], List[Any]]
+
+
+def normalize_interval(interval: str) -> str:
+    """봉 주기 표기 통일 (1M -> 1mo)"""
+    return INTERVAL_ALIASES.get(interval, interval)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("TickStore 에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    return pyarrow
+
+
+def default_store_dir() -> str:
+    return os.getenv("KIS_TICK_STORE_DIR") or os.path.join(os.path.expanduser("~"), "KIS", "ticks")
+
+
+def _is_text(column: str) -> bool:
+    return column == TS_COLUMN or column.endswith(_TEXT_SUFFIXES)
+
+
+def _to_frame(data: Frame) -> pd.DataFrame:
+    # KISWebSocket mode 별 on_result 데이터 (DataFrame / 컬럼 dict / namedtuple 목록) 를 DataFrame 으로 변환
+    if isinstance(data, pd.DataFrame):
+        df = data
+    elif isinstance(data, dict):
+        df = pd.DataFrame(data)
+    else:
+        df = pd.DataFrame([row._asdict() if hasattr(row, "_asdict") else row for row in data])
+    return df.rename(columns=lambda c: str(c).lower())
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    # 응답은 모두 문자열이므로 컬럼 단위로 한번에 변환
+    out = {}
+    for column in df.columns:
+        values = df[column]
+        if column == TS_COLUMN:
+            out[column] = values
+        elif _is_text(column):
+            out[column] = values.where(values.isna(), values.astype(str).str.strip())
+        else:
+            out[column] = pd.to_numeric(values, errors="coerce").astype("float64")
+    return pd.DataFrame(out, index=df.index)
+
+
+def _timestamps(dates: pd.Series, times: Optional[pd.Series]) -> pd.Series:
+    text = dates.astype(str).str.strip().str[:8]
+    if times is None:
+        return pd.to_datetime(text, format="%Y%m%d", errors="coerce")
+    return pd.to_datetime(text + times.astype(str).str.strip().str.zfill(6).str[:6], format="%Y%m%d%H%M%S", errors="coerce")
+
+
+def _ns(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    return pd.Timestamp(value).value
+
+
+class TickStore:
+    """데이터셋/종목/일자별 Arrow 세그먼트 저장소
+
+    Args:
+        root: 저장 폴더 (생략시 환경변수 KIS_TICK_STORE_DIR, 기본 ~/KIS/ticks)
+        flush_rows: 세그먼트별로 모아 두었다가 파트 파일로 기록할 건수
+        flush_interval: 마지막 기록 후 이 시간(초)이 지나면 건수와 관계없이 기록
+    """
+
+    def __init__(self, root: Optional[str] = None, flush_rows: int = 5000, flush_interval: float = 5.0):
+        self.pa = _pyarrow()
+        self.root = root or default_store_dir()
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        # tr_id -> [(수신 데이터, 수신일)], 변환 전 실시간 데이터 (수신 콜백이 기록 중에 기다리지 않도록 별도 lock)
+        self._raw_lock = threading.Lock()
+        self._raw: Dict[str, List[Tuple[Frame, str]]] = {}
+        self._raw_rows = 0
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._pending: Dict[Tuple[str, str, str], List[pd.DataFrame]] = {}
+        self._pending_rows: Dict[Tuple[str, str, str], int] = {}
+        self._last_flush = time.monotonic()
+        self._stats = {"rows": 0, "parts": 0, "dropped": 0, "reads": 0}
+        atexit.register(self.flush)
+
+    # ========== 경로 ==========
+
+    @staticmethod
+    def partition_of(dataset: str) -> int:
+        """세그먼트 폴더명 길이 (일봉 이상: 연도 4자리, 그 외: 일자 8자리)"""
+        return 4 if dataset.startswith(BAR_PREFIX) and dataset[len(BAR_PREFIX):] in DAILY_INTERVALS else 8
+
+    def segment_dir(self, dataset: str, symbol: str, partition: str) -> str:
+        return os.path.join(self.root, dataset, symbol, partition)
+
+    def datasets(self) -> List[str]:
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d))) \
+            if os.path.isdir(self.root) else []
+
+    def symbols(self, dataset: str) -> List[str]:
+        path = os.path.join(self.root, dataset)
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    @staticmethod
+    def bar_dataset(interval: str) -> str:
+        """봉 주기의 데이터셋명 (bar_1m, bar_1d, bar_1mo 등)"""
+        return f"{BAR_PREFIX}{normalize_interval(interval)}"
+
+    def partitions(self, dataset: str, symbol: str) -> List[str]:
+        # 데이터셋의 폴더명 길이가 아닌 폴더는 제외 (대소문자만 다른 데이터셋이 같은 폴더에 저장된 경우 등)
+        path = os.path.join(self.root, dataset, symbol)
+        size = self.partition_of(dataset)
+        return sorted(p for p in os.listdir(path) if p.isdigit() and len(p) == size) if os.path.isdir(path) else []
+
+    # ========== 저장 ==========
+
+    def on_ws_result(self, ws, tr_id: str, result: Frame, data_map: dict):
+        """KISWebSocket.start(on_result=...) 에 그대로 사용할 수 있는 콜백"""
+        self.append_frame(tr_id, result)
+
+    def append_frame(self, tr_id: str, result: Frame) -> int:
+        """실시간 데이터 저장 (WS_DATASETS 에 없는 tr_id 는 무시), 접수 건수 반환
+
+        수신 데이터는 그대로 보관하고 flush_rows 건이 모이거나 flush_interval 이 지나면 기록 스레드가 한번에 DataFrame 으로
+        변환하여 기록한다. 호출한 스레드(웹소켓 수신 콜백)에서는 파일을 기록하지 않는다.
+        """
+        if tr_id not in WS_DATASETS or result is None:
+            return 0
+        rows = len(result)
+        if rows == 0:
+            return 0
+        with self._raw_lock:
+            self._raw.setdefault(tr_id, []).append((result, datetime.now().strftime("%Y%m%d")))
+            self._raw_rows += rows
+            full = self._raw_rows >= self.flush_rows
+        self._start_writer()
+        if full or self.flush_interval <= 0:
+            self._wake.set()
+        return rows
+
+    def _start_writer(self):
+        if self._writer is not None or self._closed.is_set():
+            return
+        with self._raw_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="tick-store-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        # flush_rows 건이 모이면 바로, 아니면 flush_interval 초마다 기록
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval if self.flush_interval > 0 else None)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"tick store flush failed: {e}")
+
+    def _drain_raw(self):
+        # 모아 둔 실시간 데이터를 tr_id 별로 한번에 변환하여 세그먼트 버퍼로 이동
+        with self._raw_lock:
+            raw, self._raw, self._raw_rows = self._raw, {}, 0
+        for tr_id, items in raw.items():
+            dataset, symbol_column, date_column, time_column = WS_DATASETS[tr_id]
+            frames = [_to_frame(result) for result, _ in items]
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+            if symbol_column not in df.columns or time_column not in df.columns:
+                logging.warning(f"tick store: {tr_id} 데이터에 {symbol_column}/{time_column} 컬럼이 없습니다.")
+                self._stats["dropped"] += len(df)
+                continue
+            received = pd.Series([day for frame, (_, day) in zip(frames, items) for _ in range(len(frame))], index=df.index)
+            dates = df[date_column].where(df[date_column].astype(str).str.strip() != "", received) \
+                if date_column and date_column in df.columns else received
+            self._add(dataset, df, df[symbol_column].astype(str).str.strip(), _timestamps(dates, df[time_column]))
+
+    def append_bars(self, symbol: str, bars: pd.DataFrame, interval: str = "1m") -> int:
+        """REST 차트 조회 결과(분봉/일봉) 저장, 같은 시각의 봉은 조회시 마지막으로 저장한 값 사용"""
+        if bars is None or bars.empty:
+            return 0
+        df = _to_frame(bars)
+        date_column = next((c for c in BAR_DATE_COLUMNS if c in df.columns), None)
+        if date_column is None:
+            raise KeyError(f"차트 데이터에 일자 컬럼이 없습니다: {BAR_DATE_COLUMNS}")
+        time_column = next((c for c in BAR_TIME_COLUMNS if c in df.columns), None)
+        interval = normalize_interval(interval)
+        ts = _timestamps(df[date_column], df[time_column] if time_column and interval not in DAILY_INTERVALS else None)
+        return self.append(self.bar_dataset(interval), df, symbol=symbol, ts=ts)
+
+    def append(self, dataset: str, df: pd.DataFrame, symbol: Optional[str] = None, symbol_column: Optional[str] = None,
+               ts: Optional[pd.Series] = None) -> int:
+        """DataFrame 저장 (종목은 symbol 또는 symbol_column 으로 지정, 시각은 ts 또는 df 의 ts 컬럼), 저장 건수 반환"""
+        df = _to_frame(df)
+        if ts is None:
+            if TS_COLUMN not in df.columns:
+                raise KeyError("저장할 데이터에 ts 컬럼이 없습니다.")
+            ts = df[TS_COLUMN]
+        symbols = df[symbol_column].astype(str).str.strip() if symbol_column else pd.Series(symbol, index=df.index)
+        with self._lock:
+            added = self._add(dataset, df, symbols, pd.Series(np.asarray(ts), index=df.index))
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        return added
+
+    def _add(self, dataset: str, df: pd.DataFrame, symbols: pd.Series, ts: pd.Series) -> int:
+        # 변환 후 종목/세그먼트별 버퍼에 추가, flush_rows 를 넘은 세그먼트는 바로 기록
+        ts = pd.to_datetime(ts, errors="coerce").astype("datetime64[ns]")
+        valid = ts.notna().to_numpy()
+        self._stats["dropped"] += int((~valid).sum())
+        if not valid.any():
+            return 0
+        df = _normalize(df[valid].drop(columns=TS_COLUMN, errors="ignore"))
+        df[TS_COLUMN] = ts[valid].to_numpy()
+        symbols = symbols[valid]
+        keys = df[TS_COLUMN].dt.strftime("%Y%m%d").str[:self.partition_of(dataset)]
+
+        for (sym, part), group in df.groupby([symbols, keys], sort=False):
+            key = (dataset, sym, part)
+            self._pending.setdefault(key, []).append(group)
+            self._pending_rows[key] = self._pending_rows.get(key, 0) + len(group)
+            if self._pending_rows[key] >= self.flush_rows:
+                self._flush_segment(key)
+        self._stats["rows"] += len(df)
+        return len(df)
+
+    def flush(self, dataset: Optional[str] = None, symbol: Optional[str] = None):
+        """메모리에 모아 둔 데이터를 파트 파일로 기록 (dataset/symbol 지정시 해당 세그먼트만)"""
+        with self._lock:
+            self._drain_raw()
+            for key in list(self._pending):
+                if (dataset is None or key[0] == dataset) and (symbol is None or key[1] == symbol):
+                    self._flush_segment(key)
+            if dataset is None and symbol is None:
+                self._last_flush = time.monotonic()
+
+    def _flush_segment(self, key: Tuple[str, str, str]):
+        frames = self._pending.pop(key, None)
+        self._pending_rows.pop(key, None)
+        if not frames:
+            return
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+        try:
+            self._write_part(self.segment_dir(*key), df)
+        except Exception as e:
+            logging.error(f"tick store write failed {key}: {e}")
+
+    def _write_part(self, seg_dir: str, df: pd.DataFrame, index: Optional[dict] = None):
+        pa = self.pa
+        os.makedirs(seg_dir, exist_ok=True)
+        index = index if index is not None else self._read_index(seg_dir)
+        seq = index.get("next_seq", 0)
+        name = f"part-{seq:06d}.arrow"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        ts = df[TS_COLUMN]
+
+        path = os.path.join(seg_dir, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        index.setdefault("parts", []).append({
+            "file": name,
+            "rows": len(df),
+            "ts_min": int(ts.min().value),
+            "ts_max": int(ts.max().value),
+            "sorted": bool(ts.is_monotonic_increasing),
+        })
+        index["next_seq"] = seq + 1
+        self._write_index(seg_dir, index)
+        self._stats["parts"] += 1
+
+    @staticmethod
+    def _read_index(seg_dir: str) -> dict:
+        path = os.path.join(seg_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return {"parts": [], "next_seq": 0}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_index(seg_dir: str, index: dict):
+        path = os.path.join(seg_dir, INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+
+    # ========== 조회 ==========
+
+    def _selected_partitions(self, dataset: str, symbol: str, start_ns: Optional[int], end_ns: Optional[int]) -> List[str]:
+        width = self.partition_of(dataset)
+        lo = pd.Timestamp(start_ns).strftime("%Y%m%d")[:width] if start_ns is not None else None
+        hi = pd.Timestamp(end_ns).strftime("%Y%m%d")[:width] if end_ns is not None else None
+        keys = set(self.partitions(dataset, symbol))
+        keys.update(part for (ds, sym, part) in self._pending if ds == dataset and sym == symbol)
+        return sorted(k for k in keys if (lo is None or k >= lo) and (hi is None or k <= hi))
+
+    def _segment_tables(self, dataset: str, symbol: str, part: str, start_ns: Optional[int] = None,
+                        end_ns: Optional[int] = None) -> list:
+        # 구간과 겹치는 파트 파일(메모리 매핑)과 기록 전 데이터
+        pa = self.pa
+        tables = []
+        seg_dir = self.segment_dir(dataset, symbol, part)
+        for entry in self._read_index(seg_dir)["parts"] if os.path.isdir(seg_dir) else []:
+            if (start_ns is not None and entry["ts_max"] < start_ns) or (end_ns is not None and entry["ts_min"] > end_ns):
+                continue
+            source = pa.memory_map(os.path.join(seg_dir, entry["file"]), "r")
+            tables.append(pa.ipc.open_file(source).read_all())
+        for frame in self._pending.get((dataset, symbol, part), []):
+            tables.append(pa.Table.from_pandas(frame, preserve_index=False))
+        return tables
+
+    def _combine(self, dataset: str, tables: list, start_ns: Optional[int] = None, end_ns: Optional[int] = None):
+        # 파트 합치기, 구간 필터, 시각 정렬 (기록 순서 유지), 봉 데이터는 같은 시각의 마지막 기록만 사용
+        pa, pc = self.pa, self.pa.compute
+        if not tables:
+            return pa.table({TS_COLUMN: pa.array([], type=pa.timestamp("ns"))})
+        table = pa.concat_tables(tables, promote_options="permissive") if len(tables) > 1 else tables[0]
+
+        ts = table[TS_COLUMN]
+        mask = None
+        if start_ns is not None:
+            mask = pc.greater_equal(ts, pa.scalar(start_ns, type=pa.timestamp("ns")))
+        if end_ns is not None:
+            upper = pc.less_equal(ts, pa.scalar(end_ns, type=pa.timestamp("ns")))
+            mask = upper if mask is None else pc.and_(mask, upper)
+        if mask is not None:
+            table = table.filter(mask)
+
+        table = table.take(pc.sort_indices(table, sort_keys=[(TS_COLUMN, "ascending")]))
+        if dataset.startswith(BAR_PREFIX) and table.num_rows > 1:
+            values = table[TS_COLUMN].to_numpy()
+            keep = np.append(values[1:] != values[:-1], True)
+            table = table.filter(pa.array(keep))
+        return table
+
+    def read_table(self, dataset: str, symbol: str, start: Any = None, end: Any = None,
+                   columns: Optional[Iterable[str]] = None):
+        """구간 [start, end] 의 데이터를 시각 순서로 정렬한 pyarrow.Table 로 반환 (기록 전 데이터 포함)"""
+        start_ns, end_ns = _ns(start), _ns(end)
+        with self._lock:
+            self._drain_raw()
+            tables = [table for part in self._selected_partitions(dataset, symbol, start_ns, end_ns)
+                      for table in self._segment_tables(dataset, symbol, part, start_ns, end_ns)]
+        self._stats["reads"] += 1
+        table = self._combine(dataset, tables, start_ns, end_ns)
+        if columns is not None:
+            columns = list(dict.fromkeys([TS_COLUMN, *columns]))
+            table = table.select([c for c in columns if c in table.column_names])
+        return table
+
+    def read(self, dataset: str, symbol: str, start: Any = None, end: Any = None,
+             columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """read_table() 결과를 DataFrame 으로 반환"""
+        return self.read_table(dataset, symbol, start, end, columns).to_pandas()
+
+    def read_bars(self, symbol: str, interval: str = "1m", start: Any = None, end: Any = None) -> pd.DataFrame:
+        return self.read(self.bar_dataset(interval), symbol, start, end)
+
+    def last_ts(self, dataset: str, symbol: str) -> Optional[pd.Timestamp]:
+        """저장된 마지막 시각 (재시작시 이어받을 위치 확인용)"""
+        with self._lock:
+            self._drain_raw()
+            last = None
+            for part in reversed(self._selected_partitions(dataset, symbol, None, None)):
+                seg_dir = self.segment_dir(dataset, symbol, part)
+                values = [entry["ts_max"] for entry in self._read_index(seg_dir)["parts"]] if os.path.isdir(seg_dir) else []
+                values += [int(frame[TS_COLUMN].max().value) for frame in self._pending.get((dataset, symbol, part), [])]
+                if values:
+                    last = max(values)
+                    break
+        return pd.Timestamp(last) if last is not None else None
+
+    # ========== 관리 ==========
+
+    def compact(self, dataset: str, symbol: str, partition: str) -> int:
+        """세그먼트의 파트 파일을 시각 순서로 정렬한 1개 파일로 합침 (장 마감 후 사용), 합친 후 건수 반환"""
+        with self._lock:
+            self._drain_raw()
+            self._flush_segment((dataset, symbol, partition))
+            seg_dir = self.segment_dir(dataset, symbol, partition)
+            old = self._read_index(seg_dir)
+            if len(old["parts"]) <= 1:
+                return sum(entry["rows"] for entry in old["parts"])
+
+            df = self._combine(dataset, self._segment_tables(dataset, symbol, partition)).to_pandas()
+            # 새 파일과 index 를 먼저 기록한 후 이전 파트 삭제
+            self._write_part(seg_dir, df, {"parts": [], "next_seq": old["next_seq"]})
+            for entry in old["parts"]:
+                try:
+                    os.remove(os.path.join(seg_dir, entry["file"]))
+                except OSError:
+                    pass
+            return len(df)
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["pending_rows"] = sum(self._pending_rows.values()) + self._raw_rows
+        stats["pending_segments"] = len(self._pending)
+        return stats
+
+    def close(self):
+        """기록 스레드 종료 후 남은 데이터 기록"""
+        self._closed.set()
+        self._wake.set()
+        writer = self._writer
+        if writer is not None and writer is not threading.current_thread():
+            writer.join()
+        self.flush()
@@ -133,38 +133,27 @@ def inquire_balance(
         "CTX_AREA_NK100": NK100
     }
     
-    res = ka._url_fetch(API_URL, tr_id, tr_cont, params)
-    
-    if res.isOK():
-        # output1 처리
-        current_data1 = pd.DataFrame(res.getBody().output1)
-        if dataframe1 is not None:
-            dataframe1 = pd.concat([dataframe1, current_data1], ignore_index=True)
-        else:
-            dataframe1 = current_data1
-            
-        # output2 처리
-        current_data2 = pd.DataFrame(res.getBody().output2)
-        if dataframe2 is not None:
-            dataframe2 = pd.concat([dataframe2, current_data2], ignore_index=True)
-        else:
-            dataframe2 = current_data2
-            
-        tr_cont = res.getHeader().tr_cont
-        FK100 = res.getBody().ctx_area_fk100
-        NK100 = res.getBody().ctx_area_nk100
-        
-        if tr_cont in ["M", "F"]:  # 다음 페이지 존재
-            logging.info("Call Next page...")
-            ka.smart_sleep()  # 시스템 안정적 운영을 위한 지연
-            return inquire_balance(
-                env_dv, cano, acnt_prdt_cd, afhr_flpr_yn, inqr_dvsn, unpr_dvsn, 
-                fund_sttl_icld_yn, fncg_amt_auto_rdpt_yn, prcs_dvsn, FK100, NK100, 
-                "N", dataframe1, dataframe2, depth + 1, max_depth
-            )
-        else:
-            logging.info("Data fetch complete.")
-            return dataframe1, dataframe2
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        API_URL, tr_id, params,
+        outputs=("output1", "output2"),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth + 1,
+    )
+
+    current_data1, current_data2 = result.frames
+    if dataframe1 is not None:
+        current_data1 = pd.concat([dataframe1, current_data1], ignore_index=True)
+    if dataframe2 is not None:
+        current_data2 = pd.concat([dataframe2, current_data2], ignore_index=True)
+
+    if result.error is not None:
+        result.error.printError(url=API_URL)
+        return pd.DataFrame(), pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logging.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        res.printError(url=API_URL)
-        return pd.DataFrame(), pd.DataFrame() 
\ No newline at end of file
+        logging.info("Data fetch complete.")
+    return current_data1, current_data2
\ No newline at end of file
@@ -115,43 +115,26 @@ def inquire_period_trans(
         "PWD_CHK_YN": pwd_chk_yn,
     }
 
-    res = ka._url_fetch(API_URL, tr_id, tr_cont, params)
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        API_URL, tr_id, params,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
 
-    if res.isOK():
-        if hasattr(res.getBody(), 'output'):
-            output_data = res.getBody().output
-            if not isinstance(output_data, list):
-                output_data = [output_data]
-            current_data = pd.DataFrame(output_data)
-        else:
-            current_data = pd.DataFrame()
-            
-        if dataframe is not None:
-            dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-        else:
-            dataframe = current_data
-            
-        tr_cont = res.getHeader().tr_cont
-        
-        if tr_cont == "M":
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_period_trans(
-                inqr_term_from_dt,
-                inqr_term_to_dt,
-                cano,
-                acnt_prdt_cd,
-                acnt_tr_type_cd,
-                crcy_cd,
-                ctx_area_fk100,
-                ctx_area_nk100,
-                pwd_chk_yn,
-                "N", dataframe, depth + 1, max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe
-    else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(API_URL)
+    current_data = result.frames[0]
+    if dataframe is not None:
+        current_data = pd.concat([dataframe, current_data], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(API_URL)
         return pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
+    else:
+        logger.info("Data fetch complete.")
+    return current_data
@@ -82,29 +82,25 @@ def algo_ordno(
         "CTX_AREA_NK200": NK200         # 연속조회키200
     }
     
-    res = ka._url_fetch(API_URL, tr_id, tr_cont, params)
-    
-    if res.isOK():
-        current_data = pd.DataFrame(res.getBody().output)
-            
-        if dataframe is not None:
-            dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-        else:
-            dataframe = current_data
-            
-        tr_cont = res.getHeader().tr_cont
-        FK200 = res.getBody().ctx_area_fk200
-        NK200 = res.getBody().ctx_area_nk200
-        
-        if tr_cont in ["M", "F"]:  # 다음 페이지 존재
-            logging.info("Call Next page...")
-            ka.smart_sleep()  # 시스템 안정적 운영을 위한 지연
-            return algo_ordno(
-                cano, acnt_prdt_cd, trad_dt, FK200, NK200, "N", dataframe, depth + 1, max_depth
-            )
-        else:
-            logging.info("Data fetch complete.")
-            return dataframe
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        API_URL, tr_id, params,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth + 1,
+    )
+
+    current_data = result.frames[0]
+    if dataframe is not None:
+        current_data = pd.concat([dataframe, current_data], ignore_index=True)
+
+    if result.error is not None:
+        result.error.printError(url=API_URL)
+        return pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logging.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        res.printError(url=API_URL)
-        return pd.DataFrame() 
\ No newline at end of file
+        logging.info("Data fetch complete.")
+    return current_data
\ No newline at end of file
@@ -108,74 +108,28 @@ def inquire_balance(
         "CTX_AREA_NK200": NK200,
     }
 
-    res = ka._url_fetch(api_url=API_URL, ptr_id=tr_id, tr_cont=tr_cont, params=params)
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        API_URL, tr_id, params,
+        outputs=("output1", "output2"),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
 
-    if res.isOK():
-        # output1 처리
-        if hasattr(res.getBody(), 'output1'):
-            output_data = res.getBody().output1
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data1 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data1 = pd.DataFrame([output_data])
-                
-                if dataframe1 is not None:
-                    dataframe1 = pd.concat([dataframe1, current_data1], ignore_index=True)
-                else:
-                    dataframe1 = current_data1
-            else:
-                if dataframe1 is None:
-                    dataframe1 = pd.DataFrame()
-        else:
-            if dataframe1 is None:
-                dataframe1 = pd.DataFrame()
-        # output2 처리
-        if hasattr(res.getBody(), 'output2'):
-            output_data = res.getBody().output2
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data2 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data2 = pd.DataFrame([output_data])
-                
-                if dataframe2 is not None:
-                    dataframe2 = pd.concat([dataframe2, current_data2], ignore_index=True)
-                else:
-                    dataframe2 = current_data2
-            else:
-                if dataframe2 is None:
-                    dataframe2 = pd.DataFrame()
-        else:
-            if dataframe2 is None:
-                dataframe2 = pd.DataFrame()
-        tr_cont, FK200, NK200 = res.getHeader().tr_cont, res.getBody().ctx_area_fk200, res.getBody().ctx_area_nk200
-        
-        if tr_cont in ["M", "F"]:
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_balance(
-                cano,
-                acnt_prdt_cd,
-                ovrs_excg_cd,
-                tr_crcy_cd,
-                FK200,
-                NK200,
-                env_dv,
-                dataframe1,
-                dataframe2,
-                "N",
-                depth + 1,
-                max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe1, dataframe2
-    else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(API_URL)
+    current_data1, current_data2 = result.frames
+    if dataframe1 is not None:
+        current_data1 = pd.concat([dataframe1, current_data1], ignore_index=True)
+    if dataframe2 is not None:
+        current_data2 = pd.concat([dataframe2, current_data2], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(API_URL)
         return pd.DataFrame(), pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
+    else:
+        logger.info("Data fetch complete.")
+    return current_data1, current_data2
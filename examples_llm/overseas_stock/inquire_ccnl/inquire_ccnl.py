@@ -149,52 +149,26 @@ def inquire_ccnl(
         "CTX_AREA_FK200": FK200,
     }
 
-    res = ka._url_fetch(api_url=API_URL, ptr_id=tr_id, tr_cont=tr_cont, params=params)
-
-    if res.isOK():
-        if hasattr(res.getBody(), 'output'):
-            output_data = res.getBody().output
-            if not isinstance(output_data, list):
-                output_data = [output_data]
-            current_data = pd.DataFrame(output_data)
-        else:
-            current_data = pd.DataFrame()
-
-        if dataframe is not None:
-            dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-        else:
-            dataframe = current_data
-
-        tr_cont, NK200, FK200 = res.getHeader().tr_cont, res.getBody().ctx_area_nk200, res.getBody().ctx_area_fk200
-
-        if tr_cont in ["M", "F"]:
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_ccnl(
-                cano=cano,
-                acnt_prdt_cd=acnt_prdt_cd,
-                pdno=pdno,
-                ord_strt_dt=ord_strt_dt,
-                ord_end_dt=ord_end_dt,
-                sll_buy_dvsn=sll_buy_dvsn,
-                ccld_nccs_dvsn=ccld_nccs_dvsn,
-                ovrs_excg_cd=ovrs_excg_cd,
-                sort_sqn=sort_sqn,
-                ord_dt=ord_dt,
-                ord_gno_brno=ord_gno_brno,
-                odno=odno,
-                NK200=NK200,
-                FK200=FK200,
-                env_dv=env_dv,
-                tr_cont="N",
-                dataframe=dataframe,
-                depth=depth + 1,
-                max_depth=max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe
-    else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(API_URL)
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        API_URL, tr_id, params,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
+
+    current_data = result.frames[0]
+    if dataframe is not None:
+        current_data = pd.concat([dataframe, current_data], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(API_URL)
         return pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
+    else:
+        logger.info("Data fetch complete.")
+    return current_data
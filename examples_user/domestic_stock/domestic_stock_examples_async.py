@@ -0,0 +1,63 @@
+import asyncio
+import sys
+import logging
+
+import pandas as pd
+
+sys.path.extend(['..', '.'])
+import kis_auth as ka
+from domestic_stock_functions_async import *
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    # 인증 (토큰 발급도 이벤트 루프를 멈추지 않음)
+    await ka.async_auth()
+    trenv = ka.getTREnv()
+
+    ##############################################################################################
+    # [국내주식] 기본시세 > 주식현재가 시세[v1_국내주식-008] : 여러 종목 동시 조회
+    ##############################################################################################
+
+    codes = ["005930", "000660", "035420", "005380"]
+    results = await asyncio.gather(*[inquire_price(env_dv="real", fid_cond_mrkt_div_code="J", fid_input_iscd=code)
+                                     for code in codes])
+    print(pd.concat(results, ignore_index=True))
+
+    ##############################################################################################
+    # [국내주식] 기본시세 > 국내주식기간별시세(일/주/월/년)[v1_국내주식-016]
+    ##############################################################################################
+
+    df1, df2 = await inquire_daily_itemchartprice(env_dv="real", fid_cond_mrkt_div_code="J", fid_input_iscd="005930",
+                                                  fid_input_date_1="20220501", fid_input_date_2="20220530",
+                                                  fid_period_div_code="D", fid_org_adj_prc="1")
+    print(df1)
+    print(df2)
+
+    ##############################################################################################
+    # [국내주식] 기본시세 > 주식당일분봉조회[v1_국내주식-022]
+    ##############################################################################################
+
+    output1, output2 = await inquire_time_itemchartprice(env_dv="real", fid_cond_mrkt_div_code="J",
+                                                         fid_input_iscd="005930", fid_input_hour_1="093000",
+                                                         fid_pw_data_incu_yn="Y")
+    print(output1)
+    print(output2)
+
+    ##############################################################################################
+    # [국내주식] 주문/계좌 > 주식잔고조회[v1_국내주식-006]
+    ##############################################################################################
+
+    df1, df2 = await inquire_balance(env_dv="real", cano=trenv.my_acct, acnt_prdt_cd=trenv.my_prod,
+                                     afhr_flpr_yn="N", inqr_dvsn="01", unpr_dvsn="01", fund_sttl_icld_yn="N",
+                                     fncg_amt_auto_rdpt_yn="N", prcs_dvsn="00")
+    print(df1)
+    print(df2)
+
+    await ka.get_async_transport().close()
+
+
+asyncio.run(main())
@@ -0,0 +1,364 @@
+import logging
+import sys
+from typing import Tuple
+
+import pandas as pd
+
+sys.path.extend(['..', '.'])
+import kis_auth as ka
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# domestic_stock_functions.py 의 한줄호출함수와 같은 인자/반환값을 갖는 asyncio 버전 함수 모음
+# ka.async_url_fetch 를 사용하므로 하나의 이벤트 루프에서 여러 건의 조회를 동시에 진행할 수 있습니다.
+#
+# Example:
+#     >>> await ka.async_auth()
+#     >>> dfs = await asyncio.gather(*[inquire_price("real", "J", code) for code in ["005930", "000660"]])
+
+
+##############################################################################################
+# [국내주식] 기본시세 > 주식현재가 시세[v1_국내주식-008]
+##############################################################################################
+
+async def inquire_price(
+        env_dv: str,  # [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        fid_cond_mrkt_div_code: str,  # [필수] 조건 시장 분류 코드 (ex. J:KRX, NX:NXT, UN:통합)
+        fid_input_iscd: str  # [필수] 입력 종목코드 (ex. 종목코드 (ex 005930 삼성전자), ETN은 종목코드 6자리 앞에 Q 입력 필수)
+) -> pd.DataFrame:
+    """
+    주식 현재가 시세 API의 asyncio 버전입니다. 실시간 시세를 원하신다면 웹소켓 API를 활용하세요.
+
+    Args:
+        env_dv (str): [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        fid_cond_mrkt_div_code (str): [필수] 조건 시장 분류 코드 (ex. J:KRX, NX:NXT, UN:통합)
+        fid_input_iscd (str): [필수] 입력 종목코드 (ex. 종목코드 (ex 005930 삼성전자), ETN은 종목코드 6자리 앞에 Q 입력 필수)
+
+    Returns:
+        pd.DataFrame: 주식 현재가 시세 데이터
+
+    Example:
+        >>> df = await inquire_price("real", "J", "005930")
+        >>> print(df)
+    """
+    api_url = "/uapi/domestic-stock/v1/quotations/inquire-price"
+
+    # 필수 파라미터 검증
+    if env_dv == "" or env_dv is None:
+        raise ValueError("env_dv is required (e.g. 'real:실전, demo:모의')")
+
+    if fid_cond_mrkt_div_code == "" or fid_cond_mrkt_div_code is None:
+        raise ValueError("fid_cond_mrkt_div_code is required (e.g. 'J:KRX, NX:NXT, UN:통합')")
+
+    if fid_input_iscd == "" or fid_input_iscd is None:
+        raise ValueError("fid_input_iscd is required (e.g. '종목코드 (ex 005930 삼성전자), ETN은 종목코드 6자리 앞에 Q 입력 필수')")
+
+    # tr_id 설정
+    if env_dv == "real":
+        tr_id = "FHKST01010100"
+    elif env_dv == "demo":
+        tr_id = "FHKST01010100"
+    else:
+        raise ValueError("env_dv can only be 'real' or 'demo'")
+
+    params = {
+        "FID_COND_MRKT_DIV_CODE": fid_cond_mrkt_div_code,
+        "FID_INPUT_ISCD": fid_input_iscd
+    }
+
+    res = await ka.async_url_fetch(api_url, tr_id, "", params)
+
+    if res.isOK():
+        current_data = pd.DataFrame(res.getBody().output, index=[0])
+        return current_data
+    else:
+        res.printError(url=api_url)
+        return pd.DataFrame()
+
+
+##############################################################################################
+# [국내주식] 기본시세 > 국내주식기간별시세(일/주/월/년)[v1_국내주식-016]
+##############################################################################################
+
+async def inquire_daily_itemchartprice(
+        env_dv: str,  # 실전모의구분
+        fid_cond_mrkt_div_code: str,  # 조건 시장 분류 코드
+        fid_input_iscd: str,  # 입력 종목코드
+        fid_input_date_1: str,  # 입력 날짜 1
+        fid_input_date_2: str,  # 입력 날짜 2
+        fid_period_div_code: str,  # 기간분류코드
+        fid_org_adj_prc: str  # 수정주가 원주가 가격 여부
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    국내주식기간별시세(일/주/월/년) API의 asyncio 버전입니다.
+    실전계좌/모의계좌의 경우, 한 번의 호출에 최대 100건까지 확인 가능합니다.
+
+    Args:
+        env_dv (str): [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        fid_cond_mrkt_div_code (str): [필수] 조건 시장 분류 코드 (ex. J:KRX, NX:NXT, UN:통합)
+        fid_input_iscd (str): [필수] 입력 종목코드 (ex. 종목코드 (ex 005930 삼성전자))
+        fid_input_date_1 (str): [필수] 입력 날짜 1 (ex. 조회 시작일자)
+        fid_input_date_2 (str): [필수] 입력 날짜 2 (ex. 조회 종료일자 (최대 100개))
+        fid_period_div_code (str): [필수] 기간분류코드 (ex. D:일봉 W:주봉, M:월봉, Y:년봉)
+        fid_org_adj_prc (str): [필수] 수정주가 원주가 가격 여부 (ex. 0:수정주가 1:원주가)
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (output1 데이터, output2 데이터)
+
+    Example:
+        >>> df1, df2 = await inquire_daily_itemchartprice("real", "J", "005930", "20220101", "20220809", "D", "1")
+        >>> print(df1)
+        >>> print(df2)
+    """
+    api_url = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+
+    # 필수 파라미터 검증
+    if env_dv == "":
+        raise ValueError("env_dv is required (e.g. 'real:실전, demo:모의')")
+
+    if fid_cond_mrkt_div_code == "":
+        raise ValueError("fid_cond_mrkt_div_code is required (e.g. 'J:KRX, NX:NXT, UN:통합')")
+
+    if fid_input_iscd == "":
+        raise ValueError("fid_input_iscd is required (e.g. '종목코드 (ex 005930 삼성전자)')")
+
+    if fid_input_date_1 == "":
+        raise ValueError("fid_input_date_1 is required (e.g. '조회 시작일자')")
+
+    if fid_input_date_2 == "":
+        raise ValueError("fid_input_date_2 is required (e.g. '조회 종료일자 (최대 100개)')")
+
+    if fid_period_div_code == "":
+        raise ValueError("fid_period_div_code is required (e.g. 'D:일봉 W:주봉, M:월봉, Y:년봉')")
+
+    if fid_org_adj_prc == "":
+        raise ValueError("fid_org_adj_prc is required (e.g. '0:수정주가 1:원주가')")
+
+    # TR_ID 설정
+    if env_dv == "real":
+        tr_id = "FHKST03010100"
+    elif env_dv == "demo":
+        tr_id = "FHKST03010100"
+    else:
+        raise ValueError("env_dv is required (e.g. 'real' or 'demo')")
+
+    params = {
+        "FID_COND_MRKT_DIV_CODE": fid_cond_mrkt_div_code,
+        "FID_INPUT_ISCD": fid_input_iscd,
+        "FID_INPUT_DATE_1": fid_input_date_1,
+        "FID_INPUT_DATE_2": fid_input_date_2,
+        "FID_PERIOD_DIV_CODE": fid_period_div_code,
+        "FID_ORG_ADJ_PRC": fid_org_adj_prc
+    }
+
+    res = await ka.async_url_fetch(api_url, tr_id, "", params)
+
+    if res.isOK():
+        # output1 처리 (object 타입이므로 DataFrame)
+        output1_data = pd.DataFrame([res.getBody().output1])
+
+        # output2 처리 (array 타입이므로 DataFrame)
+        output2_data = pd.DataFrame(res.getBody().output2)
+
+        return (output1_data, output2_data)
+    else:
+        res.printError(url=api_url)
+        return (pd.DataFrame(), pd.DataFrame())
+
+
+##############################################################################################
+# [국내주식] 기본시세 > 주식당일분봉조회[v1_국내주식-022]
+##############################################################################################
+
+async def inquire_time_itemchartprice(
+        env_dv: str,  # [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        fid_cond_mrkt_div_code: str,  # [필수] 조건 시장 분류 코드 (ex. J:KRX, NX:NXT, UN:통합)
+        fid_input_iscd: str,  # [필수] 입력 종목코드 (ex. 123456)
+        fid_input_hour_1: str,  # [필수] 입력 시간1 (ex. 입력시간)
+        fid_pw_data_incu_yn: str,  # [필수] 과거 데이터 포함 여부
+        fid_etc_cls_code: str = ""  # [필수] 기타 구분 코드
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    주식당일분봉조회 API의 asyncio 버전입니다.
+    실전계좌/모의계좌의 경우, 한 번의 호출에 최대 30건까지 확인 가능합니다.
+
+    Args:
+        env_dv (str): [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        fid_cond_mrkt_div_code (str): [필수] 조건 시장 분류 코드 (ex. J:KRX, NX:NXT, UN:통합)
+        fid_input_iscd (str): [필수] 입력 종목코드 (ex. 123456)
+        fid_input_hour_1 (str): [필수] 입력 시간1 (ex. 입력시간)
+        fid_pw_data_incu_yn (str): [필수] 과거 데이터 포함 여부
+        fid_etc_cls_code (str): [필수] 기타 구분 코드
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (output1 데이터, output2 데이터)
+
+    Example:
+        >>> output1, output2 = await inquire_time_itemchartprice(env_dv="real", fid_cond_mrkt_div_code="J", fid_input_iscd="005930", fid_input_hour_1="093000", fid_pw_data_incu_yn="Y")
+        >>> print(output2)
+    """
+    api_url = "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+
+    # 필수 파라미터 검증
+    if env_dv == "" or env_dv is None:
+        raise ValueError("env_dv is required (e.g. 'real:실전, demo:모의')")
+
+    if fid_cond_mrkt_div_code == "" or fid_cond_mrkt_div_code is None:
+        raise ValueError("fid_cond_mrkt_div_code is required (e.g. 'J:KRX, NX:NXT, UN:통합')")
+
+    if fid_input_iscd == "" or fid_input_iscd is None:
+        raise ValueError("fid_input_iscd is required (e.g. '123456')")
+
+    if fid_input_hour_1 == "" or fid_input_hour_1 is None:
+        raise ValueError("fid_input_hour_1 is required (e.g. '입력시간')")
+
+    if fid_pw_data_incu_yn == "" or fid_pw_data_incu_yn is None:
+        raise ValueError("fid_pw_data_incu_yn is required")
+
+    # tr_id 설정 (실전/모의 동일)
+    if env_dv == "real" or env_dv == "demo":
+        tr_id = "FHKST03010200"
+    else:
+        raise ValueError("env_dv can only be real or demo")
+
+    params = {
+        "FID_COND_MRKT_DIV_CODE": fid_cond_mrkt_div_code,
+        "FID_INPUT_ISCD": fid_input_iscd,
+        "FID_INPUT_HOUR_1": fid_input_hour_1,
+        "FID_PW_DATA_INCU_YN": fid_pw_data_incu_yn,
+        "FID_ETC_CLS_CODE": fid_etc_cls_code
+    }
+
+    res = await ka.async_url_fetch(api_url, tr_id, "", params)
+
+    if res.isOK():
+        # output1 (object) -> DataFrame (1행)
+        output1_data = pd.DataFrame(res.getBody().output1, index=[0])
+
+        # output2 (array) -> DataFrame (여러행)
+        output2_data = pd.DataFrame(res.getBody().output2)
+
+        return output1_data, output2_data
+    else:
+        res.printError(url=api_url)
+        return pd.DataFrame(), pd.DataFrame()
+
+
+##############################################################################################
+# [국내주식] 주문/계좌 > 주식잔고조회[v1_국내주식-006]
+##############################################################################################
+
+async def inquire_balance(
+        env_dv: str,  # 실전모의구분
+        cano: str,  # 종합계좌번호
+        acnt_prdt_cd: str,  # 계좌상품코드
+        afhr_flpr_yn: str,  # 시간외단일가·거래소여부
+        inqr_dvsn: str,  # 조회구분
+        unpr_dvsn: str,  # 단가구분
+        fund_sttl_icld_yn: str,  # 펀드결제분포함여부
+        fncg_amt_auto_rdpt_yn: str,  # 융자금액자동상환여부
+        prcs_dvsn: str,  # 처리구분
+        FK100: str = "",  # 연속조회검색조건100
+        NK100: str = "",  # 연속조회키100
+        tr_cont: str = "",  # 연속거래여부
+        max_depth: int = 10  # 최대 연속조회 횟수 제한
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    주식 잔고조회 API의 asyncio 버전입니다.
+    연속조회(tr_cont M/F)가 있으면 다음 페이지를 이어서 조회하고, 페이지 사이의 대기는 이벤트 루프를 멈추지 않습니다.
+
+    Args:
+        env_dv (str): [필수] 실전모의구분 (ex. real:실전, demo:모의)
+        cano (str): [필수] 종합계좌번호 (ex. 계좌번호 체계(8-2)의 앞 8자리)
+        acnt_prdt_cd (str): [필수] 계좌상품코드 (ex. 계좌번호 체계(8-2)의 뒤 2자리)
+        afhr_flpr_yn (str): [필수] 시간외단일가·거래소여부 (ex. N:기본값, Y:시간외단일가, X:NXT)
+        inqr_dvsn (str): [필수] 조회구분 (ex. 01 – 대출일별 | 02 – 종목별)
+        unpr_dvsn (str): [필수] 단가구분 (ex. 01)
+        fund_sttl_icld_yn (str): [필수] 펀드결제분포함여부 (ex. N, Y)
+        fncg_amt_auto_rdpt_yn (str): [필수] 융자금액자동상환여부 (ex. N)
+        prcs_dvsn (str): [필수] 처리구분 (ex. 00: 전일매매포함, 01:전일매매미포함)
+        FK100 (str): 연속조회검색조건100
+        NK100 (str): 연속조회키100
+        tr_cont (str): 연속거래여부
+        max_depth (int): 최대 연속조회 횟수 제한
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: 주식잔고조회 데이터 (output1, output2)
+
+    Example:
+        >>> df1, df2 = await inquire_balance(env_dv="real", cano=trenv.my_acct, acnt_prdt_cd=trenv.my_prod, afhr_flpr_yn="N", inqr_dvsn="01", unpr_dvsn="01", fund_sttl_icld_yn="N", fncg_amt_auto_rdpt_yn="N", prcs_dvsn="00")
+        >>> print(df1)
+        >>> print(df2)
+    """
+    api_url = "/uapi/domestic-stock/v1/trading/inquire-balance"
+
+    # 필수 파라미터 검증
+    if env_dv == "":
+        raise ValueError("env_dv is required (e.g. 'real:실전, demo:모의')")
+
+    if cano == "":
+        raise ValueError("cano is required (e.g. '계좌번호 체계(8-2)의 앞 8자리')")
+
+    if acnt_prdt_cd == "":
+        raise ValueError("acnt_prdt_cd is required (e.g. '계좌번호 체계(8-2)의 뒤 2자리')")
+
+    if afhr_flpr_yn == "":
+        raise ValueError("afhr_flpr_yn is required (e.g. 'N:기본값, Y:시간외단일가, X:NXT')")
+
+    if inqr_dvsn == "":
+        raise ValueError("inqr_dvsn is required (e.g. '01 – 대출일별 | 02 – 종목별')")
+
+    if unpr_dvsn == "":
+        raise ValueError("unpr_dvsn is required (e.g. '01')")
+
+    if fund_sttl_icld_yn == "":
+        raise ValueError("fund_sttl_icld_yn is required (e.g. 'N, Y')")
+
+    if fncg_amt_auto_rdpt_yn == "":
+        raise ValueError("fncg_amt_auto_rdpt_yn is required (e.g. 'N')")
+
+    if prcs_dvsn == "":
+        raise ValueError("prcs_dvsn is required (e.g. '00: 전일매매포함, 01:전일매매미포함')")
+
+    # tr_id 설정
+    if env_dv == "real":
+        tr_id = "TTTC8434R"
+    elif env_dv == "demo":
+        tr_id = "VTTC8434R"
+    else:
+        raise ValueError("env_dv is required (e.g. 'real' or 'demo')")
+
+    params = {
+        "CANO": cano,
+        "ACNT_PRDT_CD": acnt_prdt_cd,
+        "AFHR_FLPR_YN": afhr_flpr_yn,
+        "OFL_YN": "",
+        "INQR_DVSN": inqr_dvsn,
+        "UNPR_DVSN": unpr_dvsn,
+        "FUND_STTL_ICLD_YN": fund_sttl_icld_yn,
+        "FNCG_AMT_AUTO_RDPT_YN": fncg_amt_auto_rdpt_yn,
+        "PRCS_DVSN": prcs_dvsn,
+        "CTX_AREA_FK100": FK100,
+        "CTX_AREA_NK100": NK100
+    }
+
+    # 연속조회 : 페이지별 결과를 모아 DataFrame 은 마지막에 한 번만 생성
+    result = await ka.fetch_pages_async(
+        api_url, tr_id, params,
+        outputs=("output1", "output2"),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont=tr_cont,
+        max_pages=max_depth + 1,
+    )
+
+    if result.error is not None:
+        result.error.printError(url=api_url)
+        return pd.DataFrame(), pd.DataFrame()
+
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logging.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
+    else:
+        logging.info("Data fetch complete.")
+    return tuple(result.frames)
@@ -4,26 +4,61 @@
 
 import asyncio
 import copy
+import hashlib
 import json
 import logging
 import os
+import random
+import re
+import threading
 import time
-from base64 import b64decode
+import weakref
+from base64 import b64decode, urlsafe_b64decode, urlsafe_b64encode
 from collections import namedtuple
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import StringIO
+from urllib.parse import urlsplit
 
+import numpy as np
 import pandas as pd
 
 # pip install requests (패키지설치)
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # 웹 소켓 모듈을 선언한다.
 import websockets
 
 # pip install PyYAML (패키지설치)
 import yaml
+
+# 여러 프로세스 간 호출 속도 제한 공유시 파일 잠금 (POSIX: fcntl, Windows: msvcrt)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# pip install aiohttp (선택 설치, 없으면 비동기 REST 호출은 스레드 풀에서 동기 세션으로 실행)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# pip install orjson 또는 msgspec (선택 설치, 없으면 응답 body 파싱에 표준 json 사용)
+try:
+    import orjson
+
+    _fast_json_loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        _fast_json_loads = msgspec.json.decode
+    except ImportError:
+        _fast_json_loads = None
 from Crypto.Cipher import AES
 
 # pip install pycryptodome
@@ -69,6 +104,336 @@ _base_headers = {
 }
 
 
+########### HTTP 전송 계층 : base URL 별 keep-alive 세션 풀
+
+# 전송 계층 기본 설정, set_transport_config() 로 변경 가능
+# - pool_connections : base URL(호스트) 별로 유지할 커넥션 풀 개수
+# - pool_maxsize     : 커넥션 풀 하나가 동시에 유지하는 최대 커넥션 수 (동시 호출 스레드 수 이상 권장)
+# - keep_alive       : False 이면 매 요청마다 "Connection: close" 로 연결을 끊음
+# - connect_timeout, read_timeout : 요청 타임아웃(초)
+# - retry_total, retry_backoff, retry_status : 일시 장애 재시도 정책 (GET 등 멱등 요청만 재시도, 주문 POST 는 재시도하지 않음)
+# - async_pool_limit : 비동기(aiohttp) 호출시 이벤트 루프당 동시에 열어둘 수 있는 최대 커넥션 수
+_transport_cfg = {
+    "pool_connections": 4,
+    "pool_maxsize": 16,
+    "keep_alive": True,
+    "connect_timeout": 3.05,
+    "read_timeout": 10.0,
+    "retry_total": 3,
+    "retry_backoff": 0.3,
+    "retry_status": (500, 502, 503, 504),
+    "async_pool_limit": 100,
+}
+
+
+class HTTPTransport:
+    """base URL 별로 requests.Session 을 공유하는 스레드 안전 HTTP 전송 계층
+
+    매 호출마다 requests.get/post 를 사용하면 :9443 도메인에 TCP+TLS 연결을 새로 맺기 때문에,
+    base URL(scheme://host:port) 단위로 세션과 커넥션 풀을 재사용하여 handshake 비용을 없앤다.
+
+    Example:
+        >>> transport = HTTPTransport(pool_maxsize=32)
+        >>> res = transport.request("GET", url, headers=headers, params=params)
+        >>> print(transport.get_stats())
+    """
+
+    def __init__(self, **cfg):
+        self._cfg = dict(_transport_cfg)
+        self._cfg.update(cfg)
+        self._sessions: dict = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _base_url(url: str) -> str:
+        u = urlsplit(url)
+        return f"{u.scheme}://{u.netloc}"
+
+    def _new_session(self) -> requests.Session:
+        retry = Retry(
+            total=self._cfg["retry_total"],
+            backoff_factor=self._cfg["retry_backoff"],
+            status_forcelist=self._cfg["retry_status"],
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),  # 주문 등 POST 는 중복 실행 방지를 위해 재시도 제외
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self._cfg["pool_connections"],
+            pool_maxsize=self._cfg["pool_maxsize"],
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self._cfg["keep_alive"]:
+            session.headers["Connection"] = "close"
+        return session
+
+    def session(self, url: str) -> requests.Session:
+        base_url = self._base_url(url)
+        session = self._sessions.get(base_url)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(base_url)
+                if session is None:
+                    session = self._new_session()
+                    self._sessions[base_url] = session
+        return session
+
+    def request(self, method: str, url: str, headers=None, params=None, data=None) -> requests.Response:
+        return self.session(url).request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            timeout=(self._cfg["connect_timeout"], self._cfg["read_timeout"]),
+        )
+
+    def get_stats(self) -> dict:
+        """base URL 별 요청 수, 신규 연결 수, 재사용 횟수, 재사용률 반환"""
+        stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for base_url, session in sessions:
+            adapter = session.get_adapter(base_url)
+            pools = adapter.poolmanager.pools
+            num_requests = 0
+            num_connections = 0
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+            reused = max(num_requests - num_connections, 0)
+            stats[base_url] = {
+                "requests": num_requests,
+                "new_connections": num_connections,
+                "reused": reused,
+                "reuse_ratio": round(reused / num_requests, 4) if num_requests else 0.0,
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_transport = HTTPTransport()
+
+
+# 전송 계층 교체 (테스트용 mock, 프록시 등), request(method, url, headers, params, data) 를 구현한 객체면 사용 가능
+def set_transport(transport):
+    global _transport
+    _transport = transport
+
+
+def get_transport():
+    return _transport
+
+
+# 커넥션 풀 크기, keep-alive, 타임아웃, 재시도 정책 변경 (기존 세션은 닫고 새 설정으로 다시 생성)
+def set_transport_config(**cfg):
+    unknown = set(cfg.keys()) - set(_transport_cfg.keys())
+    if unknown:
+        raise ValueError(f"unknown transport option: {sorted(unknown)}")
+    _transport_cfg.update(cfg)
+    if isinstance(_transport, HTTPTransport):
+        _transport.close()
+        set_transport(HTTPTransport())
+
+
+# 연결 재사용 통계 (폴링 루프에서 handshake 가 반복되는지 확인용)
+def get_transport_stats() -> dict:
+    if hasattr(_transport, "get_stats"):
+        return _transport.get_stats()
+    return {}
+
+
+########### 호출 속도 제한 : app key 별 token bucket
+
+# 호출 속도 제한 기본 설정, set_rate_limit_config() 로 변경 가능
+# - enabled        : False 이면 예전처럼 연속조회/웹소켓 등록 사이에 고정 시간(smart_sleep) 대기
+# - prod, vps      : 실전/모의 app key 별 초당 호출 건수 (유량 안내 기준 실전 20건, 모의 2건)
+# - burst          : 순간적으로 몰아서 보낼 수 있는 호출 건수, 1 이면 일정한 간격으로 분산
+# - shared_file    : True 이면 같은 app key 를 사용하는 여러 프로세스가 config_root 의 파일 잠금으로 호출 간격을 공유
+# - throttle_retry : 서버에서 EGW00201(초당 거래건수 초과) 응답시 대기 후 재요청할 횟수
+_rate_limit_cfg = {
+    "enabled": True,
+    "prod": 20,
+    "vps": 2,
+    "burst": 1,
+    "shared_file": False,
+    "throttle_retry": 2,
+}
+
+# 초당 거래건수 초과 오류 코드
+_THROTTLE_CODE = "EGW00201"
+
+
+def _lockFile(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlockFile(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RateLimiter:
+    """app key 별 호출 속도 제한기 (token bucket 을 GCRA 방식으로 구현)
+
+    호출할 때마다 다음 호출 가능 시각(tat)을 예약하고, 예약된 시각까지 남은 시간만큼만 대기한다.
+    예약은 잠금 안에서, 대기는 잠금 밖에서 하므로 여러 스레드와 asyncio task 가 같은 bucket 을 공유해도
+    실제 진행 중인 호출 수에 맞추어 필요한 만큼만 기다린다.
+    shared_path 를 지정하면 tat 를 파일에 저장하여 여러 프로세스가 같은 bucket 을 공유한다.
+
+    Example:
+        >>> limiter = RateLimiter(rate=20)
+        >>> waited = limiter.acquire()  # 동기 코드
+        >>> waited = await limiter.acquire_async()  # asyncio 코드
+    """
+
+    def __init__(self, rate: float, burst: int = 1, shared_path: str = None):
+        self.rate = rate
+        self._interval = 1.0 / rate
+        self._tolerance = (max(burst, 1) - 1) * self._interval
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        self._shared_path = shared_path
+        self._stats = {"calls": 0, "waited_calls": 0, "total_wait": 0.0, "max_wait": 0.0, "throttled": 0}
+
+    def _reserveAt(self, tat: float, now: float, penalty: float) -> tuple:
+        tat = max(tat, now) + penalty
+        wait = max(tat - self._tolerance - now, 0.0)
+        return tat + self._interval, wait
+
+    def _reserveShared(self, now: float, penalty: float) -> float:
+        with open(self._shared_path, "a+", encoding="utf-8") as f:
+            _lockFile(f)
+            try:
+                f.seek(0)
+                text = f.read().strip()
+                tat = float(text) if text else 0.0
+                tat, wait = self._reserveAt(tat, now, penalty)
+                f.seek(0)
+                f.truncate()
+                f.write(f"{tat:.6f}")
+                f.flush()
+            finally:
+                _unlockFile(f)
+        return wait
+
+    def _reserve(self, penalty: float = 0.0) -> float:
+        with self._lock:
+            now = time.time()  # 프로세스 간 공유를 위해 wall clock 사용
+            if self._shared_path:
+                wait = self._reserveShared(now, penalty)
+            else:
+                self._tat, wait = self._reserveAt(self._tat, now, penalty)
+
+            if penalty:
+                self._stats["throttled"] += 1
+                return wait
+
+            self._stats["calls"] += 1
+            if wait > 0:
+                self._stats["waited_calls"] += 1
+                self._stats["total_wait"] += wait
+                self._stats["max_wait"] = max(self._stats["max_wait"], wait)
+        return wait
+
+    def acquire(self) -> float:
+        """호출 1건을 예약하고 필요한 만큼 대기, 대기한 시간(초) 반환"""
+        wait = self._reserve()
+        if wait > 0:
+            if _DEBUG:
+                print(f"[RateLimit] Sleeping {wait:.3f}s ")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """acquire() 의 asyncio 버전, 이벤트 루프를 멈추지 않고 대기"""
+        wait = self._reserve()
+        if wait > 0:
+            if _DEBUG:
+                print(f"[RateLimit] Sleeping {wait:.3f}s ")
+            await asyncio.sleep(wait)
+        return wait
+
+    def throttled(self):
+        """서버에서 초당 거래건수 초과(EGW00201) 응답을 받은 경우, 1초 동안 새 호출을 보내지 않도록 예약을 미룸"""
+        self._reserve(penalty=1.0)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["rate"] = self.rate
+        stats["avg_wait"] = round(stats["total_wait"] / stats["calls"], 6) if stats["calls"] else 0.0
+        return stats
+
+
+_rate_limiters: dict = {}
+_rate_limiters_lock = threading.Lock()
+
+
+# 현재 환경(app key, 실전/모의)의 호출 속도 제한기, 같은 app key 는 같은 제한기를 공유
+def get_rate_limiter(app_key: str = None):
+    if not _rate_limit_cfg["enabled"]:
+        return None
+
+    if app_key is None:
+        app_key = getattr(_TRENV, "my_app", "")
+    key = hashlib.sha256(f"{app_key}:{_isPaper}".encode("utf-8")).hexdigest()[:16]  # app key 원문은 파일명/통계에 남기지 않음
+
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        with _rate_limiters_lock:
+            limiter = _rate_limiters.get(key)
+            if limiter is None:
+                shared_path = None
+                if _rate_limit_cfg["shared_file"]:
+                    shared_path = os.path.join(config_root, f"ratelimit_{key}")
+                limiter = RateLimiter(
+                    rate=_rate_limit_cfg["vps" if _isPaper else "prod"],
+                    burst=_rate_limit_cfg["burst"],
+                    shared_path=shared_path,
+                )
+                _rate_limiters[key] = limiter
+    return limiter
+
+
+# 초당 호출 건수, burst, 프로세스 간 공유 여부 등 변경 (이미 만든 제한기는 버리고 새 설정으로 다시 생성)
+def set_rate_limit_config(**cfg):
+    unknown = set(cfg.keys()) - set(_rate_limit_cfg.keys())
+    if unknown:
+        raise ValueError(f"unknown rate limit option: {sorted(unknown)}")
+    _rate_limit_cfg.update(cfg)
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
+
+
+# app key 별 호출 건수, 대기 건수, 누적/평균/최대 대기시간(초), EGW00201 발생 건수
+def get_rate_limit_stats() -> dict:
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.items())
+    return {key: limiter.get_stats() for key, limiter in limiters}
+
+
+def _isThrottled(res) -> bool:
+    return _THROTTLE_CODE in (res.text or "")
+
+
 # 토큰 발급 받아 저장 (토큰값, 토큰 유효시간,1일, 6시간 이내 발급신청시는 기존 토큰값과 동일, 발급시 알림톡 발송)
 def save_token(my_token, my_expired):
     # print(type(my_expired), my_expired)
@@ -142,7 +507,7 @@ def isPaperTrading():  # 모의투자 매매
 def changeTREnv(token_key, svr="prod", product=_cfg["my_prod"]):
     cfg = dict()
 
-    global _isPaper
+    global _isPaper, _smartSleep
     if svr == "prod":  # 실전투자
         ak1 = "my_app"  # 실전투자용 앱키
         ak2 = "my_sec"  # 실전투자용 앱시크리트
@@ -217,8 +582,8 @@ def auth(svr="prod", product=_cfg["my_prod"], url=None):
     # print("saved_token: ", saved_token)
     if saved_token is None:  # 기존 발급 토큰 확인이 안되면 발급처리
         url = f"{_cfg[svr]}/oauth2/tokenP"
-        res = requests.post(
-            url, data=json.dumps(p), headers=_getBaseHeader()
+        res = _transport.request(
+            "POST", url, data=json.dumps(p), headers=_getBaseHeader()
         )  # 토큰 발급
         rescode = res.status_code
         if rescode == 200:  # 토큰 정상 발급
@@ -259,13 +624,28 @@ def getEnv():
     return _cfg
 
 
+# 연속조회 사이 지연, 호출 속도 제한기(get_rate_limiter) 사용시에는 _url_fetch 에서 호출 직전에 필요한 만큼만 대기하므로 고정 지연 없음
 def smart_sleep():
+    if get_rate_limiter() is not None:
+        return
+
     if _DEBUG:
         print(f"[RateLimit] Sleeping {_smartSleep}s ")
 
     time.sleep(_smartSleep)
 
 
+# asyncio 코드에서 사용, 이벤트 루프를 멈추지 않고 대기
+async def smart_sleep_async():
+    if get_rate_limiter() is not None:
+        return
+
+    if _DEBUG:
+        print(f"[RateLimit] Sleeping {_smartSleep}s ")
+
+    await asyncio.sleep(_smartSleep)
+
+
 def getTREnv():
     return _TRENV
 
@@ -277,7 +657,10 @@ def getTREnv():
 def set_order_hash_key(h, p):
     url = f"{getTREnv().my_url}/uapi/hashkey"  # hashkey 발급 API URL
 
-    res = requests.post(url, data=json.dumps(p), headers=h)
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        limiter.acquire()
+    res = _transport.request("POST", url, data=json.dumps(p), headers=h)
     rescode = res.status_code
     if rescode == 200:
         h["hashkey"] = _getResultObject(res.json()).HASH
@@ -290,6 +673,7 @@ class APIResp:
     def __init__(self, resp):
         self._rescode = resp.status_code
         self._resp = resp
+        self._json = _respJson(resp)
         self._header = self._setHeader()
         self._body = self._setBody()
         self._err_code = self._body.msg_cd
@@ -303,14 +687,14 @@ class APIResp:
         for x in self._resp.headers.keys():
             if x.islower():
                 fld[x] = self._resp.headers.get(x)
-        _th_ = namedtuple("header", fld.keys())
+        _th_ = _namedtupleType("header", tuple(fld.keys()))
 
         return _th_(**fld)
 
     def _setBody(self):
-        _tb_ = namedtuple("body", self._resp.json().keys())
+        _tb_ = _namedtupleType("body", tuple(self._json.keys()))
 
-        return _tb_(**self._resp.json())
+        return _tb_(**self._json)
 
     def getHeader(self):
         return self._header
@@ -321,6 +705,10 @@ class APIResp:
     def getResponse(self):
         return self._resp
 
+    # output 필드를 타입 변환된 컬럼으로 반환 (decode_output 참고), 응답 header 의 tr_id 로 컬럼 타입 캐시
+    def getOutput(self, name="output", mode="pandas"):
+        return decode_output(getattr(self._body, name, None), getattr(self._header, "tr_id", None), name, mode)
+
     def isOK(self):
         try:
             if self.getBody().rt_cd == "0":
@@ -389,6 +777,9 @@ class APIRespError(APIResp):
 
         return EmptyBody()
 
+    def getOutput(self, name="output", mode="pandas"):
+        return decode_output(None, None, name, mode)
+
     def getHeader(self):
         # 빈 객체 리턴
         class EmptyHeader:
@@ -411,17 +802,142 @@ class APIRespError(APIResp):
             print(f"URL: {url}")
 
 
-########### API call wrapping : API 호출 공통
+########### 응답 디코딩 : TR 별 컬럼 타입 캐시, 숫자 문자열을 numpy 컬럼으로 변환
+
+# 응답 body/header namedtuple 타입 캐시 (같은 필드 구성이면 타입을 다시 만들지 않음)
+_namedtuple_cache: dict = {}
+
+# (tr_id, output 필드명, 컬럼 구성) 별 컬럼 타입 ("i8": int64, "f8": float64, "str": 문자열)
+_schema_cache: dict = {}
+_schema_lock = threading.Lock()
+
+# 숫자로 보이더라도 문자열로 유지할 컬럼 (종목코드, 일자, 시각, 구분코드, 주문번호 등)
+_STR_FIELD = re.compile(r"(date|_dt$|dt$|hour|time|tmd|iscd|code|cd$|yn$|name|_nm$|isnm|sign|dvsn|odno|no$|pdno|id$|cano|_tp$)")
+_NUMBER = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+
+def _namedtupleType(name, fields):
+    key = (name, fields)
+    _nt_ = _namedtuple_cache.get(key)
+    if _nt_ is None:
+        _nt_ = namedtuple(name, fields)
+        _namedtuple_cache[key] = _nt_
+    return _nt_
+
+
+# 응답 body 를 한번만 파싱 (orjson / msgspec 설치시 사용)
+def _respJson(resp):
+    if _fast_json_loads is None:
+        return resp.json()
+    content = getattr(resp, "content", None)
+    return _fast_json_loads(content if content else resp.text)
+
+
+def _inferKind(col, values):
+    # 컬럼명 규칙과 값으로 타입 추정, 값이 모두 비어 있으면 None (다음 응답에서 다시 추정)
+    if _STR_FIELD.search(col):
+        return "str"
+    kind = None
+    for v in values:
+        if v is None or v == "":
+            continue
+        if not isinstance(v, str):
+            v = str(v)
+        if not _NUMBER.match(v):
+            return "str"
+        digits = v.lstrip("+-")
+        if len(digits) > 1 and digits[0] == "0" and digits[1] != ".":  # 앞자리 0 은 코드값
+            return "str"
+        if kind != "f8":
+            kind = "i8" if digits.isdigit() else "f8"
+    return kind
+
+
+def _toColumn(values, kind):
+    # 지정한 타입으로 변환, 실패시 int64 -> float64 -> 문자열 순으로 변경
+    if kind == "i8":
+        try:
+            return np.array(values, dtype=np.int64), "i8"
+        except (ValueError, OverflowError, TypeError):
+            kind = "f8"
+    if kind == "f8":
+        try:
+            return np.array(values, dtype=np.float64), "f8"
+        except (ValueError, TypeError):
+            try:
+                return np.array([np.nan if v == "" or v is None else v for v in values], dtype=np.float64), "f8"
+            except (ValueError, TypeError):
+                pass
+    return np.array(values, dtype=object), "str"
+
+
+def decode_output(data, tr_id: str = None, name: str = "output", mode: str = "pandas"):
+    """응답 output 필드를 컬럼 단위로 변환
+
+    숫자 문자열 컬럼(stck_prpr, acml_vol, prdy_ctrt 등)은 int64/float64 numpy 배열로, 코드/일자/시각 컬럼은 문자열로 유지한다.
+    tr_id 를 지정하면 처음 응답에서 추정한 컬럼 타입을 TR 별로 캐시하여 다음 응답부터는 추정 없이 바로 변환한다.
+
+    Args:
+        data: 응답 output 필드 (dict 1건 또는 dict 목록)
+        tr_id (str): 거래ID, 컬럼 타입 캐시 키
+        name (str): output 필드명 (output, output1, output2 ...)
+        mode (str): pandas (DataFrame), numpy (컬럼명: ndarray dict), records (dict 목록), arrow (pyarrow.Table)
+
+    Example:
+        >>> res = ka._url_fetch(api_url, tr_id, "", params)
+        >>> cols = ka.decode_output(res.getBody().output, tr_id, mode="numpy")
+        >>> cols["stck_prpr"].mean()
+    """
+    rows = [data] if isinstance(data, dict) else list(data or [])
+    fields = tuple(rows[0].keys()) if rows else ()
+    raw = {col: [row.get(col, "") for row in rows] for col in fields}
+
+    schema = None
+    if tr_id is not None:
+        key = (tr_id, name, fields)
+        with _schema_lock:
+            schema = _schema_cache.setdefault(key, {})
+
+    columns = {}
+    for col, values in raw.items():
+        kind = schema.get(col) if schema is not None else None
+        if kind is None:
+            kind = _inferKind(col, values)
+        columns[col], converted = _toColumn(values, kind or "str")
+        if schema is not None and kind is not None:
+            schema[col] = converted
+
+    if mode == "numpy":
+        return columns
+    if mode == "pandas":
+        return pd.DataFrame(columns, columns=list(fields))
+    if mode == "records":
+        lists = [arr.tolist() for arr in columns.values()]
+        return [dict(zip(fields, values)) for values in zip(*lists)]
+    if mode == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("mode='arrow' requires pyarrow (pip install pyarrow)")
+        return pa.table({col: (arr.tolist() if arr.dtype == object else arr) for col, arr in columns.items()})
+    raise ValueError(f"unknown decode mode: {mode}")
+
+
+# 캐시된 컬럼 타입 (tr_id 지정시 해당 TR 만)
+def get_decode_schema(tr_id: str = None) -> dict:
+    with _schema_lock:
+        return {
+            f"{key[0]}.{key[1]}": dict(schema)
+            for key, schema in _schema_cache.items()
+            if tr_id is None or key[0] == tr_id
+        }
 
 
-def _url_fetch(
-        api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True
-):
-    url = f"{getTREnv().my_url}{api_url}"
+########### API call wrapping : API 호출 공통
 
-    headers = _getBaseHeader()  # 기본 header 값 정리
 
-    # 추가 Header 설정
+# API 호출 header 구성 (TR id, 연속조회 여부, 추가 header), _url_fetch / async_url_fetch 공통
+def _setApiHeaders(headers, ptr_id, tr_cont, appendHeaders=None):
     tr_id = ptr_id
     if ptr_id[0] in ("T", "J", "C"):  # 실전투자용 TR id 체크
         if isPaperTrading():  # 모의투자용 TR id 식별
@@ -436,18 +952,11 @@ def _url_fetch(
             for x in appendHeaders.keys():
                 headers[x] = appendHeaders.get(x)
 
-    if _DEBUG:
-        print("< Sending Info >")
-        print(f"URL: {url}, TR: {tr_id}")
-        print(f"<header>\n{headers}")
-        print(f"<body>\n{params}")
+    return tr_id
 
-    if postFlag:
-        # if (hashFlag): set_order_hash_key(headers, params)
-        res = requests.post(url, headers=headers, data=json.dumps(params))
-    else:
-        res = requests.get(url, headers=headers, params=params)
 
+# HTTP 응답을 APIResp / APIRespError 로 변환, _url_fetch / async_url_fetch 공통
+def _getApiResp(res):
     if res.status_code == 200:
         ar = APIResp(res)
         if _DEBUG:
@@ -458,6 +967,469 @@ def _url_fetch(
         return APIRespError(res.status_code, res.text)
 
 
+def _url_fetch(
+        api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True
+):
+    url = f"{getTREnv().my_url}{api_url}"
+
+    headers = _getBaseHeader()  # 기본 header 값 정리
+
+    # 추가 Header 설정
+    tr_id = _setApiHeaders(headers, ptr_id, tr_cont, appendHeaders)
+
+    if _DEBUG:
+        print("< Sending Info >")
+        print(f"URL: {url}, TR: {tr_id}")
+        print(f"<header>\n{headers}")
+        print(f"<body>\n{params}")
+
+    # 호출 속도 제한, EGW00201(초당 거래건수 초과)은 서버에서 처리하지 않은 요청이므로 대기 후 재요청
+    limiter = get_rate_limiter()
+    for retry in range(_rate_limit_cfg["throttle_retry"] + 1):
+        if limiter is not None:
+            limiter.acquire()
+
+        if postFlag:
+            # if (hashFlag): set_order_hash_key(headers, params)
+            res = _transport.request("POST", url, headers=headers, data=json.dumps(params))
+        else:
+            res = _transport.request("GET", url, headers=headers, params=params)
+
+        if limiter is None or not _isThrottled(res):
+            break
+        limiter.throttled()
+
+    return _getApiResp(res)
+
+
+########### asyncio REST 호출 : _url_fetch / auth 의 비동기 버전
+# 하나의 이벤트 루프에서 수백 건의 시세/잔고 조회를 동시에 진행하면서 웹소켓 수신도 함께 처리하기 위해 사용
+
+
+class _AsyncHTTPResponse:
+    """aiohttp 응답 본문을 미리 읽어 requests.Response 와 같은 형태(status_code, headers, text, json())로 감싼 객체"""
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHTTPTransport:
+    """asyncio 용 HTTP 전송 계층
+
+    aiohttp 가 설치되어 있으면 이벤트 루프별로 ClientSession(커넥션 풀)을 하나씩 만들어 공유하고,
+    설치되어 있지 않으면 동기 전송 계층(get_transport())의 요청을 스레드 풀에서 실행한다.
+    재시도는 동기 전송 계층과 같은 정책으로 GET 요청에만 적용한다.
+    세션은 close() 를 호출하지 않아도 asyncio.run() 이 끝날 때(loop.shutdown_asyncgens) 닫힌다.
+    세션과 closer 는 루프를 참조하므로(WeakKeyDictionary 로는 지워지지 않음) 세션을 닫을 때 항목을 직접 제거한다.
+    """
+
+    def __init__(self):
+        self._sessions = weakref.WeakKeyDictionary()  # event loop -> aiohttp.ClientSession
+        self._closers = weakref.WeakKeyDictionary()  # event loop -> 세션을 닫는 async generator
+
+    def _session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            if _transport_cfg["keep_alive"]:
+                connector = aiohttp.TCPConnector(limit=_transport_cfg["async_pool_limit"])
+            else:
+                connector = aiohttp.TCPConnector(limit=_transport_cfg["async_pool_limit"], force_close=True)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=_transport_cfg["connect_timeout"],
+                sock_read=_transport_cfg["read_timeout"],
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._sessions[loop] = session
+            # 루프 종료시 shutdown_asyncgens() 가 closer 의 finally 를 실행하여 세션을 닫음
+            closer = self._closer(loop, session)
+            self._closers[loop] = closer
+            asyncio.ensure_future(closer.__anext__(), loop=loop)
+        return session
+
+    async def _closer(self, loop, session):
+        try:
+            yield
+        finally:
+            if self._sessions.get(loop) is session:
+                self._sessions.pop(loop, None)
+                self._closers.pop(loop, None)
+            if not session.closed:
+                await session.close()
+
+    async def request(self, method: str, url: str, headers=None, params=None, data=None):
+        if aiohttp is None:
+            return await asyncio.to_thread(get_transport().request, method, url, headers, params, data)
+
+        session = self._session()
+        retry = 0
+        while True:
+            async with session.request(method, url, headers=headers, params=params, data=data) as resp:
+                text = await resp.text()
+                if (
+                        method == "GET"
+                        and resp.status in _transport_cfg["retry_status"]
+                        and retry < _transport_cfg["retry_total"]
+                ):
+                    retry += 1
+                    await asyncio.sleep(_transport_cfg["retry_backoff"] * (2 ** (retry - 1)))
+                    continue
+                return _AsyncHTTPResponse(resp.status, resp.headers, text)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        self._closers.pop(loop, None)  # 이미 닫은 세션은 closer 에서 다시 닫지 않음
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_async_transport = AsyncHTTPTransport()
+# 이벤트 루프별 토큰 발급 lock (asyncio.Lock 은 처음 사용한 루프에 묶이므로 asyncio.run() 을 여러 번 호출하는 경우 대비)
+# event loop -> (asyncio.Lock, 루프 종료시 항목을 지우는 async generator)
+_async_auth_locks = weakref.WeakKeyDictionary()
+
+
+async def _dropAuthLock(loop):
+    try:
+        yield
+    finally:
+        _async_auth_locks.pop(loop, None)
+
+
+def _asyncAuthLock():
+    loop = asyncio.get_running_loop()
+    entry = _async_auth_locks.get(loop)
+    if entry is None:
+        # lock 이 루프를 참조하므로 루프 종료시(loop.shutdown_asyncgens) 직접 제거
+        finalizer = _dropAuthLock(loop)
+        entry = _async_auth_locks[loop] = (asyncio.Lock(), finalizer)
+        asyncio.ensure_future(finalizer.__anext__(), loop=loop)
+    return entry[0]
+
+
+def set_async_transport(transport):
+    global _async_transport
+    _async_transport = transport
+
+
+def get_async_transport():
+    return _async_transport
+
+
+# 비동기 토큰 발급, 저장된 토큰이 없을 때만 토큰 발급 API를 비동기로 호출하고 나머지 처리는 auth()와 동일
+# 여러 task 가 동시에 호출해도 토큰 발급은 한 번만 진행
+async def async_auth(svr="prod", product=_cfg["my_prod"]):
+    async with _asyncAuthLock():
+        if read_token() is None:
+            p = {
+                "grant_type": "client_credentials",
+            }
+            if svr == "prod":  # 실전투자
+                ak1 = "my_app"  # 앱키 (실전투자용)
+                ak2 = "my_sec"  # 앱시크리트 (실전투자용)
+            elif svr == "vps":  # 모의투자
+                ak1 = "paper_app"  # 앱키 (모의투자용)
+                ak2 = "paper_sec"  # 앱시크리트 (모의투자용)
+
+            p["appkey"] = _cfg[ak1]
+            p["appsecret"] = _cfg[ak2]
+
+            url = f"{_cfg[svr]}/oauth2/tokenP"
+            res = await _async_transport.request(
+                "POST", url, data=json.dumps(p), headers=copy.deepcopy(_base_headers)
+            )  # 토큰 발급
+            if res.status_code == 200:  # 토큰 정상 발급
+                body = _getResultObject(res.json())
+                save_token(body.access_token, body.access_token_token_expired)  # 새로 발급 받은 토큰 저장
+            else:
+                print("Get Authentification token fail!\nYou have to restart your app!!!")
+                return
+
+        # 저장된 토큰으로 환경 설정 (네트워크 호출 없음)
+        auth(svr, product)
+
+
+# 비동기 토큰 유효시간 체크, 만료된 토큰이면 재발급처리
+async def async_reAuth(svr="prod", product=_cfg["my_prod"]):
+    n2 = datetime.now()
+    if (n2 - _last_auth_time).seconds >= 86400:  # 유효시간 1일
+        await async_auth(svr, product)
+
+
+async def _getBaseHeader_async():
+    if _autoReAuth:
+        await async_reAuth()
+    return copy.deepcopy(_base_headers)
+
+
+async def async_url_fetch(
+        api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True
+):
+    url = f"{getTREnv().my_url}{api_url}"
+
+    headers = await _getBaseHeader_async()  # 기본 header 값 정리
+
+    # 추가 Header 설정
+    tr_id = _setApiHeaders(headers, ptr_id, tr_cont, appendHeaders)
+
+    if _DEBUG:
+        print("< Sending Info >")
+        print(f"URL: {url}, TR: {tr_id}")
+        print(f"<header>\n{headers}")
+        print(f"<body>\n{params}")
+
+    # 호출 속도 제한은 동기 호출과 같은 app key 별 제한기를 공유
+    limiter = get_rate_limiter()
+    for retry in range(_rate_limit_cfg["throttle_retry"] + 1):
+        if limiter is not None:
+            await limiter.acquire_async()
+
+        if postFlag:
+            res = await _async_transport.request("POST", url, headers=headers, data=json.dumps(params))
+        else:
+            res = await _async_transport.request("GET", url, headers=headers, params=params)
+
+        if limiter is None or not _isThrottled(res):
+            break
+        limiter.throttled()
+
+    return _getApiResp(res)
+
+
+########### 연속조회 : tr_cont / CTX_AREA 연속조회키를 따라 반복 조회
+
+# 연속조회 결과 한 페이지
+# - res    : 응답 (APIResp, 오류시 APIRespError)
+# - page   : 0 부터 시작하는 페이지 번호 (resume 으로 이어받은 경우 이어서 증가)
+# - cursor : 다음 페이지를 조회할 수 있는 resume 토큰, 마지막 페이지면 None (오류 페이지는 같은 페이지를 다시 조회하는 토큰)
+Page = namedtuple("Page", ["res", "page", "cursor"])
+
+# 여러 페이지를 모은 결과
+# - frames : outputs 순서대로 모든 페이지를 합친 DataFrame
+# - pages  : 조회한 페이지 수
+# - cursor : 모두 조회하지 못한 경우(max_pages 도달 또는 오류) 이어서 조회할 resume 토큰, 완료시 None
+# - error  : 오류로 중단된 경우 해당 응답, 정상 완료시 None
+PagedResult = namedtuple("PagedResult", ["frames", "pages", "cursor", "error"])
+
+
+def _encodeCursor(api_url, ptr_id, ctx, page) -> str:
+    data = {"url": api_url, "tr_id": ptr_id, "ctx": ctx, "page": page}
+    return urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+# resume 토큰 해석, 다른 API 의 토큰이면 ValueError
+def decode_cursor(cursor: str, api_url: str = None, ptr_id: str = None) -> dict:
+    try:
+        data = json.loads(urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError(f"invalid pagination cursor: {cursor!r}")
+    if (api_url is not None and data.get("url") != api_url) or (ptr_id is not None and data.get("tr_id") != ptr_id):
+        raise ValueError(f"pagination cursor belongs to {data.get('url')} ({data.get('tr_id')})")
+    return data
+
+
+def _pageSetup(api_url, ptr_id, params, tr_cont, resume):
+    params = dict(params)
+    page = 0
+    if resume:
+        data = decode_cursor(resume, api_url, ptr_id)
+        params.update(data["ctx"])
+        tr_cont = "N"
+        page = data["page"]
+    return params, tr_cont, page
+
+
+def _pageNext(res, api_url, ptr_id, params, ctx_keys, page):
+    # 다음 페이지 요청 파라미터 갱신, 마지막 페이지면 None 반환
+    tr_cont = getattr(res.getHeader(), "tr_cont", "")
+    if tr_cont not in ["M", "F"]:  # 다음 페이지 없음
+        return None
+    body = res.getBody()
+    ctx = {key: getattr(body, key.lower(), "") for key in ctx_keys}
+    params.update(ctx)
+    return _encodeCursor(api_url, ptr_id, ctx, page + 1)
+
+
+def paginate(
+        api_url: str,
+        ptr_id: str,
+        params: dict,
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont: str = "",
+        max_pages: int = None,
+        resume: str = None,
+        appendHeaders=None,
+        postFlag: bool = False,
+):
+    """연속조회 API 를 재귀 없이 한 페이지씩 조회하는 generator
+
+    tr_cont 응답 헤더가 M/F 인 동안 응답 body 의 연속조회키(ctx_keys 의 소문자 필드)를 다음 요청에 넣어 반복 조회한다.
+    페이지마다 Page(res, page, cursor) 를 반환하며, cursor 를 저장해 두면 중단된 조회를 resume 으로 이어서 조회할 수 있다.
+    오류 응답은 해당 페이지를 다시 조회하는 cursor 와 함께 반환하고 종료한다.
+
+    Args:
+        api_url (str): API URL
+        ptr_id (str): 거래ID
+        params (dict): 요청 파라미터 (연속조회키 포함)
+        ctx_keys (tuple): 연속조회키 요청 파라미터명 (ex. CTX_AREA_FK100, CTX_AREA_NK100 / CTX_AREA_FK200, CTX_AREA_NK200)
+        tr_cont (str): 첫 요청의 연속거래여부
+        max_pages (int): 최대 조회 페이지 수 (None: 제한 없음)
+        resume (str): 이전 조회에서 받은 cursor, 지정시 해당 위치부터 이어서 조회
+
+    Example:
+        >>> for page in ka.paginate(api_url, tr_id, params, ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200")):
+        ...     save(page.res.getBody().output1)
+        ...     checkpoint(page.cursor)
+    """
+    params, tr_cont, page = _pageSetup(api_url, ptr_id, params, tr_cont, resume)
+    current = resume
+    count = 0
+
+    while max_pages is None or count < max_pages:
+        res = _url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders, postFlag)
+        if not res.isOK():
+            yield Page(res, page, current or _encodeCursor(api_url, ptr_id, {key: params.get(key, "") for key in ctx_keys}, page))
+            return
+
+        current = _pageNext(res, api_url, ptr_id, params, ctx_keys, page)
+        yield Page(res, page, current)
+        count += 1
+        if current is None:
+            return
+
+        logging.info("Call Next page...")
+        smart_sleep()  # 호출 속도 제한기 미사용시 시스템 안정적 운영을 위한 지연
+        tr_cont = "N"
+        page += 1
+
+
+async def paginate_async(
+        api_url: str,
+        ptr_id: str,
+        params: dict,
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont: str = "",
+        max_pages: int = None,
+        resume: str = None,
+        appendHeaders=None,
+        postFlag: bool = False,
+):
+    """paginate() 의 asyncio 버전 (async for 로 사용), async_url_fetch 사용"""
+    params, tr_cont, page = _pageSetup(api_url, ptr_id, params, tr_cont, resume)
+    current = resume
+    count = 0
+
+    while max_pages is None or count < max_pages:
+        res = await async_url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders, postFlag)
+        if not res.isOK():
+            yield Page(res, page, current or _encodeCursor(api_url, ptr_id, {key: params.get(key, "") for key in ctx_keys}, page))
+            return
+
+        current = _pageNext(res, api_url, ptr_id, params, ctx_keys, page)
+        yield Page(res, page, current)
+        count += 1
+        if current is None:
+            return
+
+        logging.info("Call Next page...")
+        await smart_sleep_async()
+        tr_cont = "N"
+        page += 1
+
+
+class _PageCollector:
+    # 페이지별 output 을 레코드 목록으로 모아 두었다가 마지막에 DataFrame 으로 한번만 변환 (페이지마다 concat 하지 않음)
+    def __init__(self, outputs, ptr_id=None, mode=None):
+        self.outputs = outputs
+        self.ptr_id = ptr_id
+        self.mode = mode
+        self.records = [[] for _ in outputs]
+        self.pages = 0
+        self.cursor = None
+        self.error = None
+
+    def add(self, page):
+        self.cursor = page.cursor
+        if not page.res.isOK():
+            self.error = page.res
+            return
+        self.pages += 1
+        body = page.res.getBody()
+        for i, name in enumerate(self.outputs):
+            data = getattr(body, name, None)
+            if isinstance(data, dict):
+                self.records[i].append(data)
+            elif data:
+                self.records[i].extend(data)
+
+    def result(self):
+        if self.mode is None:
+            frames = [pd.DataFrame.from_records(rows) for rows in self.records]
+        else:
+            frames = [decode_output(rows, self.ptr_id, name, self.mode) for name, rows in zip(self.outputs, self.records)]
+        return PagedResult(frames, self.pages, self.cursor, self.error)
+
+
+def fetch_pages(
+        api_url: str,
+        ptr_id: str,
+        params: dict,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont: str = "",
+        max_pages: int = None,
+        resume: str = None,
+        appendHeaders=None,
+        postFlag: bool = False,
+        mode: str = None,
+) -> PagedResult:
+    """연속조회 API 의 모든 페이지를 조회하여 output 별 DataFrame 으로 반환
+
+    Args:
+        outputs (tuple): DataFrame 으로 만들 응답 body 필드 (ex. ("output1", "output2"))
+        mode (str): None 이면 응답 그대로(문자열) DataFrame, 지정시 decode_output 의 mode 로 타입 변환 (pandas, numpy, records, arrow)
+        그 외 인자는 paginate() 와 동일
+
+    Returns:
+        PagedResult: (frames, pages, cursor, error), 모두 조회하지 못하면 cursor 로 resume 가능
+
+    Example:
+        >>> result = ka.fetch_pages(api_url, tr_id, params, outputs=("output1", "output2"), max_pages=50)
+        >>> df1, df2 = result.frames
+        >>> if result.cursor: result = ka.fetch_pages(api_url, tr_id, params, outputs=("output1", "output2"), resume=result.cursor)
+    """
+    collector = _PageCollector(outputs, ptr_id, mode)
+    for page in paginate(api_url, ptr_id, params, ctx_keys, tr_cont, max_pages, resume, appendHeaders, postFlag):
+        collector.add(page)
+    return collector.result()
+
+
+async def fetch_pages_async(
+        api_url: str,
+        ptr_id: str,
+        params: dict,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont: str = "",
+        max_pages: int = None,
+        resume: str = None,
+        appendHeaders=None,
+        postFlag: bool = False,
+        mode: str = None,
+) -> PagedResult:
+    """fetch_pages() 의 asyncio 버전"""
+    collector = _PageCollector(outputs, ptr_id, mode)
+    async for page in paginate_async(api_url, ptr_id, params, ctx_keys, tr_cont, max_pages, resume, appendHeaders, postFlag):
+        collector.add(page)
+    return collector.result()
+
+
 # auth()
 # print("Pass through the end of the line")
 
@@ -477,7 +1449,6 @@ def _getBaseHeader_ws():
 
 
 def auth_ws(svr="prod", product=_cfg["my_prod"]):
-    p = {"grant_type": "client_credentials"}
     if svr == "prod":
         ak1 = "my_app"
         ak2 = "my_sec"
@@ -485,15 +1456,8 @@ def auth_ws(svr="prod", product=_cfg["my_prod"]):
         ak1 = "paper_app"
         ak2 = "paper_sec"
 
-    p["appkey"] = _cfg[ak1]
-    p["secretkey"] = _cfg[ak2]
-
-    url = f"{_cfg[svr]}/oauth2/Approval"
-    res = requests.post(url, data=json.dumps(p), headers=_getBaseHeader())  # 토큰 발급
-    rescode = res.status_code
-    if rescode == 200:  # 토큰 정상 발급
-        approval_key = _getResultObject(res.json()).approval_key
-    else:
+    approval_key = _issueApprovalKey(_cfg[ak1], _cfg[ak2], svr)  # 토큰 발급
+    if approval_key is None:
         print("Get Approval token fail!\nYou have to restart your app!!!")
         return
 
@@ -593,12 +1557,31 @@ def system_resp(data):
     return nt2(**d)
 
 
+# key 별 AES 복호화 객체 캐시
+# CBC 객체는 복호화할 때마다 iv 가 바뀌므로 재사용할 수 없어, 상태가 없는 ECB 객체를 캐시하고 CBC 연결(xor)은 직접 처리
+_aes_ciphers: dict = {}
+
+
+def _aesCipher(key: str):
+    cipher = _aes_ciphers.get(key)
+    if cipher is None:
+        cipher = AES.new(key.encode("utf-8"), AES.MODE_ECB)
+        _aes_ciphers[key] = cipher
+    return cipher
+
+
 def aes_cbc_base64_dec(key, iv, cipher_text):
     if key is None or iv is None:
         raise AttributeError("key and iv cannot be None")
 
-    cipher = AES.new(key.encode("utf-8"), AES.MODE_CBC, iv.encode("utf-8"))
-    return bytes.decode(unpad(cipher.decrypt(b64decode(cipher_text)), AES.block_size))
+    data = b64decode(cipher_text)
+    if not data or len(data) % AES.block_size:
+        raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+    # P_i = D(C_i) xor C_(i-1), C_0 = iv
+    plain = _aesCipher(key).decrypt(data)
+    chain = iv.encode("utf-8") + data[:-AES.block_size]
+    plain = (int.from_bytes(plain, "big") ^ int.from_bytes(chain, "big")).to_bytes(len(data), "big")
+    return bytes.decode(unpad(plain, AES.block_size))
 
 
 #####
@@ -638,6 +1621,8 @@ def add_data_map(
         data_map[tr_id] = {"columns": [], "encrypt": False, "key": None, "iv": None}
 
     if columns is not None:
+        if data_map[tr_id]["columns"] != columns:
+            _frame_decoders.pop(tr_id, None)
         data_map[tr_id]["columns"] = columns
 
     if encrypt is not None:
@@ -650,20 +1635,393 @@ def add_data_map(
         data_map[tr_id]["iv"] = iv
 
 
+########### 실시간 데이터 디코딩 : tr_id 별 컬럼 목록으로 미리 만든 디코더
+
+_frame_decoders: dict = {}
+
+
+class FrameDecoder:
+    """실시간 데이터 프레임(0|tr_id|data_cnt|data) 디코더
+
+    '^' 로 구분된 payload 를 한번만 분리하고, data_cnt 건의 레코드를 컬럼 수 단위로 나누어 변환한다.
+    컬럼 타입(int64/float64/문자열)은 처음 수신한 데이터로 추정하여 tr_id 별로 유지한다 (decode_output 과 같은 규칙).
+
+    Example:
+        >>> decoder = ka.register_frame_decoder("H0STCNT0", columns)
+        >>> rows = decoder.rows(payload, 2)  # namedtuple 목록
+        >>> cols = decoder.columns(payload, 2)  # 컬럼명: ndarray
+    """
+
+    def __init__(self, tr_id: str, columns: list):
+        self.tr_id = tr_id
+        self.names = list(columns)
+        self.width = len(self.names)
+        self.kinds = [None] * self.width
+        self.row_type = namedtuple("Row", self.names, rename=True)
+
+    def split(self, payload: str, count: int = 1) -> list:
+        fields = payload.split("^")
+        if self.width and len(fields) != count * self.width:
+            # data_cnt 와 컬럼 수가 맞지 않으면 완전한 레코드만 사용
+            logging.warning(f"{self.tr_id}: {len(fields)} fields for {count} x {self.width} columns")
+            fields = fields[: (len(fields) // self.width) * self.width]
+        return fields
+
+    def _convert(self, fields: list) -> list:
+        arrays = []
+        for i, name in enumerate(self.names):
+            values = fields[i::self.width]
+            kind = self.kinds[i]
+            if kind is None:
+                kind = _inferKind(name.lower(), values)
+            arr, converted = _toColumn(values, kind or "str")
+            if kind is not None:
+                self.kinds[i] = converted
+            arrays.append(arr)
+        return arrays
+
+    def columns(self, payload: str, count: int = 1, fields: list = None) -> dict:
+        """struct-of-arrays, 컬럼명: ndarray"""
+        if fields is None:
+            fields = self.split(payload, count)
+        return dict(zip(self.names, self._convert(fields)))
+
+    def rows(self, payload: str, count: int = 1, fields: list = None) -> list:
+        """타입 변환된 namedtuple 목록 (레코드 1건당 1개)"""
+        if fields is None:
+            fields = self.split(payload, count)
+        if not fields:
+            return []
+        lists = [arr.tolist() for arr in self._convert(fields)]
+        return [self.row_type._make(values) for values in zip(*lists)]
+
+    def frame(self, payload: str, count: int = 1, fields: list = None) -> pd.DataFrame:
+        """문자열(object) DataFrame, 기존 KISWebSocket on_result 와 같은 형태"""
+        if fields is None:
+            fields = self.split(payload, count)
+        records = [fields[i:i + self.width] for i in range(0, len(fields), self.width)]
+        return pd.DataFrame(records, columns=self.names, dtype=object)
+
+
+# tr_id 의 디코더, data_map 에 등록된 컬럼 목록으로 생성
+def get_frame_decoder(tr_id: str) -> FrameDecoder:
+    decoder = _frame_decoders.get(tr_id)
+    if decoder is None:
+        dm = data_map.get(tr_id)
+        if dm is None or not dm["columns"]:
+            raise KeyError(f"columns not registered for {tr_id}")
+        decoder = FrameDecoder(tr_id, dm["columns"])
+        _frame_decoders[tr_id] = decoder
+    return decoder
+
+
+def register_frame_decoder(tr_id: str, columns: list) -> FrameDecoder:
+    add_data_map(tr_id=tr_id, columns=columns)
+    return get_frame_decoder(tr_id)
+
+
+# *_functions_ws.py 의 구독 요청 함수가 반환하는 컬럼 목록으로 디코더 등록 (구독 요청은 보내지 않음)
+def register_ws_decoders(request: Callable[[str, str, ...], (dict, list[str])], tr_key: str, **kwargs) -> FrameDecoder:
+    msg, columns = request("1", tr_key, **kwargs)
+    return register_frame_decoder(msg["body"]["input"]["tr_id"], columns)
+
+
+# 실시간 데이터 메시지 분리 및 복호화, (tr_id, data_cnt, payload) 반환
+# keys 를 지정하면 해당 dict 의 tr_id 별 key/iv 로 복호화 (연결별 key 사용시), 없으면 data_map 사용
+# decrypt=False 이면 암호화된 payload 를 그대로 반환 (DecryptPipeline 으로 복호화)
+def parse_frame(raw: str, keys: dict = None, decrypt: bool = True) -> tuple:
+    d1 = raw.split("|", 3)
+    if len(d1) < 4:
+        raise ValueError("data not found...")
+
+    tr_id = d1[1]
+    count = int(d1[2]) if d1[2].isdigit() else 1
+    payload = d1[3]
+
+    if decrypt:
+        cipher = _frameCipher(tr_id, keys)
+        if cipher is not None:
+            payload = aes_cbc_base64_dec(cipher[0], cipher[1], payload)
+    return tr_id, count, payload
+
+
+# tr_id 의 암호화 key/iv, 암호화되지 않은 tr_id 는 None (keys 지정시 해당 dict 우선)
+def _frameCipher(tr_id: str, keys: dict = None):
+    dm = keys.get(tr_id) if keys is not None else None
+    if dm is None:
+        dm = data_map.get(tr_id, {})
+    if dm.get("encrypt", None) == "Y":
+        return dm["key"], dm["iv"]
+    return None
+
+
+# 복호화 worker 에서 실행, 실패한 메시지는 None
+def _decryptBatch(items: list) -> list:
+    out = []
+    for key, iv, payload in items:
+        try:
+            out.append(aes_cbc_base64_dec(key, iv, payload))
+        except Exception as e:
+            logging.error(f"decrypt failed: {e}")
+            out.append(None)
+    return out
+
+
+_decrypt_executor = None
+
+
+def _getDecryptExecutor():
+    global _decrypt_executor
+    if _decrypt_executor is None:
+        _decrypt_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ws_decrypt")
+    return _decrypt_executor
+
+
+class DecryptPipeline:
+    """암호화된 실시간 데이터(체결통보)를 이벤트 루프 밖에서 복호화
+
+    메시지를 받은 시점의 key/iv 와 함께 순서키(ex. tr_id) 별 queue 에 넣고, 순서키마다 하나의 worker 가
+    쌓인 메시지를 max_batch 건씩 executor 에서 한번에 복호화한 뒤 받은 순서대로 callback 을 호출한다.
+    같은 순서키(계좌의 체결통보)의 순서는 유지되고, 체결통보가 몰려도 같은 연결의 시세 데이터 처리는 기다리지 않는다.
+
+    Args:
+        executor: 복호화 executor, None 이면 모듈 공용 스레드 풀 (ProcessPoolExecutor 도 사용 가능)
+        max_batch (int): executor 1회 호출당 최대 메시지 수
+    """
+
+    def __init__(self, executor=None, max_batch: int = 256):
+        self.executor = executor
+        self.max_batch = max_batch
+        self._queues: dict = {}
+        self._workers: dict = {}
+        self.stats = {"messages": 0, "batches": 0, "failed": 0}
+
+    def submit(self, order_key, key: str, iv: str, payload: str, callback: Callable[[str], None]):
+        """payload 복호화 후 callback(복호화된 payload) 호출 (이벤트 루프에서 호출)"""
+        queue = self._queues.get(order_key)
+        if queue is None:
+            queue = self._queues[order_key] = asyncio.Queue()
+            self._workers[order_key] = asyncio.get_running_loop().create_task(self._worker(queue))
+        queue.put_nowait((key, iv, payload, callback))
+
+    async def _worker(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        executor = self.executor or _getDecryptExecutor()
+        while True:
+            items = [await queue.get()]
+            while len(items) < self.max_batch and not queue.empty():
+                items.append(queue.get_nowait())
+            try:
+                plains = await loop.run_in_executor(executor, _decryptBatch, [i[:3] for i in items])
+            except Exception as e:
+                logging.error(f"decrypt batch failed: {e}")
+                plains = [None] * len(items)
+            self.stats["messages"] += len(items)
+            self.stats["batches"] += 1
+            for (_, _, _, callback), plain in zip(items, plains):
+                if plain is None:
+                    self.stats["failed"] += 1
+                    continue
+                try:
+                    callback(plain)
+                except Exception as e:
+                    logging.error(f"decrypt callback error: {e}")
+
+    async def close(self):
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._queues.clear()
+        self._workers.clear()
+
+
+class FrameBatcher:
+    """실시간 데이터를 모아 두었다가 flush 할 때 tr_id 별 DataFrame 을 한번에 생성 (micro-batch)
+
+    메시지마다 DataFrame 을 만들지 않고 분리한 필드만 누적하므로, pandas 가 필요한 경우에도 N ms 마다 한번만 변환한다.
+    """
+
+    def __init__(self, interval_ms: int = 200):
+        self.interval = interval_ms / 1000
+        self._fields: dict = {}
+
+    def add(self, tr_id: str, count: int, payload: str, fields: list = None):
+        if fields is None:
+            fields = get_frame_decoder(tr_id).split(payload, count)
+        self._fields.setdefault(tr_id, []).extend(fields)
+
+    def flush(self) -> dict:
+        fields, self._fields = self._fields, {}
+        batches = {}
+        for tr_id, values in fields.items():
+            decoder = get_frame_decoder(tr_id)
+            batches[tr_id] = pd.DataFrame(decoder.columns(None, fields=values), columns=decoder.names)
+        return batches
+
+
+########### 웹소켓 재연결 / 누락 감지
+
+# 재연결 설정
+# - backoff_base / backoff_max : 재연결 대기시간 (초), 실패할 때마다 2배씩 늘리고 backoff_max 에서 멈춤 (jitter 포함)
+# - resub_batch : 재연결 후 동시에 보내는 구독 등록 요청 수
+# - reissue_key : 재연결 전 웹소켓 접속키 재발급 여부
+_ws_supervisor_cfg = {
+    "backoff_base": 0.5,
+    "backoff_max": 30.0,
+    "resub_batch": 10,
+    "reissue_key": True,
+}
+
+
+def set_ws_supervisor_config(**cfg):
+    unknown = set(cfg) - set(_ws_supervisor_cfg)
+    if unknown:
+        raise ValueError(f"unknown ws supervisor config: {sorted(unknown)}")
+    _ws_supervisor_cfg.update(cfg)
+
+
+# 재연결 대기시간, attempt 번째 실패 후 [cap/2, cap] 범위 (여러 연결이 동시에 재접속하지 않도록 jitter)
+def _backoffDelay(attempt: int) -> float:
+    cap = min(_ws_supervisor_cfg["backoff_max"], _ws_supervisor_cfg["backoff_base"] * (2 ** attempt))
+    return cap / 2 + random.uniform(0, cap / 2)
+
+
+# 현재 환경의 앱키로 웹소켓 접속키 재발급, 실패시 기존 키 유지
+# auth_ws 는 changeTREnv 로 REST 토큰까지 초기화하므로 접속키만 교체
+async def _reissueApprovalKey_ws() -> bool:
+    env = getTREnv()
+    svr = "vps" if isPaperTrading() else "prod"
+    try:
+        approval_key = await asyncio.to_thread(_issueApprovalKey, env.my_app, env.my_sec, svr)
+    except Exception as e:
+        logging.warning(f"approval key reissue failed: {e}")
+        return False
+    if approval_key is None:
+        return False
+    _base_headers_ws["approval_key"] = approval_key
+    return True
+
+
+# 구독 등록 요청을 resub_batch 건씩 동시에 전송 (요청 간격은 호출 속도 제한기가 조절)
+async def _sendBatches(send, items: list):
+    size = max(1, _ws_supervisor_cfg["resub_batch"])
+    for i in range(0, len(items), size):
+        await asyncio.gather(*[send(*item) for item in items[i:i + size]])
+
+
+# 누락 이벤트
+# - kind   : reconnect (연결 끊김 구간) / time (gap_sec 이상 수신 없음) / sequence (누적거래량 불일치)
+# - start / end : 누락 구간의 마지막 수신 시각 / 다음 수신(또는 재연결) 시각 (time.time())
+# - detail : sequence 의 경우 expected(직전 누적거래량 + 체결거래량), acml_vol, missing_vol
+GapEvent = namedtuple("GapEvent", ["tr_id", "tr_key", "kind", "start", "end", "detail"])
+
+
+class GapDetector:
+    """tr_key(레코드 첫번째 컬럼, 종목코드) 별 실시간 데이터 누락 감지
+
+    - 재연결: 끊기기 전에 수신한 모든 tr_key 에 대해 끊긴 구간의 reconnect 이벤트 발생
+    - 시간: 같은 tr_key 의 수신 간격이 gap_sec 을 넘으면 time 이벤트 발생 (gap_sec 이 None 이면 사용 안함)
+    - 순번: ACML_VOL / CNTG_VOL 컬럼이 있는 체결 데이터는 직전 누적거래량 + 체결거래량 이 누적거래량과 다르면 sequence 이벤트 발생
+
+    이벤트를 받아 REST API(ex. inquire_time_itemconclusion) 로 누락 구간을 다시 조회할 수 있다.
+
+    Example:
+        >>> def on_gap(ev):
+        ...     if ev.kind != "time":
+        ...         backfill(ev.tr_key, ev.start, ev.end)
+        >>> kws.start(on_result, on_gap=on_gap, gap_sec=30)
+    """
+
+    def __init__(self, on_gap: Callable[[GapEvent], None] = None, gap_sec: float = None):
+        self.on_gap = on_gap
+        self.gap_sec = gap_sec
+        self.events = {"reconnect": 0, "time": 0, "sequence": 0}
+        self._last = {}  # (tr_id, tr_key) -> 마지막 수신 시각
+        self._acml = {}  # (tr_id, tr_key) -> 마지막 누적거래량
+        self._seq_cols = {}  # tr_id -> (ACML_VOL 위치, CNTG_VOL 위치) 또는 None
+
+    def _emit(self, tr_id, tr_key, kind, start, end, detail=None):
+        self.events[kind] += 1
+        ev = GapEvent(tr_id, tr_key, kind, start, end, detail or {})
+        logging.warning(f"gap detected >> {ev}")
+        if self.on_gap is not None:
+            try:
+                self.on_gap(ev)
+            except Exception as e:
+                logging.error(f"on_gap error: {e}")
+
+    def _seqColumns(self, decoder: FrameDecoder):
+        if decoder.tr_id not in self._seq_cols:
+            names = [n.upper() for n in decoder.names]
+            self._seq_cols[decoder.tr_id] = (
+                (names.index("ACML_VOL"), names.index("CNTG_VOL"))
+                if "ACML_VOL" in names and "CNTG_VOL" in names else None
+            )
+        return self._seq_cols[decoder.tr_id]
+
+    def observe(self, decoder: FrameDecoder, fields: list, now: float):
+        """분리된 필드(FrameDecoder.split 결과) 의 레코드별 누락 확인"""
+        width = decoder.width
+        if not width:
+            return
+        cols = self._seqColumns(decoder)
+        tr_id = decoder.tr_id
+        for i in range(0, len(fields), width):
+            key = (tr_id, fields[i])
+            last = self._last.get(key)
+            if self.gap_sec is not None and last is not None and now - last > self.gap_sec:
+                self._emit(tr_id, fields[i], "time", last, now)
+            self._last[key] = now
+
+            if cols is None:
+                continue
+            try:
+                acml = int(fields[i + cols[0]])
+                cntg = int(fields[i + cols[1]])
+            except ValueError:
+                continue
+            prev = self._acml.get(key)
+            self._acml[key] = acml
+            # 누적거래량이 줄어든 경우는 장 구분 변경 등으로 보고 기준만 다시 잡음
+            if prev is not None and acml > prev + cntg:
+                self._emit(tr_id, fields[i], "sequence", last, now, {
+                    "expected": prev + cntg, "acml_vol": acml, "missing_vol": acml - prev - cntg,
+                })
+
+    def reconnected(self, now: float, tr_keys: set = None):
+        """재연결 후 호출, 끊기기 전 수신한 tr_key 별로 마지막 수신 시각부터의 reconnect 이벤트 발생 (tr_keys 지정시 해당 tr_key 만)"""
+        for (tr_id, tr_key), last in list(self._last.items()):
+            if tr_keys is not None and tr_key not in tr_keys:
+                continue
+            self._emit(tr_id, tr_key, "reconnect", last, now)
+            # 끊긴 구간은 reconnect 이벤트로 알렸으므로 누적거래량 기준은 다시 잡음
+            self._acml.pop((tr_id, tr_key), None)
+
+
 class KISWebSocket:
     api_url: str = ""
     on_result: Callable[
         [websockets.ClientConnection, str, pd.DataFrame, dict], None
     ] = None
     result_all_data: bool = False
-
-    retry_count: int = 0
-    amx_retries: int = 0
+    # on_result 로 전달할 데이터 형태
+    # - pandas  : 문자열 DataFrame (기존 형태)
+    # - tuple   : 타입 변환된 namedtuple 목록
+    # - columns : 타입 변환된 컬럼명: ndarray dict
+    # - batch   : batch_ms 마다 tr_id 별로 모은 타입 변환된 DataFrame
+    mode: str = "pandas"
+    batch_ms: int = 200
+    # 암호화된 데이터(체결통보) 복호화 executor, None 이면 공용 스레드 풀
+    decrypt_executor = None
 
     # init
-    def __init__(self, api_url: str, max_retries: int = 3):
+    # max_retries : 연속 재연결 실패 허용 횟수 (None 이면 무제한), 데이터를 수신한 연결이 끊긴 경우는 처음부터 다시 셈
+    def __init__(self, api_url: str, max_retries: int = None):
         self.api_url = api_url
         self.max_retries = max_retries
+        self.retry_count = 0
+        self.reconnects = 0
+        self._gaps = GapDetector()
 
     # private
     async def __subscriber(self, ws: websockets.ClientConnection):
@@ -671,25 +2029,21 @@ class KISWebSocket:
             logging.info("received message >> %s" % raw)
             show_result = False
 
-            df = pd.DataFrame()
+            df = {"tuple": [], "columns": {}}.get(self.mode, pd.DataFrame())
 
             if raw[0] in ["0", "1"]:
-                d1 = raw.split("|")
-                if len(d1) < 4:
-                    raise ValueError("data not found...")
-
-                tr_id = d1[1]
-
-                dm = data_map[tr_id]
-                d = d1[3]
-                if dm.get("encrypt", None) == "Y":
-                    d = aes_cbc_base64_dec(dm["key"], dm["iv"], d)
-
-                df = pd.read_csv(
-                    StringIO(d), header=None, sep="^", names=dm["columns"], dtype=object
-                )
-
-                show_result = True
+                self._received = True
+                tr_id, count, d = parse_frame(raw, decrypt=False)
+                cipher = _frameCipher(tr_id)
+                if cipher is not None:
+                    # 암호화된 데이터는 루프 밖에서 복호화 후 tr_id 별 수신 순서대로 전달
+                    self._decryptor.submit(
+                        tr_id, cipher[0], cipher[1], d,
+                        lambda p, tr_id=tr_id, count=count: self.__onFrame(ws, tr_id, count, p),
+                    )
+                else:
+                    self.__onFrame(ws, tr_id, count, d)
+                continue
 
             else:
                 rsp = system_resp(raw)
@@ -710,29 +2064,82 @@ class KISWebSocket:
             if show_result is True and self.on_result is not None:
                 self.on_result(ws, tr_id, df, data_map[tr_id])
 
+    def __onFrame(self, ws: websockets.ClientConnection, tr_id: str, count: int, d: str):
+        decoder = get_frame_decoder(tr_id)
+        fields = decoder.split(d, count)
+        self._gaps.observe(decoder, fields, time.time())
+
+        if self.mode == "batch":
+            self._batcher.add(tr_id, count, d, fields)
+            return
+
+        if self.mode == "tuple":
+            df = decoder.rows(d, count, fields)
+        elif self.mode == "columns":
+            df = decoder.columns(d, count, fields)
+        else:
+            df = decoder.frame(d, count, fields)
+
+        if self.on_result is not None:
+            self.on_result(ws, tr_id, df, data_map[tr_id])
+
+    async def __flusher(self, ws: websockets.ClientConnection):
+        while True:
+            await asyncio.sleep(self._batcher.interval)
+            for tr_id, df in self._batcher.flush().items():
+                if self.on_result is not None:
+                    self.on_result(ws, tr_id, df, data_map[tr_id])
+
     async def __runner(self):
-        if len(open_map.keys()) > 40:
-            raise ValueError("Subscription's max is 40")
+        if sum(len(obj["items"]) for obj in open_map.values()) > WS_MAX_SUBSCRIPTIONS:
+            raise ValueError(f"Subscription's max is {WS_MAX_SUBSCRIPTIONS}, use KISWebSocketPool for more")
 
         url = f"{getTREnv().my_url_ws}{self.api_url}"
+        down_since = None
+        self._decryptor = DecryptPipeline(self.decrypt_executor)
 
-        while self.retry_count < self.max_retries:
+        while self.max_retries is None or self.retry_count < self.max_retries:
+            self._received = False
             try:
                 async with websockets.connect(url) as ws:
-                    # request subscribe
-                    for name, obj in open_map.items():
-                        await self.send_multiple(
-                            ws, obj["func"], "1", obj["items"], obj["kwargs"]
-                        )
-
-                    # subscriber
-                    await asyncio.gather(
-                        self.__subscriber(ws),
+                    # request subscribe (resub_batch 건씩 동시에 등록)
+                    await _sendBatches(
+                        lambda func, item, kwargs: self.send(ws, func, "1", item, kwargs),
+                        [(obj["func"], item, obj["kwargs"]) for obj in open_map.values() for item in obj["items"]],
                     )
+                    if down_since is not None:
+                        self._gaps.reconnected(time.time())
+                        down_since = None
+
+                    # subscriber (batch 모드는 batch_ms 마다 모은 데이터 전달)
+                    flusher = None
+                    if self.mode == "batch":
+                        self._batcher = FrameBatcher(self.batch_ms)
+                        flusher = asyncio.create_task(self.__flusher(ws))
+                    try:
+                        await asyncio.gather(
+                            self.__subscriber(ws),
+                        )
+                    finally:
+                        if flusher is not None:
+                            flusher.cancel()
             except Exception as e:
                 print("Connection exception >> ", e)
-                self.retry_count += 1
-                await asyncio.sleep(1)
+
+            # 데이터를 수신했던 연결이면 재시도 횟수 초기화
+            if self._received:
+                self.retry_count = 0
+            if down_since is None:
+                down_since = time.time()
+            delay = _backoffDelay(self.retry_count)
+            self.retry_count += 1
+            self.reconnects += 1
+            logging.warning(f"websocket reconnect #{self.reconnects} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            if _ws_supervisor_cfg["reissue_key"] and "approval_key" in _base_headers_ws:
+                await _reissueApprovalKey_ws()
+
+        await self._decryptor.close()
 
     # func
     @classmethod
@@ -751,8 +2158,13 @@ class KISWebSocket:
 
         logging.info("send message >> %s" % json.dumps(msg))
 
+        # 등록 요청 간격은 REST 호출과 같은 호출 속도 제한기로 조절 (제한기 미사용시 고정 지연)
+        limiter = get_rate_limiter()
+        if limiter is not None:
+            await limiter.acquire_async()
         await ws.send(json.dumps(msg))
-        smart_sleep()
+        if limiter is None:
+            await smart_sleep_async()
 
     async def send_multiple(
             self,
@@ -794,10 +2206,390 @@ class KISWebSocket:
                 [websockets.ClientConnection, str, pd.DataFrame, dict], None
             ],
             result_all_data: bool = False,
+            mode: str = "pandas",
+            batch_ms: int = 200,
+            on_gap: Callable[[GapEvent], None] = None,
+            gap_sec: float = None,
     ):
+        if mode not in ("pandas", "tuple", "columns", "batch"):
+            raise ValueError(f"unknown mode: {mode}")
         self.on_result = on_result
         self.result_all_data = result_all_data
+        self.mode = mode
+        self.batch_ms = batch_ms
+        self._gaps = GapDetector(on_gap, gap_sec)
         try:
             asyncio.run(self.__runner())
         except KeyboardInterrupt:
             print("Closing by KeyboardInterrupt")
+
+
+########### 웹소켓 다중 연결 : approval key(세션) 별 40건 구독 제한을 여러 연결로 분산
+
+# 세션 1개당 실시간 데이터 등록 가능 건수
+WS_MAX_SUBSCRIPTIONS = 40
+
+# 병합 스트림 메시지
+# - seq  : 수신 순번 (모든 연결 공통, 수신 순서대로 증가)
+# - conn : 수신한 연결 번호
+# - data : mode 에 따라 namedtuple 목록 / 컬럼명: ndarray dict / 문자열 DataFrame
+# - recv_time : 수신 시각 (time.time())
+PoolMessage = namedtuple("PoolMessage", ["seq", "conn", "tr_id", "data", "recv_time"])
+
+
+# 앱키/앱시크리트로 웹소켓 접속키 발급, 실패시 None (auth_ws 와 달리 전역 설정은 바꾸지 않음)
+def _issueApprovalKey(app_key, app_secret, svr="prod"):
+    p = {"grant_type": "client_credentials", "appkey": app_key, "secretkey": app_secret}
+    url = f"{_cfg[svr]}/oauth2/Approval"
+    res = _transport.request("POST", url, data=json.dumps(p), headers=_getBaseHeader())
+    if res.status_code != 200:
+        return None
+    return _getResultObject(res.json()).approval_key
+
+
+# kis_devlp.yaml 의 웹소켓용 앱키 목록 (기본 앱키 + my_ws_keys / paper_ws_keys)
+def _wsCredentials(svr="prod"):
+    if svr == "prod":
+        creds = [(_cfg["my_app"], _cfg["my_sec"])]
+        extra = _cfg.get("my_ws_keys") or []
+    else:
+        creds = [(_cfg["paper_app"], _cfg["paper_sec"])]
+        extra = _cfg.get("paper_ws_keys") or []
+    creds += [(k["app"], k["sec"]) for k in extra]
+    return creds
+
+
+class _PoolConnection:
+    def __init__(self, idx, app_key, app_secret, approval_key):
+        self.idx = idx
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.approval_key = approval_key
+        self.subs = set()  # (request 이름, tr_key)
+        self.keys = {}  # tr_id 별 복호화 key/iv (연결마다 다를 수 있음)
+        self.ws = None
+        self.task = None
+        self.messages = 0
+        self.records = 0
+        self.reconnects = 0
+        self.last_recv = None
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_count = 0
+        self._rate_mark = (time.monotonic(), 0)
+
+
+class KISWebSocketPool:
+    """여러 웹소켓 연결로 실시간 구독을 나누고, 수신 데이터를 하나의 async iterator 로 병합
+
+    연결(approval key) 1개당 최대 40건까지 등록할 수 있으므로, 앱키를 여러 개 등록하여 구독을 연결별로 분산한다.
+    start() 는 구독 건수에 필요한 만큼만 연결하고, 이후 구독을 추가하면 여유가 가장 많은 연결에 배정하며
+    열린 연결이 모두 가득 차면 아직 사용하지 않은 앱키로 연결을 추가한다.
+    해제 후에는 연결 간 구독 건수 차이가 1 이하가 되도록 다시 배분한다.
+    수신 데이터는 하나의 queue 에 수신 순서대로 들어가며, queue 가 가득 차면 가장 오래된 메시지를 버린다.
+
+    Args:
+        api_url (str): 웹소켓 경로 (ex. "/tryitout")
+        credentials (list): (앱키, 앱시크리트) 목록, None 이면 kis_devlp.yaml 의 기본 앱키 + my_ws_keys
+        svr (str): prod (실전) / vps (모의)
+        mode (str): tuple (namedtuple 목록), columns (컬럼명: ndarray), pandas (문자열 DataFrame)
+        on_gap (Callable): 누락 이벤트(GapEvent) 콜백, 연결이 끊긴 경우 해당 연결의 tr_key 만 reconnect 이벤트 발생
+        gap_sec (float): tr_key 별 수신 간격이 이 값을 넘으면 time 이벤트 발생 (None 이면 사용 안함)
+        decrypt_executor: 체결통보 복호화 executor, None 이면 공용 스레드 풀
+
+    Example:
+        >>> pool = ka.KISWebSocketPool("/tryitout")
+        >>> pool.subscribe(ccnl_krx, codes)  # 40건 초과 가능
+        >>> async with pool:
+        ...     async for msg in pool:
+        ...         print(msg.conn, msg.tr_id, msg.data)
+    """
+
+    def __init__(self, api_url: str, credentials: list = None, svr: str = "prod",
+                 mode: str = "tuple", max_per_conn: int = WS_MAX_SUBSCRIPTIONS, queue_size: int = 100000,
+                 on_gap: Callable[[GapEvent], None] = None, gap_sec: float = None, decrypt_executor=None):
+        if mode not in ("tuple", "columns", "pandas"):
+            raise ValueError(f"unknown mode: {mode}")
+        self.api_url = api_url
+        self.svr = svr
+        self.mode = mode
+        self.max_per_conn = max_per_conn
+        self._credentials = credentials
+        self._creds = []  # start() 에서 확정한 (앱키, 앱시크리트) 목록
+        self._queue_size = queue_size
+        self._queue = None
+        self._requests = {}  # request 이름 -> (request, kwargs)
+        self._wanted = []  # 구독 요청 순서 유지 (request 이름, tr_key)
+        self._conns = []
+        self._seq = 0
+        self._dropped = 0
+        self._closed = True
+        self._gaps = GapDetector(on_gap, gap_sec)
+        self._decryptor = DecryptPipeline(decrypt_executor)
+
+    # 구독 관리
+
+    def subscribe(self, request: Callable[[str, str, ...], (dict, list[str])], data: list | str, kwargs: dict = None):
+        items = [data] if type(data) is str else list(data)
+        self._requests[request.__name__] = (request, kwargs or {})
+        for tr_key in items:
+            sub = (request.__name__, tr_key)
+            if sub in self._wanted:
+                continue
+            self._wanted.append(sub)
+            if self._conns:
+                self._assign(sub)
+
+    def unsubscribe(self, request: Callable[[str, str, ...], (dict, list[str])], data: list | str):
+        items = [data] if type(data) is str else list(data)
+        for tr_key in items:
+            sub = (request.__name__, tr_key)
+            if sub not in self._wanted:
+                continue
+            self._wanted.remove(sub)
+            for conn in self._conns:
+                if sub in conn.subs:
+                    conn.subs.discard(sub)
+                    self._sendLater(conn, sub, "2")
+        if self._conns:
+            self.rebalance()
+
+    def _assign(self, sub):
+        conn = min(self._conns, key=lambda c: len(c.subs))
+        if len(conn.subs) >= self.max_per_conn:
+            if len(self._conns) >= len(self._creds):
+                raise ValueError(
+                    f"Subscription's max is {self.max_per_conn * len(self._creds)} with {len(self._creds)} app keys, add my_ws_keys"
+                )
+            # 열린 연결이 모두 가득 차면 사용하지 않은 앱키로 연결 추가 (approval key 는 연결 task 에서 발급)
+            conn = self._addConnection(*self._creds[len(self._conns)])
+            if not self._closed:
+                conn.task = asyncio.get_running_loop().create_task(self._run(conn))
+        conn.subs.add(sub)
+        self._sendLater(conn, sub, "1")
+
+    def _addConnection(self, app_key, app_secret, approval_key=None):
+        conn = _PoolConnection(len(self._conns), app_key, app_secret, approval_key)
+        self._conns.append(conn)
+        return conn
+
+    def rebalance(self):
+        """연결 간 구독 건수 차이가 1 이하가 되도록 구독 이동 (이동하는 구독은 기존 연결에서 해제 후 새 연결에 등록)"""
+        while True:
+            most = max(self._conns, key=lambda c: len(c.subs))
+            least = min(self._conns, key=lambda c: len(c.subs))
+            if len(most.subs) - len(least.subs) <= 1:
+                return
+            sub = sorted(most.subs)[-1]
+            most.subs.discard(sub)
+            self._sendLater(most, sub, "2")
+            least.subs.add(sub)
+            self._sendLater(least, sub, "1")
+
+    def _sendLater(self, conn, sub, tr_type):
+        if conn.ws is not None and not self._closed:
+            asyncio.get_running_loop().create_task(self._send(conn, sub, tr_type))
+
+    async def _send(self, conn, sub, tr_type):
+        request, kwargs = self._requests[sub[0]]
+        msg, columns = request(tr_type, sub[1], **kwargs)
+        msg["header"]["approval_key"] = conn.approval_key
+        if tr_type == "1":
+            add_data_map(tr_id=msg["body"]["input"]["tr_id"], columns=columns)
+
+        limiter = get_rate_limiter(conn.app_key)
+        if limiter is not None:
+            await limiter.acquire_async()
+        else:
+            await smart_sleep_async()
+        try:
+            await conn.ws.send(json.dumps(msg))
+        except Exception as e:
+            logging.warning(f"[ws pool #{conn.idx}] send failed ({sub}): {e}")
+
+    # 연결
+
+    async def start(self):
+        if not self._closed:
+            return
+        creds = self._credentials if self._credentials is not None else _wsCredentials(self.svr)
+        needed = max(1, -(-len(self._wanted) // self.max_per_conn))
+        if needed > len(creds):
+            raise ValueError(
+                f"{len(self._wanted)} subscriptions need {needed} connections but only {len(creds)} app keys, add my_ws_keys"
+            )
+
+        self._creds = list(creds)
+        self._conns = []
+        for app_key, app_secret in creds[:needed]:
+            approval_key = await asyncio.to_thread(_issueApprovalKey, app_key, app_secret, self.svr)
+            if approval_key is None:
+                raise ValueError("Get Approval token fail!")
+            self._addConnection(app_key, app_secret, approval_key)
+
+        # 구독 요청 순서대로 연결에 나누어 배정 (연결 전이므로 등록은 연결 후 일괄 전송)
+        for i, sub in enumerate(self._wanted):
+            self._conns[i % len(self._conns)].subs.add(sub)
+
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._closed = False
+        for conn in self._conns:
+            conn.task = asyncio.create_task(self._run(conn))
+
+    async def close(self):
+        self._closed = True
+        for conn in self._conns:
+            if conn.task is not None:
+                conn.task.cancel()
+        await asyncio.gather(*[c.task for c in self._conns if c.task is not None], return_exceptions=True)
+        await self._decryptor.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _run(self, conn):
+        url = f"{getTREnv().my_url_ws}{self.api_url}"
+        attempt = 0
+        down_since = None
+        while not self._closed:
+            if conn.approval_key is None:  # 구독 추가로 연 연결
+                try:
+                    conn.approval_key = await asyncio.to_thread(_issueApprovalKey, conn.app_key, conn.app_secret, self.svr)
+                except Exception as e:
+                    logging.warning(f"[ws pool #{conn.idx}] approval key issue failed: {e}")
+                if conn.approval_key is None:
+                    await asyncio.sleep(_backoffDelay(attempt))
+                    attempt += 1
+                    continue
+            received = conn.messages
+            try:
+                async with websockets.connect(url) as ws:
+                    conn.ws = ws
+                    await _sendBatches(lambda sub: self._send(conn, sub, "1"), [(sub,) for sub in sorted(conn.subs)])
+                    if down_since is not None:
+                        self._gaps.reconnected(time.time(), {tr_key for _, tr_key in conn.subs})
+                        down_since = None
+                    async for raw in ws:
+                        self._recv(conn, raw)
+                        if raw[0] not in ["0", "1"]:
+                            rsp = system_resp(raw)
+                            if rsp.isPingPong:
+                                await ws.pong(raw)
+                            elif rsp.encrypt is not None:
+                                conn.keys[rsp.tr_id] = {"encrypt": rsp.encrypt, "key": rsp.ekey, "iv": rsp.iv}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"[ws pool #{conn.idx}] connection exception >> {e}")
+            finally:
+                conn.ws = None
+            if self._closed:
+                break
+            if conn.messages > received:
+                attempt = 0
+            if down_since is None:
+                down_since = time.time()
+            conn.reconnects += 1
+            await asyncio.sleep(_backoffDelay(attempt))
+            attempt += 1
+            if _ws_supervisor_cfg["reissue_key"]:
+                try:
+                    approval_key = await asyncio.to_thread(_issueApprovalKey, conn.app_key, conn.app_secret, self.svr)
+                except Exception as e:
+                    logging.warning(f"[ws pool #{conn.idx}] approval key reissue failed: {e}")
+                    approval_key = None
+                if approval_key is not None:
+                    conn.approval_key = approval_key
+
+    def _recv(self, conn, raw):
+        if raw[0] not in ["0", "1"]:
+            return
+        now = time.time()
+        conn.messages += 1
+        conn.last_recv = now
+        tr_id, count, payload = parse_frame(raw, conn.keys, decrypt=False)
+        cipher = _frameCipher(tr_id, conn.keys)
+        if cipher is not None:
+            # 체결통보는 연결/tr_id 별 수신 순서대로 루프 밖에서 복호화
+            self._decryptor.submit(
+                (conn.idx, tr_id), cipher[0], cipher[1], payload,
+                lambda p: self._deliver(conn, tr_id, count, p, now),
+            )
+            return
+        self._deliver(conn, tr_id, count, payload, now)
+
+    def _deliver(self, conn, tr_id, count, payload, now):
+        decoder = get_frame_decoder(tr_id)
+        fields = decoder.split(payload, count)
+        self._gaps.observe(decoder, fields, now)
+        if self.mode == "tuple":
+            data = decoder.rows(payload, count, fields)
+        elif self.mode == "columns":
+            data = decoder.columns(payload, count, fields)
+        else:
+            data = decoder.frame(payload, count, fields)
+
+        conn.records += count
+        self._seq += 1
+        msg = PoolMessage(self._seq, conn.idx, tr_id, data, now)
+        if self._queue.full():  # 소비가 늦으면 가장 오래된 메시지를 버림
+            self._queue.get_nowait()
+            self._dropped += 1
+        self._queue.put_nowait(msg)
+
+    # 병합 스트림
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> PoolMessage:
+        if self._queue is None:
+            raise StopAsyncIteration
+        while True:
+            if self._closed and self._queue.empty():
+                raise StopAsyncIteration
+            try:
+                msg = await asyncio.wait_for(self._queue.get(), 1.0)
+                break
+            except asyncio.TimeoutError:
+                continue
+        # 수신 후 소비까지 걸린 시간 (연결별 lag)
+        conn = self._conns[msg.conn]
+        lag = time.time() - msg.recv_time
+        conn.lag_total += lag
+        conn.lag_count += 1
+        conn.lag_max = max(conn.lag_max, lag)
+        return msg
+
+    def get_stats(self) -> dict:
+        """연결별 구독 건수, 수신 메시지/레코드 수, 초당 메시지 수(직전 get_stats 이후), 수신-소비 lag(초), 재연결 횟수"""
+        now = time.monotonic()
+        conns = []
+        for conn in self._conns:
+            mark_time, mark_count = conn._rate_mark
+            elapsed = now - mark_time
+            rate = (conn.messages - mark_count) / elapsed if elapsed > 0 else 0.0
+            conn._rate_mark = (now, conn.messages)
+            conns.append({
+                "conn": conn.idx,
+                "connected": conn.ws is not None,
+                "subscriptions": len(conn.subs),
+                "messages": conn.messages,
+                "records": conn.records,
+                "msg_per_sec": round(rate, 2),
+                "avg_lag": round(conn.lag_total / conn.lag_count, 6) if conn.lag_count else 0.0,
+                "max_lag": round(conn.lag_max, 6),
+                "last_msg_age": round(time.time() - conn.last_recv, 3) if conn.last_recv else None,
+                "reconnects": conn.reconnects,
+            })
+        return {
+            "connections": conns,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "dropped": self._dropped,
+            "gaps": dict(self._gaps.events),
+            "decrypt": dict(self._decryptor.stats),
+        }
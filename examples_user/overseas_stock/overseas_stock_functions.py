@@ -78,32 +78,28 @@ def algo_ordno(
         "CTX_AREA_NK200": NK200  # 연속조회키200
     }
 
-    res = ka._url_fetch(api_url, tr_id, tr_cont, params)
-
-    if res.isOK():
-        current_data = pd.DataFrame(res.getBody().output)
-
-        if dataframe is not None:
-            dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-        else:
-            dataframe = current_data
-
-        tr_cont = res.getHeader().tr_cont
-        FK200 = res.getBody().ctx_area_fk200
-        NK200 = res.getBody().ctx_area_nk200
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        api_url, tr_id, params,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth + 1,
+    )
+
+    current_data = result.frames[0]
+    if dataframe is not None:
+        current_data = pd.concat([dataframe, current_data], ignore_index=True)
+
+    if result.error is not None:
+        result.error.printError(url=api_url)
+        return pd.DataFrame()
 
-        if tr_cont in ["M", "F"]:  # 다음 페이지 존재
-            logging.info("Call Next page...")
-            ka.smart_sleep()  # 시스템 안정적 운영을 위한 지연
-            return algo_ordno(
-                cano, acnt_prdt_cd, trad_dt, FK200, NK200, "N", dataframe, depth + 1, max_depth
-            )
-        else:
-            logging.info("Data fetch complete.")
-            return dataframe
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logging.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        res.printError(url=api_url)
-        return pd.DataFrame()
+        logging.info("Data fetch complete.")
+    return current_data
 
 
 ##############################################################################################
@@ -650,77 +646,31 @@ def inquire_balance(
         "CTX_AREA_NK200": NK200,
     }
 
-    res = ka._url_fetch(api_url=api_url, ptr_id=tr_id, tr_cont=tr_cont, params=params)
-
-    if res.isOK():
-        # output1 처리
-        if hasattr(res.getBody(), 'output1'):
-            output_data = res.getBody().output1
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data1 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data1 = pd.DataFrame([output_data])
-
-                if dataframe1 is not None:
-                    dataframe1 = pd.concat([dataframe1, current_data1], ignore_index=True)
-                else:
-                    dataframe1 = current_data1
-            else:
-                if dataframe1 is None:
-                    dataframe1 = pd.DataFrame()
-        else:
-            if dataframe1 is None:
-                dataframe1 = pd.DataFrame()
-        # output2 처리
-        if hasattr(res.getBody(), 'output2'):
-            output_data = res.getBody().output2
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data2 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data2 = pd.DataFrame([output_data])
-
-                if dataframe2 is not None:
-                    dataframe2 = pd.concat([dataframe2, current_data2], ignore_index=True)
-                else:
-                    dataframe2 = current_data2
-            else:
-                if dataframe2 is None:
-                    dataframe2 = pd.DataFrame()
-        else:
-            if dataframe2 is None:
-                dataframe2 = pd.DataFrame()
-        tr_cont, FK200, NK200 = res.getHeader().tr_cont, res.getBody().ctx_area_fk200, res.getBody().ctx_area_nk200
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        api_url, tr_id, params,
+        outputs=("output1", "output2"),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
+
+    current_data1, current_data2 = result.frames
+    if dataframe1 is not None:
+        current_data1 = pd.concat([dataframe1, current_data1], ignore_index=True)
+    if dataframe2 is not None:
+        current_data2 = pd.concat([dataframe2, current_data2], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(api_url)
+        return pd.DataFrame(), pd.DataFrame()
 
-        if tr_cont in ["M", "F"]:
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_balance(
-                cano,
-                acnt_prdt_cd,
-                ovrs_excg_cd,
-                tr_crcy_cd,
-                FK200,
-                NK200,
-                env_dv,
-                dataframe1,
-                dataframe2,
-                "N",
-                depth + 1,
-                max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe1, dataframe2
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(api_url)
-        return pd.DataFrame(), pd.DataFrame()
+        logger.info("Data fetch complete.")
+    return current_data1, current_data2
 
 
 ##############################################################################################
@@ -851,55 +801,29 @@ def inquire_ccnl(
         "CTX_AREA_FK200": FK200,
     }
 
-    res = ka._url_fetch(api_url=api_url, ptr_id=tr_id, tr_cont=tr_cont, params=params)
-
-    if res.isOK():
-        if hasattr(res.getBody(), 'output'):
-            output_data = res.getBody().output
-            if not isinstance(output_data, list):
-                output_data = [output_data]
-            current_data = pd.DataFrame(output_data)
-        else:
-            current_data = pd.DataFrame()
-
-        if dataframe is not None:
-            dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-        else:
-            dataframe = current_data
-
-        tr_cont, NK200, FK200 = res.getHeader().tr_cont, res.getBody().ctx_area_nk200, res.getBody().ctx_area_fk200
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        api_url, tr_id, params,
+        outputs=("output",),
+        ctx_keys=("CTX_AREA_FK200", "CTX_AREA_NK200"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
+
+    current_data = result.frames[0]
+    if dataframe is not None:
+        current_data = pd.concat([dataframe, current_data], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(api_url)
+        return pd.DataFrame()
 
-        if tr_cont in ["M", "F"]:
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_ccnl(
-                cano=cano,
-                acnt_prdt_cd=acnt_prdt_cd,
-                pdno=pdno,
-                ord_strt_dt=ord_strt_dt,
-                ord_end_dt=ord_end_dt,
-                sll_buy_dvsn=sll_buy_dvsn,
-                ccld_nccs_dvsn=ccld_nccs_dvsn,
-                ovrs_excg_cd=ovrs_excg_cd,
-                sort_sqn=sort_sqn,
-                ord_dt=ord_dt,
-                ord_gno_brno=ord_gno_brno,
-                odno=odno,
-                NK200=NK200,
-                FK200=FK200,
-                env_dv=env_dv,
-                tr_cont="N",
-                dataframe=dataframe,
-                depth=depth + 1,
-                max_depth=max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(api_url)
-        return pd.DataFrame()
+        logger.info("Data fetch complete.")
+    return current_data
 
 
 ##############################################################################################
@@ -1510,86 +1434,35 @@ def inquire_period_trans(
         "CTX_AREA_NK100": NK100,
     }
 
-    res = ka._url_fetch(api_url=api_url, ptr_id=tr_id, tr_cont=tr_cont, params=params)
-
-    if res.isOK():
-        # output1 처리
-        if hasattr(res.getBody(), 'output1'):
-            output_data = res.getBody().output1
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data1 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data1 = pd.DataFrame([output_data])
-
-                if dataframe1 is not None:
-                    dataframe1 = pd.concat([dataframe1, current_data1], ignore_index=True)
-                else:
-                    dataframe1 = current_data1
-            else:
-                if dataframe1 is None:
-                    dataframe1 = pd.DataFrame()
-        else:
-            if dataframe1 is None:
-                dataframe1 = pd.DataFrame()
-        # output2 처리
-        if hasattr(res.getBody(), 'output2'):
-            output_data = res.getBody().output2
-            if output_data:
-                # output1은 단일 객체, output2는 배열일 수 있음
-                if isinstance(output_data, list):
-                    current_data2 = pd.DataFrame(output_data)
-                else:
-                    # 단일 객체인 경우 리스트로 감싸서 DataFrame 생성
-                    current_data2 = pd.DataFrame([output_data])
-
-                if dataframe2 is not None:
-                    dataframe2 = pd.concat([dataframe2, current_data2], ignore_index=True)
-                else:
-                    dataframe2 = current_data2
-            else:
-                if dataframe2 is None:
-                    dataframe2 = pd.DataFrame()
-        else:
-            if dataframe2 is None:
-                dataframe2 = pd.DataFrame()
-
-        tr_cont, NK100, FK100 = res.getHeader().tr_cont, res.getBody().ctx_area_nk100, res.getBody().ctx_area_fk100
+    # 연속조회 : 모든 페이지의 레코드를 모아 마지막에 DataFrame 으로 한번만 변환
+    result = ka.fetch_pages(
+        api_url, tr_id, params,
+        outputs=("output1", "output2"),
+        ctx_keys=("CTX_AREA_FK100", "CTX_AREA_NK100"),
+        tr_cont=tr_cont,
+        max_pages=max_depth - depth,
+    )
+
+    current_data1, current_data2 = result.frames
+    if dataframe1 is not None:
+        current_data1 = pd.concat([dataframe1, current_data1], ignore_index=True)
+    if dataframe2 is not None:
+        current_data2 = pd.concat([dataframe2, current_data2], ignore_index=True)
+
+    if result.error is not None:
+        logger.error("API call failed: %s - %s", result.error.getErrorCode(), result.error.getErrorMessage())
+        result.error.printError(api_url)
+        # 이미 수집된 데이터가 있으면 그것을 반환, 없으면 빈 DataFrame 반환
+        if not current_data1.empty:
+            logger.info("Returning already collected data due to API error. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
+            return current_data1, current_data2
+        return pd.DataFrame(), pd.DataFrame()
 
-        if tr_cont in ["M", "F"]:
-            logger.info("Calling next page...")
-            ka.smart_sleep()
-            return inquire_period_trans(
-                cano=cano,
-                acnt_prdt_cd=acnt_prdt_cd,
-                erlm_strt_dt=erlm_strt_dt,
-                erlm_end_dt=erlm_end_dt,
-                ovrs_excg_cd=ovrs_excg_cd,
-                pdno=pdno,
-                sll_buy_dvsn_cd=sll_buy_dvsn_cd,
-                loan_dvsn_cd=loan_dvsn_cd,
-                FK100=FK100,
-                NK100=NK100,
-                dataframe1=dataframe1,
-                dataframe2=dataframe2,
-                tr_cont="N",
-                depth=depth + 1,
-                max_depth=max_depth
-            )
-        else:
-            logger.info("Data fetch complete.")
-            return dataframe1, dataframe2
+    if result.cursor is not None:  # max_depth 도달, 연속조회키로 이어서 조회 가능
+        logger.warning("Max recursive depth reached. (resume: %s)", ka.decode_cursor(result.cursor)["ctx"])
     else:
-        logger.error("API call failed: %s - %s", res.getErrorCode(), res.getErrorMessage())
-        res.printError(api_url)
-        # 이미 수집된 데이터가 있으면 그것을 반환, 없으면 빈 DataFrame 반환
-        if dataframe1 is not None and not dataframe1.empty:
-            logger.info("Returning already collected data due to API error.")
-            return dataframe1, dataframe2 if dataframe2 is not None else pd.DataFrame()
-        else:
-            return pd.DataFrame(), pd.DataFrame()
+        logger.info("Data fetch complete.")
+    return current_data1, current_data2
 
 
 ##############################################################################################
@@ -29,6 +29,9 @@ if BASE_DIR not in sys.path:
 EXAMPLES_USER_DIR = os.path.join(BASE_DIR, "examples_user")
 if EXAMPLES_USER_DIR not in sys.path:
     sys.path.append(EXAMPLES_USER_DIR)
+STOCKS_INFO_DIR = os.path.join(BASE_DIR, "stocks_info")
+if STOCKS_INFO_DIR not in sys.path:
+    sys.path.append(STOCKS_INFO_DIR)
 
 import kis_auth as ka
 from examples_user.domestic_futureoption.domestic_futureoption_functions_ws import krx_ngt_futures_ccnl
@@ -37,6 +40,7 @@ from examples_llm.domestic_stock.inquire_asking_price_exp_ccn.inquire_asking_pri
 from examples_user.etfetn.etfetn_functions import inquire_price as etfetn_inquire_price
 from examples_llm.domestic_stock.search_info.search_info import search_info
 from examples_llm.domestic_stock.search_stock_info.search_stock_info import search_stock_info
+from kis_master_cache import MasterCache
 
 logging.getLogger().setLevel(logging.WARNING)
 _handler = logging.StreamHandler()
@@ -90,7 +94,24 @@ def _easy_msg(now: str, code: str, pct: float, lev: float) -> str:
         f"주의: 9:00 이후는 장중 수급 영향"
     )
 
+_master_cache = MasterCache()
+
+def _cached_name(code: str, masters: list[str] | None = None) -> str | None:
+    # stocks_info 정제 스크립트가 저장한 종목마스터 캐시에서 종목명 조회 (API 호출 없음)
+    try:
+        for row in _master_cache.lookup(code, masters):
+            _, name_col = _master_cache.key_columns(row["master"])
+            nm = str(row.get(name_col) or "").strip()
+            if nm:
+                return nm
+    except Exception:
+        pass
+    return None
+
 def _resolve_fut_name(code: str) -> str | None:
+    nm = _cached_name(code, ["index_future", "cme_future"])
+    if nm:
+        return nm
     try:
         df = display_board_futures("F", "20503", "MKI")
         if df is None or df.empty:
@@ -171,8 +192,11 @@ def _preopen_expected_lines(env: str, codes: list[str]) -> list[str]:
                 "069500": "KODEX 200",
                 "122630": "KODEX 레버리지",
             }
+            cur = None
+            name = _cached_name(c, ["kospi", "kosdaq", "konex"])
             try:
-                cur = etfetn_inquire_price("J", c)
+                if not name:
+                    cur = etfetn_inquire_price("J", c)
                 if cur is not None and not cur.empty:
                     for nk in ["hts_kor_isnm", "HTS_KOR_ISNM", "prdt_name", "PRDT_NAME", "issu_nm", "ISSU_NM", "itmd_nm", "ITMD_NM"]:
                         if nk in cur.columns:
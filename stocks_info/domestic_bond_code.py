@@ -5,6 +5,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -61,4 +62,5 @@ df_bond = get_bond_master_dataframe(file_path)
 # 엑셀 파일 저장
 print("Saving to Excel...")
 df_bond.to_excel('bond_code.xlsx', index=False)
+save_master_cache('bond', df_bond, code_column='표준코드', name_column='종목명')
 print("Excel file created successfully.")
\ No newline at end of file
@@ -5,6 +5,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -102,4 +103,5 @@ df = get_elw_master_dataframe(file_path)
 # Save to Excel
 print("Saving to Excel...")
 df.to_excel('elw_code.xlsx', index=False)
+save_master_cache('elw', df, code_column='단축코드', name_column='한글종목명')
 print("Excel file created successfully.")
\ No newline at end of file
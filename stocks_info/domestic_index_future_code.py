@@ -5,6 +5,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -31,4 +32,5 @@ def get_domestic_future_master_dataframe(base_dir):
     return df
     
 df = get_domestic_future_master_dataframe(base_dir)
+save_master_cache('index_future', df, code_column='단축코드', name_column=' 한글종목명')
 print("Done")
@@ -5,6 +5,8 @@ import ssl
 import zipfile
 import os
 import pandas as pd
+from kis_master_parser import read_layout, layout_path, parse_master_file
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -29,43 +31,8 @@ def kospi_master_download(base_dir, verbose=False):
 
 def get_kospi_master_dataframe(base_dir):
     file_name = base_dir + "\\kospi_code.mst"
-    tmp_fil1 = base_dir + "\\kospi_code_part1.tmp"
-    tmp_fil2 = base_dir + "\\kospi_code_part2.tmp"
-
-    wf1 = open(tmp_fil1, mode="w")
-    wf2 = open(tmp_fil2, mode="w")
-
-    with open(file_name, mode="r", encoding="cp949") as f:
-        for row in f:
-            rf1 = row[0:len(row) - 228]
-            rf1_1 = rf1[0:9].rstrip()
-            rf1_2 = rf1[9:21].rstrip()
-            rf1_3 = rf1[21:].strip()
-            wf1.write(rf1_1 + ',' + rf1_2 + ',' + rf1_3 + '\n')
-            rf2 = row[-228:]
-            wf2.write(rf2)
-
-    wf1.close()
-    wf2.close()
 
     part1_columns = ['단축코드', '표준코드', '한글명']
-    df1 = pd.read_csv(tmp_fil1, header=None, names=part1_columns, encoding='cp949')
-
-    field_specs = [2, 1, 4, 4, 4,
-                   1, 1, 1, 1, 1,
-                   1, 1, 1, 1, 1,
-                   1, 1, 1, 1, 1,
-                   1, 1, 1, 1, 1,
-                   1, 1, 1, 1, 1,
-                   1, 9, 5, 5, 1,
-                   1, 1, 2, 1, 1,
-                   1, 2, 2, 2, 3,
-                   1, 3, 12, 12, 8,
-                   15, 21, 2, 7, 1,
-                   1, 1, 1, 1, 9,
-                   9, 9, 5, 9, 8,
-                   9, 3, 1, 1, 1
-                   ]
 
     part2_columns = ['그룹코드', '시가총액규모', '지수업종대분류', '지수업종중분류', '지수업종소분류',
                      '제조업', '저유동성', '지배구조지수종목', 'KOSPI200섹터업종', 'KOSPI100',
@@ -83,16 +50,11 @@ def get_kospi_master_dataframe(base_dir):
                      '시가총액', '그룹사코드', '회사신용한도초과', '담보대출가능', '대주가능'
                      ]
 
-    df2 = pd.read_fwf(tmp_fil2, widths=field_specs, names=part2_columns)
-
-    df = pd.merge(df1, df2, how='outer', left_index=True, right_index=True)
+    # 종목마스터정보(코스피).h 레이아웃으로 파일 전체를 메모리에서 한번에 분리 (임시 파일 없음)
+    layout = read_layout(layout_path("종목마스터정보(코스피).h"))
+    df = parse_master_file(file_name, layout, columns=part1_columns + part2_columns, numeric=True,
+                           text=part1_columns)
 
-    # clean temporary file and dataframe
-    del (df1)
-    del (df2)
-    os.remove(tmp_fil1)
-    os.remove(tmp_fil2)
-    
     print("Done")
 
     return df
@@ -105,4 +67,5 @@ df = get_kospi_master_dataframe(base_dir)
 df3 = df
 # print(df3[['단축코드', '한글명', 'KRX', 'KRX증권', '기준가', '증거금비율', '상장일자', 'ROE']])
 df3.to_excel('kospi_code.xlsx',index=False) # 현재 위치에 엑셀파일로 저장
+save_master_cache('kospi', df, code_column='단축코드', name_column='한글명')  # 종목마스터 공용 캐시로 저장
 df3
@@ -0,0 +1,303 @@
+'''종목마스터 공용 캐시 (Arrow IPC + 메모리 매핑)
+
+stocks_info 의 정제 스크립트가 만든 DataFrame 을 날짜별 Arrow 파일(`{마스터명}_{YYYYMMDD}.arrow`) 로 저장하고,
+다른 프로세스는 파일을 메모리 매핑으로 열어 다운로드/파싱 없이 바로 조회합니다. (pyarrow 필요)
+
+    >>> save_master_cache("kospi", df, code_column="단축코드", name_column="한글명")
+    >>> cache = MasterCache()
+    >>> cache.lookup("005930")                  # 종목코드로 조회 (전체 마스터)
+    >>> cache.search("삼성", masters=["kospi"])  # 종목명 부분 일치
+    >>> cache.select("kospi", KRX반도체="Y")     # 플래그/컬럼 조건
+    >>> cache.sector_members("전기전자")         # 업종 구성 종목
+    >>> cache.theme_members("2차전지")           # 테마 구성 종목
+
+캐시 폴더는 환경변수 KIS_MASTER_CACHE_DIR 로 변경할 수 있습니다. (기본 ~/KIS/master)
+'''
+
+import glob
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# 스키마 메타데이터 키 (마스터별 종목코드/종목명 컬럼)
+META_CODE = b"kis.code_column"
+META_NAME = b"kis.name_column"
+
+# 업종/테마 조회에 사용하는 마스터와 컬럼
+SECTOR_MASTER = "sector"
+THEME_MASTER = "theme"
+SECTOR_COLUMNS = {
+    "kospi": ("지수업종대분류", "지수업종중분류", "지수업종소분류"),
+    "kosdaq": ("지수업종 대분류 코드", "지수 업종 중분류 코드", "지수업종 소분류 코드"),
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("종목마스터 캐시에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    return pyarrow
+
+
+def default_cache_dir() -> str:
+    return os.getenv("KIS_MASTER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), "KIS", "master")
+
+
+class MasterCache:
+    '''날짜별 Arrow 파일로 저장된 종목마스터 조회
+
+    파일은 압축 없이 저장하여 메모리 매핑으로 열 때 복사가 일어나지 않으며, 열린 테이블은 프로세스 안에서 재사용한다.
+    조회 함수는 각 마스터의 가장 최근 날짜 파일을 사용한다.
+    '''
+
+    def __init__(self, cache_dir: Optional[str] = None, keep: int = 3):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.keep = max(1, keep)  # 마스터별로 남겨둘 날짜 수
+        self._tables: Dict[str, Any] = {}
+
+    # ========== 저장 ==========
+
+    def path(self, name: str, date: Optional[str] = None) -> str:
+        return os.path.join(self.cache_dir, f"{name}_{date or datetime.now().strftime('%Y%m%d')}.arrow")
+
+    def put(self, name: str, df: pd.DataFrame, code_column: str, name_column: str, date: Optional[str] = None) -> str:
+        '''DataFrame 을 마스터 캐시로 저장 (같은 날짜 파일은 교체)
+
+        Args:
+            name: 마스터명 (kospi, kosdaq, overseas_nas 등)
+            df: 정제된 마스터 DataFrame
+            code_column: 종목코드 컬럼명
+            name_column: 종목명 컬럼명
+            date: 기준일 YYYYMMDD (생략시 오늘)
+        '''
+        pa = _pyarrow()
+        for column in (code_column, name_column):
+            if column not in df.columns:
+                raise KeyError(f"{name} 마스터에 '{column}' 컬럼이 없습니다.")
+
+        df = df.reset_index(drop=True).copy()
+        # 종목코드/종목명은 문자열로 저장 (조회 기준)
+        df[code_column] = df[code_column].astype(str).str.strip()
+        df[name_column] = df[name_column].astype(str).str.strip()
+        # object 컬럼에 숫자/문자가 섞인 경우 Arrow 변환이 실패하므로 문자열로 통일
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            META_CODE: code_column.encode("utf-8"),
+            META_NAME: name_column.encode("utf-8"),
+        })
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(name, date)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self._tables.pop(path, None)
+        self._prune(name)
+        return path
+
+    def _prune(self, name: str):
+        for path in self._files(name)[:-self.keep]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._tables.pop(path, None)
+
+    # ========== 열기 ==========
+
+    def _files(self, name: str) -> List[str]:
+        # 날짜 오름차순
+        pattern = re.compile(re.escape(name) + r"_(\d{8})\.arrow$")
+        files = [p for p in glob.glob(os.path.join(self.cache_dir, f"{glob.escape(name)}_*.arrow"))
+                 if pattern.search(os.path.basename(p))]
+        return sorted(files)
+
+    def names(self) -> List[str]:
+        '''캐시에 저장된 마스터명 목록'''
+        found = set()
+        for path in glob.glob(os.path.join(self.cache_dir, "*.arrow")):
+            m = re.match(r"(.+)_\d{8}\.arrow$", os.path.basename(path))
+            if m:
+                found.add(m.group(1))
+        return sorted(found)
+
+    def latest(self, name: str) -> Optional[Tuple[str, str]]:
+        '''(기준일 YYYYMMDD, 파일 경로), 없으면 None'''
+        files = self._files(name)
+        if not files:
+            return None
+        return os.path.basename(files[-1])[-14:-6], files[-1]
+
+    def is_fresh(self, name: str, date: Optional[str] = None) -> bool:
+        '''기준일(생략시 오늘) 캐시가 있는지 여부'''
+        latest = self.latest(name)
+        return latest is not None and latest[0] >= (date or datetime.now().strftime("%Y%m%d"))
+
+    def table(self, name: str, date: Optional[str] = None):
+        '''마스터 pyarrow.Table (메모리 매핑), 없으면 FileNotFoundError'''
+        pa = _pyarrow()
+        if date:
+            path = self.path(name, date)
+        else:
+            latest = self.latest(name)
+            path = latest[1] if latest else self.path(name)
+        table = self._tables.get(path)
+        if table is None:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"종목마스터 캐시가 없습니다: {path}")
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            self._tables[path] = table
+        return table
+
+    def load(self, name: str, columns: Optional[Sequence[str]] = None, date: Optional[str] = None) -> pd.DataFrame:
+        '''마스터 전체(또는 일부 컬럼) 를 DataFrame 으로 반환'''
+        table = self.table(name, date)
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas()
+
+    def key_columns(self, name: str) -> Tuple[str, str]:
+        '''(종목코드 컬럼, 종목명 컬럼)'''
+        metadata = self.table(name).schema.metadata or {}
+        return metadata[META_CODE].decode("utf-8"), metadata[META_NAME].decode("utf-8")
+
+    # ========== 조회 ==========
+
+    def _masters(self, masters: Optional[Iterable[str]]) -> List[str]:
+        # 지정한 마스터 중 캐시에 있는 것만 (생략시 전체)
+        cached = self.names()
+        return cached if masters is None else [name for name in masters if name in cached]
+
+    def _rows(self, name: str, mask, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self.table(name).filter(mask)
+        if limit is not None:
+            rows = rows.slice(0, limit)
+        return [dict(row, master=name) for row in rows.to_pylist()]
+
+    def lookup(self, code: str, masters: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        '''종목코드가 일치하는 행 목록 (각 행에 master 키 추가)'''
+        pc = _pyarrow().compute
+        result = []
+        for name in self._masters(masters):
+            code_column, _ = self.key_columns(name)
+            result += self._rows(name, pc.equal(self.table(name)[code_column], str(code).strip()))
+        return result
+
+    def search(self, keyword: str, masters: Optional[Iterable[str]] = None, exact: bool = False,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        '''종목명 검색 (exact=False 이면 부분 일치, 대소문자 무시)'''
+        pc = _pyarrow().compute
+        keyword = keyword.strip()
+        result = []
+        for name in self._masters(masters):
+            _, name_column = self.key_columns(name)
+            names = self.table(name)[name_column]
+            if exact:
+                mask = pc.equal(names, keyword)
+            else:
+                mask = pc.match_substring(names, keyword, ignore_case=True)
+            result += self._rows(name, mask, limit - len(result))
+            if len(result) >= limit:
+                break
+        return result
+
+    def select(self, name: str, where: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+               **conditions) -> pd.DataFrame:
+        '''컬럼 조건으로 필터링한 DataFrame
+
+        where/conditions 의 값이 list/tuple/set 이면 포함 여부, 그 외에는 일치 여부로 비교한다.
+        컬럼명에 공백 등이 있으면 where 로 전달한다.
+
+            >>> cache.select("kospi", KRX반도체="Y", columns=["단축코드", "한글명"])
+            >>> cache.select("kosdaq", where={"KOSDAQ150지수여부 (Y,N)": "Y"})
+        '''
+        pa = _pyarrow()
+        table = self.table(name)
+        mask = None
+        for column, value in {**(where or {}), **conditions}.items():
+            if column not in table.column_names:
+                raise KeyError(f"{name} 마스터에 '{column}' 컬럼이 없습니다.")
+            condition = self._condition(table[column], value)
+            mask = condition if mask is None else pa.compute.and_(mask, condition)
+        if mask is not None:
+            table = table.filter(mask)
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas()
+
+    @staticmethod
+    def _condition(column, value):
+        pa = _pyarrow()
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        # 숫자형으로 저장된 코드 컬럼('0027' -> 27) 도 문자열 조건으로 조회
+        if pa.types.is_integer(column.type):
+            values = [int(v) for v in values]
+        elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            values = [str(v) for v in values]
+        if len(values) == 1:
+            return pa.compute.equal(column, values[0])
+        return pa.compute.is_in(column, value_set=pa.array(values, type=column.type))
+
+    def _resolve(self, master: str, keyword: str) -> Optional[str]:
+        # 업종/테마 코드 또는 이름 -> 코드
+        code_column, name_column = self.key_columns(master)
+        df = self.select(master, columns=[code_column, name_column])
+        hit = df[(df[code_column] == keyword) | (df[name_column] == keyword)]
+        return None if hit.empty else hit.iloc[0][code_column]
+
+    def sector_members(self, sector: str, masters: Iterable[str] = ("kospi", "kosdaq")) -> pd.DataFrame:
+        '''업종코드 또는 업종명(sector 마스터) 에 속한 종목 (대/중/소분류 중 하나라도 일치)'''
+        pc = _pyarrow().compute
+        code = self._resolve(SECTOR_MASTER, sector) if SECTOR_MASTER in self.names() else sector
+        if code is None:
+            return pd.DataFrame()
+        frames = []
+        for name in self._masters(masters):
+            table = self.table(name)
+            mask = None
+            for column in SECTOR_COLUMNS.get(name, ()):
+                if column in table.column_names:
+                    condition = self._condition(table[column], code)
+                    mask = condition if mask is None else pc.or_(mask, condition)
+            if mask is not None:
+                frames.append(table.filter(mask).to_pandas().assign(master=name))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def theme_members(self, theme: str) -> pd.DataFrame:
+        '''테마코드 또는 테마명(theme 마스터) 에 속한 종목코드와 종목명'''
+        themes = self.select(THEME_MASTER)
+        hit = themes[(themes["테마코드"] == theme) | (themes["테마명"] == theme)].reset_index(drop=True)
+        hit["종목코드"] = hit["종목코드"].str.strip()
+        names = {}
+        for master in self._masters(("kospi", "kosdaq", "konex")):
+            if not hit.empty:
+                code_column, name_column = self.key_columns(master)
+                found = self.select(master, where={code_column: hit["종목코드"].tolist()},
+                                    columns=[code_column, name_column])
+                names.update(zip(found[code_column], found[name_column]))
+        return hit.assign(종목명=hit["종목코드"].map(names))
+
+
+def save_master_cache(name: str, df: pd.DataFrame, code_column: str, name_column: str,
+                      cache_dir: Optional[str] = None) -> Optional[str]:
+    '''정제 스크립트용: 마스터 캐시 저장, pyarrow 가 없으면 안내만 출력'''
+    try:
+        path = MasterCache(cache_dir).put(name, df, code_column, name_column)
+    except ImportError as e:
+        print(f"Skipping master cache: {e}")
+        return None
+    print(f"Master cache saved: {path}")
+    return path
@@ -0,0 +1,91 @@
+'''종목마스터 고정폭 파일(*.mst) 공통 파서
+
+stocks_info 의 *.h 레이아웃 정의를 읽어 파일 전체를 cp949 바이트 그대로 메모리에서 잘라 DataFrame 으로 변환합니다.
+임시 파일(_part1.tmp, _part2.tmp) 과 read_csv/read_fwf 재읽기 없이 한번에 처리합니다.
+
+    >>> layout = read_layout("종목마스터정보(코스피).h")
+    >>> df = parse_master_file("kospi_code.mst", layout, numeric=True)
+    >>> save_parquet(df, "kospi_code.parquet")
+
+파서 본체(MasterLayout, parse_fixed_width) 는 MCP 서버의 module/plugin/master_parser.py 를 그대로 불러 씁니다.
+'''
+
+import importlib.util
+import os
+import re
+import sqlite3
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+def _load_parser():
+    # MCP 서버 패키지(module) 의 초기화 없이 파서 파일만 로드 (numpy/pandas 외 의존성 없음)
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                        "MCP", "Kis Trading MCP", "module", "plugin", "master_parser.py")
+    spec = importlib.util.spec_from_file_location("kis_master_parser_core", os.path.normpath(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_parser = _load_parser()
+Field = _parser.Field
+MasterLayout = _parser.MasterLayout
+parse_fixed_width = _parser.parse_fixed_width
+
+# *.h 에서 크기가 주석으로만 정의되거나 정의되지 않은 매크로의 기본 크기
+DEFAULT_SIZES = {"SZ_SHRNCODE": 9, "SZ_STNDCODE": 12}
+
+
+def read_layout(h_file: str, sizes: Optional[Dict[str, int]] = None) -> MasterLayout:
+    '''*.h 구조체 정의를 레이아웃으로 변환
+
+    `char name[크기]; /* 설명 */` 형식의 필드를 순서대로 읽는다.
+    크기가 매크로인 경우 주석의 `(SZ_KORNAME=40)` 정의, sizes, DEFAULT_SIZES 순으로 찾고, 어디에도 없으면 가변 길이로 본다.
+    '''
+    raw = open(h_file, "rb").read()
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode("cp949")
+
+    macros = dict(DEFAULT_SIZES)
+    macros.update({k: int(v) for k, v in re.findall(r"(SZ_\w+)\s*=\s*(\d+)", text)})
+    macros.update(sizes or {})
+
+    fields = []
+    for name, size, label in re.findall(r"char\s+(\w+)\s*\[\s*(\w+)\s*\]\s*;\s*(?:/\*\s*(.*?)\s*\*/)?", text):
+        width = int(size) if size.isdigit() else macros.get(size)
+        fields.append(Field(name, width, re.sub(r"\s*\(.*$", "", label).strip()))
+    if not fields:
+        raise ValueError(f"필드 정의를 찾을 수 없습니다: {h_file}")
+    return MasterLayout(fields)
+
+
+def parse_master_file(file_name: str, layout: MasterLayout, **kwargs) -> pd.DataFrame:
+    '''마스터파일 경로로 parse_fixed_width 호출'''
+    with open(file_name, "rb") as f:
+        return parse_fixed_width(f.read(), layout, **kwargs)
+
+
+def save_parquet(df: pd.DataFrame, path: str) -> str:
+    '''Parquet 파일로 저장 (pyarrow 필요)'''
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet 저장에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    df.to_parquet(path, index=False)
+    return path
+
+
+def save_sqlite(df: pd.DataFrame, path: str, table: str) -> str:
+    '''SQLite 테이블로 저장 (기존 테이블은 교체)'''
+    with sqlite3.connect(path) as conn:
+        df.to_sql(table, conn, if_exists="replace", index=False)
+    return path
+
+
+def layout_path(h_name: str) -> str:
+    '''stocks_info 폴더의 *.h 경로'''
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), h_name)
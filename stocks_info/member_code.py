@@ -4,6 +4,7 @@ import pandas as pd
 import urllib.request
 import ssl
 import os
+from kis_master_cache import save_master_cache
 
 # 현재 작업 디렉토리
 base_dir = os.getcwd()
@@ -48,4 +49,5 @@ df_memcode = parse_memcode_file(file_path)
 excel_filename = 'memcode.xlsx'
 print("Saving to Excel...")
 df_memcode.to_excel(excel_filename, index=False)
+save_master_cache('member', df_memcode, code_column='회원사코드', name_column='회원사명')
 print(f"Excel file '{excel_filename}' created successfully.")
\ No newline at end of file
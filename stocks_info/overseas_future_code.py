@@ -5,6 +5,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -58,4 +59,5 @@ def get_overseas_future_master_dataframe(base_dir):
     return df
     
 df = get_overseas_future_master_dataframe(base_dir)
+save_master_cache('overseas_future', df, code_column='종목코드', name_column='종목한글명')
 print("Done")
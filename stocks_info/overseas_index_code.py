@@ -10,6 +10,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 import numpy as np
 
 base_dir = os.getcwd()
@@ -78,4 +79,5 @@ def get_overseas_index_master_dataframe(base_dir):
     return DF
 
 df = get_overseas_index_master_dataframe(base_dir)
+save_master_cache('overseas_index', df, code_column='심볼', name_column='한글명')
 print("Done")
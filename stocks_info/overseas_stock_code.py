@@ -20,6 +20,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -43,6 +44,7 @@ def get_overseas_master_dataframe(base_dir,val):
     df = pd.read_table(os.path.join(base_dir, f"{val}mst.cod"), sep='\t',encoding='cp949')
     df.columns = columns
     df.to_excel(f'{val}_code.xlsx',index=False)  # 현재 위치에 엑셀파일로 저장
+    save_master_cache(f'overseas_{val}', df, code_column='Symbol', name_column='Korea name')  # 종목마스터 공용 캐시로 저장
 
     
     return df
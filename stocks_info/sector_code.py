@@ -3,6 +3,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -32,4 +33,5 @@ def get_sector_master_dataframe(base_dir):
 
 df2 = get_sector_master_dataframe(base_dir)
 df2.to_excel('idxcode.xlsx',index=False) # 현재 위치에 엑셀파일로 저장
+save_master_cache('sector', df2, code_column='업종코드', name_column='업종명')  # 종목마스터 공용 캐시로 저장
 df2
@@ -3,6 +3,7 @@ import urllib.request
 import ssl
 import zipfile
 import os
+from kis_master_cache import save_master_cache
 
 base_dir = os.getcwd()
 
@@ -33,4 +34,5 @@ def get_theme_master_dataframe(base_dir):
 
 df1 = get_theme_master_dataframe(base_dir)
 df1.to_excel('theme_code.xlsx',index=False)  # 현재 위치에 엑셀파일로 저장
+save_master_cache('theme', df1, code_column='테마코드', name_column='테마명')  # 종목마스터 공용 캐시로 저장
 df1
\ No newline at end of file
@@ -118,8 +118,9 @@ def _resolve_futures_name(code: str) -> str | None:
     except Exception:
         return None
 class Monitor:
-    def __init__(self, fut_code: str, idx_keys: list[str], basis_th: float = 0.20, nabt_ntby_th: int = 1500):
+    def __init__(self, fut_code: str, idx_keys: list[str], basis_th: float = 0.20, nabt_ntby_th: int = 1500, store=None):
         self.fut_code = fut_code
+        self.store = store
         self.idx_keys = idx_keys
         self.basis_th = basis_th
         self.nabt_ntby_th = nabt_ntby_th
@@ -152,6 +153,8 @@ class Monitor:
         try:
             if result is None or result.empty:
                 return
+            if self.store is not None:
+                self.store.append_frame(tr_id, result)
             cols = result.columns.tolist()
             when = None
             if "bsop_hour" in cols:
@@ -282,7 +285,12 @@ def main():
     basis_th = float(os.environ.get("BASIS_TH", "0.20"))
     nabt_ntby_th = int(os.environ.get("NABT_NTBY_TH", "1500"))
     heartbeat = int(os.environ.get("HEARTBEAT_SEC", "60"))
-    mon = Monitor(fut_code, idx_keys, basis_th, nabt_ntby_th)
+    store = None
+    if os.environ.get("TICK_STORE", "0") == "1":
+        # 지수선물 체결(H0IFCNT0) 을 app/tick_store 에 저장 (KIS_TICK_STORE_DIR, 기본 ~/KIS/ticks)
+        from app.tick_store import TickStore
+        store = TickStore()
+    mon = Monitor(fut_code, idx_keys, basis_th, nabt_ntby_th, store)
     kws = ka.KISWebSocket(api_url="/tryitout")
     nm = _resolve_futures_name(fut_code)
     disp = f"{nm}({fut_code})" if nm else fut_code